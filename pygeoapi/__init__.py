@@ -37,8 +37,10 @@ try:
     from importlib.metadata import entry_points
 except ImportError:
     from importlib_metadata import entry_points
+from pygeoapi.cache.tiles.seed import tiles
 from pygeoapi.config import config
 from pygeoapi.openapi import openapi
+from pygeoapi.process.executor.worker import jobs
 
 
 def _find_plugins():
@@ -111,3 +113,5 @@ def serve(ctx, server):
 
 cli.add_command(config)
 cli.add_command(openapi)
+cli.add_command(tiles)
+cli.add_command(jobs)
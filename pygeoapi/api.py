@@ -40,14 +40,20 @@ import asyncio
 from collections import OrderedDict
 from copy import deepcopy
 from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
 from functools import partial
+import gzip as gzip_
 from gzip import compress
+import hashlib
 from http import HTTPStatus
+from inspect import signature
 import json
 import logging
+from pathlib import Path
 import re
-from typing import Any, Tuple, Union, Optional
+from typing import Any, Iterator, Tuple, Union, Optional
 import urllib.parse
+import zlib
 
 from dateutil.parser import parse as dateparse
 from pygeofilter.parsers.ecql import parse as parse_ecql_text
@@ -58,12 +64,17 @@ from shapely.errors import WKTReadingError
 from shapely.wkt import loads as shapely_loads
 
 from pygeoapi import __version__, l10n
+from pygeoapi.cache.tiles.base import gunzip, is_gzipped
+from pygeoapi.concurrency import await_result
 from pygeoapi.formatter.base import FormatterSerializationError
 from pygeoapi.linked_data import (geojson2jsonld, jsonldify,
                                   jsonldify_collection)
 from pygeoapi.log import setup_logger
+from pygeoapi.openapi import OpenAPIDocument
 from pygeoapi.process.base import ProcessorExecuteError
-from pygeoapi.plugin import load_plugin, PLUGINS
+from pygeoapi.process.executor.base import ExecutorQueueFullError
+from pygeoapi.process.manager.base import filter_jobs, get_datetime_range
+from pygeoapi.plugin import load_plugin, PLUGINS, ProviderRegistry
 from pygeoapi.provider.base import (
     ProviderGenericError, ProviderConnectionError, ProviderNotFoundError,
     ProviderInvalidDataError, ProviderInvalidQueryError, ProviderNoDataError,
@@ -72,16 +83,21 @@ from pygeoapi.provider.base import (
 
 from pygeoapi.provider.tile import (ProviderTileNotFoundError,
                                     ProviderTileQueryError,
-                                    ProviderTilesetIdNotFoundError)
+                                    ProviderTilesetIdNotFoundError,
+                                    TILE_MATRIX_SETS)
 from pygeoapi.models.cql import CQLModel
 from pygeoapi.util import (dategetter, RequestedProcessExecutionMode,
                            DATETIME_FORMAT, UrlPrefetcher,
                            filter_dict_by_key_value, get_provider_by_type,
                            get_provider_default, get_typed_value, JobStatus,
                            json_serial, render_j2_template, str2bool,
-                           TEMPLATES, to_json, get_api_rules, get_base_url,
-                           get_crs_from_uri, get_supported_crs_list,
-                           CrsTransformSpec, transform_bbox)
+                           precompile_j2_templates,
+                           TEMPLATES, to_coverage_json_stream, to_json,
+                           to_json_stream,
+                           get_api_rules, get_base_url,
+                           get_crs_transform_spec,
+                           get_supported_crs_list, CrsTransformSpec,
+                           transform_bbox)
 
 from pygeoapi.models.provider.base import TilesMetadataFormat
 
@@ -172,6 +188,9 @@ DEFAULT_CRS_LIST = [
 DEFAULT_CRS = 'http://www.opengis.net/def/crs/OGC/1.3/CRS84'
 DEFAULT_STORAGE_CRS = DEFAULT_CRS
 
+#: bytes read at once from streamed files (e.g. job results)
+FILE_CHUNK_SIZE = 1048576
+
 
 def pre_process(func):
     """
@@ -207,25 +226,358 @@ def gzip(func):
 
     def inner(*args, **kwargs):
         headers, status, content = func(*args, **kwargs)
-        charset = CHARSET[0]
-        if F_GZIP in headers.get('Content-Encoding', []):
-            try:
-                if isinstance(content, bytes):
-                    # bytes means Content-Type needs to be set upstream
-                    content = compress(content)
-                else:
+        return headers, status, gzip_content(headers, content)
+
+    return inner
+
+
+def gzip_content(headers: dict, content: Union[str, bytes]) -> Union[str,
+                                                                     bytes]:
+    """
+    Compresses content if the Content-Encoding response header was set
+    to gzip.
+
+    :param headers: `dict` of response headers
+    :param content: response content
+
+    :returns: compressed or unchanged response content
+    """
+
+    charset = CHARSET[0]
+    if F_GZIP in headers.get('Content-Encoding', []):
+        try:
+            if isinstance(content, Iterator):
+                # streamed content is compressed chunk by chunk
+                if _needs_charset(headers.get('Content-Type', '')):
                     headers['Content-Type'] = \
                         f"{headers['Content-Type']}; charset={charset}"
-                    content = compress(content.encode(charset))
-            except TypeError as err:
-                headers.pop('Content-Encoding')
-                LOGGER.error(f'Error in compression: {err}')
+                content = _gzip_stream(content, charset)
+            elif isinstance(content, bytes):
+                # bytes means Content-Type needs to be set upstream
+                content = compress(content)
+            else:
+                headers['Content-Type'] = \
+                    f"{headers['Content-Type']}; charset={charset}"
+                content = compress(content.encode(charset))
+        except TypeError as err:
+            headers.pop('Content-Encoding')
+            LOGGER.error(f'Error in compression: {err}')
 
-        return headers, status, content
+    return content
+
+
+def _gzip_stream(chunks: Iterator[Union[str, bytes]],
+                 charset: str) -> Iterator[bytes]:
+    """
+    Compresses streamed response content
+
+    :param chunks: iterator of response content chunks
+    :param charset: `str` of charset to encode `str` chunks with
+
+    :returns: generator of gzip compressed chunks
+    """
+
+    compressor = zlib.compressobj(wbits=31)  # gzip container
+    try:
+        for chunk in chunks:
+            if isinstance(chunk, str):
+                chunk = chunk.encode(charset)
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+    finally:
+        # release the resources of the stream (e.g. temporary files)
+        if hasattr(chunks, 'close'):
+            chunks.close()
+
+
+def _needs_charset(content_type: str) -> bool:
+    """
+    Checks whether a charset is to be added to a Content-Type header, i.e.
+    whether it is textual (JSON, HTML, text, etc.) and has no charset yet
+
+    :param content_type: `str` of Content-Type header
+
+    :returns: `bool` of whether a charset is to be added
+    """
+
+    mimetype, _, params = content_type.partition(';')
+    mimetype = mimetype.strip().lower()
+    if 'charset=' in params.lower():
+        return False
+
+    return (mimetype.startswith('text/') or
+            mimetype in ['application/json', 'application/xml'] or
+            mimetype.endswith('+json') or mimetype.endswith('+xml'))
+
+
+def etag_matches(request, etag: str) -> bool:
+    """
+    Checks whether an ETag matches the If-None-Match request header
+
+    :param request: `APIRequest` instance
+    :param etag: `str` of (quoted) entity tag
+
+    :returns: `bool` of whether the ETag matches
+    """
+
+    if_none_match = None
+    for key, value in request.headers.items():
+        if key.lower() == 'if-none-match':
+            if_none_match = value
+            break
+
+    if not if_none_match:
+        return False
+
+    if if_none_match.strip() == '*':
+        return True
+
+    # weak comparison (RFC 9110, section 13.1.2)
+    def opaque_tag(tag):
+        tag = tag.strip()
+        return tag[2:] if tag.startswith('W/') else tag
+
+    candidates = [opaque_tag(tag) for tag in if_none_match.split(',')]
+
+    return opaque_tag(etag) in candidates
+
+
+def cached(func):
+    """
+    Decorator that serves the responses of a read endpoint from the
+    response cache (if configured) and answers conditional requests.
+
+    Responses are keyed on the endpoint, its arguments, the normalized
+    query parameters, format, locale and content coding, and on the
+    generation of the collection, which transactions renew.  `ETag` and
+    `Last-Modified` validators are added to cached responses, and
+    matching `If-None-Match`/`If-Modified-Since` requests get a
+    304 Not Modified response.  Must be applied within :func:`pre_process`.
+
+    :param func: decorated function
+
+    :returns: `func`
+    """
+
+    def inner(cls, request, *args):
+        cache = getattr(cls, 'cache', None)
+        if cache is None:
+            return func(cls, request, *args)
+
+        resources = cls.config['resources']
+        dataset = args[0] if args and args[0] in resources else None
+        if dataset is None:
+            ttl = cache.ttl
+        else:
+            ttl = resources[dataset].get('cache_ttl', cache.ttl)
+        if not ttl:
+            return func(cls, request, *args)
+
+        gzip_ = (F_GZIP in FORMAT_TYPES and
+                 F_GZIP in request.headers.get('Accept-Encoding', ''))
+        key = json.dumps([
+            func.__name__, args, sorted(request.params.items()),
+            request.format, str(request.locale), gzip_,
+            cache.get_generation(dataset or '')
+        ], default=str)
+        key = hashlib.sha256(key.encode()).hexdigest()
+
+        entry = cache.get(key)
+        if entry is not None:
+            LOGGER.debug('Serving response from cache')
+            headers, content = entry['headers'], entry['content']
+        else:
+            headers, status, content = func(cls, request, *args)
+            if status != HTTPStatus.OK or isinstance(content, Iterator):
+                return headers, status, content
+
+            data = content if isinstance(content, bytes) else \
+                content.encode(CHARSET[0])
+            etag = hashlib.sha256(data).hexdigest()[:32]
+            headers['ETag'] = f'"{etag}-{F_GZIP}"' if gzip_ else f'"{etag}"'
+            headers['Last-Modified'] = formatdate(usegmt=True)
+            cache.set(key, {'headers': headers, 'content': content}, ttl)
+
+        if not_modified(request, headers):
+            headers.pop('Content-Encoding', None)
+            return headers, HTTPStatus.NOT_MODIFIED, ''
+
+        return headers, HTTPStatus.OK, content
 
     return inner
 
 
+def not_modified(request, headers: dict) -> bool:
+    """
+    Checks whether a conditional request matches the validators of a
+    response (`If-None-Match` takes precedence over `If-Modified-Since`)
+
+    :param request: `APIRequest` instance
+    :param headers: `dict` of response headers
+
+    :returns: `bool` of whether the response is not modified
+    """
+
+    request_headers = {k.lower(): v for k, v in request.headers.items()}
+
+    if 'if-none-match' in request_headers:
+        return 'ETag' in headers and etag_matches(request, headers['ETag'])
+
+    if_modified_since = request_headers.get('if-modified-since')
+    if if_modified_since and 'Last-Modified' in headers:
+        try:
+            return (parsedate_to_datetime(headers['Last-Modified']) <=
+                    parsedate_to_datetime(if_modified_since))
+        except (TypeError, ValueError):
+            return False
+
+    return False
+
+
+def file_response(request, headers: dict, path: Path,
+                  offload: Optional[Tuple[str, str]] = None
+                  ) -> Tuple[dict, int, Any]:
+    """
+    Creates the response of a file (e.g. a job result) streamed in chunks
+    rather than read in memory
+
+    The response has `ETag` and `Last-Modified` validators (answering
+    conditional requests with 304 Not Modified) and a `Content-Length`,
+    and a single byte range (`Range`, `If-Range`) gets a 206 Partial
+    Content response.  gzip compressed files (`.gz`) are sent as is to
+    clients accepting gzip, else decompressed on the fly (without
+    byte ranges).  With `offload`, the file is left to the front web
+    server (e.g. `X-Accel-Redirect` for nginx, `X-Sendfile` for Apache).
+
+    :param request: `APIRequest` instance
+    :param headers: `dict` of response headers
+    :param path: `Path` of file
+    :param offload: optional tuple of header name and value
+                    (e.g. internal location) of offloaded responses
+
+    :returns: tuple of headers, status code, content
+    """
+
+    request_headers = {k.lower(): v for k, v in request.headers.items()}
+    headers.pop('Content-Encoding', None)
+
+    stat = path.stat()
+    etag = f'{stat.st_mtime_ns:x}-{stat.st_size:x}'
+    decompress = False
+    if path.suffix == '.gz':
+        headers['Vary'] = 'Accept-Encoding'
+        if F_GZIP in request_headers.get('accept-encoding', ''):
+            headers['Content-Encoding'] = F_GZIP
+            etag = f'{etag}-{F_GZIP}'
+        else:
+            decompress = True
+    headers['ETag'] = f'"{etag}"'
+    headers['Last-Modified'] = formatdate(stat.st_mtime, usegmt=True)
+
+    if not_modified(request, headers):
+        headers.pop('Content-Encoding', None)
+        return headers, HTTPStatus.NOT_MODIFIED, ''
+
+    if decompress:
+        headers['Accept-Ranges'] = 'none'
+        return headers, HTTPStatus.OK, _read_file(path, decompress=True)
+
+    if offload is not None:
+        LOGGER.debug(f'Offloading {path} with {offload[0]}')
+        headers[offload[0]] = offload[1]
+        return headers, HTTPStatus.OK, ''
+
+    size = stat.st_size
+    headers['Accept-Ranges'] = 'bytes'
+    start, end = 0, size - 1
+    status = HTTPStatus.OK
+
+    range_ = request_headers.get('range')
+    if_range = request_headers.get('if-range', '').strip()
+    if range_ and if_range in ('', headers['ETag'], headers['Last-Modified']):
+        try:
+            byte_range = parse_byte_range(range_, size)
+        except ValueError:
+            headers['Content-Range'] = f'bytes */{size}'
+            headers.pop('Content-Encoding', None)
+            return (headers, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE,
+                    '')
+        if byte_range is not None:
+            start, end = byte_range
+            status = HTTPStatus.PARTIAL_CONTENT
+            headers['Content-Range'] = f'bytes {start}-{end}/{size}'
+
+    headers['Content-Length'] = str(end - start + 1)
+
+    return headers, status, _read_file(path, start, end - start + 1)
+
+
+def parse_byte_range(value: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parses a Range request header of a single byte range
+
+    :param value: `str` of Range header
+    :param size: `int` of size of the representation
+
+    :raises: `ValueError` if the range is not satisfiable
+    :returns: tuple of first and last byte positions, or `None` if the
+              header is invalid or has several ranges (i.e. is ignored)
+    """
+
+    match = re.match(r'^\s*bytes\s*=\s*(\d*)\s*-\s*(\d*)\s*$', value,
+                     re.IGNORECASE)
+    if match is None or match.groups() == ('', ''):
+        return None
+
+    first, last = match.groups()
+
+    if not first:
+        # suffix range: the last bytes
+        length = int(last)
+        if length == 0 or size == 0:
+            raise ValueError(value)
+        return max(0, size - length), size - 1
+
+    first = int(first)
+    if last and int(last) < first:
+        return None
+    if first >= size:
+        raise ValueError(value)
+
+    return first, size - 1 if not last else min(int(last), size - 1)
+
+
+def _read_file(path: Path, start: int = 0, length: Optional[int] = None,
+               decompress: bool = False,
+               chunk_size: int = FILE_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Reads (part of) a file in chunks
+
+    :param path: `Path` of file
+    :param start: `int` of first byte position
+    :param length: `int` of number of bytes (default is up to the end)
+    :param decompress: `bool` of whether to decompress a gzip file
+    :param chunk_size: `int` of size of chunks
+
+    :returns: generator of chunks
+    """
+
+    opener = gzip_.open if decompress else open
+    with opener(path, 'rb') as fh:
+        if start:
+            fh.seek(start)
+        while length is None or length > 0:
+            size = chunk_size if length is None else min(chunk_size, length)
+            chunk = fh.read(size)
+            if not chunk:
+                break
+            if length is not None:
+                length -= len(chunk)
+            yield chunk
+
+
 class APIRequest:
     """
     Transforms an incoming server-specific Request into an object
@@ -349,6 +701,10 @@ class APIRequest:
             if 'django' in str(request.__class__):
                 # Set data from Django request
                 api_req._data = request.body
+            elif hasattr(request, '_body'):
+                # Set data from Starlette request body already awaited
+                # (i.e. before dispatching off the event loop)
+                api_req._data = request._body
             else:
                 try:
                     import nest_asyncio
@@ -660,13 +1016,41 @@ class API:
             self.config['server']['pretty_print'] = False
 
         self.pretty_print = self.config['server']['pretty_print']
+        self.streaming = self.config['server'].get('streaming', False)
 
         setup_logger(self.config['logging'])
 
+        # Long-lived provider instances, reused across requests
+        registry_def = self.config['server'].get('provider_registry') or {}
+        self.providers = ProviderRegistry(
+            registry_def.get('health_check_interval', 0))
+        if registry_def.get('preload', False):
+            LOGGER.debug('Preloading providers')
+            self.providers.preload(
+                filter_dict_by_key_value(self.config['resources'],
+                                         'type', 'collection'))
+
+        # Response cache of read endpoints
+        self.cache = None
+        if self.config['server'].get('cache'):
+            LOGGER.debug('Loading response cache')
+            self.cache = load_plugin('cache', self.config['server']['cache'])
+
+        # Tile cache store of collection tiles
+        self.tile_cache = None
+        if self.config['server'].get('tile_cache'):
+            LOGGER.debug('Loading tile cache')
+            self.tile_cache = load_plugin(
+                'tile_cache', self.config['server']['tile_cache'])
+
         # Create config clone for HTML templating with modified base URL
         self.tpl_config = deepcopy(self.config)
         self.tpl_config['server']['url'] = self.base_url
 
+        if self.config['server']['templates'].get('precompile', False):
+            LOGGER.debug('Precompiling templates')
+            precompile_j2_templates(self.tpl_config, self.locales)
+
         # TODO: add as decorator
         if 'manager' in self.config['server']:
             manager_def = self.config['server']['manager']
@@ -789,7 +1173,6 @@ class API:
 
         return headers, HTTPStatus.OK, to_json(fcm, self.pretty_print)
 
-    @gzip
     @pre_process
     def openapi(self, request: Union[APIRequest, Any],
                 openapi) -> Tuple[dict, int, str]:
@@ -797,13 +1180,15 @@ class API:
         Provide OpenAPI document
 
         :param request: A request object
-        :param openapi: dict of OpenAPI definition
+        :param openapi: `OpenAPIDocument`, dict of OpenAPI definition
+                        or JSON string
 
         :returns: tuple of headers, status code, content
         """
 
         if not request.is_valid():
-            return self.get_format_exception(request)
+            headers, status, content = self.get_format_exception(request)
+            return headers, status, gzip_content(headers, content)
 
         headers = request.get_response_headers(**self.api_headers)
 
@@ -818,14 +1203,32 @@ class API:
             }
             content = render_j2_template(self.tpl_config, template, data,
                                          request.locale)
-            return headers, HTTPStatus.OK, content
+            return headers, HTTPStatus.OK, gzip_content(headers, content)
 
         headers['Content-Type'] = 'application/vnd.oai.openapi+json;version=3.0'  # noqa
 
         if isinstance(openapi, dict):
-            return headers, HTTPStatus.OK, to_json(openapi, self.pretty_print)
+            content = to_json(openapi, self.pretty_print)
+            return headers, HTTPStatus.OK, gzip_content(headers, content)
+        elif not isinstance(openapi, OpenAPIDocument):
+            return headers, HTTPStatus.OK, gzip_content(headers, openapi)
+
+        # Serve precomputed document (and compressed variant)
+        openapi.refresh()
+        if F_GZIP in headers.get('Content-Encoding', []):
+            headers['Content-Type'] = \
+                f"{headers['Content-Type']}; charset={CHARSET[0]}"
+            headers['ETag'] = f'{openapi.etag[:-1]}-{F_GZIP}"'
+            content = openapi.compressed(CHARSET[0])
         else:
-            return headers, HTTPStatus.OK, openapi
+            headers['ETag'] = openapi.etag
+            content = openapi.content
+
+        if etag_matches(request, headers['ETag']):
+            headers.pop('Content-Encoding', None)
+            return headers, HTTPStatus.NOT_MODIFIED, ''
+
+        return headers, HTTPStatus.OK, content
 
     @gzip
     @pre_process
@@ -866,6 +1269,7 @@ class API:
 
     @gzip
     @pre_process
+    @cached
     @jsonldify
     def describe_collections(self, request: Union[APIRequest, Any],
                              dataset=None) -> Tuple[dict, int, str]:
@@ -1115,7 +1519,7 @@ class API:
                         provider_def = get_provider_by_type(
                             self.config['resources'][k]['providers'],
                             'coverage')
-                        p = load_plugin('provider', provider_def)
+                        p = self.providers.get(k, provider_def)
                     except ProviderConnectionError:
                         msg = 'connection error (check logs)'
                         return self.get_exception(
@@ -1177,7 +1581,7 @@ class API:
                 # TODO: translate
                 LOGGER.debug('Adding EDR links')
                 try:
-                    p = load_plugin('provider', get_provider_by_type(
+                    p = self.providers.get(dataset, get_provider_by_type(
                         self.config['resources'][dataset]['providers'], 'edr'))
                     parameters = p.get_fields()
                     if parameters:
@@ -1262,6 +1666,7 @@ class API:
 
     @gzip
     @pre_process
+    @cached
     @jsonldify
     def get_collection_queryables(self, request: Union[APIRequest, Any],
                                   dataset=None) -> Tuple[dict, int, str]:
@@ -1288,11 +1693,11 @@ class API:
         LOGGER.debug('Creating collection queryables')
         try:
             LOGGER.debug('Loading feature provider')
-            p = load_plugin('provider', get_provider_by_type(
+            p = self.providers.get(dataset, get_provider_by_type(
                 self.config['resources'][dataset]['providers'], 'feature'))
         except ProviderTypeError:
             LOGGER.debug('Loading record provider')
-            p = load_plugin('provider', get_provider_by_type(
+            p = self.providers.get(dataset, get_provider_by_type(
                 self.config['resources'][dataset]['providers'], 'record'))
         except ProviderConnectionError:
             msg = 'connection error (check logs)'
@@ -1353,6 +1758,7 @@ class API:
 
     @gzip
     @pre_process
+    @cached
     def get_collection_items(
             self, request: Union[APIRequest, Any],
             dataset) -> Tuple[dict, int, str]:
@@ -1374,10 +1780,10 @@ class API:
                                                **self.api_headers)
 
         properties = []
-        reserved_fieldnames = ['bbox', 'bbox-crs', 'crs', 'f', 'lang', 'limit',
-                               'offset', 'resulttype', 'datetime', 'sortby',
-                               'properties', 'skipGeometry', 'q',
-                               'filter', 'filter-lang']
+        reserved_fieldnames = ['bbox', 'bbox-crs', 'crs', 'cursor', 'f',
+                               'lang', 'limit', 'offset', 'resulttype',
+                               'datetime', 'sortby', 'properties',
+                               'skipGeometry', 'q', 'filter', 'filter-lang']
 
         collections = filter_dict_by_key_value(self.config['resources'],
                                                'type', 'collection')
@@ -1406,6 +1812,12 @@ class API:
                 HTTPStatus.BAD_REQUEST, headers, request.format,
                 'InvalidParameterValue', msg)
 
+        # Opaque keyset pagination token handed out by providers in
+        # next links (replaces offset)
+        cursor = request.params.get('cursor')
+        if cursor is not None:
+            offset = 0
+
         LOGGER.debug('Processing limit parameter')
         try:
             limit = int(request.params.get('limit'))
@@ -1463,13 +1875,13 @@ class API:
             provider_type = 'feature'
             provider_def = get_provider_by_type(
                 collections[dataset]['providers'], provider_type)
-            p = load_plugin('provider', provider_def)
+            p = self.providers.get(dataset, provider_def)
         except ProviderTypeError:
             try:
                 provider_type = 'record'
                 provider_def = get_provider_by_type(
                     collections[dataset]['providers'], provider_type)
-                p = load_plugin('provider', provider_def)
+                p = self.providers.get(dataset, provider_def)
             except ProviderTypeError:
                 msg = 'Invalid provider type'
                 return self.get_exception(
@@ -1638,20 +2050,30 @@ class API:
         LOGGER.debug(f'cql_text: {cql_text}')
         LOGGER.debug(f'filter-lang: {filter_lang}')
 
+        # Stream features from provider to response for GeoJSON output
+        stream = self.streaming and request.format in [None, F_JSON]
+
         try:
-            content = p.query(offset=offset, limit=limit,
-                              resulttype=resulttype, bbox=bbox,
-                              datetime_=datetime_, properties=properties,
-                              sortby=sortby, skip_geometry=skip_geometry,
-                              select_properties=select_properties,
-                              crs_transform_spec=crs_transform_spec,
-                              q=q, language=prv_locale, filterq=filter_)
+            content = await_result(p.query(
+                offset=offset, limit=limit, resulttype=resulttype, bbox=bbox,
+                datetime_=datetime_, properties=properties, sortby=sortby,
+                skip_geometry=skip_geometry,
+                select_properties=select_properties,
+                crs_transform_spec=crs_transform_spec, q=q,
+                language=prv_locale, filterq=filter_, stream=stream,
+                cursor=cursor))
         except ProviderConnectionError as err:
             LOGGER.error(err)
             msg = 'connection error (check logs)'
             return self.get_exception(
                 HTTPStatus.INTERNAL_SERVER_ERROR, headers, request.format,
                 'NoApplicableCode', msg)
+        except ProviderInvalidQueryError as err:
+            LOGGER.error(err)
+            msg = f'query error: {err}'
+            return self.get_exception(
+                HTTPStatus.BAD_REQUEST, headers, request.format,
+                'InvalidParameterValue', msg)
         except ProviderQueryError as err:
             LOGGER.error(err)
             msg = 'query error (check logs)'
@@ -1665,9 +2087,13 @@ class API:
                 HTTPStatus.INTERNAL_SERVER_ERROR, headers, request.format,
                 'NoApplicableCode', msg)
 
+        # providers supporting keyset pagination return the cursor
+        # of the next page
+        next_cursor = content.pop('next_cursor', None)
+
         serialized_query_params = ''
         for k, v in request.params.items():
-            if k not in ('f', 'offset'):
+            if k not in ('f', 'offset', 'cursor'):
                 serialized_query_params += '&'
                 serialized_query_params += urllib.parse.quote(k, safe='')
                 serialized_query_params += '='
@@ -1702,33 +2128,54 @@ class API:
                     'href': f'{uri}?offset={prev}{serialized_query_params}'
                 })
 
-        if len(content['features']) == limit:
-            next_ = offset + limit
-            content['links'].append(
-                {
-                    'type': 'application/geo+json',
-                    'rel': 'next',
-                    'title': 'items (next)',
-                    'href': f'{uri}?offset={next_}{serialized_query_params}'
-                })
-
-        content['links'].append(
-            {
-                'type': FORMAT_TYPES[F_JSON],
-                'title': l10n.translate(
-                    collections[dataset]['title'], request.locale),
-                'rel': 'collection',
-                'href': uri
-            })
+        if next_cursor is not None:
+            next_page = f'cursor={urllib.parse.quote(next_cursor, safe="")}'
+        else:
+            next_page = f'offset={offset + limit}'
+        next_link = {
+            'type': 'application/geo+json',
+            'rel': 'next',
+            'title': 'items (next)',
+            'href': f'{uri}?{next_page}{serialized_query_params}'
+        }
+        collection_link = {
+            'type': FORMAT_TYPES[F_JSON],
+            'title': l10n.translate(
+                collections[dataset]['title'], request.locale),
+            'rel': 'collection',
+            'href': uri
+        }
 
         content['timeStamp'] = datetime.utcnow().strftime(
             '%Y-%m-%dT%H:%M:%S.%fZ')
 
+        if stream:
+            # the number of features, hence the next link, is only known
+            # once all features have been written: emit links in the trailer
+            links = content.pop('links')
+
+            def trailer_links(number_returned):
+                if number_returned == limit:
+                    links.append(next_link)
+                links.append(collection_link)
+                return links
+
+            content['links'] = trailer_links
+        else:
+            if len(content['features']) == limit:
+                content['links'].append(next_link)
+
+            content['links'].append(collection_link)
+
         # Set response language to requested provider locale
         # (if it supports language) and/or otherwise the requested pygeoapi
         # locale (or fallback default locale)
         l10n.set_response_language(headers, prv_locale, request.locale)
 
+        if stream:
+            return headers, HTTPStatus.OK, to_json_stream(content,
+                                                          self.pretty_print)
+
         if request.format == F_HTML:  # render
             # For constructing proper URIs to items
 
@@ -1904,11 +2351,11 @@ class API:
         LOGGER.debug('Loading provider')
 
         try:
-            p = load_plugin('provider', get_provider_by_type(
+            p = self.providers.get(dataset, get_provider_by_type(
                 collections[dataset]['providers'], 'feature'))
         except ProviderTypeError:
             try:
-                p = load_plugin('provider', get_provider_by_type(
+                p = self.providers.get(dataset, get_provider_by_type(
                     collections[dataset]['providers'], 'record'))
             except ProviderTypeError:
                 msg = 'Invalid provider type'
@@ -2057,14 +2504,11 @@ class API:
                     'InvalidParameterValue', msg)
 
         try:
-            content = p.query(offset=offset, limit=limit,
-                              resulttype=resulttype, bbox=bbox,
-                              datetime_=datetime_, properties=properties,
-                              sortby=sortby,
-                              select_properties=select_properties,
-                              skip_geometry=skip_geometry,
-                              q=q,
-                              filterq=filter_)
+            content = await_result(p.query(
+                offset=offset, limit=limit, resulttype=resulttype, bbox=bbox,
+                datetime_=datetime_, properties=properties, sortby=sortby,
+                select_properties=select_properties,
+                skip_geometry=skip_geometry, q=q, filterq=filter_))
         except ProviderConnectionError as err:
             LOGGER.error(err)
             msg = 'connection error (check logs)'
@@ -2122,12 +2566,12 @@ class API:
         try:
             provider_def = get_provider_by_type(
                 collections[dataset]['providers'], 'feature')
-            p = load_plugin('provider', provider_def)
+            p = self.providers.get(dataset, provider_def)
         except ProviderTypeError:
             try:
                 provider_def = get_provider_by_type(
                     collections[dataset]['providers'], 'record')
-                p = load_plugin('provider', provider_def)
+                p = self.providers.get(dataset, provider_def)
             except ProviderTypeError:
                 msg = 'Invalid provider type'
                 LOGGER.error(msg)
@@ -2161,13 +2605,15 @@ class API:
         if action == 'create':
             LOGGER.debug('Creating item')
             try:
-                identifier = p.create(request.data)
+                identifier = await_result(p.create(request.data))
             except (ProviderInvalidDataError, TypeError) as err:
                 msg = str(err)
                 return self.get_exception(
                     HTTPStatus.BAD_REQUEST, headers, request.format,
                     'InvalidParameterValue', msg)
 
+            self._invalidate_collection(dataset, provider_def['type'])
+
             headers['Location'] = f'{self.get_collections_url()}/{dataset}/items/{identifier}'  # noqa
 
             return headers, HTTPStatus.CREATED, ''
@@ -2175,29 +2621,34 @@ class API:
         if action == 'update':
             LOGGER.debug('Updating item')
             try:
-                _ = p.update(identifier, request.data)
+                _ = await_result(p.update(identifier, request.data))
             except (ProviderInvalidDataError, TypeError) as err:
                 msg = str(err)
                 return self.get_exception(
                     HTTPStatus.BAD_REQUEST, headers, request.format,
                     'InvalidParameterValue', msg)
 
+            self._invalidate_collection(dataset, provider_def['type'])
+
             return headers, HTTPStatus.NO_CONTENT, ''
 
         if action == 'delete':
             LOGGER.debug('Deleting item')
             try:
-                _ = p.delete(identifier)
+                _ = await_result(p.delete(identifier))
             except ProviderGenericError as err:
                 msg = str(err)
                 return self.get_exception(
                     HTTPStatus.BAD_REQUEST, headers, request.format,
                     'InvalidParameterValue', msg)
 
+            self._invalidate_collection(dataset, provider_def['type'])
+
             return headers, HTTPStatus.OK, ''
 
     @gzip
     @pre_process
+    @cached
     def get_collection_item(self, request: Union[APIRequest, Any],
                             dataset, identifier) -> Tuple[dict, int, str]:
         """
@@ -2234,13 +2685,13 @@ class API:
             provider_type = 'feature'
             provider_def = get_provider_by_type(
                 collections[dataset]['providers'], provider_type)
-            p = load_plugin('provider', provider_def)
+            p = self.providers.get(dataset, provider_def)
         except ProviderTypeError:
             try:
                 provider_type = 'record'
                 provider_def = get_provider_by_type(
                     collections[dataset]['providers'], provider_type)
-                p = load_plugin('provider', provider_def)
+                p = self.providers.get(dataset, provider_def)
             except ProviderTypeError:
                 msg = 'Invalid provider type'
                 return self.get_exception(
@@ -2279,11 +2730,11 @@ class API:
 
         try:
             LOGGER.debug(f'Fetching id {identifier}')
-            content = p.get(
+            content = await_result(p.get(
                 identifier,
                 language=prv_locale,
                 crs_transform_spec=crs_transform_spec,
-            )
+            ))
         except ProviderConnectionError as err:
             LOGGER.error(err)
             msg = 'connection error (check logs)'
@@ -2315,8 +2766,8 @@ class API:
         uri = content['properties'].get(p.uri_field) if p.uri_field else \
             f'{self.get_collections_url()}/{dataset}/items/{identifier}'
 
-        if 'links' not in content:
-            content['links'] = []
+        # links of the provider feature are not extended in place
+        content['links'] = list(content.get('links', []))
 
         content['links'].extend([{
             'type': FORMAT_TYPES[F_JSON],
@@ -2418,7 +2869,7 @@ class API:
             collection_def = get_provider_by_type(
                 self.config['resources'][dataset]['providers'], 'coverage')
 
-            p = load_plugin('provider', collection_def)
+            p = self.providers.get(dataset, collection_def)
         except KeyError:
             msg = 'collection does not exist'
             return self.get_exception(
@@ -2512,9 +2963,49 @@ class API:
             query_args['subsets'] = subsets
             LOGGER.debug(f"Subsets: {query_args['subsets']}")
 
+        if 'scale-factor' in request.params:
+            LOGGER.debug('Processing scale-factor parameter')
+            try:
+                scale_factor = float(request.params['scale-factor'])
+                if scale_factor <= 0:
+                    raise ValueError(scale_factor)
+            except (TypeError, ValueError):
+                msg = 'Invalid scale-factor'
+                LOGGER.error(msg)
+                return self.get_exception(
+                    HTTPStatus.BAD_REQUEST, headers, format_,
+                    'InvalidParameterValue', msg)
+
+            query_args['scale_factor'] = scale_factor
+
+        if 'scale-size' in request.params:
+            LOGGER.debug('Processing scale-size parameter')
+            try:
+                scale_size = {
+                    axis: int(values[0]) for axis, values in
+                    validate_subset(request.params['scale-size'] or '').items()
+                }
+                if min(scale_size.values()) < 1:
+                    raise ValueError(scale_size)
+            except (AttributeError, TypeError, ValueError) as err:
+                msg = f'Invalid scale-size: {err}'
+                LOGGER.error(msg)
+                return self.get_exception(
+                    HTTPStatus.BAD_REQUEST, headers, format_,
+                    'InvalidParameterValue', msg)
+
+            if not set(scale_size.keys()).issubset(p.axes):
+                msg = 'Invalid axis name'
+                LOGGER.error(msg)
+                return self.get_exception(
+                    HTTPStatus.BAD_REQUEST, headers, format_,
+                    'InvalidParameterValue', msg)
+
+            query_args['scale_size'] = scale_size
+
         LOGGER.debug('Querying coverage')
         try:
-            data = p.query(**query_args)
+            data = await_result(p.query(**query_args))
         except ProviderInvalidQueryError as err:
             msg = f'query error: {err}'
             return self.get_exception(
@@ -2530,6 +3021,10 @@ class API:
             return self.get_exception(
                 HTTPStatus.INTERNAL_SERVER_ERROR, headers, format_,
                 'NoApplicableCode', msg)
+        except ProviderRequestEntityTooLargeError as err:
+            return self.get_exception(
+                HTTPStatus.REQUEST_ENTITY_TOO_LARGE, headers, format_,
+                'NoApplicableCode', str(err))
 
         mt = collection_def['format']['name']
         if format_ == mt:  # native format
@@ -2541,6 +3036,11 @@ class API:
             return headers, HTTPStatus.OK, data
         elif format_ == F_JSON:
             headers['Content-Type'] = 'application/prs.coverage+json'
+            if any(not isinstance(range_.get('values', []), list)
+                   for range_ in data.get('ranges', {}).values()):
+                LOGGER.debug('Streaming CoverageJSON ranges')
+                return headers, HTTPStatus.OK, to_coverage_json_stream(
+                    data, self.pretty_print)
             return headers, HTTPStatus.OK, to_json(data, self.pretty_print)
         else:
             return self.get_format_exception(request)
@@ -2568,7 +3068,7 @@ class API:
             collection_def = get_provider_by_type(
                 self.config['resources'][dataset]['providers'], 'coverage')
 
-            p = load_plugin('provider', collection_def)
+            p = self.providers.get(dataset, collection_def)
 
             data = p.get_coverage_domainset()
         except KeyError:
@@ -2625,7 +3125,7 @@ class API:
             collection_def = get_provider_by_type(
                 self.config['resources'][dataset]['providers'], 'coverage')
 
-            p = load_plugin('provider', collection_def)
+            p = self.providers.get(dataset, collection_def)
 
             data = p.get_coverage_rangetype()
         except KeyError:
@@ -2690,7 +3190,7 @@ class API:
         try:
             t = get_provider_by_type(
                 self.config['resources'][dataset]['providers'], 'tile')
-            p = load_plugin('provider', t)
+            p = self.providers.get(dataset, t)
         except (KeyError, ProviderTypeError):
             msg = 'Invalid collection tiles'
             return self.get_exception(
@@ -2787,6 +3287,7 @@ class API:
         return headers, HTTPStatus.OK, to_json(tiles, self.pretty_print)
 
     @pre_process
+    @cached
     def get_collection_tiles_data(
             self, request: Union[APIRequest, Any],
             dataset=None, matrix_id=None,
@@ -2823,20 +3324,60 @@ class API:
         try:
             t = get_provider_by_type(
                 self.config['resources'][dataset]['providers'], 'tile')
-            p = load_plugin('provider', t)
+            p = self.providers.get(dataset, t)
 
             format_ = p.format_type
             headers['Content-Type'] = format_
 
-            LOGGER.debug(f'Fetching tileset id {matrix_id} and tile {z_idx}/{y_idx}/{x_idx}')  # noqa
-            content = p.get_tiles(layer=p.get_layer(), tileset=matrix_id,
-                                  z=z_idx, y=y_idx, x=x_idx, format_=format_)
+            # only well-formed tiles of known tile matrix sets are cached
+            tile_cache = self.tile_cache
+            if tile_cache is not None and (
+                    matrix_id not in TILE_MATRIX_SETS or
+                    not tile_cache.supports(matrix_id) or not all(
+                        str(idx).isdigit() for idx in (z_idx, y_idx, x_idx))):
+                tile_cache = None
+
+            content = None
+            if tile_cache is not None:
+                tile = (dataset, matrix_id, int(z_idx), int(y_idx),
+                        int(x_idx), format_)
+                content = tile_cache.get(*tile)
+
+            if content is None:
+                LOGGER.debug(f'Fetching tileset id {matrix_id} and tile {z_idx}/{y_idx}/{x_idx}')  # noqa
+                content = await_result(p.get_tiles(
+                    layer=p.get_layer(), tileset=matrix_id,
+                    z=z_idx, y=y_idx, x=x_idx, format_=format_))
+                if content is not None and tile_cache is not None and \
+                        tile_cache.writable:
+                    content = tile_cache.set(*tile, content)
+            else:
+                LOGGER.debug('Serving tile from tile cache')
+
             if content is None:
                 msg = 'identifier not found'
                 return self.get_exception(
                     HTTPStatus.NOT_FOUND, headers, format_, 'NotFound', msg)
-            else:
-                return headers, HTTPStatus.ACCEPTED, content
+
+            if tile_cache is None:
+                return headers, HTTPStatus.OK, content
+
+            headers.update(tile_cache.get_response_headers(content))
+            headers.pop('Content-Encoding', None)
+            if tile_cache.gzip and is_gzipped(content):
+                # pre-compressed tiles are sent as is to clients accepting
+                # gzip, and decompressed for the others
+                headers['Vary'] = 'Accept-Encoding'
+                if F_GZIP in request.headers.get('Accept-Encoding', ''):
+                    headers['Content-Encoding'] = F_GZIP
+                    headers['ETag'] = f'{headers["ETag"][:-1]}-{F_GZIP}"'
+                else:
+                    content = gunzip(content)
+
+            if not_modified(request, headers):
+                return headers, HTTPStatus.NOT_MODIFIED, ''
+
+            return headers, HTTPStatus.OK, content
 
         # @TODO: figure out if the spec requires to return json errors
         except KeyError:
@@ -2904,7 +3445,7 @@ class API:
         try:
             t = get_provider_by_type(
                 self.config['resources'][dataset]['providers'], 'tile')
-            p = load_plugin('provider', t)
+            p = self.providers.get(dataset, t)
         except KeyError:
             msg = 'Invalid collection tiles'
             return self.get_exception(
@@ -3001,7 +3542,7 @@ class API:
             collection_def = get_provider_by_type(
                 self.config['resources'][dataset]['providers'], 'map')
 
-            p = load_plugin('provider', collection_def)
+            p = self.providers.get(dataset, collection_def)
         except KeyError:
             exception = {
                 'code': 'InvalidParameterValue',
@@ -3087,7 +3628,7 @@ class API:
 
         LOGGER.debug('Generating map')
         try:
-            data = p.query(**query_args)
+            data = await_result(p.query(**query_args))
         except ProviderInvalidQueryError as err:
             exception = {
                 'code': 'NoApplicableCode',
@@ -3156,7 +3697,7 @@ class API:
             collection_def = get_provider_by_type(
                 self.config['resources'][dataset]['providers'], 'map')
 
-            p = load_plugin('provider', collection_def)
+            p = self.providers.get(dataset, collection_def)
         except KeyError:
             exception = {
                 'code': 'InvalidParameterValue',
@@ -3403,31 +3944,112 @@ class API:
             return self.get_format_exception(request)
         headers = request.get_response_headers(SYSTEM_LOCALE,
                                                **self.api_headers)
+        offset = limit = 0
+        matched = None
+        if job_id is None:
+            LOGGER.debug('Processing job list parameters')
+            try:
+                offset = int(request.params.get('offset', 0))
+                limit = int(request.params.get(
+                    'limit', self.config['server']['limit']))
+                if offset < 0 or limit <= 0:
+                    raise ValueError()
+            except ValueError:
+                msg = ('limit value should be a strictly positive integer '
+                       'and offset value a positive integer')
+                return self.get_exception(
+                    HTTPStatus.BAD_REQUEST, headers, request.format,
+                    'InvalidParameterValue', msg)
+
+            status = request.params.get('status')
+            try:
+                if status:
+                    status = [JobStatus(s) for s in status.split(',')]
+            except ValueError:
+                msg = 'Invalid status value'
+                return self.get_exception(
+                    HTTPStatus.BAD_REQUEST, headers, request.format,
+                    'InvalidParameterValue', msg)
+
+            process_id = request.params.get('processID')
+            if process_id:
+                process_id = process_id.split(',')
+
+            datetime_ = request.params.get('datetime')
+            try:
+                get_datetime_range(datetime_)
+            except ValueError:
+                msg = 'datetime parameter out of range or invalid'
+                return self.get_exception(
+                    HTTPStatus.BAD_REQUEST, headers, request.format,
+                    'InvalidParameterValue', msg)
+
         if self.manager:
             if job_id is None:
-                jobs = sorted(self.manager.get_jobs(),
-                              key=lambda k: k['job_start_datetime'],
-                              reverse=True)
+                if 'datetime_' in signature(
+                        self.manager.get_jobs).parameters:
+                    # filtered, sorted and paged by the manager
+                    result = self.manager.get_jobs(
+                        status=status or None, process_id=process_id or None,
+                        datetime_=datetime_, sortby=[{
+                            'property': 'job_start_datetime', 'order': '-'}],
+                        limit=limit, offset=offset)
+                else:
+                    result = self.manager.get_jobs()
+                if isinstance(result, list):
+                    LOGGER.debug('Filtering legacy list of jobs')
+                    result = filter_jobs(
+                        result, status=status, process_id=process_id,
+                        datetime_=datetime_, limit=limit, offset=offset)
+                jobs = result['jobs']
+                matched = result['numberMatched']
             else:
                 jobs = [self.manager.get_job(job_id)]
         else:
             LOGGER.debug('Process management not configured')
             jobs = []
+            matched = 0
 
+        serialized_query_params = ''
+        for k, v in request.params.items():
+            if k not in ('f', 'offset'):
+                serialized_query_params += '&'
+                serialized_query_params += urllib.parse.quote(k, safe='')
+                serialized_query_params += '='
+                serialized_query_params += urllib.parse.quote(str(v), safe=',')
+
+        jobs_url = f'{self.base_url}/jobs'
         serialized_jobs = {
             'jobs': [],
             'links': [{
-                'href': f"{self.base_url}/jobs?f={F_HTML}",
+                'href': f'{jobs_url}?f={F_HTML}{serialized_query_params}',
                 'rel': request.get_linkrel(F_HTML),
                 'type': FORMAT_TYPES[F_HTML],
                 'title': 'Jobs list as HTML'
             }, {
-                'href': f"{self.base_url}/jobs?f={F_JSON}",
+                'href': f'{jobs_url}?f={F_JSON}{serialized_query_params}',
                 'rel': request.get_linkrel(F_JSON),
                 'type': FORMAT_TYPES[F_JSON],
                 'title': 'Jobs list as JSON'
             }]
         }
+
+        if job_id is None:
+            if offset > 0:
+                prev = max(0, offset - limit)
+                serialized_jobs['links'].append({
+                    'href': f'{jobs_url}?offset={prev}{serialized_query_params}',  # noqa
+                    'rel': 'prev',
+                    'type': FORMAT_TYPES[F_JSON],
+                    'title': 'Jobs list (prev)'
+                })
+            if offset + limit < matched:
+                serialized_jobs['links'].append({
+                    'href': f'{jobs_url}?offset={offset + limit}{serialized_query_params}',  # noqa
+                    'rel': 'next',
+                    'type': FORMAT_TYPES[F_JSON],
+                    'title': 'Jobs list (next)'
+                })
         for job_ in jobs:
             job2 = {
                 'processID': job_['process_id'],
@@ -3470,6 +4092,8 @@ class API:
             serialized_jobs['jobs'].append(job2)
 
         if job_id is None:
+            serialized_jobs['numberMatched'] = matched
+            serialized_jobs['numberReturned'] = len(serialized_jobs['jobs'])
             j2_template = 'jobs/index.html'
         else:
             serialized_jobs = serialized_jobs['jobs'][0]
@@ -3570,6 +4194,13 @@ class API:
             job_id, mime_type, outputs, status, additional_headers = result
             headers.update(additional_headers or {})
             headers['Location'] = f'{self.base_url}/jobs/{job_id}'
+        except ExecutorQueueFullError as err:
+            LOGGER.warning(err)
+            headers['Retry-After'] = str(err.retry_after)
+            msg = 'Too many jobs queued, try again later'
+            return self.get_exception(
+                HTTPStatus.SERVICE_UNAVAILABLE, headers,
+                request.format, 'NoApplicableCode', msg)
         except ProcessorExecuteError as err:
             LOGGER.error(err)
             msg = 'Processing error'
@@ -3599,7 +4230,6 @@ class API:
 
         return headers, http_status, response2
 
-    @gzip
     @pre_process
     def get_job_result(self, request: Union[APIRequest, Any],
                        job_id) -> Tuple[dict, int, str]:
@@ -3644,6 +4274,29 @@ class API:
                 HTTPStatus.BAD_REQUEST, headers, request.format,
                 'InvalidParameterValue', msg)
 
+        result_file = self.manager.get_job_result_file(job_id)
+        if result_file is not None:
+            mimetype, location = result_file
+            if mimetype not in (None, FORMAT_TYPES[F_JSON]):
+                headers['Content-Type'] = mimetype
+            elif request.format == F_JSON:
+                # outputs are written as they are serialized
+                headers['Content-Type'] = FORMAT_TYPES[F_JSON]
+            else:
+                result_file = None
+
+        if result_file is not None:
+            offload = None
+            if self.manager.offload:
+                prefix = self.manager.offload.get('prefix')
+                if prefix is None:
+                    value = str(location.resolve())
+                else:
+                    value = f"{prefix.rstrip('/')}/{location.name}"
+                offload = (self.manager.offload['header'], value)
+
+            return file_response(request, headers, location, offload)
+
         mimetype, job_output = self.manager.get_job_result(job_id)
 
         if mimetype not in (None, FORMAT_TYPES[F_JSON]):
@@ -3663,7 +4316,7 @@ class API:
                     self.config, 'jobs/results/index.html',
                     data, request.locale)
 
-        return headers, HTTPStatus.OK, content
+        return headers, HTTPStatus.OK, gzip_content(headers, content)
 
     def delete_job(self, job_id) -> Tuple[dict, int, str]:
         """
@@ -3674,6 +4327,10 @@ class API:
         :returns: tuple of headers, status code, content
         """
 
+        # stop the job if it is still queued or running
+        if self.manager.cancel_job(job_id):
+            LOGGER.debug(f'Job {job_id} cancelled')
+
         success = self.manager.delete_job(job_id)
 
         if not success:
@@ -3789,7 +4446,7 @@ class API:
 
         LOGGER.debug('Loading provider')
         try:
-            p = load_plugin('provider', get_provider_by_type(
+            p = self.providers.get(dataset, get_provider_by_type(
                 collections[dataset]['providers'], 'edr'))
         except ProviderTypeError:
             msg = 'invalid provider type'
@@ -3841,7 +4498,12 @@ class API:
         )
 
         try:
-            data = p.query(**query_args)
+            data = await_result(p.query(**query_args))
+        except ProviderInvalidQueryError as err:
+            msg = f'query error: {err}'
+            return self.get_exception(
+                HTTPStatus.BAD_REQUEST, headers, request.format,
+                'InvalidParameterValue', msg)
         except ProviderNoDataError:
             msg = 'No data found'
             return self.get_exception(
@@ -3924,6 +4586,7 @@ class API:
 
     @gzip
     @pre_process
+    @cached
     @jsonldify
     def get_stac_path(self, request: Union[APIRequest, Any],
                       path) -> Tuple[dict, int, str]:
@@ -3955,7 +4618,7 @@ class API:
 
         LOGGER.debug('Loading provider')
         try:
-            p = load_plugin('provider', get_provider_by_type(
+            p = self.providers.get(dataset, get_provider_by_type(
                 stac_collections[dataset]['providers'], 'stac'))
         except ProviderConnectionError as err:
             LOGGER.error(err)
@@ -4065,6 +4728,38 @@ class API:
     def get_collections_url(self):
         return f"{self.base_url}/collections"
 
+    def _invalidate_collection(self, dataset: str,
+                               provider_type: str) -> None:
+        """
+        Discard the state derived from the data of a collection (provider
+        instances, cached responses and tiles) after the data has changed
+
+        :param dataset: dataset name
+        :param provider_type: type of the provider whose data has changed
+
+        :returns: `None`
+        """
+
+        # provider state (e.g. fields) may be derived from the data
+        self.providers.invalidate(dataset, provider_type)
+        if self.cache is not None:
+            self.cache.invalidate(dataset)
+        if self.tile_cache is not None:
+            self.tile_cache.invalidate(dataset)
+
+        try:
+            tile_def = get_provider_by_type(
+                self.config['resources'][dataset]['providers'], 'tile')
+        except ProviderTypeError:
+            return
+
+        # tiles built on the fly may be cached by the tile provider itself
+        try:
+            self.providers.get(dataset, tile_def).invalidate()
+        except ProviderGenericError as err:
+            LOGGER.warning(f'Could not invalidate tiles of {dataset}: {err}')
+        self.providers.invalidate(dataset, 'tile')
+
     @staticmethod
     def _create_crs_transform_spec(
         config: dict,
@@ -4108,24 +4803,15 @@ class API:
                 'collection. List of supported CRSs: '
                 f'{", ".join(supported_crs_list)}.'
             )
-        crs_out = get_crs_from_uri(query_crs_uri)
-
-        storage_crs = get_crs_from_uri(storage_crs_uri)
-        # Check if the crs specified in query parameter differs from the
-        # storage crs.
-        if str(storage_crs) != str(crs_out):
+        crs_transform_spec = get_crs_transform_spec(storage_crs_uri,
+                                                    query_crs_uri)
+        if crs_transform_spec is not None:
             LOGGER.debug(
-                f'CRS transformation: {storage_crs} -> {crs_out}'
-            )
-            return CrsTransformSpec(
-                source_crs_uri=storage_crs_uri,
-                source_crs_wkt=storage_crs.to_wkt(),
-                target_crs_uri=query_crs_uri,
-                target_crs_wkt=crs_out.to_wkt(),
+                f'CRS transformation: {storage_crs_uri} -> {query_crs_uri}'
             )
         else:
             LOGGER.debug('No CRS transformation')
-            return None
+        return crs_transform_spec
 
     @staticmethod
     def _set_content_crs_header(
@@ -0,0 +1,158 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import base64
+import json
+import logging
+import uuid
+from typing import Optional
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BaseCache:
+    """generic response cache ABC"""
+
+    def __init__(self, cache_def: dict):
+        """
+        Initialize object
+
+        :param cache_def: cache definition
+
+        :returns: `pygeoapi.cache.base.BaseCache`
+        """
+
+        self.name = cache_def['name']
+        self.ttl = cache_def.get('ttl', 300)
+
+    def get(self, key: str) -> Optional[dict]:
+        """
+        Get a cached entry
+
+        :param key: cache key
+
+        :returns: `dict` of entry, or `None` if missing or expired
+        """
+
+        raise NotImplementedError()
+
+    def set(self, key: str, entry: dict, ttl: int) -> None:
+        """
+        Store an entry
+
+        :param key: cache key
+        :param entry: `dict` of entry (JSON serializable, except for
+                      `bytes` content)
+        :param ttl: time to live, in seconds
+
+        :returns: `None`
+        """
+
+        raise NotImplementedError()
+
+    def delete(self, key: str) -> None:
+        """
+        Delete an entry
+
+        :param key: cache key
+
+        :returns: `None`
+        """
+
+        raise NotImplementedError()
+
+    def get_generation(self, scope: str) -> str:
+        """
+        Get the current generation of a scope (i.e. a collection), which
+        is part of the keys of the entries of that scope
+
+        :param scope: scope name
+
+        :returns: `str` of generation
+        """
+
+        entry = self.get(f'generation:{scope}')
+        if entry is None:
+            return self.invalidate(scope)
+
+        return entry['generation']
+
+    def invalidate(self, scope: str) -> str:
+        """
+        Invalidate all entries of a scope (i.e. after a transaction on a
+        collection), by starting a new generation
+
+        :param scope: scope name
+
+        :returns: `str` of new generation
+        """
+
+        LOGGER.debug(f'Invalidating cache entries of {scope}')
+        generation = uuid.uuid4().hex
+        # generations outlive the entries keyed on them
+        self.set(f'generation:{scope}', {'generation': generation},
+                 max(self.ttl, 86400))
+
+        return generation
+
+    @staticmethod
+    def dumps(entry: dict) -> bytes:
+        """
+        Serialize an entry
+
+        :param entry: `dict` of entry
+
+        :returns: `bytes` of serialized entry
+        """
+
+        entry = entry.copy()
+        if isinstance(entry.get('content'), bytes):
+            entry['content'] = base64.b64encode(entry['content']).decode()
+            entry['binary'] = True
+
+        return json.dumps(entry).encode()
+
+    @staticmethod
+    def loads(data: bytes) -> dict:
+        """
+        Deserialize an entry
+
+        :param data: `bytes` of serialized entry
+
+        :returns: `dict` of entry
+        """
+
+        entry = json.loads(data)
+        if entry.pop('binary', False):
+            entry['content'] = base64.b64decode(entry['content'])
+
+        return entry
+
+    def __repr__(self):
+        return f'<BaseCache> {self.name}'
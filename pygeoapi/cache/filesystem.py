@@ -0,0 +1,173 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from pygeoapi.cache.base import BaseCache
+
+LOGGER = logging.getLogger(__name__)
+
+
+class FilesystemCache(BaseCache):
+    """
+    Filesystem response cache, shareable between processes
+
+    Expired entries (including the entries of past generations) are swept
+    periodically when storing entries, and the least recently used
+    entries are removed beyond `max_size` bytes.
+    """
+
+    def __init__(self, cache_def: dict):
+        """
+        Initialize object
+
+        :param cache_def: cache definition
+
+        :returns: `pygeoapi.cache.filesystem.FilesystemCache`
+        """
+
+        super().__init__(cache_def)
+
+        self.path = Path(cache_def['path'])
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.max_size = cache_def.get('max_size', 1073741824)
+        self.sweep_interval = cache_def.get('sweep_interval', 60)
+
+        self._swept = 0
+        self._lock = threading.Lock()
+
+    def _get_filepath(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode()).hexdigest()
+        return self.path / digest[:2] / digest
+
+    def get(self, key: str) -> Optional[dict]:
+        filepath = self._get_filepath(key)
+        try:
+            with filepath.open('rb') as fh:
+                expires = float(fh.readline())
+                data = fh.read()
+        except (OSError, ValueError):
+            return None
+
+        if expires < time.time():
+            self.delete(key)
+            return None
+
+        try:
+            # last use, for the least recently used entries to go first
+            os.utime(filepath)
+        except OSError:
+            pass
+
+        return self.loads(data)
+
+    def set(self, key: str, entry: dict, ttl: int) -> None:
+        filepath = self._get_filepath(key)
+        filepath.parent.mkdir(exist_ok=True)
+
+        # write then rename, so that readers never see partial entries
+        fd, tmp_path = tempfile.mkstemp(dir=filepath.parent)
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(f'{time.time() + ttl}\n'.encode())
+                fh.write(self.dumps(entry))
+            os.replace(tmp_path, filepath)
+        except OSError as err:
+            LOGGER.warning(f'Cannot write cache entry: {err}')
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self._swept < self.sweep_interval:
+                return
+            self._swept = now
+
+        self.sweep()
+
+    def delete(self, key: str) -> None:
+        try:
+            self._get_filepath(key).unlink()
+        except FileNotFoundError:
+            pass
+
+    def sweep(self) -> None:
+        """
+        Remove expired entries, then the least recently used entries
+        beyond the maximum size of the cache
+
+        :returns: `None`
+        """
+
+        now = time.time()
+        entries = []
+        size = 0
+        # entry files are named after the sha256 digest of their key
+        for filepath in self.path.glob('??/' + '?' * 64):
+            try:
+                stat = filepath.stat()
+                with filepath.open('rb') as fh:
+                    expires = float(fh.readline())
+            except (OSError, ValueError):
+                continue
+
+            if expires < now:
+                self._remove(filepath)
+            else:
+                entries.append((stat.st_mtime, stat.st_size, filepath))
+                size += stat.st_size
+
+        if size > self.max_size:
+            entries.sort()
+            for _, entry_size, filepath in entries:
+                self._remove(filepath)
+                size -= entry_size
+                if size <= self.max_size:
+                    break
+
+        LOGGER.debug(f'Swept cache entries, {size} bytes left')
+
+    @staticmethod
+    def _remove(filepath: Path) -> None:
+        try:
+            filepath.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __repr__(self):
+        return f'<FilesystemCache> {self.path}'
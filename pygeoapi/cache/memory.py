@@ -0,0 +1,85 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from collections import OrderedDict
+from copy import deepcopy
+import logging
+import threading
+import time
+from typing import Optional
+
+from pygeoapi.cache.base import BaseCache
+
+LOGGER = logging.getLogger(__name__)
+
+
+class MemoryCache(BaseCache):
+    """In-process least recently used response cache"""
+
+    def __init__(self, cache_def: dict):
+        """
+        Initialize object
+
+        :param cache_def: cache definition
+
+        :returns: `pygeoapi.cache.memory.MemoryCache`
+        """
+
+        super().__init__(cache_def)
+
+        self.max_entries = cache_def.get('max_entries', 1000)
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            expires, entry = self._entries.get(key, (0, None))
+            if entry is None:
+                return None
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+
+        return deepcopy(entry)
+
+    def set(self, key: str, entry: dict, ttl: int) -> None:
+        expires = time.monotonic() + ttl
+        with self._lock:
+            self._entries[key] = (expires, deepcopy(entry))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def __repr__(self):
+        return f'<MemoryCache> {self.max_entries}'
@@ -0,0 +1,85 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import logging
+from typing import Any, Optional
+
+from pygeoapi.cache.base import BaseCache
+
+LOGGER = logging.getLogger(__name__)
+
+
+class RedisCache(BaseCache):
+    """Redis response cache, shareable between processes and hosts"""
+
+    def __init__(self, cache_def: dict, client: Any = None):
+        """
+        Initialize object
+
+        :param cache_def: cache definition
+        :param client: Redis compatible client (providing `get`,
+                       `set` with `px` and `delete`), optional
+
+        :returns: `pygeoapi.cache.redis_.RedisCache`
+        """
+
+        super().__init__(cache_def)
+
+        self.connection = cache_def.get('connection',
+                                        'redis://localhost:6379/0')
+        self.prefix = cache_def.get('prefix', 'pygeoapi:')
+
+        if client is None:
+            import redis
+            client = redis.Redis.from_url(self.connection)
+
+        self.client = client
+
+    def get(self, key: str) -> Optional[dict]:
+        data = self.client.get(f'{self.prefix}{key}')
+        if data is None:
+            return None
+
+        return self.loads(data)
+
+    def set(self, key: str, entry: dict, ttl: int) -> None:
+        if ttl <= 0:  # Redis requires a positive expiry
+            self.delete(key)
+            return
+
+        # expiry in milliseconds, so that sub-second TTLs do not expire
+        # entries at once
+        self.client.set(f'{self.prefix}{key}', self.dumps(entry),
+                        px=max(1, int(ttl * 1000)))
+
+    def delete(self, key: str) -> None:
+        self.client.delete(f'{self.prefix}{key}')
+
+    def __repr__(self):
+        return f'<RedisCache> {self.connection}'
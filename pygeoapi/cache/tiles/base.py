@@ -0,0 +1,202 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from gzip import compress, decompress
+import hashlib
+import logging
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+LOGGER = logging.getLogger(__name__)
+
+#: magic bytes of gzip compressed data
+GZIP_MAGIC = b'\x1f\x8b'
+
+
+class BaseTileStore:
+    """generic tile cache store ABC"""
+
+    #: whether tiles can be stored one by one, as they are requested
+    #: (otherwise the store is only filled by seeding)
+    writable = True
+
+    #: identifiers of the tile matrix sets the store can hold
+    #: (`None` for all)
+    tilesets = None
+
+    def __init__(self, store_def: dict):
+        """
+        Initialize object
+
+        :param store_def: tile cache store definition
+
+        :returns: `pygeoapi.cache.tiles.base.BaseTileStore`
+        """
+
+        self.name = store_def['name']
+        self.path = Path(store_def['path'])
+        self.gzip = store_def.get('gzip', False)
+        self.max_age = store_def.get('max_age', 86400)
+
+    def get(self, collection: str, tileset: str, z: int, y: int, x: int,
+            format_: str) -> Optional[bytes]:
+        """
+        Get a cached tile
+
+        :param collection: collection name
+        :param tileset: tile matrix set identifier
+        :param z: tile matrix (zoom level)
+        :param y: tile row
+        :param x: tile column
+        :param format_: tile format
+
+        :returns: `bytes` of tile (gzip compressed if the store
+                  pre-compresses tiles), or `None` if not cached
+        """
+
+        raise NotImplementedError()
+
+    def set(self, collection: str, tileset: str, z: int, y: int, x: int,
+            format_: str, data: bytes) -> bytes:
+        """
+        Store a tile
+
+        :param collection: collection name
+        :param tileset: tile matrix set identifier
+        :param z: tile matrix (zoom level)
+        :param y: tile row
+        :param x: tile column
+        :param format_: tile format
+        :param data: `bytes` of tile
+
+        :returns: `bytes` of tile as stored
+        """
+
+        raise NotImplementedError()
+
+    def set_many(self, collection: str, tileset: str, format_: str,
+                 tiles: Iterable[Tuple[int, int, int, bytes]]) -> int:
+        """
+        Store a batch of tiles (i.e. when seeding)
+
+        :param collection: collection name
+        :param tileset: tile matrix set identifier
+        :param format_: tile format
+        :param tiles: iterable of (z, y, x, data) tuples
+
+        :returns: `int` of number of tiles stored
+        """
+
+        count = 0
+        for z, y, x, data in tiles:
+            self.set(collection, tileset, z, y, x, format_, data)
+            count += 1
+
+        return count
+
+    def supports(self, tileset: str) -> bool:
+        """
+        Whether the store can hold the tiles of a tile matrix set
+
+        :param tileset: tile matrix set identifier
+
+        :returns: `bool` of whether the tile matrix set is supported
+        """
+
+        return self.tilesets is None or tileset in self.tilesets
+
+    def invalidate(self, collection: str) -> None:
+        """
+        Remove the cached tiles of a collection (i.e. after a transaction)
+
+        :param collection: collection name
+
+        :returns: `None`
+        """
+
+        raise NotImplementedError()
+
+    def encode(self, data: bytes) -> bytes:
+        """
+        Prepare a tile for storage, compressing it if the store
+        pre-compresses tiles
+
+        :param data: `bytes` of tile
+
+        :returns: `bytes` of tile to store
+        """
+
+        if self.gzip and not is_gzipped(data):
+            return compress(data)
+
+        return data
+
+    def get_response_headers(self, data: bytes) -> dict:
+        """
+        Get the caching headers of a cached tile
+
+        :param data: `bytes` of tile
+
+        :returns: `dict` of `ETag` and `Cache-Control` headers
+        """
+
+        return {
+            'ETag': f'"{hashlib.sha256(data).hexdigest()[:32]}"',
+            'Cache-Control': f'public, max-age={self.max_age}'
+        }
+
+    def __repr__(self):
+        return f'<BaseTileStore> {self.path}'
+
+
+def is_gzipped(data: bytes) -> bool:
+    """
+    Checks whether a tile is gzip compressed
+
+    :param data: `bytes` of tile
+
+    :returns: `bool` of whether the tile is gzip compressed
+    """
+
+    return data[:2] == GZIP_MAGIC
+
+
+def gunzip(data: bytes) -> bytes:
+    """
+    Decompresses a tile if it is gzip compressed
+
+    :param data: `bytes` of tile
+
+    :returns: `bytes` of uncompressed tile
+    """
+
+    if is_gzipped(data):
+        return decompress(data)
+
+    return data
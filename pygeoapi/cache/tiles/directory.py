@@ -0,0 +1,102 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import logging
+import os
+from pathlib import Path
+import shutil
+import tempfile
+from typing import Optional
+
+from pygeoapi.cache.tiles.base import BaseTileStore
+
+LOGGER = logging.getLogger(__name__)
+
+
+class DirectoryTileStore(BaseTileStore):
+    """
+    Directory tree tile cache store
+    (``<path>/<collection>/<tileset>/<z>/<y>/<x>.<format>``), shareable
+    between processes and servable by a web server
+    """
+
+    def __init__(self, store_def: dict):
+        """
+        Initialize object
+
+        :param store_def: tile cache store definition
+
+        :returns: `pygeoapi.cache.tiles.directory.DirectoryTileStore`
+        """
+
+        super().__init__(store_def)
+
+        self.path.mkdir(parents=True, exist_ok=True)
+
+    def _get_filepath(self, collection: str, tileset: str, z: int, y: int,
+                      x: int, format_: str) -> Path:
+        return self.path / collection / tileset / str(z) / str(y) / \
+            f'{x}.{format_}'
+
+    def get(self, collection: str, tileset: str, z: int, y: int, x: int,
+            format_: str) -> Optional[bytes]:
+        filepath = self._get_filepath(collection, tileset, z, y, x, format_)
+        try:
+            return filepath.read_bytes()
+        except OSError:
+            return None
+
+    def set(self, collection: str, tileset: str, z: int, y: int, x: int,
+            format_: str, data: bytes) -> bytes:
+        data = self.encode(data)
+
+        filepath = self._get_filepath(collection, tileset, z, y, x, format_)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+
+        # write then rename, so that readers never see partial tiles
+        fd, tmp_path = tempfile.mkstemp(dir=filepath.parent)
+        try:
+            with os.fdopen(fd, 'wb') as fh:
+                fh.write(data)
+            os.replace(tmp_path, filepath)
+        except OSError as err:
+            LOGGER.warning(f'Cannot write tile: {err}')
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+        return data
+
+    def invalidate(self, collection: str) -> None:
+        LOGGER.debug(f'Removing cached tiles of {collection}')
+        shutil.rmtree(self.path / collection, ignore_errors=True)
+
+    def __repr__(self):
+        return f'<DirectoryTileStore> {self.path}'
@@ -0,0 +1,188 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Iterable, Optional, Tuple
+
+from pygeoapi.cache.tiles.base import BaseTileStore
+
+LOGGER = logging.getLogger(__name__)
+
+#: number of tiles written per transaction when seeding
+BATCH_SIZE = 1000
+
+SCHEMA = [
+    'CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT)',
+    'CREATE UNIQUE INDEX IF NOT EXISTS name ON metadata (name)',
+    ('CREATE TABLE IF NOT EXISTS tiles (zoom_level INTEGER, '
+     'tile_column INTEGER, tile_row INTEGER, tile_data BLOB)'),
+    ('CREATE UNIQUE INDEX IF NOT EXISTS tile_index '
+     'ON tiles (zoom_level, tile_column, tile_row)')
+]
+
+INSERT_TILE = 'INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)'
+
+
+class MBTilesTileStore(BaseTileStore):
+    """
+    MBTiles tile cache store, one SQLite database per collection and
+    tile matrix set (``<path>/<collection>/<tileset>.<format>.mbtiles``)
+    """
+
+    def __init__(self, store_def: dict):
+        """
+        Initialize object
+
+        :param store_def: tile cache store definition
+
+        :returns: `pygeoapi.cache.tiles.mbtiles.MBTilesTileStore`
+        """
+
+        super().__init__(store_def)
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        # connections are not shared between threads
+        self._local = threading.local()
+
+    def _get_filepath(self, collection: str, tileset: str,
+                      format_: str) -> Path:
+        return self.path / collection / f'{tileset}.{format_}.mbtiles'
+
+    def _get_connection(self, collection: str, tileset: str, format_: str,
+                        create: bool = False) -> Optional[sqlite3.Connection]:
+        """
+        Get the connection of the current thread to a database
+
+        :param collection: collection name
+        :param tileset: tile matrix set identifier
+        :param format_: tile format
+        :param create: `bool` of whether to create a missing database
+
+        :returns: `sqlite3.Connection`, or `None` if the database
+                  does not exist
+        """
+
+        filepath = self._get_filepath(collection, tileset, format_)
+        connections = self._local.__dict__.setdefault('connections', {})
+
+        conn = connections.get(filepath)
+        if conn is not None:
+            return conn
+
+        if not filepath.exists():
+            if not create:
+                return None
+            filepath.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(filepath, timeout=30)
+        conn.execute('PRAGMA journal_mode=WAL')
+        if create:
+            with conn:
+                for statement in SCHEMA:
+                    conn.execute(statement)
+                conn.executemany(
+                    'INSERT OR IGNORE INTO metadata VALUES (?, ?)', [
+                        ('name', collection),
+                        ('format', format_),
+                        ('tile_matrix_set', tileset),
+                        ('type', 'overlay')
+                    ])
+
+        connections[filepath] = conn
+        return conn
+
+    def get(self, collection: str, tileset: str, z: int, y: int, x: int,
+            format_: str) -> Optional[bytes]:
+        conn = self._get_connection(collection, tileset, format_)
+        if conn is None:
+            return None
+
+        # MBTiles rows are numbered from the bottom (TMS)
+        try:
+            row = conn.execute(
+                'SELECT tile_data FROM tiles WHERE zoom_level = ? '
+                'AND tile_column = ? AND tile_row = ?',
+                (z, x, 2 ** z - 1 - y)).fetchone()
+        except sqlite3.Error as err:
+            LOGGER.warning(f'Cannot read tile: {err}')
+            return None
+
+        return None if row is None else bytes(row[0])
+
+    def set(self, collection: str, tileset: str, z: int, y: int, x: int,
+            format_: str, data: bytes) -> bytes:
+        data = self.encode(data)
+
+        conn = self._get_connection(collection, tileset, format_, True)
+        try:
+            with conn:
+                conn.execute(INSERT_TILE, (z, x, 2 ** z - 1 - y, data))
+        except sqlite3.Error as err:
+            LOGGER.warning(f'Cannot write tile: {err}')
+
+        return data
+
+    def set_many(self, collection: str, tileset: str, format_: str,
+                 tiles: Iterable[Tuple[int, int, int, bytes]]) -> int:
+        conn = self._get_connection(collection, tileset, format_, True)
+
+        count = 0
+        batch = []
+        for z, y, x, data in tiles:
+            batch.append((z, x, 2 ** z - 1 - y, self.encode(data)))
+            if len(batch) == BATCH_SIZE:
+                count += self._write_batch(conn, batch)
+                batch = []
+        count += self._write_batch(conn, batch)
+
+        return count
+
+    @staticmethod
+    def _write_batch(conn: sqlite3.Connection, batch: list) -> int:
+        with conn:
+            conn.executemany(INSERT_TILE, batch)
+
+        return len(batch)
+
+    def invalidate(self, collection: str) -> None:
+        LOGGER.debug(f'Removing cached tiles of {collection}')
+        for filepath in (self.path / collection).glob('*.mbtiles'):
+            try:
+                conn = sqlite3.connect(filepath, timeout=30)
+                with conn:
+                    conn.execute('DELETE FROM tiles')
+                conn.close()
+            except sqlite3.Error as err:
+                LOGGER.warning(f'Cannot remove tiles of {filepath}: {err}')
+
+    def __repr__(self):
+        return f'<MBTilesTileStore> {self.path}'
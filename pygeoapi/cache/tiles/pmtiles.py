@@ -0,0 +1,657 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from collections import OrderedDict, namedtuple
+from gzip import compress, decompress
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+import struct
+import tempfile
+import threading
+from typing import Iterable, Optional, Tuple
+
+from pygeoapi.cache.tiles.base import BaseTileStore
+
+LOGGER = logging.getLogger(__name__)
+
+#: PMTiles (version 3) header layout
+HEADER_FORMAT = '<7sBQQQQQQQQQQQBBBBBBiiiiBii'
+HEADER_SIZE = 127
+
+#: the header and the root directory fit in the first read of an archive
+ROOT_SIZE = 16384
+
+#: maximum depth of leaf directories
+MAX_DEPTH = 3
+
+#: number of leaf directories kept in memory
+LEAF_CACHE_SIZE = 64
+
+COMPRESSION_UNKNOWN = 0
+COMPRESSION_NONE = 1
+COMPRESSION_GZIP = 2
+
+TILE_TYPES = {
+    'mvt': 1,
+    'pbf': 1,
+    'png': 2,
+    'jpeg': 3,
+    'jpg': 3,
+    'webp': 4,
+    'avif': 5
+}
+
+Entry = namedtuple('Entry', 'tile_id offset length run_length')
+
+
+class PMTilesTileStore(BaseTileStore):
+    """
+    PMTiles tile cache store, one single-file archive per collection and
+    tile matrix set (``<path>/<collection>/<tileset>.<format>.pmtiles``).
+
+    Tiles are read with range reads of the archive; archives are written
+    as a whole when seeding.  PMTiles tile ids only cover square tile
+    matrices, hence WebMercatorQuad only.
+    """
+
+    writable = False
+
+    tilesets = ('WebMercatorQuad',)
+
+    def __init__(self, store_def: dict):
+        """
+        Initialize object
+
+        :param store_def: tile cache store definition
+
+        :returns: `pygeoapi.cache.tiles.pmtiles.PMTilesTileStore`
+        """
+
+        super().__init__(store_def)
+
+        self.path.mkdir(parents=True, exist_ok=True)
+        # headers and root directories, per archive
+        self._archives = {}
+        self._leaves = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_filepath(self, collection: str, tileset: str,
+                      format_: str) -> Path:
+        return self.path / collection / f'{tileset}.{format_}.pmtiles'
+
+    def get(self, collection: str, tileset: str, z: int, y: int, x: int,
+            format_: str) -> Optional[bytes]:
+        if not self.supports(tileset):
+            return None
+
+        filepath = self._get_filepath(collection, tileset, format_)
+        try:
+            with filepath.open('rb') as fh:
+                return self._read_tile(fh, zxy_to_tile_id(z, x, y))
+        except (OSError, ValueError) as err:
+            if filepath.exists():
+                LOGGER.warning(f'Cannot read tile: {err}')
+            return None
+
+    def set(self, collection: str, tileset: str, z: int, y: int, x: int,
+            format_: str, data: bytes) -> bytes:
+        self.set_many(collection, tileset, format_, [(z, y, x, data)])
+        return self.encode(data)
+
+    def set_many(self, collection: str, tileset: str, format_: str,
+                 tiles: Iterable[Tuple[int, int, int, bytes]]) -> int:
+        if not self.supports(tileset):
+            raise ValueError(
+                f'PMTiles tile cache does not support tileset {tileset}')
+
+        filepath = self._get_filepath(collection, tileset, format_)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+
+        # tile contents are spooled to disk as they come, and written
+        # in tile id order (clustered) once all tiles are known
+        count = 0
+        sources = {}
+        with tempfile.TemporaryFile(dir=filepath.parent) as spool:
+            for z, y, x, data in tiles:
+                data = self.encode(data)
+                sources[zxy_to_tile_id(z, x, y)] = (
+                    spool, spool.tell(), len(data))
+                spool.write(data)
+                count += 1
+
+            try:
+                archive = filepath.open('rb')
+            except FileNotFoundError:
+                archive = None
+            try:
+                if archive is not None:
+                    # keep the tiles of the archive which are not renewed
+                    for tile_id, offset, length in self._iter_tiles(archive):
+                        sources.setdefault(tile_id, (archive, offset, length))
+
+                metadata = {
+                    'name': collection,
+                    'format': format_,
+                    'tile_matrix_set': tileset
+                }
+                self._write_archive(filepath, sources, format_, metadata)
+            finally:
+                if archive is not None:
+                    archive.close()
+
+        with self._lock:
+            self._archives.pop(filepath, None)
+
+        return count
+
+    def invalidate(self, collection: str) -> None:
+        LOGGER.debug(f'Removing cached tiles of {collection}')
+        for filepath in (self.path / collection).glob('*.pmtiles'):
+            try:
+                filepath.unlink()
+            except FileNotFoundError:
+                pass
+            with self._lock:
+                self._archives.pop(filepath, None)
+
+    def _read_header(self, fh) -> Tuple[dict, list]:
+        """
+        Read the header and root directory of an archive, once per
+        archive version
+
+        :param fh: file object of archive
+
+        :returns: tuple of `dict` of header and `list` of root entries
+        """
+
+        stat = os.fstat(fh.fileno())
+        key = Path(fh.name)
+        with self._lock:
+            archive = self._archives.get(key)
+        if archive is not None and archive[0] == stat.st_mtime_ns:
+            return archive[1], archive[2]
+
+        fh.seek(0)
+        data = fh.read(ROOT_SIZE)
+        header = deserialize_header(data[:HEADER_SIZE])
+        root_offset = header['root_offset']
+        root = deserialize_directory(decompress_directory(
+            data[root_offset:root_offset + header['root_length']],
+            header['internal_compression']))
+
+        with self._lock:
+            self._archives[key] = (stat.st_mtime_ns, header, root)
+
+        return header, root
+
+    def _read_leaf(self, fh, header: dict, entry: Entry) -> list:
+        """
+        Read a leaf directory of an archive
+
+        :param fh: file object of archive
+        :param header: `dict` of archive header
+        :param entry: `Entry` of root or leaf directory pointing to the leaf
+
+        :returns: `list` of leaf entries
+        """
+
+        key = (fh.name, os.fstat(fh.fileno()).st_mtime_ns,
+               header['leaf_offset'] + entry.offset)
+        with self._lock:
+            if key in self._leaves:
+                self._leaves.move_to_end(key)
+                return self._leaves[key]
+
+        fh.seek(header['leaf_offset'] + entry.offset)
+        leaf = deserialize_directory(decompress_directory(
+            fh.read(entry.length), header['internal_compression']))
+
+        with self._lock:
+            self._leaves[key] = leaf
+            while len(self._leaves) > LEAF_CACHE_SIZE:
+                self._leaves.popitem(last=False)
+
+        return leaf
+
+    def _read_tile(self, fh, tile_id: int) -> Optional[bytes]:
+        """
+        Read a tile from an archive
+
+        :param fh: file object of archive
+        :param tile_id: `int` of tile id
+
+        :returns: `bytes` of tile, or `None` if not in archive
+        """
+
+        header, entries = self._read_header(fh)
+        for depth in range(MAX_DEPTH + 1):
+            entry = find_entry(entries, tile_id)
+            if entry is None:
+                return None
+            elif entry.run_length > 0:
+                fh.seek(header['tile_data_offset'] + entry.offset)
+                return fh.read(entry.length)
+            entries = self._read_leaf(fh, header, entry)
+
+        return None
+
+    def _iter_tiles(self, fh):
+        """
+        Iterate over the tiles of an archive
+
+        :param fh: file object of archive
+
+        :returns: generator of (tile id, offset, length) tuples
+        """
+
+        header, root = self._read_header(fh)
+
+        def iter_entries(entries, depth):
+            for entry in entries:
+                if entry.run_length > 0:
+                    yield entry
+                elif depth < MAX_DEPTH:
+                    yield from iter_entries(
+                        self._read_leaf(fh, header, entry), depth + 1)
+
+        for entry in iter_entries(root, 0):
+            offset = header['tile_data_offset'] + entry.offset
+            for tile_id in range(entry.tile_id,
+                                 entry.tile_id + entry.run_length):
+                yield tile_id, offset, entry.length
+
+    def _write_archive(self, filepath: Path, sources: dict, format_: str,
+                       metadata: dict) -> None:
+        """
+        Write an archive from the contents of its tiles
+
+        :param filepath: `Path` of archive
+        :param sources: `dict` of tile id to (file object, offset, length)
+                        of tile content
+        :param format_: tile format
+        :param metadata: `dict` of archive metadata
+
+        :raises: `OSError` if the archive cannot be written
+        :returns: `None`
+        """
+
+        entries = []
+        contents = {}
+        written = {}
+        fd, tmp_path = tempfile.mkstemp(dir=filepath.parent)
+        try:
+            with os.fdopen(fd, 'wb') as fh, \
+                    tempfile.TemporaryFile(dir=filepath.parent) as tile_data:
+                for tile_id in sorted(sources):
+                    source = sources[tile_id]
+                    src, offset, length = source
+                    key = (id(src), offset, length)
+                    if key not in written:
+                        src.seek(offset)
+                        data = src.read(length)
+                        digest = hashlib.sha256(data).digest()
+                        if digest not in contents:
+                            contents[digest] = tile_data.tell()
+                            tile_data.write(data)
+                        written[key] = contents[digest]
+                    tile_offset = written[key]
+
+                    last = entries[-1] if entries else None
+                    if (last is not None and last.offset == tile_offset and
+                            last.length == length and
+                            last.tile_id + last.run_length == tile_id):
+                        entries[-1] = last._replace(
+                            run_length=last.run_length + 1)
+                    else:
+                        entries.append(
+                            Entry(tile_id, tile_offset, length, 1))
+
+                root, leaves = build_directories(entries)
+                metadata = compress(json.dumps(metadata).encode())
+                zoom_levels = [tile_id_to_z(tile_id) for tile_id in
+                               (min(sources), max(sources))] \
+                    if sources else [0, 0]
+
+                header = {
+                    'root_offset': HEADER_SIZE,
+                    'root_length': len(root),
+                    'metadata_offset': HEADER_SIZE + len(root),
+                    'metadata_length': len(metadata),
+                    'leaf_offset': HEADER_SIZE + len(root) + len(metadata),
+                    'leaf_length': len(leaves),
+                    'tile_data_offset': (HEADER_SIZE + len(root) +
+                                         len(metadata) + len(leaves)),
+                    'tile_data_length': tile_data.tell(),
+                    'addressed_tiles': len(sources),
+                    'tile_entries': len(entries),
+                    'tile_contents': len(contents),
+                    'clustered': 1,
+                    'internal_compression': COMPRESSION_GZIP,
+                    'tile_compression': (COMPRESSION_GZIP if self.gzip
+                                         else COMPRESSION_UNKNOWN),
+                    'tile_type': TILE_TYPES.get(format_, 0),
+                    'min_zoom': zoom_levels[0],
+                    'max_zoom': zoom_levels[1],
+                    'min_lon': -180,
+                    'min_lat': -85.05112878,
+                    'max_lon': 180,
+                    'max_lat': 85.05112878,
+                    'center_zoom': zoom_levels[0],
+                    'center_lon': 0,
+                    'center_lat': 0
+                }
+
+                fh.write(serialize_header(header))
+                fh.write(root)
+                fh.write(metadata)
+                fh.write(leaves)
+                tile_data.seek(0)
+                while True:
+                    chunk = tile_data.read(1048576)
+                    if not chunk:
+                        break
+                    fh.write(chunk)
+
+            os.replace(tmp_path, filepath)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def __repr__(self):
+        return f'<PMTilesTileStore> {self.path}'
+
+
+def zxy_to_tile_id(z: int, x: int, y: int) -> int:
+    """
+    Get the id of a tile: its position along the Hilbert curves of the
+    successive zoom levels
+
+    :param z: tile matrix (zoom level)
+    :param x: tile column
+    :param y: tile row
+
+    :returns: `int` of tile id
+    """
+
+    n = 2 ** z
+    if not (0 <= x < n and 0 <= y < n):
+        raise ValueError(f'Tile {z}/{y}/{x} out of bounds')
+
+    tile_id = (4 ** z - 1) // 3
+    s = n // 2
+    while s > 0:
+        rx = 1 if x & s else 0
+        ry = 1 if y & s else 0
+        tile_id += s * s * ((3 * rx) ^ ry)
+        if ry == 0:
+            if rx == 1:
+                x = n - 1 - x
+                y = n - 1 - y
+            x, y = y, x
+        s //= 2
+
+    return tile_id
+
+
+def tile_id_to_z(tile_id: int) -> int:
+    """
+    Get the zoom level of a tile id
+
+    :param tile_id: `int` of tile id
+
+    :returns: `int` of zoom level
+    """
+
+    z = 0
+    while tile_id >= (4 ** (z + 1) - 1) // 3:
+        z += 1
+
+    return z
+
+
+def find_entry(entries: list, tile_id: int) -> Optional[Entry]:
+    """
+    Find the directory entry of a tile id
+
+    :param entries: `list` of directory entries, sorted by tile id
+    :param tile_id: `int` of tile id
+
+    :returns: `Entry` of tile or of leaf directory, or `None`
+    """
+
+    low, high = 0, len(entries)
+    while low < high:
+        middle = (low + high) // 2
+        if entries[middle].tile_id <= tile_id:
+            low = middle + 1
+        else:
+            high = middle
+    if low == 0:
+        return None
+
+    entry = entries[low - 1]
+    if entry.run_length == 0 or tile_id < entry.tile_id + entry.run_length:
+        return entry
+
+    return None
+
+
+def build_directories(entries: list) -> Tuple[bytes, bytes]:
+    """
+    Build the root directory of an archive, and leaf directories if the
+    entries do not fit in the root directory
+
+    :param entries: `list` of tile entries, sorted by tile id
+
+    :returns: tuple of `bytes` of root directory and leaf directories
+    """
+
+    root = compress(serialize_directory(entries))
+    if len(root) <= ROOT_SIZE - HEADER_SIZE:
+        return root, b''
+
+    leaf_size = 4096
+    while True:
+        root_entries = []
+        leaves = bytearray()
+        for i in range(0, len(entries), leaf_size):
+            leaf = compress(serialize_directory(entries[i:i + leaf_size]))
+            root_entries.append(
+                Entry(entries[i].tile_id, len(leaves), len(leaf), 0))
+            leaves += leaf
+
+        root = compress(serialize_directory(root_entries))
+        if len(root) <= ROOT_SIZE - HEADER_SIZE:
+            return root, bytes(leaves)
+        leaf_size *= 2
+
+
+def serialize_directory(entries: list) -> bytes:
+    """
+    Serialize directory entries (varint encoded columns of delta encoded
+    tile ids, run lengths, lengths and offsets)
+
+    :param entries: `list` of directory entries, sorted by tile id
+
+    :returns: `bytes` of uncompressed directory
+    """
+
+    data = bytearray()
+    write_varint(data, len(entries))
+
+    last_id = 0
+    for entry in entries:
+        write_varint(data, entry.tile_id - last_id)
+        last_id = entry.tile_id
+    for entry in entries:
+        write_varint(data, entry.run_length)
+    for entry in entries:
+        write_varint(data, entry.length)
+    for i, entry in enumerate(entries):
+        previous = entries[i - 1] if i > 0 else None
+        if (previous is not None and
+                entry.offset == previous.offset + previous.length):
+            write_varint(data, 0)
+        else:
+            write_varint(data, entry.offset + 1)
+
+    return bytes(data)
+
+
+def deserialize_directory(data: bytes) -> list:
+    """
+    Deserialize directory entries
+
+    :param data: `bytes` of uncompressed directory
+
+    :returns: `list` of directory entries
+    """
+
+    position = 0
+
+    def read_varint():
+        nonlocal position
+        value = shift = 0
+        while True:
+            byte = data[position]
+            position += 1
+            value |= (byte & 0x7f) << shift
+            if byte < 0x80:
+                return value
+            shift += 7
+
+    count = read_varint()
+    tile_ids = []
+    last_id = 0
+    for _ in range(count):
+        last_id += read_varint()
+        tile_ids.append(last_id)
+    run_lengths = [read_varint() for _ in range(count)]
+    lengths = [read_varint() for _ in range(count)]
+
+    entries = []
+    for i in range(count):
+        offset = read_varint()
+        if offset == 0 and i > 0:
+            offset = entries[i - 1].offset + entries[i - 1].length
+        else:
+            offset -= 1
+        entries.append(Entry(tile_ids[i], offset, lengths[i], run_lengths[i]))
+
+    return entries
+
+
+def decompress_directory(data: bytes, compression: int) -> bytes:
+    """
+    Decompress a directory
+
+    :param data: `bytes` of directory
+    :param compression: internal compression of archive
+
+    :returns: `bytes` of uncompressed directory
+    """
+
+    if compression == COMPRESSION_GZIP:
+        return decompress(data)
+    elif compression in (COMPRESSION_NONE, COMPRESSION_UNKNOWN):
+        return data
+
+    raise ValueError(f'Unsupported directory compression: {compression}')
+
+
+def write_varint(data: bytearray, value: int) -> None:
+    """
+    Append an unsigned LEB128 varint
+
+    :param data: `bytearray` to write to
+    :param value: `int` of value
+
+    :returns: `None`
+    """
+
+    while value >= 0x80:
+        data.append((value & 0x7f) | 0x80)
+        value >>= 7
+    data.append(value)
+
+
+def serialize_header(header: dict) -> bytes:
+    """
+    Serialize an archive header
+
+    :param header: `dict` of header
+
+    :returns: `bytes` of header
+    """
+
+    return struct.pack(
+        HEADER_FORMAT, b'PMTiles', 3,
+        header['root_offset'], header['root_length'],
+        header['metadata_offset'], header['metadata_length'],
+        header['leaf_offset'], header['leaf_length'],
+        header['tile_data_offset'], header['tile_data_length'],
+        header['addressed_tiles'], header['tile_entries'],
+        header['tile_contents'], header['clustered'],
+        header['internal_compression'], header['tile_compression'],
+        header['tile_type'], header['min_zoom'], header['max_zoom'],
+        int(header['min_lon'] * 10000000), int(header['min_lat'] * 10000000),
+        int(header['max_lon'] * 10000000), int(header['max_lat'] * 10000000),
+        header['center_zoom'], int(header['center_lon'] * 10000000),
+        int(header['center_lat'] * 10000000))
+
+
+def deserialize_header(data: bytes) -> dict:
+    """
+    Deserialize an archive header
+
+    :param data: `bytes` of header
+
+    :returns: `dict` of header
+    """
+
+    values = struct.unpack(HEADER_FORMAT, data)
+    if values[0] != b'PMTiles' or values[1] != 3:
+        raise ValueError('Not a PMTiles version 3 archive')
+
+    keys = [
+        'root_offset', 'root_length', 'metadata_offset', 'metadata_length',
+        'leaf_offset', 'leaf_length', 'tile_data_offset', 'tile_data_length',
+        'addressed_tiles', 'tile_entries', 'tile_contents', 'clustered',
+        'internal_compression', 'tile_compression', 'tile_type', 'min_zoom',
+        'max_zoom', 'min_lon', 'min_lat', 'max_lon', 'max_lat', 'center_zoom',
+        'center_lon', 'center_lat'
+    ]
+
+    return dict(zip(keys, values[2:]))
@@ -0,0 +1,197 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import product
+import logging
+import os
+import threading
+from typing import Iterable, Optional
+
+import click
+
+from pygeoapi.concurrency import await_result
+from pygeoapi.plugin import load_plugin
+from pygeoapi.provider.tile import ProviderTileNotFoundError, get_tile_range
+from pygeoapi.util import get_provider_by_type, yaml_load
+
+LOGGER = logging.getLogger(__name__)
+
+
+def seed_tiles(config: dict, collection: str, tileset: str,
+               zoom_levels: Iterable[int], bbox: Optional[list] = None,
+               workers: int = 4) -> int:
+    """
+    Build the tiles of a collection ahead of requests and store them in
+    the tile cache
+
+    :param config: `dict` of pygeoapi configuration
+    :param collection: collection name
+    :param tileset: tile matrix set identifier
+    :param zoom_levels: iterable of zoom levels
+    :param bbox: bounding box [minx,miny,maxx,maxy] (in CRS84) to
+                 restrict seeding to (default all tiles)
+    :param workers: number of threads fetching tiles from the provider
+
+    :raises: `ValueError` if the tile cache does not support the tileset
+    :returns: `int` of number of tiles seeded
+    """
+
+    provider_def = get_provider_by_type(
+        config['resources'][collection]['providers'], 'tile')
+    store = load_plugin('tile_cache', config['server']['tile_cache'])
+    if not store.supports(tileset):
+        raise ValueError(f'Tile cache does not support tileset {tileset}')
+    format_ = provider_def['format']['name']
+
+    # providers are not shared between worker threads
+    local = threading.local()
+
+    def get_tile(tile):
+        provider = getattr(local, 'provider', None)
+        if provider is None:
+            provider = local.provider = load_plugin('provider', provider_def)
+
+        z, y, x = tile
+        try:
+            data = await_result(provider.get_tiles(
+                layer=provider.get_layer(), tileset=tileset,
+                z=z, y=y, x=x, format_=format_))
+        except ProviderTileNotFoundError:
+            data = None
+
+        return z, y, x, data
+
+    tiles = (
+        (z, y, x) for z in zoom_levels
+        for y, x in product(*get_tile_range(tileset, z, bbox))
+    )
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = _map_bounded(executor, get_tile, tiles, workers * 16)
+        count = store.set_many(
+            collection, tileset, format_,
+            (tile for tile in results if tile[3] is not None))
+
+    LOGGER.debug(f'Seeded {count} tiles of {collection}')
+    return count
+
+
+def _map_bounded(executor: ThreadPoolExecutor, func, items: Iterable,
+                 window: int):
+    """
+    Map a function over items with an executor, in order, keeping at most
+    `window` items in flight (unlike `Executor.map`, which submits all
+    items upfront)
+
+    :param executor: `ThreadPoolExecutor`
+    :param func: function to apply
+    :param items: iterable of items
+    :param window: maximum number of pending items
+
+    :returns: generator of results
+    """
+
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+
+    while pending:
+        yield pending.popleft().result()
+
+
+def _parse_zoom_levels(zoom: str) -> range:
+    """
+    Parse a zoom level or a range of zoom levels (i.e. `0-8`)
+
+    :param zoom: `str` of zoom levels
+
+    :returns: `range` of zoom levels
+    """
+
+    try:
+        min_zoom, _, max_zoom = zoom.partition('-')
+        return range(int(min_zoom), int(max_zoom or min_zoom) + 1)
+    except ValueError:
+        raise click.BadParameter(f'Invalid zoom levels: {zoom}')
+
+
+@click.group()
+def tiles():
+    """Tile cache management"""
+    pass
+
+
+@click.command()
+@click.pass_context
+@click.option('--config', '-c', 'config_file', help='configuration file')
+@click.option('--collection', required=True, help='collection name')
+@click.option('--tileset', default='WebMercatorQuad',
+              help='tile matrix set identifier (default WebMercatorQuad)')
+@click.option('--zoom', '-z', required=True,
+              help='zoom level or range of zoom levels (e.g. 0-8)')
+@click.option('--bbox', help='bounding box in CRS84 (minx,miny,maxx,maxy)')
+@click.option('--workers', type=int, default=4,
+              help='number of worker threads (default 4)')
+def seed(ctx, config_file, collection, tileset, zoom, bbox, workers):
+    """Seed the tile cache of a collection"""
+
+    config_file = config_file or os.environ.get('PYGEOAPI_CONFIG')
+    if config_file is None:
+        raise click.ClickException('--config/-c required')
+
+    with open(config_file, encoding='utf8') as fh:
+        config = yaml_load(fh)
+
+    if not config['server'].get('tile_cache'):
+        raise click.ClickException('No tile cache configured')
+    if collection not in config['resources']:
+        raise click.ClickException(f'Collection not found: {collection}')
+
+    if bbox is not None:
+        try:
+            bbox = [float(value) for value in bbox.split(',')]
+        except ValueError:
+            bbox = []
+        if len(bbox) != 4:
+            raise click.BadParameter('bbox must be minx,miny,maxx,maxy')
+
+    click.echo(f'Seeding tiles of {collection}')
+    try:
+        count = seed_tiles(config, collection, tileset,
+                           _parse_zoom_levels(zoom), bbox, workers)
+    except ValueError as err:
+        raise click.ClickException(str(err))
+    click.echo(f'Seeded {count} tiles')
+
+
+tiles.add_command(seed)
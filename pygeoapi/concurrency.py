@@ -0,0 +1,346 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+"""Dispatching of blocking API calls from asynchronous web frameworks"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import inspect
+import logging
+import os
+import threading
+from typing import Any, AsyncIterator, Callable, Iterator, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+# event loop of the dispatcher that submitted the call running in a thread
+_LOCAL = threading.local()
+
+# end of a stream, returned by `next` in the thread pool
+_END = object()
+
+
+def await_result(result: Any) -> Any:
+    """
+    Resolves the result of a provider call, which may be awaitable
+    (i.e. from a provider exposing native `async` methods)
+
+    When called from a thread of a :class:`RequestDispatcher`, the
+    awaitable runs on the dispatcher's event loop (so that it can share
+    connection pools and other loop bound resources); otherwise it runs
+    in a new event loop.
+
+    :param result: result of a provider call
+
+    :returns: result, awaited if needed
+    """
+
+    if not inspect.isawaitable(result):
+        return result
+
+    loop = getattr(_LOCAL, 'loop', None)
+    if loop is not None and loop.is_running():
+        return asyncio.run_coroutine_threadsafe(
+            _await(result), loop).result()
+
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(_await(result))
+
+    # called on a running event loop, which cannot be blocked on
+    with ThreadPoolExecutor(1) as executor:
+        return executor.submit(asyncio.run, _await(result)).result()
+
+
+async def _await(awaitable):
+    return await awaitable
+
+
+class RequestDispatcher:
+    """Runs blocking API calls in a bounded thread pool, off the event loop
+
+    Calls for a given collection can additionally be limited in number,
+    so that a slow backend cannot take up all worker threads.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None,
+                 collection_limit: int = 0,
+                 collection_limits: dict = {}):
+        """
+        Initialize object
+
+        :param max_workers: `int` of thread pool size (defaults to
+                            the number of processors + 4, at most 32)
+        :param collection_limit: `int` of maximum number of concurrent
+                                 calls per collection (0 is unbounded)
+        :param collection_limits: `dict` of collection specific maximum
+                                  number of concurrent calls
+
+        :returns: pygeoapi.concurrency.RequestDispatcher
+        """
+
+        self.max_workers = max_workers or min(32, (os.cpu_count() or 1) + 4)
+        self.collection_limit = collection_limit
+        self.collection_limits = collection_limits
+        self.executor = ThreadPoolExecutor(
+            self.max_workers, thread_name_prefix='pygeoapi')
+
+        self._lock = threading.Lock()
+        self._semaphores = {}
+        self._queued = 0
+        self._active = 0
+        self._collections = {}
+
+    @classmethod
+    def from_config(cls, config: dict) -> 'RequestDispatcher':
+        """
+        Create a dispatcher from the `server.concurrency` section
+        and the `concurrency_limit` of resources of a pygeoapi configuration
+
+        :param config: `dict` of pygeoapi configuration
+
+        :returns: pygeoapi.concurrency.RequestDispatcher
+        """
+
+        concurrency = config['server'].get('concurrency') or {}
+        collection_limits = {
+            name: resource['concurrency_limit']
+            for name, resource in config.get('resources', {}).items()
+            if 'concurrency_limit' in resource
+        }
+
+        return cls(concurrency.get('max_workers'),
+                   concurrency.get('collection_limit', 0),
+                   collection_limits)
+
+    def _get_semaphore(self, collection: str) -> Optional[asyncio.Semaphore]:
+        limit = self.collection_limits.get(collection, self.collection_limit)
+        if not limit:
+            return None
+
+        try:
+            return self._semaphores[collection]
+        except KeyError:
+            semaphore = self._semaphores[collection] = asyncio.Semaphore(limit)
+            return semaphore
+
+    def _update(self, collection: Optional[str], key: str, delta: int):
+        with self._lock:
+            if key == 'queued':
+                self._queued += delta
+            elif key == 'active':
+                self._active += delta
+
+            if collection is not None:
+                stats = self._collections.setdefault(
+                    collection, {'waiting': 0, 'queued': 0, 'active': 0})
+                stats[key] += delta
+
+    async def run(self, func: Callable, *args,
+                  collection: Optional[str] = None, **kwargs) -> Any:
+        """
+        Run a blocking function in the thread pool
+
+        :param func: function to call
+        :param args: positional arguments of function
+        :param collection: `str` of collection identifier the call
+                           applies to, if any
+        :param kwargs: keyword arguments of function
+
+        :returns: result of function, where the streamed content of an API
+                  response (headers, status, content iterator) is turned
+                  into an asynchronous iterator consuming the stream in
+                  the thread pool
+        """
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._call, loop, collection, func,
+                                 *args, **kwargs)
+
+        semaphore = self._get_semaphore(collection)
+        if semaphore is not None:
+            self._update(collection, 'waiting', 1)
+            try:
+                await semaphore.acquire()
+            finally:
+                self._update(collection, 'waiting', -1)
+
+        try:
+            result = await self._submit(loop, collection, call)
+            if isinstance(result, tuple) and result and \
+                    isinstance(result[-1], Iterator):
+                # the stream holds the collection slot until it is over
+                stream = _DispatchedStream(self, loop, collection,
+                                           result[-1], semaphore)
+                semaphore = None
+                result = (*result[:-1], stream)
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+        return result
+
+    async def _submit(self, loop, collection, call):
+        return await self._schedule(loop, collection, call)
+
+    def _schedule(self, loop, collection, call) -> asyncio.Future:
+        self._update(collection, 'queued', 1)
+        if self._queued > 0 and self._active >= self.max_workers:
+            LOGGER.debug(f'All {self.max_workers} workers busy; '
+                         f'{self._queued} call(s) queued')
+        return loop.run_in_executor(self.executor, call)
+
+    def _call(self, loop, collection, func, *args, **kwargs):
+        self._update(collection, 'queued', -1)
+        self._update(collection, 'active', 1)
+        _LOCAL.loop = loop
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _LOCAL.loop = None
+            self._update(collection, 'active', -1)
+
+    def stats(self) -> dict:
+        """
+        Queue depth metrics of the dispatcher
+
+        :returns: `dict` of numbers of calls queued for and active in
+                  the thread pool, overall and per collection (where calls
+                  `waiting` are held back by the collection limit)
+        """
+
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'queued': self._queued,
+                'active': self._active,
+                'collections': {
+                    name: stats.copy()
+                    for name, stats in self._collections.items()
+                }
+            }
+
+    def shutdown(self):
+        """
+        Shut down the thread pool
+
+        :returns: `None`
+        """
+
+        self.executor.shutdown(wait=False)
+
+
+class _DispatchedStream:
+    """
+    Asynchronous iterator consuming a stream (e.g. the content of an API
+    response read from a provider chunk by chunk) in the thread pool of
+    a dispatcher, holding the collection limit until the stream is
+    exhausted or closed
+    """
+
+    def __init__(self, dispatcher: RequestDispatcher, loop, collection,
+                 iterator: Iterator, semaphore: Optional[asyncio.Semaphore]):
+        """
+        Initialize object
+
+        :param dispatcher: `RequestDispatcher` running the stream
+        :param loop: event loop of the dispatcher
+        :param collection: `str` of collection identifier, if any
+        :param iterator: iterator of the stream
+        :param semaphore: `asyncio.Semaphore` of the collection limit held
+                          by the stream, if any
+
+        :returns: pygeoapi.concurrency._DispatchedStream
+        """
+
+        self._dispatcher = dispatcher
+        self._loop = loop
+        self._collection = collection
+        self._iterator = iterator
+        self._semaphore = semaphore
+        self._done = False
+
+    def __aiter__(self) -> AsyncIterator:
+        return self
+
+    async def __anext__(self) -> Any:
+        if self._done:
+            raise StopAsyncIteration
+
+        try:
+            item = await self._dispatcher._submit(
+                self._loop, self._collection, functools.partial(
+                    self._dispatcher._call, self._loop, self._collection,
+                    next, self._iterator, _END))
+        except BaseException:
+            self.close()
+            raise
+
+        if item is _END:
+            self.close()
+            raise StopAsyncIteration
+
+        return item
+
+    async def aclose(self) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Close the stream, in the thread pool, then release the collection
+        limit (without waiting, so that it works from cancelled tasks)
+
+        :returns: `None`
+        """
+
+        if self._done:
+            return
+        self._done = True
+
+        def release(future=None):
+            if future is not None and not future.cancelled() and \
+                    future.exception() is not None:
+                LOGGER.warning(f'Error closing stream: {future.exception()}')
+            if self._semaphore is not None:
+                self._semaphore.release()
+
+        if hasattr(self._iterator, 'close'):
+            self._dispatcher._schedule(
+                self._loop, self._collection, functools.partial(
+                    self._dispatcher._call, self._loop, self._collection,
+                    self._iterator.close)).add_done_callback(release)
+        else:
+            release()
+
+    def __del__(self):
+        # streams of responses which are never sent
+        if not self._done and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self.close)
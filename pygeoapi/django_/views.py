@@ -34,11 +34,18 @@
 # =================================================================
 
 """Integration module for Django"""
-from typing import Tuple, Dict, Mapping, Optional
+import os
+from typing import Iterator, Tuple, Dict, Mapping, Optional
 from django.conf import settings
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, StreamingHttpResponse
 from pygeoapi.api import API
-from pygeoapi.openapi import get_oas
+from pygeoapi.openapi import OpenAPIDocument
+
+API_ = API(settings.PYGEOAPI_CONFIG)
+
+OPENAPI = OpenAPIDocument(
+    os.environ.get('PYGEOAPI_OPENAPI'), os.environ.get('PYGEOAPI_CONFIG'),
+    settings.PYGEOAPI_CONFIG['server'].get('pretty_print', False))
 
 
 def landing_page(request: HttpRequest) -> HttpResponse:
@@ -65,8 +72,7 @@ def openapi(request: HttpRequest) -> HttpResponse:
     :returns: Django HTTP Response
     """
 
-    openapi_config = get_oas(settings.PYGEOAPI_CONFIG)
-    response_ = _feed_response(request, 'openapi', openapi_config)
+    response_ = _feed_response(request, 'openapi', OPENAPI)
     response = _to_django_response(*response_)
 
     return response
@@ -491,8 +497,7 @@ def _feed_response(request: HttpRequest, api_definition: str,
                    *args, **kwargs) -> Tuple[Dict, int, str]:
     """Use pygeoapi api to process the input request"""
 
-    api_ = API(settings.PYGEOAPI_CONFIG)
-    api = getattr(api_, api_definition)
+    api = getattr(API_, api_definition)
     return api(request, *args, **kwargs)
 
 
@@ -500,7 +505,11 @@ def _to_django_response(headers: Mapping, status_code: int,
                         content: str) -> HttpResponse:
     """Convert API payload to a django response"""
 
-    response = HttpResponse(content, status=status_code)
+    if isinstance(content, Iterator):
+        # streamed content is sent chunked
+        response = StreamingHttpResponse(content, status=status_code)
+    else:
+        response = HttpResponse(content, status=status_code)
 
     for key, value in headers.items():
         response[key] = value
@@ -37,6 +37,7 @@ import click
 from flask import Flask, Blueprint, make_response, request, send_from_directory
 
 from pygeoapi.api import API
+from pygeoapi.openapi import OpenAPIDocument
 from pygeoapi.util import get_mimetype, yaml_load, get_api_rules
 
 os.environ['PYGEOAPI_CONFIG'] = 'example-config.yml'
@@ -77,6 +78,10 @@ APP.config['JSONIFY_PRETTYPRINT_REGULAR'] = CONFIG['server'].get(
 
 api_ = API(CONFIG)
 
+OPENAPI = OpenAPIDocument(os.environ.get('PYGEOAPI_OPENAPI'),
+                          os.environ.get('PYGEOAPI_CONFIG'),
+                          CONFIG['server'].get('pretty_print', False))
+
 OGC_SCHEMAS_LOCATION = CONFIG['server'].get('ogc_schemas_location')
 
 if (OGC_SCHEMAS_LOCATION is not None and
@@ -141,13 +146,7 @@ def openapi():
 
     :returns: HTTP response
     """
-    with open(os.environ.get('PYGEOAPI_OPENAPI'), encoding='utf8') as ff:
-        if os.environ.get('PYGEOAPI_OPENAPI').endswith(('.yaml', '.yml')):
-            openapi_ = yaml_load(ff)
-        else:  # JSON string, do not transform
-            openapi_ = ff.read()
-
-    return get_response(api_.openapi(request, openapi_))
+    return get_response(api_.openapi(request, OPENAPI))
 
 
 @BLUEPRINT.route('/conformance')
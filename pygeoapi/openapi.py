@@ -30,11 +30,14 @@
 # =================================================================
 
 from copy import deepcopy
+from gzip import compress
+import hashlib
 import io
 import json
 import logging
 import os
 from pathlib import Path
+import threading
 from typing import Union
 
 import click
@@ -47,7 +50,7 @@ from pygeoapi.models.openapi import OAPIFormat
 from pygeoapi.provider.base import ProviderTypeError, SchemaType
 from pygeoapi.util import (filter_dict_by_key_value, get_provider_by_type,
                            filter_providers_by_type, to_json, yaml_load,
-                           get_api_rules, get_base_url)
+                           get_api_rules, get_base_url, JobStatus)
 
 LOGGER = logging.getLogger(__name__)
 
@@ -1209,6 +1212,39 @@ def get_oas_30(cfg):
                 'description': 'Retrieve a list of jobs',
                 'tags': ['jobs'],
                 'operationId': 'getJobs',
+                'parameters': [
+                    {'$ref': '#/components/parameters/f'},
+                    {'$ref': f"{OPENAPI_YAML['oapif-1']}#/components/parameters/limit"},  # noqa
+                    {'$ref': '#/components/parameters/offset'},
+                    {'$ref': f"{OPENAPI_YAML['oapif-1']}#/components/parameters/datetime"},  # noqa
+                    {
+                        'name': 'status',
+                        'in': 'query',
+                        'description': 'Comma-separated list of job statuses',  # noqa
+                        'required': False,
+                        'style': 'form',
+                        'explode': False,
+                        'schema': {
+                            'type': 'array',
+                            'items': {
+                                'type': 'string',
+                                'enum': [s.value for s in JobStatus]
+                            }
+                        }
+                    },
+                    {
+                        'name': 'processID',
+                        'in': 'query',
+                        'description': 'Comma-separated list of process identifiers',  # noqa
+                        'required': False,
+                        'style': 'form',
+                        'explode': False,
+                        'schema': {
+                            'type': 'array',
+                            'items': {'type': 'string'}
+                        }
+                    }
+                ],
                 'responses': {
                     '200': {'$ref': '#/components/responses/200'},
                     '404': {'$ref': f"{OPENAPI_YAML['oapip']}/responses/NotFound.yaml"},  # noqa
@@ -1338,6 +1374,120 @@ def generate_openapi_document(cfg_file: Union[Path, io.TextIOWrapper],
     return content
 
 
+class OpenAPIDocument:
+    """
+    OpenAPI document held in memory and serialized ahead of time
+
+    The document is loaded from an OpenAPI file (YAML or JSON) if given,
+    otherwise generated from the configuration file.  It is reloaded when
+    the OpenAPI file changes and regenerated in-process when the
+    configuration file changes.
+    """
+
+    def __init__(self, openapi_file: Union[Path, str] = None,
+                 config_file: Union[Path, str] = None,
+                 pretty_print: bool = False):
+        """
+        Initialize object
+
+        :param openapi_file: path to OpenAPI document (YAML or JSON)
+        :param config_file: path to pygeoapi configuration
+        :param pretty_print: whether to pretty-print generated JSON
+
+        :returns: `pygeoapi.openapi.OpenAPIDocument`
+        """
+
+        if openapi_file is None and config_file is None:
+            raise RuntimeError('OpenAPI document or configuration required')
+
+        self.openapi_file = openapi_file
+        self.config_file = config_file
+        self.pretty_print = pretty_print
+
+        self.content = None
+        self.etag = None
+        self._compressed = {}
+        self._signatures = {}
+        self._lock = threading.Lock()
+
+        self.refresh()
+
+    @staticmethod
+    def _signature(filepath: Union[Path, str, None]) -> Union[tuple, None]:
+        if filepath is None:
+            return None
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self) -> bool:
+        """
+        Reload or regenerate the document if its sources have changed
+
+        :returns: `bool` of whether the document was updated
+        """
+
+        signatures = {
+            'openapi': self._signature(self.openapi_file),
+            'config': self._signature(self.config_file)
+        }
+        if signatures == self._signatures:
+            return False
+
+        with self._lock:
+            if signatures == self._signatures:
+                return False
+
+            if self.content is None:
+                from_config = signatures['openapi'] is None
+            else:
+                from_config = (signatures['config'] !=
+                               self._signatures.get('config'))
+
+            if from_config:
+                LOGGER.debug('Generating OpenAPI document from configuration')
+                with open(self.config_file, encoding='utf8') as fh:
+                    content = to_json(get_oas(yaml_load(fh)),
+                                      pretty=self.pretty_print)
+            else:
+                LOGGER.debug(f'Loading OpenAPI document {self.openapi_file}')
+                with open(self.openapi_file, encoding='utf8') as fh:
+                    if str(self.openapi_file).endswith(('.yaml', '.yml')):
+                        content = to_json(yaml_load(fh),
+                                          pretty=self.pretty_print)
+                    else:  # JSON, do not transform
+                        content = fh.read()
+
+            self._set_content(content)
+            self._signatures = signatures
+
+        return True
+
+    def _set_content(self, content: str) -> None:
+        digest = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        self._compressed = {}
+        self.content = content
+        self.etag = f'"{digest}"'
+
+    def compressed(self, encoding: str = 'utf-8') -> bytes:
+        """
+        Get gzip compressed document, compressed once per encoding
+
+        :param encoding: character encoding
+
+        :returns: `bytes` of gzip compressed document
+        """
+
+        try:
+            return self._compressed[encoding]
+        except KeyError:
+            compressed = compress(self.content.encode(encoding))
+            self._compressed[encoding] = compressed
+            return compressed
+
+
 @click.group()
 def openapi():
     """OpenAPI management"""
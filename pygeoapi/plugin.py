@@ -28,8 +28,11 @@
 # =================================================================
 """Plugin loader"""
 
+from copy import deepcopy
 import importlib
 import logging
+import threading
+import time
 from typing import Any
 
 LOGGER = logging.getLogger(__name__)
@@ -50,6 +53,7 @@ PLUGINS = {
         'MapScript': 'pygeoapi.provider.mapscript_.MapScriptProvider',
         'MongoDB': 'pygeoapi.provider.mongo.MongoProvider',
         'MVT': 'pygeoapi.provider.mvt.MVTProvider',
+        'MVT-features': 'pygeoapi.provider.mvt_features.MVTFeaturesProvider',  # noqa
         'OGR': 'pygeoapi.provider.ogr.OGRProvider',
         'PostgreSQL': 'pygeoapi.provider.postgresql.PostgreSQLProvider',
         'rasterio': 'pygeoapi.provider.rasterio_.RasterioProvider',
@@ -70,11 +74,27 @@ PLUGINS = {
         'Gdalinfo': 'pygeoapi.process.gdal_process.GdalinfoProcessor',
         'K8s': 'pygeoapi.process.k8s_process.K8sProcessor',
     },
+    'cache': {
+        'Filesystem': 'pygeoapi.cache.filesystem.FilesystemCache',
+        'Memory': 'pygeoapi.cache.memory.MemoryCache',
+        'Redis': 'pygeoapi.cache.redis_.RedisCache'
+    },
+    'tile_cache': {
+        'Directory': 'pygeoapi.cache.tiles.directory.DirectoryTileStore',
+        'MBTiles': 'pygeoapi.cache.tiles.mbtiles.MBTilesTileStore',
+        'PMTiles': 'pygeoapi.cache.tiles.pmtiles.PMTilesTileStore'
+    },
     'process_manager': {
         'Dummy': 'pygeoapi.process.manager.dummy.DummyManager',
         'MongoDB': 'pygeoapi.process.manager.mongodb_.MongoDBManager',
+        'SQLite': 'pygeoapi.process.manager.sqlite_.SQLiteManager',
         'TinyDB': 'pygeoapi.process.manager.tinydb_.TinyDBManager',
         'Kubernetes': 'pygeoapi.process.manager.kubernetes.KubernetesManager'
+    },
+    'process_executor': {
+        'Thread': 'pygeoapi.process.executor.pool.ThreadExecutor',
+        'Process': 'pygeoapi.process.executor.pool.ProcessExecutor',
+        'Worker': 'pygeoapi.process.executor.worker.WorkerExecutor'
     }
 }
 
@@ -120,6 +140,196 @@ def load_plugin(plugin_type: str, plugin_def: dict) -> Any:
     return plugin
 
 
+class ProviderRegistry:
+    """
+    Registry of long-lived provider instances
+
+    Providers are built once per collection and provider type (at startup
+    via :meth:`preload` or on first use) and reused across requests.
+    Providers which do not declare themselves thread-safe (see
+    `BaseProvider.thread_safe`) are kept one instance per thread, released
+    with their thread.
+    """
+
+    def __init__(self, health_check_interval: int = 0):
+        """
+        Initialize object
+
+        :param health_check_interval: seconds between provider health checks
+                                      (0 disables health checks)
+
+        :returns: `pygeoapi.plugin.ProviderRegistry`
+        """
+
+        self.health_check_interval = health_check_interval
+        self._entries = {}
+        self._local = threading.local()
+        # invalidation count per (dataset, provider type), which outdates
+        # the per-thread instances of the other threads
+        self._generations = {}
+        self._lock = threading.Lock()
+
+    def get(self, dataset: str, provider_def: dict) -> Any:
+        """
+        Get a provider instance, building it if required
+
+        A cached instance is rebuilt if its provider definition has changed
+        since it was built or if its health check fails.
+
+        :param dataset: dataset (collection) name
+        :param provider_def: provider definition
+
+        :returns: provider object
+        """
+
+        key = (dataset, provider_def['type'])
+        generation = self._generations.get(key, 0)
+
+        for entries in (self._entries, self._get_local_entries()):
+            entry = entries.get(key)
+            if entry is None:
+                continue
+            if entry['generation'] != generation:
+                LOGGER.debug(f'Provider invalidated for {key}')
+                self._discard(entries, key)
+                continue
+            if entry['definition'] != provider_def:
+                LOGGER.debug(f'Provider definition changed for {key}')
+                self._discard(entries, key)
+                continue
+            if not self._is_healthy(key, entry):
+                self._discard(entries, key)
+                continue
+            return entry['provider']
+
+        LOGGER.debug(f'Building provider for {dataset}')
+        provider = load_plugin('provider', provider_def)
+
+        entries = self._entries if getattr(provider, 'thread_safe', False) \
+            else self._get_local_entries()
+
+        with self._lock:
+            self._generations.setdefault(key, generation)
+            entries[key] = {
+                'definition': deepcopy(provider_def),
+                'provider': provider,
+                'generation': generation,
+                'checked': time.monotonic()
+            }
+
+        return provider
+
+    def preload(self, resources: dict) -> None:
+        """
+        Build providers of all collections ahead of the first request
+
+        Providers which fail to load are logged and left to be built on
+        first use.
+
+        :param resources: `dict` of resources from configuration
+
+        :returns: `None`
+        """
+
+        for dataset, resource in resources.items():
+            for provider_def in resource.get('providers', []):
+                try:
+                    self.get(dataset, provider_def)
+                except Exception as err:
+                    LOGGER.warning(f'Could not preload provider for '
+                                   f'{dataset}: {err}')
+
+    def invalidate(self, dataset: str = None,
+                   provider_type: str = None) -> None:
+        """
+        Discard cached provider instances (e.g. when data has changed)
+
+        :param dataset: dataset name (default is all datasets)
+        :param provider_type: provider type (default is all types)
+
+        :returns: `None`
+        """
+
+        with self._lock:
+            for key in list(self._generations):
+                if dataset is not None and key[0] != dataset:
+                    continue
+                if provider_type is not None and key[1] != provider_type:
+                    continue
+                self._generations[key] = self._generations.get(key, 0) + 1
+                self._entries.pop(key, None)
+                self._get_local_entries().pop(key, None)
+
+    def check_health(self) -> dict:
+        """
+        Run the health check of every cached provider (shared, or of the
+        current thread)
+
+        :returns: `dict` of (dataset, provider type) to `bool` health status
+        """
+
+        status = {}
+        for entries in (self._entries, self._get_local_entries()):
+            for key, entry in list(entries.items()):
+                healthy = self._run_health_check(entry['provider'])
+                status[key] = status.get(key, True) and healthy
+
+        return status
+
+    def _get_local_entries(self) -> dict:
+        """
+        Get the provider instances of the current thread
+
+        :returns: `dict` of registry entries
+        """
+
+        entries = getattr(self._local, 'entries', None)
+        if entries is None:
+            entries = self._local.entries = {}
+
+        return entries
+
+    def _is_healthy(self, key: tuple, entry: dict) -> bool:
+        """
+        Check provider health if the health check interval has elapsed
+
+        :param key: registry key
+        :param entry: registry entry
+
+        :returns: `bool` of whether the provider can be reused
+        """
+
+        if not self.health_check_interval:
+            return True
+
+        now = time.monotonic()
+        if now - entry['checked'] < self.health_check_interval:
+            return True
+
+        entry['checked'] = now
+        healthy = self._run_health_check(entry['provider'])
+        if not healthy:
+            LOGGER.warning(f'Provider health check failed for {key}')
+
+        return healthy
+
+    @staticmethod
+    def _run_health_check(provider: Any) -> bool:
+        health_check = getattr(provider, 'health_check', None)
+        if health_check is None:
+            return True
+
+        try:
+            return bool(health_check())
+        except Exception as err:
+            LOGGER.warning(f'Provider health check error: {err}')
+            return False
+
+    def _discard(self, entries: dict, key: tuple) -> None:
+        with self._lock:
+            entries.pop(key, None)
+
+
 class InvalidPluginError(Exception):
     """Invalid plugin"""
     pass
@@ -0,0 +1,132 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import logging
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+
+class BaseExecutor:
+    """generic job executor ABC"""
+
+    def __init__(self, executor_def: dict):
+        """
+        Initialize object
+
+        :param executor_def: executor definition
+
+        :returns: `pygeoapi.process.executor.base.BaseExecutor`
+        """
+
+        self.name = executor_def['name']
+        self.max_workers = executor_def.get('max_workers', 4)
+        self.queue_size = executor_def.get('queue_size', 100)
+        # seconds clients are asked to wait when the queue is full
+        self.retry_after = executor_def.get('retry_after', 30)
+        # per-process options (max_workers, priority)
+        self.processes = executor_def.get('processes', {})
+
+    def get_max_workers(self, process_id: str) -> int:
+        """
+        Get the maximum number of concurrent jobs of a process
+
+        :param process_id: process identifier
+
+        :returns: `int` of maximum number of concurrent jobs
+        """
+
+        return self.processes.get(process_id, {}).get(
+            'max_workers', self.max_workers)
+
+    def get_priority(self, process_id: str) -> int:
+        """
+        Get the priority of the jobs of a process (higher runs first)
+
+        :param process_id: process identifier
+
+        :returns: `int` of priority
+        """
+
+        return self.processes.get(process_id, {}).get('priority', 0)
+
+    def submit(self, manager: Any, p: Any, job_id: str,
+               data_dict: dict) -> None:
+        """
+        Queue a job for execution
+
+        :param manager: `pygeoapi.process.manager.base.BaseManager` of job
+        :param p: `pygeoapi.process` object
+        :param job_id: job identifier
+        :param data_dict: `dict` of data parameters
+
+        :raises: `ExecutorQueueFullError` if the queue is full
+        :returns: `None`
+        """
+
+        raise NotImplementedError()
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job
+
+        :param job_id: job identifier
+
+        :returns: `bool` of whether the job was cancelled
+        """
+
+        raise NotImplementedError()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Stop accepting jobs and release the workers
+
+        :param wait: `bool` of whether to wait for running jobs
+
+        :returns: `None`
+        """
+
+        pass
+
+    def __repr__(self):
+        return f'<BaseExecutor> {self.name}'
+
+
+class ExecutorError(Exception):
+    """executor generic error"""
+    pass
+
+
+class ExecutorQueueFullError(ExecutorError):
+    """job queue is full"""
+
+    def __init__(self, msg: str = 'Job queue is full',
+                 retry_after: int = 30):
+        super().__init__(msg)
+        self.retry_after = retry_after
@@ -0,0 +1,260 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from collections import Counter, namedtuple
+from datetime import datetime
+import heapq
+import itertools
+import logging
+import multiprocessing
+import threading
+from typing import Any, Optional
+
+from pygeoapi.process.executor.base import (BaseExecutor, ExecutorError,
+                                            ExecutorQueueFullError)
+from pygeoapi.util import DATETIME_FORMAT, JobStatus
+
+LOGGER = logging.getLogger(__name__)
+
+Job = namedtuple('Job', ['job_id', 'process_id', 'manager', 'p',
+                         'data_dict'])
+
+
+class ThreadExecutor(BaseExecutor):
+    """
+    Bounded pool of worker threads running jobs from a priority queue
+    """
+
+    def __init__(self, executor_def: dict):
+        """
+        Initialize object
+
+        :param executor_def: executor definition
+
+        :returns: `pygeoapi.process.executor.pool.ThreadExecutor`
+        """
+
+        super().__init__(executor_def)
+
+        self._lock = threading.Lock()
+        # heap of (-priority, sequence, job)
+        self._pending = []
+        self._sequence = itertools.count()
+        # number of running jobs per process
+        self._running = Counter()
+        self._workers = []
+        self._shutdown = False
+
+    def submit(self, manager: Any, p: Any, job_id: str,
+               data_dict: dict) -> None:
+        process_id = p.metadata['id']
+        job = Job(job_id, process_id, manager, p, data_dict)
+
+        with self._lock:
+            if self._shutdown:
+                raise ExecutorError('Executor is shut down')
+            if len(self._pending) >= self.queue_size:
+                msg = f'Job queue is full ({self.queue_size} jobs)'
+                LOGGER.warning(msg)
+                raise ExecutorQueueFullError(msg, self.retry_after)
+
+            LOGGER.debug(f'Queueing job {job_id}')
+            heapq.heappush(self._pending, (-self.get_priority(process_id),
+                                           next(self._sequence), job))
+            self._start_worker()
+
+    def cancel(self, job_id: str) -> bool:
+        with self._lock:
+            for i, (_, _, job) in enumerate(self._pending):
+                if job.job_id == job_id:
+                    LOGGER.debug(f'Removing job {job_id} from queue')
+                    self._pending.pop(i)
+                    heapq.heapify(self._pending)
+                    return True
+
+        # threads cannot be interrupted: running jobs run to completion
+        return False
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            self._shutdown = True
+            self._pending.clear()
+
+        if wait:
+            for worker in list(self._workers):
+                worker.join()
+
+    def _start_worker(self) -> None:
+        """
+        Start a worker thread, unless all of them are running
+
+        Workers stop when no queued job can run, and are not daemon
+        threads: exiting processes wait for running jobs to complete.
+
+        :returns: `None`
+        """
+
+        if len(self._workers) < self.max_workers:
+            worker = threading.Thread(target=self._work,
+                                      name='pygeoapi-job-worker')
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_job(self) -> Optional[Job]:
+        """
+        Take the queued job with the highest priority whose process
+        has not reached its concurrency limit
+
+        :returns: `Job`, or `None` if no queued job can run
+        """
+
+        for item in sorted(self._pending):
+            job = item[2]
+            if self._running[job.process_id] < self.get_max_workers(
+                    job.process_id):
+                self._pending.remove(item)
+                heapq.heapify(self._pending)
+                return job
+
+        return None
+
+    def _work(self) -> None:
+        """
+        Worker thread loop
+
+        :returns: `None`
+        """
+
+        while True:
+            with self._lock:
+                job = self._next_job()
+                if job is None:
+                    # running workers take the jobs waiting for them
+                    self._workers.remove(threading.current_thread())
+                    return
+                self._running[job.process_id] += 1
+
+            try:
+                self._run(job)
+            except Exception as err:
+                LOGGER.error(f'Job {job.job_id} failed: {err}')
+            finally:
+                with self._lock:
+                    self._running[job.process_id] -= 1
+
+    def _run(self, job: Job) -> None:
+        """
+        Run a job
+
+        :param job: `Job` to run
+
+        :returns: `None`
+        """
+
+        job.manager._execute_job(job.p, job.job_id, job.data_dict)
+
+    def __repr__(self):
+        return f'<ThreadExecutor> {self.max_workers}'
+
+
+class ProcessExecutor(ThreadExecutor):
+    """
+    Bounded pool running each job in its own child process, so that
+    CPU-bound processes use more than one core and running jobs can be
+    cancelled
+    """
+
+    def __init__(self, executor_def: dict):
+        """
+        Initialize object
+
+        :param executor_def: executor definition
+
+        :returns: `pygeoapi.process.executor.pool.ProcessExecutor`
+        """
+
+        super().__init__(executor_def)
+
+        # jobs are not forked from the (threaded) server process directly,
+        # which could copy locks held by other threads
+        start_method = executor_def.get('start_method')
+        if start_method is None:
+            if 'forkserver' in multiprocessing.get_all_start_methods():
+                start_method = 'forkserver'
+            else:
+                start_method = 'spawn'
+        self._context = multiprocessing.get_context(start_method)
+        self._processes = {}
+        self._cancelled = set()
+
+    def cancel(self, job_id: str) -> bool:
+        if super().cancel(job_id):
+            return True
+
+        with self._lock:
+            process = self._processes.get(job_id)
+            if process is None or job_id in self._cancelled:
+                return False
+            LOGGER.debug(f'Terminating job {job_id}')
+            self._cancelled.add(job_id)
+            process.terminate()
+
+        return True
+
+    def _run(self, job: Job) -> None:
+        process = self._context.Process(
+            target=job.manager._execute_job,
+            args=(job.p, job.job_id, job.data_dict),
+            name=f'pygeoapi-job-{job.job_id}', daemon=True)
+
+        with self._lock:
+            process.start()
+            self._processes[job.job_id] = process
+
+        process.join()
+
+        with self._lock:
+            self._processes.pop(job.job_id)
+            if job.job_id in self._cancelled:
+                self._cancelled.discard(job.job_id)
+                return
+
+        if process.exitcode != 0:
+            # the job could not record its own failure
+            msg = f'Job process exited with code {process.exitcode}'
+            LOGGER.error(f'Job {job.job_id}: {msg}')
+            job.manager.update_job(job.job_id, {
+                'job_end_datetime': datetime.utcnow().strftime(
+                    DATETIME_FORMAT),
+                'status': JobStatus.failed.value,
+                'message': msg
+            })
+
+    def __repr__(self):
+        return f'<ProcessExecutor> {self.max_workers}'
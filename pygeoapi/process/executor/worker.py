@@ -0,0 +1,340 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from datetime import datetime
+import json
+import logging
+import os
+import signal
+import socket
+import sqlite3
+import threading
+import time
+from typing import Any, Optional, Tuple
+
+import click
+
+from pygeoapi.plugin import load_plugin
+from pygeoapi.process.executor.base import (BaseExecutor, ExecutorError,
+                                            ExecutorQueueFullError)
+from pygeoapi.util import DATETIME_FORMAT, JobStatus, yaml_load
+
+LOGGER = logging.getLogger(__name__)
+
+SCHEMA = [
+    ('CREATE TABLE IF NOT EXISTS job_queue (job_id TEXT PRIMARY KEY, '
+     'process_id TEXT NOT NULL, priority INTEGER NOT NULL, '
+     'data TEXT NOT NULL, status TEXT NOT NULL, worker TEXT, '
+     'queued REAL NOT NULL)'),
+    ('CREATE INDEX IF NOT EXISTS job_queue_status '
+     'ON job_queue (status, priority, queued)')
+]
+
+QUEUED = 'queued'
+RUNNING = 'running'
+
+
+class WorkerExecutor(BaseExecutor):
+    """
+    Durable SQLite job queue, executed by separate local worker daemons
+    (``pygeoapi jobs worker``) instead of the web server processes
+    """
+
+    def __init__(self, executor_def: dict):
+        """
+        Initialize object
+
+        :param executor_def: executor definition
+
+        :returns: `pygeoapi.process.executor.worker.WorkerExecutor`
+        """
+
+        super().__init__(executor_def)
+
+        self.connection = executor_def['connection']
+        # seconds between polls of an empty queue by the workers
+        self.poll_interval = executor_def.get('poll_interval', 1)
+        # connections are not shared between threads
+        self._local = threading.local()
+
+        conn = self._connect()
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get the connection of the current thread to the queue database
+
+        :returns: `sqlite3.Connection`
+        """
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.connection, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+
+        return conn
+
+    def submit(self, manager: Any, p: Any, job_id: str,
+               data_dict: dict) -> None:
+        process_id = p.metadata['id']
+
+        conn = self._connect()
+        with conn:
+            # lock the queue between counting and inserting
+            conn.execute('BEGIN IMMEDIATE')
+            queued, = conn.execute(
+                'SELECT COUNT(*) FROM job_queue WHERE status = ?',
+                (QUEUED,)).fetchone()
+            if queued >= self.queue_size:
+                msg = f'Job queue is full ({self.queue_size} jobs)'
+                LOGGER.warning(msg)
+                raise ExecutorQueueFullError(msg, self.retry_after)
+
+            LOGGER.debug(f'Queueing job {job_id}')
+            conn.execute(
+                'INSERT INTO job_queue VALUES (?, ?, ?, ?, ?, NULL, ?)',
+                (job_id, process_id, self.get_priority(process_id),
+                 json.dumps(data_dict), QUEUED, time.time()))
+
+    def cancel(self, job_id: str) -> bool:
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                'DELETE FROM job_queue WHERE job_id = ? AND status = ?',
+                (job_id, QUEUED))
+
+        # running jobs run to completion in their worker
+        return cursor.rowcount > 0
+
+    def claim(self, worker_id: str) -> Optional[Tuple[str, str, dict]]:
+        """
+        Take the queued job with the highest priority whose process
+        has not reached its concurrency limit
+
+        :param worker_id: `str` of worker identifier (host:pid)
+
+        :returns: tuple of job identifier, process identifier and `dict`
+                  of data parameters, or `None` if no queued job can run
+        """
+
+        conn = self._connect()
+        with conn:
+            conn.execute('BEGIN IMMEDIATE')
+            running = dict(conn.execute(
+                'SELECT process_id, COUNT(*) FROM job_queue '
+                'WHERE status = ? GROUP BY process_id', (RUNNING,)))
+
+            rows = conn.execute(
+                'SELECT job_id, process_id, data FROM job_queue '
+                'WHERE status = ? ORDER BY priority DESC, queued',
+                (QUEUED,))
+            for job_id, process_id, data in rows:
+                if running.get(process_id, 0) < self.get_max_workers(
+                        process_id):
+                    conn.execute(
+                        'UPDATE job_queue SET status = ?, worker = ? '
+                        'WHERE job_id = ?', (RUNNING, worker_id, job_id))
+                    return job_id, process_id, json.loads(data)
+
+        return None
+
+    def complete(self, job_id: str) -> None:
+        """
+        Remove a finished job from the queue
+
+        :param job_id: job identifier
+
+        :returns: `None`
+        """
+
+        conn = self._connect()
+        with conn:
+            conn.execute('DELETE FROM job_queue WHERE job_id = ?', (job_id,))
+
+    def recover(self) -> int:
+        """
+        Queue again the jobs left running by dead workers of this host
+
+        :returns: `int` of number of jobs queued again
+        """
+
+        hostname = socket.gethostname()
+
+        conn = self._connect()
+        with conn:
+            rows = conn.execute(
+                'SELECT job_id, worker FROM job_queue WHERE status = ?',
+                (RUNNING,)).fetchall()
+
+            count = 0
+            for job_id, worker in rows:
+                host, _, pid = (worker or '').rpartition(':')
+                if host != hostname or _is_alive(int(pid)):
+                    continue
+                LOGGER.info(f'Queueing job {job_id} of dead worker {worker}')
+                conn.execute(
+                    'UPDATE job_queue SET status = ?, worker = NULL '
+                    'WHERE job_id = ?', (QUEUED, job_id))
+                count += 1
+
+        return count
+
+    def work(self, manager: Any, processes: dict,
+             stop: threading.Event) -> None:
+        """
+        Worker loop, running queued jobs until stopped
+
+        :param manager: `pygeoapi.process.manager.base.BaseManager` of jobs
+        :param processes: `dict` of process resources configuration
+        :param stop: `threading.Event` stopping the worker
+
+        :returns: `None`
+        """
+
+        worker_id = f'{socket.gethostname()}:{os.getpid()}'
+
+        while not stop.is_set():
+            job = self.claim(worker_id)
+            if job is None:
+                stop.wait(self.poll_interval)
+                continue
+
+            job_id, process_id, data_dict = job
+            LOGGER.info(f'Running job {job_id} of {process_id}')
+            try:
+                p = load_plugin('process',
+                                processes[process_id]['processor'])
+                manager._execute_job(p, job_id, data_dict)
+            except Exception as err:
+                LOGGER.error(f'Job {job_id} failed: {err}')
+                manager.update_job(job_id, {
+                    'job_end_datetime': datetime.utcnow().strftime(
+                        DATETIME_FORMAT),
+                    'status': JobStatus.failed.value,
+                    'message': f'Cannot run job: {err}'
+                })
+            finally:
+                self.complete(job_id)
+
+    def __repr__(self):
+        return f'<WorkerExecutor> {self.connection}'
+
+
+def _is_alive(pid: int) -> bool:
+    """
+    Checks whether a local process is running
+
+    :param pid: process identifier
+
+    :returns: `bool` of whether the process is running
+    """
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
+
+
+def run_worker(config: dict, workers: int = 1,
+               stop: Optional[threading.Event] = None) -> None:
+    """
+    Run the queued jobs of a pygeoapi configuration until stopped
+
+    :param config: `dict` of pygeoapi configuration
+    :param workers: number of jobs run concurrently
+    :param stop: `threading.Event` stopping the worker (optional)
+
+    :returns: `None`
+    """
+
+    manager = load_plugin('process_manager', config['server']['manager'])
+    executor = manager.executor
+    if not isinstance(executor, WorkerExecutor):
+        raise ExecutorError('Process manager does not use a Worker executor')
+
+    processes = {key: value for key, value in config['resources'].items()
+                 if value.get('type') == 'process'}
+
+    executor.recover()
+
+    stop = stop or threading.Event()
+    threads = [threading.Thread(target=executor.work,
+                                args=(manager, processes, stop))
+               for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+@click.group()
+def jobs():
+    """Process job management"""
+    pass
+
+
+@click.command()
+@click.pass_context
+@click.option('--config', '-c', 'config_file', help='configuration file')
+@click.option('--workers', type=int, default=1,
+              help='number of jobs run concurrently (default 1)')
+def worker(ctx, config_file, workers):
+    """Run queued process jobs"""
+
+    config_file = config_file or os.environ.get('PYGEOAPI_CONFIG')
+    if config_file is None:
+        raise click.ClickException('--config/-c required')
+
+    with open(config_file, encoding='utf8') as fh:
+        config = yaml_load(fh)
+
+    stop = threading.Event()
+
+    def handle_signal(signum, frame):
+        click.echo('Stopping after running jobs')
+        stop.set()
+
+    signal.signal(signal.SIGTERM, handle_signal)
+    signal.signal(signal.SIGINT, handle_signal)
+
+    click.echo(f'Running jobs with {workers} workers')
+    try:
+        run_worker(config, workers, stop)
+    except ExecutorError as err:
+        raise click.ClickException(str(err))
+
+
+jobs.add_command(worker)
@@ -27,21 +27,26 @@
 #
 # =================================================================
 
-from datetime import datetime
+from datetime import datetime, timezone
+import gzip
 import json
 import logging
-from multiprocessing import dummy
 from pathlib import Path
-from typing import Any, Dict, Tuple, Optional
+import threading
+from typing import IO, Any, Dict, Tuple, Optional
 import uuid
 
+import dateutil.parser
+
 from pygeoapi.util import (
     DATETIME_FORMAT,
     JobStatus,
     ProcessExecutionMode,
     RequestedProcessExecutionMode,
 )
+from pygeoapi.plugin import load_plugin
 from pygeoapi.process.base import BaseProcessor
+from pygeoapi.process.executor.base import BaseExecutor
 
 LOGGER = logging.getLogger(__name__)
 
@@ -66,14 +71,74 @@ class BaseManager:
         if self.output_dir is not None:
             self.output_dir = Path(self.output_dir)
 
-    def get_jobs(self, status: JobStatus = None) -> list:
+        # results are written gzip compressed (<output_dir>/<file>.gz)
+        self.compress_outputs = manager_def.get('compress_outputs', False)
+        # results are sent by the front web server (header, prefix)
+        self.offload = manager_def.get('offload')
+
+        # asynchronous jobs are run by the executor (built on first use)
+        self.executor_def = manager_def.get('executor', {'name': 'Thread'})
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def executor(self) -> BaseExecutor:
+        """
+        Executor of asynchronous jobs
+
+        :returns: `pygeoapi.process.executor.base.BaseExecutor`
+        """
+
+        with self._executor_lock:
+            if self._executor is None:
+                LOGGER.debug(f"Loading executor {self.executor_def['name']}")
+                self._executor = load_plugin('process_executor',
+                                             self.executor_def)
+
+        return self._executor
+
+    def cancel_job(self, job_id: str) -> bool:
         """
-        Get process jobs, optionally filtered by status
+        Cancels the execution of a queued or running job
 
-        :param status: job status (accepted, running, successful,
-                       failed, results) (default is all)
+        :param job_id: job identifier
 
-        :returns: `list` of jobs (identifier, status, process identifier)
+        :returns: `bool` of whether the job was cancelled
+        """
+
+        if not self.is_async:
+            return False
+
+        return self.executor.cancel(job_id)
+
+    def __getstate__(self):
+        # executors hold threads and locks, which do not cross processes
+        state = self.__dict__.copy()
+        state['_executor'] = None
+        state.pop('_executor_lock')
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._executor_lock = threading.Lock()
+
+    def get_jobs(self, status: list = None, process_id: list = None,
+                 datetime_: str = None, sortby: list = [],
+                 limit: Optional[int] = None, offset: int = 0) -> dict:
+        """
+        Get process jobs, optionally filtered by status, process and
+        start time
+
+        :param status: list of job statuses (accepted, running,
+                       successful, failed, dismissed) (default is all)
+        :param process_id: list of process identifiers (default is all)
+        :param datetime_: temporal (datestamp or extent) of job start
+        :param sortby: list of dicts (property, order)
+        :param limit: number of jobs to return (default is all)
+        :param offset: starting job to return (default 0)
+
+        :returns: `dict` of `list` of jobs (identifier, status, process
+                  identifier) and number of matching jobs (numberMatched)
         """
 
         raise NotImplementedError()
@@ -123,6 +188,32 @@ class BaseManager:
 
         raise NotImplementedError()
 
+    def get_job_result_file(self, job_id: str) -> Optional[Tuple[str, Path]]:
+        """
+        Get the file of the output of a completed process, which can be
+        sent as is instead of being read by `get_job_result`
+
+        :param job_id: job identifier
+
+        :returns: `tuple` of mimetype and `Path` of the output file
+                  (gzip compressed if its suffix is `.gz`), or `None`
+                  if the job has no output file
+        """
+
+        job = self.get_job(job_id)
+        if not job or job['status'] != JobStatus.successful.value:
+            return None
+
+        location = job.get('location')
+        if not location or location == 'None':
+            return None
+
+        location = Path(location)
+        if not location.is_file():
+            return None
+
+        return job.get('mimetype'), location
+
     def delete_job(self, job_id: str) -> bool:
         """
         Deletes a job and associated results/outputs
@@ -134,26 +225,53 @@ class BaseManager:
 
         raise NotImplementedError()
 
+    def _get_job_metadata(self, p: BaseProcessor, job_id: str) -> dict:
+        """
+        Get the metadata of a new (accepted) job
+
+        :param p: `pygeoapi.process` object
+        :param job_id: job identifier
+
+        :returns: `dict` of job metadata
+        """
+
+        return {
+            'identifier': job_id,
+            'process_id': p.metadata['id'],
+            'job_start_datetime': datetime.utcnow().strftime(
+                DATETIME_FORMAT),
+            'job_end_datetime': None,
+            'status': JobStatus.accepted.value,
+            'location': None,
+            'mimetype': None,
+            'message': 'Job accepted and ready for execution',
+            'progress': 5
+        }
+
     def _execute_handler_async(self, p: BaseProcessor, job_id: str,
                                data_dict: dict) -> Tuple[str, None, JobStatus]:
         """
-        This private execution handler executes a process in a background
-        thread using `multiprocessing.dummy`
-
-        https://docs.python.org/3/library/multiprocessing.html#module-multiprocessing.dummy  # noqa
+        This private execution handler queues a job for execution by
+        the executor of the manager
 
         :param p: `pygeoapi.process` object
         :param job_id: job identifier
         :param data_dict: `dict` of data parameters
 
+        :raises: `ExecutorQueueFullError` if the job queue is full
         :returns: tuple of None (i.e. initial response payload)
                   and JobStatus.accepted (i.e. initial job status)
         """
-        _process = dummy.Process(
-            target=self._execute_handler_sync,
-            args=(p, job_id, data_dict)
-        )
-        _process.start()
+
+        # the job is listed (as accepted) while queued
+        self.add_job(self._get_job_metadata(p, job_id))
+
+        try:
+            self.executor.submit(self, p, job_id, data_dict)
+        except Exception:
+            self.delete_job(job_id)
+            raise
+
         return 'application/json', None, JobStatus.accepted
 
     def _execute_handler_sync(self, p: BaseProcessor, job_id: str,
@@ -161,6 +279,22 @@ class BaseManager:
         """
         Synchronous execution handler
 
+        :param p: `pygeoapi.process` object
+        :param job_id: job identifier
+        :param data_dict: `dict` of data parameters
+
+        :returns: tuple of MIME type, response payload and status
+        """
+
+        self.add_job(self._get_job_metadata(p, job_id))
+
+        return self._execute_job(p, job_id, data_dict)
+
+    def _execute_job(self, p: BaseProcessor, job_id: str,
+                     data_dict: dict) -> Tuple[str, Any, JobStatus]:
+        """
+        Executes an added job
+
         If the manager has defined `output_dir`, then the result
         will be written to disk
         output store. There is no clean-up of old process outputs.
@@ -173,35 +307,29 @@ class BaseManager:
         """
 
         process_id = p.metadata['id']
-        current_status = JobStatus.accepted
+        current_status = JobStatus.running
 
         LOGGER.debug('Executing process {}'.format(process_id))
-        LOGGER.debug('Job ID: {}'.format(job_id))   
+        LOGGER.debug('Job ID: {}'.format(job_id))
         LOGGER.debug('------------------------------------------')
 
-        job_metadata = {
-            'identifier': job_id,
-            'process_id': process_id,
+        self.update_job(job_id, {
             'job_start_datetime': datetime.utcnow().strftime(
                 DATETIME_FORMAT),
-            'job_end_datetime': None,
             'status': current_status.value,
-            'location': None,
-            'mimetype': None,
-            'message': 'Job accepted and ready for execution',
-            'progress': 5
-        }
-
-        self.add_job(job_metadata)
+            'message': 'Job running',
+            'progress': 10
+        })
 
         try:
             if self.output_dir is not None:
                 filename = f"{p.metadata['id']}-{job_id}"
+                if self.compress_outputs:
+                    filename = f'{filename}.gz'
                 job_filename = self.output_dir / filename
             else:
                 job_filename = None
 
-            current_status = JobStatus.running
             jfmt, outputs = p.execute(data_dict)
 
             self.update_job(job_id, {
@@ -220,7 +348,7 @@ class BaseManager:
                     mode = 'wb'
                     data = outputs
                     encoding = None
-                with job_filename.open(mode=mode, encoding=encoding) as fh:
+                with open_output(job_filename, mode, encoding) as fh:
                     fh.write(data)
 
             current_status = JobStatus.successful
@@ -333,3 +461,120 @@ class BaseManager:
 
     def __repr__(self):
         return f'<BaseManager> {self.name}'
+
+
+def get_datetime_range(
+        datetime_: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    """
+    Get the bounds of a job start time filter, in the format of
+    job datetimes (which sort as strings)
+
+    :param datetime_: temporal (datestamp or extent), optional
+
+    :raises: `ValueError` if the datetime is invalid
+    :returns: tuple of start and end (`None` if open)
+    """
+
+    if not datetime_:
+        return None, None
+
+    if '/' in datetime_:
+        begin, end = datetime_.split('/')
+    else:
+        begin = end = datetime_
+
+    bounds = []
+    for value, is_end in ((begin, False), (end, True)):
+        if value in ('', '..'):
+            bounds.append(None)
+            continue
+        date_only = len(value) == 10
+        value = dateutil.parser.isoparse(value)
+        if date_only and is_end:
+            # a date ends with its last microsecond
+            value = value.replace(hour=23, minute=59, second=59,
+                                  microsecond=999999)
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        bounds.append(value.strftime(DATETIME_FORMAT))
+
+    return bounds[0], bounds[1]
+
+
+def open_output(path: Path, mode: str = 'rb',
+                encoding: Optional[str] = None) -> IO:
+    """
+    Open a job output file, gzip compressed if its suffix is `.gz`
+
+    :param path: `Path` of output file
+    :param mode: file mode
+    :param encoding: text encoding (text modes)
+
+    :returns: file object
+    """
+
+    if path.suffix == '.gz':
+        # text modes of gzip.open must be explicit
+        if 'b' not in mode and 't' not in mode:
+            mode = f'{mode}t'
+        return gzip.open(path, mode, compresslevel=6, encoding=encoding)
+
+    return path.open(mode, encoding=encoding)
+
+
+def read_output(path: Path, mimetype: Optional[str]) -> Any:
+    """
+    Read a job output file
+
+    :param path: `Path` of output file
+    :param mimetype: media type of output
+
+    :returns: `dict` of JSON output, else `bytes`
+    """
+
+    if mimetype not in (None, 'application/json'):
+        with open_output(path, 'rb') as fh:
+            return fh.read()
+
+    with open_output(path, 'r', 'utf-8') as fh:
+        return json.load(fh)
+
+
+def filter_jobs(jobs: list, status: list = None, process_id: list = None,
+                datetime_: str = None, limit: Optional[int] = None,
+                offset: int = 0) -> dict:
+    """
+    Filter, sort (most recent first) and page a list of jobs, as returned
+    by managers predating manager-side job queries
+
+    :param jobs: `list` of jobs
+    :param status: list of job statuses (default is all)
+    :param process_id: list of process identifiers (default is all)
+    :param datetime_: temporal (datestamp or extent) of job start
+    :param limit: number of jobs to return (default is all)
+    :param offset: starting job to return (default 0)
+
+    :returns: `dict` of `list` of jobs and number of matching jobs
+              (numberMatched)
+    """
+
+    statuses = [JobStatus(s).value for s in status or []]
+    start, end = get_datetime_range(datetime_)
+
+    def matches(job):
+        started = job.get('job_start_datetime') or ''
+        return all([
+            not statuses or job.get('status') in statuses,
+            not process_id or job.get('process_id') in process_id,
+            start is None or started >= start,
+            end is None or started <= end
+        ])
+
+    jobs = sorted(filter(matches, jobs), reverse=True,
+                  key=lambda job: job.get('job_start_datetime') or '')
+
+    stop = None if limit is None else offset + limit
+    return {
+        'jobs': jobs[offset:stop],
+        'numberMatched': len(jobs)
+    }
@@ -55,17 +55,26 @@ class DummyManager(BaseManager):
 
         super().__init__(manager_def)
 
-    def get_jobs(self, status: JobStatus = None) -> list:
+    def get_jobs(self, status: list = None, process_id: list = None,
+                 datetime_: str = None, sortby: list = [],
+                 limit: Optional[int] = None, offset: int = 0) -> dict:
         """
-        Get process jobs, optionally filtered by status
-
-        :param status: job status (accepted, running, successful,
-                       failed, results) (default is all)
-
-        :returns: `list` of jobs (identifier, status, process identifier)
+        Get process jobs, optionally filtered by status, process and
+        start time
+
+        :param status: list of job statuses (accepted, running,
+                       successful, failed, dismissed) (default is all)
+        :param process_id: list of process identifiers (default is all)
+        :param datetime_: temporal (datestamp or extent) of job start
+        :param sortby: list of dicts (property, order)
+        :param limit: number of jobs to return (default is all)
+        :param offset: starting job to return (default 0)
+
+        :returns: `dict` of `list` of jobs (identifier, status, process
+                  identifier) and number of matching jobs (numberMatched)
         """
 
-        return []
+        return {'jobs': [], 'numberMatched': 0}
 
     def execute_process(
             self,
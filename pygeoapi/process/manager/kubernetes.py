@@ -28,24 +28,28 @@
 # =================================================================
 
 from datetime import datetime
-import json
 import logging
-from pathlib import Path
-from typing import Any, Dict, Tuple, Optional
-import uuid
-from kubernetes import client, config, utils
-from .kubernetes_utils import *
-
-from pygeoapi.util import DATETIME_FORMAT,JobStatus 
+import tempfile
+import time
+from typing import Any, Tuple
+
+from pygeoapi.util import DATETIME_FORMAT, JobStatus
+from pygeoapi.process.base import BaseProcessor, ProcessorExecuteError
+from pygeoapi.process.manager.kubernetes_utils import (
+    DONE_PHASES, create_pod, delete_pod, get_api, get_exit_message,
+    get_stream, parse_progress, wait_for_pod, watch_pod)
+from pygeoapi.process.manager.base import open_output, read_output
 from pygeoapi.process.manager.tinydb_ import TinyDBManager
-from pygeoapi.process.base import BaseProcessor
 
 LOGGER = logging.getLogger(__name__)
 
+#: label of the pods of jobs, whose value is the job identifier
+JOB_LABEL = 'pygeoapi-job'
+
 
 class KubernetesManager(TinyDBManager):
     """
-    KubernetesManager
+    KubernetesManager, running the command of each job in a pod
     """
 
     def __init__(self, manager_def: dict):
@@ -58,17 +62,55 @@ class KubernetesManager(TinyDBManager):
         """
 
         super().__init__(manager_def)
-        config.load_kube_config()
-    
 
-    def _execute_handler_sync(self, percent: BaseProcessor, job_id: str,
-                              data_dict: dict) -> Tuple[str, Any, JobStatus]:
+        self.host = manager_def.get('host')
+        self.namespace = manager_def.get('namespace', 'default')
+        self.progress_interval = manager_def.get('progress_interval', 1)
+        self.pod_timeout = manager_def.get('pod_timeout')
+        self.delete_pods = manager_def.get('delete_pods', True)
+        self._api = None
+
+    @property
+    def api(self):
         """
-        Synchronous execution handler
+        Client of the Kubernetes API (built on first use)
+
+        :returns: `kubernetes.client.CoreV1Api`
+        """
+
+        if self._api is None:
+            self._api = get_api(self.host)
+        return self._api
+
+    def cancel_job(self, job_id: str) -> bool:
+        """
+        Cancels the execution of a queued or running job, deleting
+        its pod
+
+        :param job_id: job identifier
+
+        :returns: `bool` of whether the job was cancelled
+        """
+
+        cancelled = super().cancel_job(job_id)
 
-        If the manager has defined `output_dir`, then the result
-        will be written to disk
-        output store. There is no clean-up of old process outputs.
+        pods = self.api.list_namespaced_pod(
+            self.namespace, label_selector=f'{JOB_LABEL}={job_id}')
+        for pod in pods.items:
+            cancelled = delete_pod(pod, self.api) or cancelled
+
+        return cancelled
+
+    def _execute_job(self, p: BaseProcessor, job_id: str,
+                     data_dict: dict) -> Tuple[str, Any, JobStatus]:
+        """
+        Executes an added job in a pod
+
+        The pod is followed through its events, its log is the result
+        of the job (written to `output_dir`, if defined) and progress
+        percentages found in the log update the job at most every
+        `progress_interval` seconds. Done pods are deleted, unless
+        `delete_pods` is false.
 
         :param p: `pygeoapi.process` object
         :param job_id: job identifier
@@ -77,136 +119,122 @@ class KubernetesManager(TinyDBManager):
         :returns: tuple of MIME type, response payload and status
         """
 
-        process_id = percent.metadata['id']
-        current_status = JobStatus.accepted
+        current_status = JobStatus.running
 
-        job_metadata = {
-            'identifier': job_id,
-            'process_id': process_id,
+        self.update_job(job_id, {
             'job_start_datetime': datetime.utcnow().strftime(
                 DATETIME_FORMAT),
-            'job_end_datetime': None,
             'status': current_status.value,
-            'location': None,
-            'mimetype': None,
-            'message': 'Job accepted and ready for execution',
-            'progress': 5
-        }
-
-        self.add_job(job_metadata)
+            'message': 'Job running',
+            'progress': 10
+        })
 
+        pod = None
         try:
             if self.output_dir is not None:
-                filename = f"{percent.metadata['id']}-{job_id}"
+                filename = f"{p.metadata['id']}-{job_id}"
+                if self.compress_outputs:
+                    filename = f'{filename}.gz'
                 job_filename = self.output_dir / filename
+                fh = open_output(job_filename, 'wb')
             else:
                 job_filename = None
+                fh = tempfile.TemporaryFile()
 
-            current_status = JobStatus.running
-
-            # TODO: run the pod instead  
-            #jfmt, outputs = p.execute(data_dict)
-            
-            jfmt = "application/json"
-            command = data_dict['command']
-            stream = create_pod(command)
-            
-            res = ""
-            
-            for line in stream:
-                line = line.decode("utf-8")
-                percent = parse_progress(line)
-                # get the progress percentage from table of jobs
-                job = self.get_job(job_id)
-
-                if  0 <= percent <= 100 and percent > job['progress']:
-                    self.update_job(job_id, {
-                        'status': current_status.value,
-                        'message': 'Job running',
-                        'progress': percent
-                    })
-                res += line
-
-            #application/json, { 'id': 'gdal-20230613125916', 'status': 'Completed', 'message': 'GDAL 3.7.0dev-f26e795279c48852b44bc9659d728421544528b9, released 2023/01/27\n'}
-            outputs = {
-                "id": "podname",
-                "status": "Completed",
-                "message": res
-            }
-            print(data_dict)
-            print(jfmt, outputs)
-            print("========================================")
-
-            # 1) create a pod
-            # 2) wait for the pod Running
-            # 3) get the pod logs and parse the output to eventually update the job status
-            # 4) delete the pod
+            with fh:
+                pod = create_pod(data_dict['command'], self.api,
+                                 self.namespace, {JOB_LABEL: job_id})
+                if pod is None:
+                    raise ProcessorExecuteError(
+                        f"Cannot find {data_dict['command']} in catalog")
 
-            # --- end of process execution ---
+                pod = wait_for_pod(pod, self.api, self.pod_timeout)
+                self._follow_log(job_id, pod, fh)
+                pod = watch_pod(pod, DONE_PHASES, self.api, self.pod_timeout)
 
-            self.update_job(job_id, {
-                'status': current_status.value,
-                'message': 'Writing job output',
-                'progress': 95
-            })
+                if pod.status.phase == 'Failed':
+                    raise ProcessorExecuteError(get_exit_message(pod))
 
-            if self.output_dir is not None:
-                LOGGER.debug(f'writing output to {job_filename}')
-                if isinstance(outputs, dict):
-                    mode = 'w'
-                    data = json.dumps(outputs, sort_keys=True, indent=4)
-                    encoding = 'utf-8'
-                elif isinstance(outputs, bytes):
-                    mode = 'wb'
-                    data = outputs
-                    encoding = None
-                with job_filename.open(mode=mode, encoding=encoding) as fh:
-                    fh.write(data)
+                if job_filename is None:
+                    fh.seek(0)
+                    outputs = fh.read()
 
+            jfmt = 'text/plain'
+            if job_filename is not None:
+                outputs = read_output(job_filename, jfmt)
             current_status = JobStatus.successful
 
-            job_update_metadata = {
+            self.update_job(job_id, {
                 'job_end_datetime': datetime.utcnow().strftime(
                     DATETIME_FORMAT),
                 'status': current_status.value,
-                'location': str(job_filename),
+                'location': job_filename and str(job_filename),
                 'mimetype': jfmt,
                 'message': 'Job complete',
                 'progress': 100
-            }
-
-            self.update_job(job_id, job_update_metadata)
+            })
 
         except Exception as err:
-            # TODO assess correct exception type and description to help users
-            # NOTE, the /results endpoint should return the error HTTP status
-            # for jobs that failed, ths specification says that failing jobs
-            # must still be able to be retrieved with their error message
-            # intact, and the correct HTTP error status at the /results
-            # endpoint, even if the /result endpoint correctly returns the
-            # failure information (i.e. what one might assume is a 200
-            # response).
-
             current_status = JobStatus.failed
             code = 'InvalidParameterValue'
             outputs = {
                 'code': code,
-                'description': 'Error updating job'
+                'description': str(err) or 'Error updating job'
             }
             LOGGER.error(err)
-            job_metadata = {
+
+            jfmt = 'application/json'
+
+            self.update_job(job_id, {
                 'job_end_datetime': datetime.utcnow().strftime(
                     DATETIME_FORMAT),
                 'status': current_status.value,
                 'location': None,
                 'mimetype': None,
                 'message': f'{code}: {outputs["description"]}'
-            }
-
-            jfmt = 'application/json'
+            })
 
-            self.update_job(job_id, job_metadata)
+        finally:
+            if pod is not None and self.delete_pods:
+                delete_pod(pod, self.api)
 
         return jfmt, outputs, current_status
 
-    
\ No newline at end of file
+    def _follow_log(self, job_id: str, pod, fh) -> None:
+        """
+        Writes the log of a pod, updating the progress of its job
+
+        :param job_id: job identifier
+        :param pod: started pod
+        :param fh: file object of the job result
+        """
+
+        progress = reported = 10
+        reported_at = time.monotonic()
+
+        for line in get_stream(pod, self.api):
+            fh.write(line)
+
+            percent = parse_progress(line.decode('utf-8', 'replace'))
+            if progress < percent <= 100:
+                progress = int(percent)
+
+            # progress lines are coalesced: the job is updated with the
+            # last progress at most every progress_interval seconds
+            now = time.monotonic()
+            if (progress > reported and
+                    now - reported_at >= self.progress_interval):
+                self.update_job(job_id, {'progress': progress})
+                reported, reported_at = progress, now
+
+        if progress > reported:
+            self.update_job(job_id, {'progress': progress})
+
+    def __getstate__(self):
+        # the API client holds connection pools
+        state = super().__getstate__()
+        state['_api'] = None
+        return state
+
+    def __repr__(self):
+        return f'<KubernetesManager> {self.name}'
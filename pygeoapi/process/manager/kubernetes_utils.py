@@ -1,13 +1,30 @@
+import copy
+from datetime import datetime
+import logging
 import re
-import time
-from kubernetes import client, config
 import shlex
-import logging
-from datetime import datetime
+import time
+from typing import Iterator, Optional
+
+from kubernetes import client, config, watch
+
 from .model_catalog_mockup import model_catalog
 
 LOGGER = logging.getLogger(__name__)
-logging.basicConfig(level=logging.ERROR)
+
+#: phases of a pod which has started (or is done)
+STARTED_PHASES = ('Running', 'Succeeded', 'Failed')
+
+#: phases of a pod which is done
+DONE_PHASES = ('Succeeded', 'Failed')
+
+#: bytes read at once from the log stream of a pod
+LOG_CHUNK_SIZE = 65536
+
+
+class PodError(Exception):
+    """pod did not run to completion"""
+    pass
 
 
 def get_command(command):
@@ -23,10 +40,10 @@ def parse_progress(line):
     parse_progress - parse a log line in search for a progress percentage
     """
     if line:
-        # match percentage in the line 
+        # match percentage in the line
         # regexp with named group 'percentage'
-        m = re.match(r".*?(?P<percent>\d+(\.\d*)?)\s*%.*?", line)
-        percent = m.group("percent") if m else -1
+        m = re.match(r'.*?(?P<percent>\d+(\.\d*)?)\s*%.*?', line)
+        percent = m.group('percent') if m else -1
         return float(percent)
     return -1
 
@@ -37,168 +54,242 @@ def manifest_from_catalog(command):
     """
     pod_manifest = None
     if command in model_catalog:
-        pod_manifest = model_catalog[command]
+        # the catalog entry is a template, shared by all pods
+        pod_manifest = copy.deepcopy(model_catalog[command])
         # patch the name
-        name = pod_manifest["metadata"]["name"]
-        pod_name = datetime.now().strftime(f"{name}-%Y%m%d%H%M%S")
-        pod_manifest["metadata"]["name"] = pod_name
+        name = pod_manifest['metadata']['name']
+        pod_name = datetime.now().strftime(f'{name}-%Y%m%d%H%M%S%f')
+        pod_manifest['metadata']['name'] = pod_name
     return pod_manifest
 
 
-def create_pod(command):
+def get_api(host: Optional[str] = None) -> client.CoreV1Api:
+    """
+    Get a client of the Kubernetes API
+
+    :param host: URL of the API server (e.g. of `kubectl proxy`), default
+                 is the cluster of the kube config (or of the pod)
+
+    :returns: `kubernetes.client.CoreV1Api`
     """
-    create_pod
+
+    if host is not None:
+        configuration = client.Configuration()
+        configuration.host = host
+        return client.CoreV1Api(client.ApiClient(configuration))
+
+    try:
+        config.load_kube_config()
+    except config.ConfigException:
+        config.load_incluster_config()
+
+    return client.CoreV1Api()
+
+
+def _get_phase(pod) -> Optional[str]:
+    return pod.status.phase if pod.status else None
+
+
+def create_pod(command, api=None, namespace='default', labels={}):
+    """
+    create_pod - create the pod of a command of the model catalog
+
+    :param command: command line
+    :param api: `kubernetes.client.CoreV1Api` (default from kube config)
+    :param namespace: namespace of the pod
+    :param labels: `dict` of additional pod labels
+
+    :returns: created pod, or `None` if the command is not in the catalog
     """
     args = shlex.split(command)
     command = args[0]
     args = args[1:]
 
     pod_manifest = manifest_from_catalog(command)
-    if pod_manifest:
-        config.load_kube_config()
-        #pod_name = pod_manifest["metadata"]["name"]
-        # patch the command and args
-        pod_manifest["spec"]["containers"][0]["command"] = [command,]
-        pod_manifest["spec"]["containers"][0]["args"] = args
+    if pod_manifest is None:
+        return None
 
-        api_instance = client.CoreV1Api()
+    # patch the command and args
+    pod_manifest['spec']['containers'][0]['command'] = [command]
+    pod_manifest['spec']['containers'][0]['args'] = args
+    pod_manifest['metadata'].setdefault('labels', {}).update(labels)
 
-        #LOGGER.debug(f"Creating pod {pod_name}...")
-        try:
-            ns = "default"
-            pod_name = pod_manifest["metadata"]["name"]
-            # Try creating the pod
-            pod = api_instance.create_namespaced_pod(
-                body=pod_manifest, namespace=ns)
-            LOGGER.debug(f"Pod '{pod_name}' created.")
-
-            while pod.status.phase == "Pending":
-                LOGGER.debug(f"{pod.status.phase}...")
-                pod = api_instance.read_namespaced_pod(
-                    name=pod_name, namespace=ns)
-                time.sleep(0.5)
-            
-            logs = api_instance.read_namespaced_pod_log(
-                name=pod_name, namespace=ns, follow=True, _preload_content=False)
-            return logs.stream()
-            
-        except client.rest.ApiException as ex:
-            LOGGER.error(f"Unknown error:{ex}")
-    
-    return None
+    api = api or get_api()
+    pod = api.create_namespaced_pod(body=pod_manifest, namespace=namespace)
+    LOGGER.debug(f'Pod {pod.metadata.name} created')
 
+    return pod
 
-def wait_for_pod(pod):
+
+def watch_pod(pod, phases, api=None, timeout=None):
     """
-    wait_for_pod - wait for the pod to be running
+    watch_pod - wait for the pod to reach one of phases, following the
+    events of the pod instead of polling it
+
+    :param pod: pod
+    :param phases: pod phases to wait for
+    :param api: `kubernetes.client.CoreV1Api` (default from kube config)
+    :param timeout: seconds to wait at most (default is no limit)
+
+    :raises: `PodError` if the pod is deleted or the timeout expires
+    :returns: pod in one of phases
     """
-    if pod and pod.metadata:
+
+    api = api or get_api()
+    name = pod.metadata.name
+    namespace = pod.metadata.namespace
+    resource_version = pod.metadata.resource_version
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    while _get_phase(pod) not in phases:
+        kwargs = {
+            'field_selector': f'metadata.name={name}',
+            'resource_version': resource_version
+        }
+        if deadline is not None:
+            remaining = int(deadline - time.monotonic())
+            if remaining <= 0:
+                raise PodError(f'Timeout waiting for pod {name}')
+            kwargs['timeout_seconds'] = remaining
+
+        w = watch.Watch()
         try:
-            api_instance = client.CoreV1Api()
-            pod_name = pod.metadata.name
-            namespace = pod.metadata.namespace
-            # wait for the pod to be running
-            while pod.status.phase == "Pending":
-                #LOGGER.debug(f"{pod.status.phase}...")
-                pod = api_instance.read_namespaced_pod(
-                    name=pod_name, namespace=namespace)
-                time.sleep(0.5)
-        except client.rest.ApiException as ex:
-            LOGGER.error(f"Unknown error:{ex}")
+            for event in w.stream(api.list_namespaced_pod, namespace,
+                                  **kwargs):
+                if event['type'] == 'DELETED':
+                    raise PodError(f'Pod {name} was deleted')
+                pod = event['object']
+                resource_version = pod.metadata.resource_version
+                LOGGER.debug(f'Pod {name}: {_get_phase(pod)}')
+                if _get_phase(pod) in phases:
+                    break
+        except client.rest.ApiException as err:
+            if err.status != 410:
+                raise
+            # the events since resource_version are gone: start over
+            # from the current state of the pod
+            pod = api.read_namespaced_pod(name=name, namespace=namespace)
+            resource_version = pod.metadata.resource_version
+        finally:
+            w.stop()
+
+    return pod
 
 
-def get_stream(pod):
+def wait_for_pod(pod, api=None, timeout=None):
     """
-    get_stream
+    wait_for_pod - wait for the pod to be running (or done)
     """
-    wait_for_pod(pod)
-    if pod and pod.metadata:
-        try:
-            api_instance = client.CoreV1Api()
-            pod_name = pod.metadata.name
-            namespace = pod.metadata.namespace
-            # get the pod logs
-            logs = api_instance.read_namespaced_pod_log(
-                name=pod_name, namespace=namespace, follow=True, _preload_content=False)
-            return logs.stream()
-        except client.rest.ApiException as ex:
-            LOGGER.error(f"Unknown error:{ex}")
-    return None
+    return watch_pod(pod, STARTED_PHASES, api, timeout)
 
 
-def read_log(pod, close=False):
+def get_stream(pod, api=None) -> Iterator[bytes]:
     """
-    read_log
+    get_stream - follow the log of a started pod
+
+    :param pod: pod
+    :param api: `kubernetes.client.CoreV1Api` (default from kube config)
+
+    :returns: iterator of log lines (`bytes`)
     """
-    res = ""
-    if pod and pod.metadata:
-        try:
-            api_instance = client.CoreV1Api()
-            pod_name = pod.metadata.name
-            namespace = pod.metadata.namespace
-            # wait for the pod to be running
-            while pod.status.phase == "Pending":
-                #LOGGER.debug(f"{pod.status.phase}...")
-                pod = api_instance.read_namespaced_pod(
-                    name=pod_name, namespace=namespace)
-                time.sleep(0.5)
-            # get the pod logs
-            logs = api_instance.read_namespaced_pod_log(
-                name=pod_name, namespace=namespace, follow=True, _preload_content=False)
-            for line in logs.stream():
-                line = line.decode('utf-8')
-                p = parse_progress(line)
-                if p>=0:
-                    # update the progress
-                    pass
-                res+=line 
-
-            if close:
-                api_instance.delete_namespaced_pod(
-                    name=pod_name, namespace=namespace, body=client.V1DeleteOptions())
-                #LOGGER.debug(f"Pod '{pod_name}' deleted.")
+    api = api or get_api()
+    response = api.read_namespaced_pod_log(
+        name=pod.metadata.name, namespace=pod.metadata.namespace,
+        follow=True, _preload_content=False)
 
-        except client.rest.ApiException as ex:
-            LOGGER.error(f"Exception when retrieving Pod logs: {ex}")
+    try:
+        # chunks are cut anywhere: lines are split again
+        pending = b''
+        for chunk in response.stream(LOG_CHUNK_SIZE):
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                yield line + b'\n'
+        if pending:
+            yield pending
+    finally:
+        response.release_conn()
+
+
+def get_exit_message(pod) -> str:
+    """
+    get_exit_message - describe how the containers of a done pod exited
+    """
+    messages = []
+    for status in (pod.status.container_statuses or []):
+        terminated = status.state.terminated if status.state else None
+        if terminated is not None:
+            messages.append(f'{status.name} exited with code '
+                            f'{terminated.exit_code} ({terminated.reason})')
+    return ', '.join(messages) or f'Pod {_get_phase(pod)}'
+
+
+def read_log(pod, api=None, close=False):
+    """
+    read_log - wait for the pod to start and read its whole log
+    """
+    api = api or get_api()
+    pod = wait_for_pod(pod, api)
+    res = b''.join(get_stream(pod, api)).decode('utf-8', 'replace')
+    if close:
+        delete_pod(pod, api)
     return res
 
 
-def delete_pod(pod):
+def delete_pod(pod, api=None):
     """
     delete_pod
     """
     res = False
     if pod and pod.metadata:
-        pod_name = pod.metadata.name
-        namespace = pod.metadata.namespace
-        api_instance = client.CoreV1Api()
+        api = api or get_api()
         try:
-            api_instance.delete_namespaced_pod(
-                name=pod_name, namespace=namespace, body=client.V1DeleteOptions())
-            #LOGGER.debug(f"Pod '{pod_name}' deleted.")
+            api.delete_namespaced_pod(
+                name=pod.metadata.name, namespace=pod.metadata.namespace,
+                body=client.V1DeleteOptions())
+            LOGGER.debug(f'Pod {pod.metadata.name} deleted')
             res = True
         except client.rest.ApiException as ex:
-            LOGGER.error(f"Exception when deleting Pod: {ex}")
+            LOGGER.error(f'Exception when deleting Pod: {ex}')
 
     return res
 
 
-def k8s_execute(command):
+def k8s_execute(command, api=None, namespace='default'):
     """
-    k8s_execute
+    k8s_execute - run a command of the model catalog in a pod
     """
-    pod = create_pod(command)
-    if pod:
-        outputs = read_log(pod, True)
+    api = api or get_api()
+    pod = create_pod(command, api, namespace)
+    if pod is None:
+        command_name = get_command(command)
         return {
-            "id": pod.metadata.name,
-            "status": "Completed",
-            "message": outputs
+            'id': command_name,
+            'status': 'Failed',
+            'message': f'Cannot find {command_name} in model catalog.'
         }
-    
-    command_name = get_command(command)
+
+    try:
+        outputs = read_log(pod, api)
+        pod = watch_pod(pod, DONE_PHASES, api)
+    except (PodError, client.rest.ApiException) as err:
+        delete_pod(pod, api)
+        return {
+            'id': pod.metadata.name,
+            'status': 'Failed',
+            'message': str(err)
+        }
+
+    delete_pod(pod, api)
+    if _get_phase(pod) == 'Failed':
+        return {
+            'id': pod.metadata.name,
+            'status': 'Failed',
+            'message': f'{get_exit_message(pod)}\n{outputs}'
+        }
+
     return {
-        "id": command_name,
-        "status": "Failed",
-        "message": f"Cannot find {command_name} in model catalog."
-    }
\ No newline at end of file
+        'id': pod.metadata.name,
+        'status': 'Completed',
+        'message': outputs
+    }
@@ -26,13 +26,15 @@
 # OTHER DEALINGS IN THE SOFTWARE.
 #
 # =================================================================
-import json
 import logging
+from pathlib import Path
 import traceback
 
-from pymongo import MongoClient
+from pymongo import ASCENDING, DESCENDING, MongoClient
 
-from pygeoapi.process.manager.base import BaseManager
+from pygeoapi.process.manager.base import (
+    BaseManager, get_datetime_range, read_output)
+from pygeoapi.util import JobStatus
 
 LOGGER = logging.getLogger(__name__)
 
@@ -41,6 +43,22 @@ class MongoDBManager(BaseManager):
     def __init__(self, manager_def):
         super().__init__(manager_def)
         self.is_async = True
+        self._create_indexes()
+
+    def _create_indexes(self):
+        # indexes of job lookups and of the filters/sorts of /jobs
+        try:
+            self._connect()
+            collection = self.db.job_manager_pygeoapi.jobs
+            collection.create_index("identifier", unique=True)
+            collection.create_index([("job_start_datetime", DESCENDING)])
+            for field in ("status", "process_id"):
+                collection.create_index(
+                    [(field, ASCENDING), ("job_start_datetime", DESCENDING)])
+            LOGGER.info("JOBMANAGER - MongoDB indexes created")
+        except Exception:
+            LOGGER.error("JOBMANAGER - create indexes error",
+                         exc_info=(traceback))
 
     def _connect(self):
         try:
@@ -65,21 +83,42 @@ class MongoDBManager(BaseManager):
                          exc_info=(traceback))
             return False
 
-    def get_jobs(self, status=None):
+    def get_jobs(self, status=None, process_id=None, datetime_=None,
+                 sortby=[], limit=None, offset=0):
         try:
             self._connect()
             database = self.db.job_manager_pygeoapi
             collection = database.jobs
-            if status is not None:
-                jobs = list(collection.find({}, {"status": status}))
-            else:
-                jobs = list(collection.find({}))
+            filter_ = {}
+            if status:
+                filter_["status"] = {
+                    "$in": [JobStatus(s).value for s in status]}
+            if process_id:
+                filter_["process_id"] = {"$in": process_id}
+            start, end = get_datetime_range(datetime_)
+            if start is not None:
+                filter_.setdefault("job_start_datetime", {})["$gte"] = start
+            if end is not None:
+                filter_.setdefault("job_start_datetime", {})["$lte"] = end
+            cursor = collection.find(filter_, {"_id": False})
+            if sortby:
+                cursor = cursor.sort([
+                    (sort["property"],
+                     DESCENDING if sort["order"] == "-" else ASCENDING)
+                    for sort in sortby])
+            cursor = cursor.skip(offset)
+            if limit is not None:
+                cursor = cursor.limit(limit)
+            jobs = list(cursor)
             LOGGER.info("JOBMANAGER - MongoDB jobs queried")
-            return jobs
+            return {
+                "jobs": jobs,
+                "numberMatched": collection.count_documents(filter_)
+            }
         except Exception:
             LOGGER.error("JOBMANAGER - get_jobs error",
                          exc_info=(traceback))
-            return False
+            return {"jobs": [], "numberMatched": 0}
 
     def add_job(self, job_metadata):
         try:
@@ -143,8 +182,7 @@ class MongoDBManager(BaseManager):
             if entry["status"] != "successful":
                 LOGGER.info("JOBMANAGER - job not finished or failed")
                 return (None,)
-            with open(entry["location"], "r") as file:
-                data = json.load(file)
+            data = read_output(Path(entry["location"]), entry["mimetype"])
             LOGGER.info("JOBMANAGER - MongoDB job result queried")
             return entry["mimetype"], data
         except Exception:
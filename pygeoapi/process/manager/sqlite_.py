@@ -0,0 +1,330 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import json
+import logging
+from pathlib import Path
+import sqlite3
+import threading
+from typing import Any, Optional, Tuple
+
+from pygeoapi.process.manager.base import (
+    BaseManager, get_datetime_range, read_output)
+from pygeoapi.util import JobStatus
+
+LOGGER = logging.getLogger(__name__)
+
+#: job properties, stored as columns
+FIELDS = ['identifier', 'process_id', 'status', 'message', 'progress',
+          'job_start_datetime', 'job_end_datetime', 'location', 'mimetype',
+          'parameters']
+
+SCHEMA = [
+    ('CREATE TABLE IF NOT EXISTS jobs (identifier TEXT PRIMARY KEY, '
+     'process_id TEXT NOT NULL, status TEXT NOT NULL, message TEXT, '
+     'progress INTEGER, job_start_datetime TEXT, job_end_datetime TEXT, '
+     'location TEXT, mimetype TEXT, parameters TEXT)'),
+    ('CREATE INDEX IF NOT EXISTS jobs_status '
+     'ON jobs (status, job_start_datetime)'),
+    ('CREATE INDEX IF NOT EXISTS jobs_process_id '
+     'ON jobs (process_id, job_start_datetime)'),
+    ('CREATE INDEX IF NOT EXISTS jobs_job_start_datetime '
+     'ON jobs (job_start_datetime)')
+]
+
+
+class SQLiteManager(BaseManager):
+    """SQLite Manager"""
+
+    def __init__(self, manager_def: dict):
+        """
+        Initialize object
+
+        :param manager_def: manager definition
+
+        :returns: `pygeoapi.process.manager.base.BaseManager`
+        """
+
+        super().__init__(manager_def)
+        self.is_async = True
+
+        # connections are not shared between threads
+        self._local = threading.local()
+
+        conn = self._connect()
+        with conn:
+            for statement in SCHEMA:
+                conn.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Get the connection of the current thread to the database
+
+        :returns: `sqlite3.Connection`
+        """
+
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # WAL lets readers proceed while a job writes its progress
+            conn = sqlite3.connect(self.connection, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+
+        return conn
+
+    def get_jobs(self, status: list = None, process_id: list = None,
+                 datetime_: str = None, sortby: list = [],
+                 limit: Optional[int] = None, offset: int = 0) -> dict:
+        """
+        Get jobs
+
+        :param status: list of job statuses (accepted, running,
+                       successful, failed, dismissed) (default is all)
+        :param process_id: list of process identifiers (default is all)
+        :param datetime_: temporal (datestamp or extent) of job start
+        :param sortby: list of dicts (property, order)
+        :param limit: number of jobs to return (default is all)
+        :param offset: starting job to return (default 0)
+
+        :returns: `dict` of `list` of jobs (identifier, status, process
+                  identifier) and number of matching jobs (numberMatched)
+        """
+
+        where, params = [], []
+        if status:
+            where.append(f"status IN ({', '.join('?' * len(status))})")
+            params.extend(JobStatus(s).value for s in status)
+        if process_id:
+            where.append(
+                f"process_id IN ({', '.join('?' * len(process_id))})")
+            params.extend(process_id)
+
+        start, end = get_datetime_range(datetime_)
+        if start is not None:
+            where.append('job_start_datetime >= ?')
+            params.append(start)
+        if end is not None:
+            where.append('job_start_datetime <= ?')
+            params.append(end)
+
+        where = f" WHERE {' AND '.join(where)}" if where else ''
+
+        order_by = []
+        for sort in sortby:
+            if sort['property'] not in FIELDS:
+                LOGGER.warning(f"Cannot sort by {sort['property']}")
+                continue
+            order = 'DESC' if sort['order'] == '-' else 'ASC'
+            order_by.append(f"{sort['property']} {order}")
+        order_by = f" ORDER BY {', '.join(order_by)}" if order_by else ''
+
+        conn = self._connect()
+
+        sql = f'SELECT * FROM jobs{where}{order_by}'
+        if limit is not None or offset:
+            sql += ' LIMIT ? OFFSET ?'
+            page = [-1 if limit is None else limit, offset]
+        else:
+            page = []
+
+        LOGGER.debug(f'SQL: {sql}')
+        jobs = [self._row2job(row) for row in conn.execute(sql, params + page)]
+
+        if (jobs or not offset) and (limit is None or len(jobs) < limit):
+            # the last page: no need to count
+            matched = offset + len(jobs)
+        else:
+            matched, = conn.execute(
+                f'SELECT COUNT(*) FROM jobs{where}', params).fetchone()
+
+        return {
+            'jobs': jobs,
+            'numberMatched': matched
+        }
+
+    def add_job(self, job_metadata: dict) -> str:
+        """
+        Add a job
+
+        :param job_metadata: `dict` of job metadata
+
+        :returns: identifier of added job
+        """
+
+        values = self._get_values(job_metadata)
+
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                f"INSERT INTO jobs ({', '.join(values)}) "
+                f"VALUES ({', '.join('?' * len(values))})",
+                list(values.values()))
+
+        return job_metadata['identifier']
+
+    def update_job(self, job_id: str, update_dict: dict) -> bool:
+        """
+        Updates a job
+
+        :param job_id: job identifier
+        :param update_dict: `dict` of property updates
+
+        :returns: `bool` of status result
+        """
+
+        values = self._get_values(update_dict)
+        if not values:
+            return False
+
+        # a single row is written (i.e. progress updates)
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute(
+                f"UPDATE jobs SET {', '.join(f'{k} = ?' for k in values)} "
+                'WHERE identifier = ?', [*values.values(), job_id])
+
+        return cursor.rowcount > 0
+
+    def delete_job(self, job_id: str) -> bool:
+        """
+        Deletes a job
+
+        :param job_id: job identifier
+
+        :return `bool` of status result
+        """
+
+        # delete result file if present
+        job_result = self.get_job(job_id)
+        if job_result:
+            location = job_result.get('location')
+            if location and self.output_dir is not None:
+                Path(location).unlink(missing_ok=True)
+
+        conn = self._connect()
+        with conn:
+            cursor = conn.execute('DELETE FROM jobs WHERE identifier = ?',
+                                  (job_id,))
+
+        return cursor.rowcount > 0
+
+    def get_job(self, job_id: str) -> Optional[dict]:
+        """
+        Get a single job
+
+        :param job_id: job identifier
+
+        :returns: `dict`  # `pygeoapi.process.manager.Job`
+        """
+
+        row = self._connect().execute(
+            'SELECT * FROM jobs WHERE identifier = ?', (job_id,)).fetchone()
+
+        return None if row is None else self._row2job(row)
+
+    def get_job_result(self, job_id: str) -> Tuple[str, Any]:
+        """
+        Get a job's status, and actual output of executing the process
+
+        :param job_id: job identifier
+
+        :returns: `tuple` of mimetype and raw output
+        """
+
+        job_result = self.get_job(job_id)
+        if not job_result:
+            # job does not exist
+            return None
+
+        location = job_result.get('location')
+        mimetype = job_result.get('mimetype')
+        job_status = JobStatus[job_result['status']]
+
+        if not job_status == JobStatus.successful:
+            # Job is incomplete
+            return (None,)
+        if not location:
+            # Job data was not written for some reason
+            return (None,)
+        else:
+            location = Path(location)
+
+        return mimetype, read_output(location, mimetype)
+
+    @staticmethod
+    def _get_values(job_metadata: dict) -> dict:
+        """
+        Get the column values of job properties
+
+        :param job_metadata: `dict` of job properties
+
+        :returns: `dict` of column values
+        """
+
+        values = {}
+        for key, value in job_metadata.items():
+            if key not in FIELDS:
+                LOGGER.warning(f'Ignoring unknown job property {key}')
+                continue
+            if key == 'parameters' and value is not None:
+                value = json.dumps(value)
+            values[key] = value
+
+        return values
+
+    @staticmethod
+    def _row2job(row: sqlite3.Row) -> dict:
+        """
+        Get a job from a row
+
+        :param row: `sqlite3.Row` of job
+
+        :returns: `dict` of job
+        """
+
+        job = dict(row)
+        if job['parameters'] is not None:
+            job['parameters'] = json.loads(job['parameters'])
+
+        return job
+
+    def __getstate__(self):
+        # connections are opened again in other processes
+        state = super().__getstate__()
+        state.pop('_local')
+        return state
+
+    def __setstate__(self, state):
+        super().__setstate__(state)
+        self._local = threading.local()
+
+    def __repr__(self):
+        return f'<SQLiteManager> {self.name}'
@@ -33,18 +33,25 @@ except ModuleNotFoundError:
     # When on Windows, fcntl does not exist and file locking is automatic
     fcntl = None
 
-import json
+import functools
 import logging
+import operator
 from pathlib import Path
-from typing import Any, Tuple
+import threading
+from typing import Any, Optional, Tuple
 
 import tinydb
 
-from pygeoapi.process.manager.base import BaseManager
+from pygeoapi.process.manager.base import (
+    BaseManager, get_datetime_range, read_output)
 from pygeoapi.util import JobStatus
 
 LOGGER = logging.getLogger(__name__)
 
+# file locks only exclude other processes: threads of this process (i.e.
+# jobs run by executor threads) are serialized by this lock
+_LOCK = threading.RLock()
+
 
 class TinyDBManager(BaseManager):
     """TinyDB Manager"""
@@ -70,8 +77,10 @@ class TinyDBManager(BaseManager):
 
         self.db = tinydb.TinyDB(self.connection)
 
-        if mode == 'w' and fcntl is not None:
-            fcntl.lockf(self.db.storage._handle, fcntl.LOCK_EX)
+        if fcntl is not None:
+            # readers wait for writers of other processes (i.e. jobs)
+            lock = fcntl.LOCK_EX if mode == 'w' else fcntl.LOCK_SH
+            fcntl.lockf(self.db.storage._handle, lock)
 
         return True
 
@@ -86,21 +95,57 @@ class TinyDBManager(BaseManager):
         self.db.close()
         return True
 
-    def get_jobs(self, status: JobStatus = None) -> list:
+    def get_jobs(self, status: list = None, process_id: list = None,
+                 datetime_: str = None, sortby: list = [],
+                 limit: Optional[int] = None, offset: int = 0) -> dict:
         """
         Get jobs
 
-        :param status: job status (accepted, running, successful,
-                       failed, results) (default is all)
+        :param status: list of job statuses (accepted, running,
+                       successful, failed, dismissed) (default is all)
+        :param process_id: list of process identifiers (default is all)
+        :param datetime_: temporal (datestamp or extent) of job start
+        :param sortby: list of dicts (property, order)
+        :param limit: number of jobs to return (default is all)
+        :param offset: starting job to return (default 0)
 
-        :returns: 'list` of jobs (identifier, status, process identifier)
+        :returns: `dict` of `list` of jobs (identifier, status, process
+                  identifier) and number of matching jobs (numberMatched)
         """
 
-        self._connect()
-        jobs_list = self.db.all()
-        self.db.close()
-
-        return jobs_list
+        query = tinydb.Query()
+        conditions = []
+        if status:
+            conditions.append(query.status.one_of(
+                [JobStatus(s).value for s in status]))
+        if process_id:
+            conditions.append(query.process_id.one_of(process_id))
+
+        start, end = get_datetime_range(datetime_)
+        if start is not None:
+            conditions.append(query.job_start_datetime >= start)
+        if end is not None:
+            conditions.append(query.job_start_datetime <= end)
+
+        with _LOCK:
+            self._connect()
+            if conditions:
+                jobs_list = self.db.search(
+                    functools.reduce(operator.and_, conditions))
+            else:
+                jobs_list = self.db.all()
+            self.db.close()
+
+        # stable sorts, from the last sort key to the first
+        for sort in reversed(sortby):
+            jobs_list.sort(key=functools.partial(_sort_key, sort['property']),
+                           reverse=sort['order'] == '-')
+
+        end = None if limit is None else offset + limit
+        return {
+            'jobs': jobs_list[offset:end],
+            'numberMatched': len(jobs_list)
+        }
 
     def add_job(self, job_metadata: dict) -> str:
         """
@@ -111,9 +156,10 @@ class TinyDBManager(BaseManager):
         :returns: identifier of added job
         """
 
-        self._connect(mode='w')
-        doc_id = self.db.insert(job_metadata)
-        self.db.close()
+        with _LOCK:
+            self._connect(mode='w')
+            doc_id = self.db.insert(job_metadata)
+            self.db.close()
 
         return doc_id  # noqa
 
@@ -127,9 +173,10 @@ class TinyDBManager(BaseManager):
         :returns: `bool` of status result
         """
 
-        self._connect(mode='w')
-        self.db.update(update_dict, tinydb.where('identifier') == job_id)
-        self.db.close()
+        with _LOCK:
+            self._connect(mode='w')
+            self.db.update(update_dict, tinydb.where('identifier') == job_id)
+            self.db.close()
 
         return True
 
@@ -148,9 +195,11 @@ class TinyDBManager(BaseManager):
             if location and self.output_dir is not None:
                 Path(location).unlink()
 
-        self._connect(mode='w')
-        removed = bool(self.db.remove(tinydb.where('identifier') == job_id))
-        self.db.close()
+        with _LOCK:
+            self._connect(mode='w')
+            removed = bool(
+                self.db.remove(tinydb.where('identifier') == job_id))
+            self.db.close()
 
         return removed
 
@@ -163,12 +212,13 @@ class TinyDBManager(BaseManager):
         :returns: `dict`  # `pygeoapi.process.manager.Job`
         """
 
-        self._connect()
-        query = tinydb.Query()
-        result = self.db.search(query.identifier == job_id)
+        with _LOCK:
+            self._connect()
+            query = tinydb.Query()
+            result = self.db.search(query.identifier == job_id)
 
-        result = result[0] if result else None
-        self.db.close()
+            result = result[0] if result else None
+            self.db.close()
         return result
 
     def get_job_result(self, job_id: str) -> Tuple[str, Any]:
@@ -199,10 +249,27 @@ class TinyDBManager(BaseManager):
         else:
             location = Path(location)
 
-        with location.open('r', encoding='utf-8') as filehandler:
-            result = json.load(filehandler)
+        return mimetype, read_output(location, mimetype)
 
-        return mimetype, result
+    def __getstate__(self):
+        # the database is opened again on each access
+        state = super().__getstate__()
+        state.pop('db', None)
+        return state
 
     def __repr__(self):
         return f'<TinyDBManager> {self.name}'
+
+
+def _sort_key(property_: str, job: dict) -> tuple:
+    """
+    Sort key of jobs, which never compares missing values
+
+    :param property_: job property
+    :param job: `dict` of job
+
+    :returns: `tuple` of sort key
+    """
+
+    value = job.get(property_)
+    return value is None, value
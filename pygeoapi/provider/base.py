@@ -27,12 +27,25 @@
 #
 # =================================================================
 
+from collections import OrderedDict
 import json
 import logging
 from enum import Enum
+import threading
+import time
 
 LOGGER = logging.getLogger(__name__)
 
+#: policies for reporting numberMatched
+COUNT_POLICIES = ['exact', 'estimated', 'omitted']
+
+#: maximum number of cached counts per provider
+COUNT_CACHE_SIZE = 256
+
+# exact counts, per provider definition and normalized filters
+_COUNT_CACHE = {}
+_COUNT_CACHE_LOCK = threading.Lock()
+
 
 class SchemaType(Enum):
     item = 'item'
@@ -44,6 +57,10 @@ class SchemaType(Enum):
 class BaseProvider:
     """generic Provider ABC"""
 
+    #: whether a single instance may serve concurrent requests from
+    #: multiple threads (overridable with `thread_safe` in provider_def)
+    thread_safe = False
+
     def __init__(self, provider_def):
         """
         Initialize object
@@ -72,6 +89,17 @@ class BaseProvider:
         self.file_types = provider_def.get('file_types', [])
         self.fields = {}
         self.filename = None
+        self.thread_safe = provider_def.get('thread_safe', self.thread_safe)
+
+        # numberMatched handling, for providers supporting count policies
+        self.count_policy = provider_def.get('count', 'exact')
+        if self.count_policy not in COUNT_POLICIES:
+            msg = f'Invalid count policy: {self.count_policy}'
+            LOGGER.error(msg)
+            raise RuntimeError(msg)
+        self.count_cache_ttl = provider_def.get('count_cache_ttl', 0)
+        self._count_cache_key = json.dumps(provider_def, sort_keys=True,
+                                           default=str)
 
         # for coverage providers
         self.axes = []
@@ -87,6 +115,15 @@ class BaseProvider:
 
         raise NotImplementedError()
 
+    def health_check(self):
+        """
+        Check whether the provider backend is still usable
+
+        :returns: `bool` of provider health
+        """
+
+        return True
+
     def get_schema(self, schema_type: SchemaType = SchemaType.item):
         """
         Get provider schema model
@@ -194,6 +231,92 @@ class BaseProvider:
 
         raise NotImplementedError()
 
+    def _get_count(self, filters, exact, estimate=None, hits=False):
+        """
+        Get numberMatched according to the configured count policy
+
+        :param filters: JSON serializable representation of the query
+                        filters, used as cache key
+        :param exact: callable returning the exact count
+        :param estimate: callable returning an estimated count, or `None`
+                         if no estimate is available for the filters
+        :param hits: `bool` of whether only hits were requested, in which
+                     case a count is always returned
+
+        :returns: `int` of count, or `None` if omitted
+        """
+
+        if self.count_policy == 'omitted' and not hits:
+            return None
+
+        if self.count_policy == 'estimated' and estimate is not None:
+            count = estimate()
+            if count is not None:
+                return count
+
+        count = self._get_cached_count(filters)
+        if count is None:
+            count = exact()
+            self._set_cached_count(filters, count)
+
+        return count
+
+    def _get_cached_count(self, filters):
+        """
+        Get an exact count from the count cache
+
+        :param filters: JSON serializable representation of the query filters
+
+        :returns: `int` of count, or `None` if not cached or expired
+        """
+
+        if not self.count_cache_ttl:
+            return None
+
+        key = json.dumps(filters, sort_keys=True, default=str)
+        with _COUNT_CACHE_LOCK:
+            counts = _COUNT_CACHE.get(self._count_cache_key, {})
+            expires, count = counts.get(key, (0, None))
+            if expires < time.monotonic():
+                return None
+
+        LOGGER.debug(f'Using cached count for {key}')
+        return count
+
+    def _set_cached_count(self, filters, count):
+        """
+        Store an exact count in the count cache
+
+        :param filters: JSON serializable representation of the query filters
+        :param count: `int` of count
+
+        :returns: `None`
+        """
+
+        if not self.count_cache_ttl or count is None:
+            return
+
+        key = json.dumps(filters, sort_keys=True, default=str)
+        expires = time.monotonic() + self.count_cache_ttl
+        with _COUNT_CACHE_LOCK:
+            counts = _COUNT_CACHE.setdefault(self._count_cache_key,
+                                             OrderedDict())
+            counts[key] = (expires, count)
+            counts.move_to_end(key)
+            while len(counts) > COUNT_CACHE_SIZE:
+                counts.popitem(last=False)
+
+    def _clear_count_cache(self):
+        """
+        Invalidate the cached counts of the provider (e.g. after a
+        transaction)
+
+        :returns: `None`
+        """
+
+        with _COUNT_CACHE_LOCK:
+            _COUNT_CACHE.pop(self._count_cache_key, None)
+
     def _load_and_prepare_item(self, item, identifier=None,
                                accept_missing_identifier=False,
                                raise_if_exists=True):
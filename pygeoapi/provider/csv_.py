@@ -42,6 +42,8 @@ LOGGER = logging.getLogger(__name__)
 class CSVProvider(BaseProvider):
     """CSV provider"""
 
+    thread_safe = True
+
     def __init__(self, provider_def):
         """
         Initialize object
@@ -131,38 +133,10 @@ class CSVProvider(BaseProvider):
                 return feature_collection
             LOGGER.debug('Slicing CSV rows')
             for row in itertools.islice(data_, offset, offset+limit):
-                try:
-                    coordinates = [
-                        float(row.pop(self.geometry_x)),
-                        float(row.pop(self.geometry_y)),
-                    ]
-                except ValueError:
-                    msg = f'Skipping row with invalid geometry: {row.get(self.id_field)}'  # noqa
-                    LOGGER.error(msg)
+                feature = self._row_to_feature(row, select_properties,
+                                               skip_geometry)
+                if feature is None:
                     continue
-                feature = {'type': 'Feature'}
-                feature['id'] = row.pop(self.id_field)
-                if not skip_geometry:
-                    feature['geometry'] = {
-                        'type': 'Point',
-                        'coordinates': coordinates
-                    }
-                else:
-                    feature['geometry'] = None
-
-                feature['properties'] = OrderedDict()
-
-                if self.properties or select_properties:
-                    for p in set(self.properties) | set(select_properties):
-                        try:
-                            feature['properties'][p] = get_typed_value(row[p])
-                        except KeyError as err:
-                            LOGGER.error(err)
-                            raise ProviderQueryError()
-                else:
-                    for key, value in row.items():
-                        LOGGER.debug(f'key: {key}, value: {value}')
-                        feature['properties'][key] = get_typed_value(value)
 
                 if identifier is not None and feature['id'] == identifier:
                     found = True
@@ -183,10 +157,86 @@ class CSVProvider(BaseProvider):
 
         return feature_collection
 
+    def _row_to_feature(self, row, select_properties=[],
+                        skip_geometry=False):
+        """
+        Convert a CSV row to a GeoJSON feature
+
+        :param row: `dict` of CSV row
+        :param select_properties: list of property names
+        :param skip_geometry: bool of whether to skip geometry (default False)
+
+        :returns: `dict` of GeoJSON feature, or `None` if the row has
+                  no valid geometry
+        """
+
+        try:
+            coordinates = [
+                float(row.pop(self.geometry_x)),
+                float(row.pop(self.geometry_y)),
+            ]
+        except ValueError:
+            msg = f'Skipping row with invalid geometry: {row.get(self.id_field)}'  # noqa
+            LOGGER.error(msg)
+            return None
+        feature = {'type': 'Feature'}
+        feature['id'] = row.pop(self.id_field)
+        if not skip_geometry:
+            feature['geometry'] = {
+                'type': 'Point',
+                'coordinates': coordinates
+            }
+        else:
+            feature['geometry'] = None
+
+        feature['properties'] = OrderedDict()
+
+        if self.properties or select_properties:
+            for p in set(self.properties) | set(select_properties):
+                try:
+                    feature['properties'][p] = get_typed_value(row[p])
+                except KeyError as err:
+                    LOGGER.error(err)
+                    raise ProviderQueryError()
+        else:
+            for key, value in row.items():
+                LOGGER.debug(f'key: {key}, value: {value}')
+                feature['properties'][key] = get_typed_value(value)
+
+        return feature
+
+    def _iter_features(self, offset=0, limit=10, properties=[],
+                       select_properties=[], skip_geometry=False):
+        """
+        Stream features from CSV data, reading rows as they are consumed
+
+        :param offset: starting record to return (default 0)
+        :param limit: number of records to return (default 10)
+        :param properties: list of tuples (name, value)
+        :param select_properties: list of property names
+        :param skip_geometry: bool of whether to skip geometry (default False)
+
+        :returns: generator of GeoJSON features
+        """
+
+        with open(self.data) as ff:
+            data_ = csv.DictReader(ff)
+            if properties:
+                data_ = filter(
+                    lambda p: all(
+                        [p[prop[0]] == prop[1] for prop in properties]), data_)
+
+            for row in itertools.islice(data_, offset, offset+limit):
+                feature = self._row_to_feature(row, select_properties,
+                                               skip_geometry)
+                if feature is not None:
+                    yield feature
+
     @crs_transform
     def query(self, offset=0, limit=10, resulttype='results',
               bbox=[], datetime_=None, properties=[], sortby=[],
-              select_properties=[], skip_geometry=False, q=None, **kwargs):
+              select_properties=[], skip_geometry=False, q=None,
+              stream=False, **kwargs):
         """
         CSV query
 
@@ -200,10 +250,21 @@ class CSVProvider(BaseProvider):
         :param select_properties: list of property names
         :param skip_geometry: bool of whether to skip geometry (default False)
         :param q: full-text search term(s)
+        :param stream: bool of whether to return features as a generator
+                       (default False)
 
         :returns: dict of GeoJSON FeatureCollection
         """
 
+        if stream and resulttype != 'hits':
+            return {
+                'type': 'FeatureCollection',
+                'features': self._iter_features(
+                    offset, limit, properties=properties,
+                    select_properties=select_properties,
+                    skip_geometry=skip_geometry)
+            }
+
         return self._load(offset, limit, resulttype,
                           properties=properties,
                           select_properties=select_properties,
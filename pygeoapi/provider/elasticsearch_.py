@@ -28,17 +28,20 @@
 #
 # =================================================================
 
+import base64
+import binascii
 from typing import Dict
 from collections import OrderedDict
 import json
 import logging
 import uuid
 
-from elasticsearch import Elasticsearch, exceptions, helpers
+from elasticsearch import Elasticsearch, exceptions
 from elasticsearch_dsl import Search, Q
 
 from pygeoapi.provider.base import (BaseProvider, ProviderConnectionError,
                                     ProviderQueryError,
+                                    ProviderInvalidQueryError,
                                     ProviderItemNotFoundError)
 from pygeoapi.models.cql import CQLModel, get_next_node
 from pygeoapi.util import get_envelope, crs_transform
@@ -46,6 +49,10 @@ from pygeoapi.util import get_envelope, crs_transform
 
 LOGGER = logging.getLogger(__name__)
 
+# errors of ES API calls: ApiError only exists in elasticsearch 8+
+API_ERRORS = (exceptions.TransportError,
+              getattr(exceptions, 'ApiError', exceptions.TransportError))
+
 
 class ElasticsearchProvider(BaseProvider):
     """Elasticsearch Provider"""
@@ -61,7 +68,12 @@ class ElasticsearchProvider(BaseProvider):
 
         super().__init__(provider_def)
 
-        self.select_properties = []
+        # track_total_hits upper bound for the 'estimated' count policy
+        self.count_threshold = provider_def.get('count_threshold', 10000)
+        # deepest from + size allowed by the index (index.max_result_window)
+        self.max_result_window = provider_def.get('max_result_window', 10000)
+        # lifetime of the point in time backing cursor pagination
+        self.pit_keep_alive = provider_def.get('pit_keep_alive', '1m')
 
         self.es_host, self.index_name = self.data.rsplit('/', 1)
 
@@ -134,7 +146,7 @@ class ElasticsearchProvider(BaseProvider):
     def query(self, offset=0, limit=10, resulttype='results',
               bbox=[], datetime_=None, properties=[], sortby=[],
               select_properties=[], skip_geometry=False, q=None,
-              filterq=None, **kwargs):
+              filterq=None, cursor=None, **kwargs):
         """
         query Elasticsearch index
 
@@ -149,12 +161,11 @@ class ElasticsearchProvider(BaseProvider):
         :param skip_geometry: bool of whether to skip geometry (default False)
         :param q: full-text search term(s)
         :param filterq: filter object
+        :param cursor: `str` of cursor token of a page (replaces offset)
 
         :returns: dict of 0..n GeoJSON features
         """
 
-        self.select_properties = select_properties
-
         query = {'track_total_hits': True, 'query': {'bool': {'filter': []}}}
         filter_ = []
 
@@ -260,67 +271,75 @@ class ElasticsearchProvider(BaseProvider):
                 }
                 query['sort'].append(sort_)
 
+        source = {}
         if q is not None:
             LOGGER.debug('Adding free-text search')
             query['query']['bool']['must'] = {'query_string': {'query': q}}
 
-            query['_source'] = {
-                'excludes': [
-                    'properties._metadata-payload',
-                    'properties._metadata-schema',
-                    'properties._metadata-format'
-                ]
-            }
+            source['excludes'] = [
+                'properties._metadata-payload',
+                'properties._metadata-schema',
+                'properties._metadata-format'
+            ]
 
-        if self.properties or self.select_properties:
+        if self.properties or select_properties:
             LOGGER.debug('filtering properties')
 
-            all_properties = self.get_properties()
+            all_properties = self.get_properties(select_properties)
 
-            query['_source'] = {
-                'includes': list(map(self.mask_prop, all_properties))
-            }
-
-            query['_source']['includes'].append('id')
-            query['_source']['includes'].append('type')
-            query['_source']['includes'].append('geometry')
+            # only fetch the selected properties from the index
+            source['includes'] = list(map(self.mask_prop, all_properties))
+            source['includes'].extend([self.mask_prop(self.id_field),
+                                       'id', 'type'])
+            if not skip_geometry:
+                source['includes'].append('geometry')
 
         if skip_geometry:
             LOGGER.debug('excluding geometry')
-            try:
-                query['_source']['excludes'] = ['geometry']
-            except KeyError:
-                query['_source'] = {'excludes': ['geometry']}
+            source.setdefault('excludes', []).append('geometry')
+
+        if source:
+            query['_source'] = source
+
         try:
             LOGGER.debug('querying Elasticsearch')
             if filterq:
                 LOGGER.debug(f'adding cql object: {filterq.json()}')
                 query = update_query(input_query=query, cql=filterq)
+
+            cached_count = None
+            if self.count_policy == 'estimated':
+                query['track_total_hits'] = self.count_threshold
+            elif self.count_policy == 'omitted' and resulttype != 'hits':
+                query['track_total_hits'] = False
+            else:
+                cached_count = self._get_cached_count(query['query'])
+                query['track_total_hits'] = cached_count is None
+
             LOGGER.debug(json.dumps(query, indent=4))
 
-            LOGGER.debug('Testing for ES scrolling')
-            if offset + limit > 10000:
-                gen = helpers.scan(client=self.es, query=query,
-                                   preserve_order=True,
-                                   index=self.index_name)
-                results = {'hits': {'total': limit, 'hits': []}}
-                for i in range(offset + limit):
-                    try:
-                        if i >= offset:
-                            results['hits']['hits'].append(next(gen))
-                        else:
-                            next(gen)
-                    except StopIteration:
-                        break
-
-                matched = len(results['hits']['hits']) + offset
-                returned = len(results['hits']['hits'])
+            next_cursor = None
+            # pages beyond the result window (and their predecessors, so
+            # that next links can be followed) are read with search_after
+            # over a point in time
+            if resulttype != 'hits' and (
+                    cursor is not None or
+                    offset + 2 * limit > self.max_result_window):
+                results, next_cursor = self._search_after(
+                    query, offset, limit, cursor)
+            else:
+                results = self.es.search(index=self.index_name,
+                                         from_=offset, size=limit, **query)
+
+            if cached_count is not None:
+                matched = cached_count
+            elif query['track_total_hits'] is False:
+                matched = None
             else:
-                es_results = self.es.search(index=self.index_name,
-                                            from_=offset, size=limit, **query)
-                results = es_results
-                matched = es_results['hits']['total']['value']
-                returned = len(es_results['hits']['hits'])
+                matched = results['hits']['total']['value']
+                if self.count_policy != 'estimated':
+                    self._set_cached_count(query['query'], matched)
+            returned = len(results['hits']['hits'])
 
         except exceptions.ConnectionError as err:
             LOGGER.error(err)
@@ -332,7 +351,8 @@ class ElasticsearchProvider(BaseProvider):
             LOGGER.error(err)
             raise ProviderQueryError()
 
-        feature_collection['numberMatched'] = matched
+        if matched is not None:
+            feature_collection['numberMatched'] = matched
 
         if resulttype == 'hits':
             return feature_collection
@@ -341,11 +361,139 @@ class ElasticsearchProvider(BaseProvider):
 
         LOGGER.debug('serializing features')
         for feature in results['hits']['hits']:
-            feature_ = self.esdoc2geojson(feature)
+            feature_ = self.esdoc2geojson(feature, select_properties)
             feature_collection['features'].append(feature_)
 
+        if next_cursor is not None:
+            feature_collection['next_cursor'] = next_cursor
+
         return feature_collection
 
+    def _search_after(self, query, offset, limit, cursor=None):
+        """
+        Page through a query with search_after over a point in time (PIT),
+        in requests of at most max_result_window hits
+
+        :param query: `dict` of ES query
+        :param offset: number of hits to skip (without cursor)
+        :param limit: number of hits to return
+        :param cursor: `str` of cursor token, optional
+
+        :returns: tuple of ES response `dict` and `str` of next cursor
+                  token (`None` on the last page)
+        """
+
+        # the implicit PIT tiebreaker makes sort values unique
+        sort = query.get('sort') or [{'_score': {'order': 'desc'}}]
+        query = {**query, 'sort': [*sort, {'_shard_doc': 'asc'}]}
+
+        if cursor is not None:
+            pit_id, search_after = self._decode_cursor(cursor, sort)
+            offset = 0
+        else:
+            pit_id = self.es.open_point_in_time(
+                index=self.index_name, keep_alive=self.pit_keep_alive)['id']
+            search_after = None
+
+        def search(query_, size):
+            nonlocal pit_id
+            try:
+                response = self.es.search(
+                    pit={'id': pit_id, 'keep_alive': self.pit_keep_alive},
+                    size=size, search_after=search_after, **query_)
+            except exceptions.NotFoundError as err:
+                if cursor is None:
+                    raise
+                LOGGER.error(err)
+                raise ProviderInvalidQueryError('Cursor has expired')
+            # the PIT id may change between requests
+            pit_id = response.get('pit_id', pit_id)
+            return response
+
+        LOGGER.debug(f'Skipping {offset} hits')
+        skip_query = {**query, '_source': False, 'track_total_hits': False}
+        while offset > 0:
+            size = min(offset, self.max_result_window)
+            hits = search(skip_query, size)['hits']['hits']
+            if not hits:
+                break
+            search_after = hits[-1]['sort']
+            offset -= len(hits)
+
+        results = None
+        hits = []
+        exhausted = False
+        while results is None or (not exhausted and len(hits) < limit):
+            size = min(limit - len(hits), self.max_result_window)
+            response = search(query, size)
+            if results is None:
+                results = response
+                # hits are counted once, with the first request
+                query = {**query, 'track_total_hits': False}
+
+            page = response['hits']['hits']
+            hits.extend(page)
+            exhausted = len(page) < size
+            if page:
+                search_after = page[-1]['sort']
+
+        results['hits']['hits'] = hits
+
+        if exhausted:
+            LOGGER.debug('Closing point in time')
+            try:
+                self.es.close_point_in_time(body={'id': pit_id})
+            except API_ERRORS as err:
+                LOGGER.warning(f'Cannot close point in time: {err}')
+            return results, None
+
+        return results, self._encode_cursor(pit_id, sort, search_after)
+
+    @staticmethod
+    def _encode_cursor(pit_id, sort, search_after):
+        """
+        Encode the position after the last hit of a page as an opaque
+        cursor token
+
+        :param pit_id: `str` of point in time id
+        :param sort: `list` of ES sort clauses
+        :param search_after: `list` of sort values of the last hit
+
+        :returns: `str` of cursor token
+        """
+
+        token = json.dumps({'p': pit_id, 's': sort, 'a': search_after},
+                           separators=(',', ':'))
+        return base64.urlsafe_b64encode(token.encode()).decode().rstrip('=')
+
+    @staticmethod
+    def _decode_cursor(cursor, sort):
+        """
+        Decode a cursor token
+
+        :param cursor: `str` of cursor token
+        :param sort: `list` of ES sort clauses of the query
+
+        :returns: tuple of `str` of point in time id and `list` of
+                  search_after sort values
+        """
+
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            token = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            pit_id, token_sort, search_after = (
+                token['p'], token['s'], token['a'])
+        except (binascii.Error, ValueError, KeyError, TypeError) as err:
+            LOGGER.error(err)
+            raise ProviderInvalidQueryError('Invalid cursor')
+
+        if token_sort != sort:
+            msg = 'Cursor does not match the requested sortby'
+            LOGGER.error(msg)
+            raise ProviderInvalidQueryError(msg)
+
+        return pit_id, search_after
+
     @crs_transform
     def get(self, identifier, **kwargs):
         """
@@ -412,6 +560,7 @@ class ElasticsearchProvider(BaseProvider):
 
         LOGGER.debug(f'Inserting data with identifier {identifier}')
         _ = self.es.index(index=self.index_name, id=identifier, body=json_data)
+        self._clear_count_cache()
         LOGGER.debug('Item added')
 
         return identifier
@@ -431,6 +580,7 @@ class ElasticsearchProvider(BaseProvider):
             item, identifier, raise_if_exists=False)
 
         _ = self.es.index(index=self.index_name, id=identifier, body=json_data)
+        self._clear_count_cache()
 
         return True
 
@@ -445,14 +595,16 @@ class ElasticsearchProvider(BaseProvider):
 
         LOGGER.debug(f'Deleting item {identifier}')
         _ = self.es.delete(index=self.index_name, id=identifier)
+        self._clear_count_cache()
 
         return True
 
-    def esdoc2geojson(self, doc):
+    def esdoc2geojson(self, doc, select_properties=[]):
         """
         generate GeoJSON `dict` from ES document
 
         :param doc: `dict` of ES document
+        :param select_properties: list of property names
 
         :returns: GeoJSON `dict`
         """
@@ -471,9 +623,9 @@ class ElasticsearchProvider(BaseProvider):
         feature_['id'] = id_
         feature_['geometry'] = doc['_source'].get('geometry')
 
-        if self.properties or self.select_properties:
+        if self.properties or select_properties:
             LOGGER.debug('Filtering properties')
-            all_properties = self.get_properties()
+            all_properties = self.get_properties(select_properties)
 
             feature_thinned = {
                 'id': id_,
@@ -504,18 +656,26 @@ class ElasticsearchProvider(BaseProvider):
 
         return f'properties.{property_name}'
 
-    def get_properties(self):
+    def get_properties(self, select_properties=[]):
+        """
+        Get the properties of returned features
+
+        :param select_properties: list of property names
+
+        :returns: set of property names
+        """
+
         all_properties = []
 
         LOGGER.debug(f'configured properties: {self.properties}')
-        LOGGER.debug(f'selected properties: {self.select_properties}')
+        LOGGER.debug(f'selected properties: {select_properties}')
 
-        if not self.properties and not self.select_properties:
+        if not self.properties and not select_properties:
             all_properties = self.get_fields()
-        if self.properties and self.select_properties:
-            all_properties = set(self.properties) & set(self.select_properties)
+        if self.properties and select_properties:
+            all_properties = set(self.properties) & set(select_properties)
         else:
-            all_properties = set(self.properties) | set(self.select_properties)
+            all_properties = set(self.properties) | set(select_properties)
 
         LOGGER.debug(f'resulting properties: {all_properties}')
         return all_properties
@@ -548,7 +708,7 @@ class ElasticsearchCatalogueProvider(ElasticsearchProvider):
     def query(self, offset=0, limit=10, resulttype='results',
               bbox=[], datetime_=None, properties=[], sortby=[],
               select_properties=[], skip_geometry=False, q=None,
-              filterq=None, **kwargs):
+              filterq=None, cursor=None, **kwargs):
 
         records = super().query(
             offset=offset, limit=limit,
@@ -557,7 +717,7 @@ class ElasticsearchCatalogueProvider(ElasticsearchProvider):
             sortby=sortby,
             select_properties=select_properties,
             skip_geometry=skip_geometry,
-            q=q)
+            q=q, cursor=cursor)
 
         return records
 
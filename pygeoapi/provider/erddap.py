@@ -47,10 +47,9 @@
 from datetime import datetime, timedelta, timezone
 import logging
 
-import requests
-
 from pygeoapi.provider.base import (
     BaseProvider, ProviderNotFoundError, ProviderQueryError)
+from pygeoapi.provider.http_ import get_http_client
 
 LOGGER = logging.getLogger(__name__)
 
@@ -59,6 +58,8 @@ class TabledapProvider(BaseProvider):
     def __init__(self, provider_def):
         super().__init__(provider_def)
 
+        self.http = get_http_client(provider_def)
+
         LOGGER.debug('Setting provider query filters')
         self.filters = self.options.get('filters')
         self.fields = self.get_fields()
@@ -123,9 +124,7 @@ class TabledapProvider(BaseProvider):
         url = f'{url}?{"&".join(query_params)}'
 
         LOGGER.debug(f'Fetching data from {url}')
-        response = requests.get(url)
-        LOGGER.debug(f'Response: {response}')
-        data = response.json()
+        data = self.http.get_json(url)
         LOGGER.debug(f'Data: {data}')
 
         matched = len(data['features'])
@@ -177,9 +176,7 @@ class TabledapProvider(BaseProvider):
         url = f'{url}?{"&".join(query_params)}'
         LOGGER.debug(f'Fetching data from {url}')
 
-        response = requests.get(url)
-        LOGGER.debug(f'Response: {response}')
-        data = response.json()
+        data = self.http.get_json(url)
         LOGGER.debug(f'Data: {data}')
 
         if len(data['features']) < 1:
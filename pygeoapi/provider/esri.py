@@ -28,12 +28,11 @@
 # =================================================================
 
 from copy import deepcopy
-import json
 import logging
-from requests import Session, codes
 
 from pygeoapi.provider.base import (BaseProvider, ProviderConnectionError,
-                                    ProviderTypeError, ProviderQueryError)
+                                    ProviderTypeError)
+from pygeoapi.provider.http_ import get_http_client
 from pygeoapi.util import format_datetime, crs_transform
 
 LOGGER = logging.getLogger(__name__)
@@ -63,8 +62,9 @@ class ESRIServiceProvider(BaseProvider):
         self.username = provider_def.get('username')
         self.password = provider_def.get('password')
         self.token = None
+        self.headers = {}
 
-        self.session = Session()
+        self.http = get_http_client(provider_def)
 
         self.login()
         self.get_fields()
@@ -144,21 +144,27 @@ class ESRIServiceProvider(BaseProvider):
 
         fc = {
             'type': 'FeatureCollection',
-            'features': [],
-            'numberMatched': self._get_count(params)
+            'features': []
         }
 
         if resulttype == 'hits':
+            fc['numberMatched'] = self._get_count(params)
             return fc
 
+        # count while fetching the first page
+        count = self.http.submit(self._get_count, deepcopy(params))
+
         params['orderByFields'] = self._make_orderby(sortby)
 
         params['returnGeometry'] = 'false' if skip_geometry else 'true'
         params['resultOffset'] = offset
         params['resultRecordCount'] = limit
 
-        hits_ = min(limit, fc['numberMatched'])
-        fc['features'] = self._get_all(params, hits_)
+        features = self.get_response(self.url, params=params).get('features')
+
+        fc['numberMatched'] = count.result()
+        hits_ = min(limit, max(fc['numberMatched'] - offset, 0))
+        fc['features'] = self._get_all(params, features, hits_)
 
         fc['numberReturned'] = len(fc['features'])
 
@@ -203,26 +209,17 @@ class ESRIServiceProvider(BaseProvider):
             }
 
             LOGGER.debug('Logging in')
-            with self.session.post(GENERATE_TOKEN_URL, data=params) as r:
+            with self.http.request('POST', GENERATE_TOKEN_URL,
+                                   data=params) as r:
                 self.token = r.json().get('token')
                 # https://enterprise.arcgis.com/en/server/latest/administer/windows/about-arcgis-tokens.htm
-                self.session.headers.update({
-                    'X-Esri-Authorization': f'Bearer {self.token}'
-                })
+                # (sent per request, the HTTP session being shared)
+                self.headers['X-Esri-Authorization'] = f'Bearer {self.token}'
 
-    def get_response(self, url, **kwargs):
+    def get_response(self, url, params=None):
         # Form URL for GET request
         LOGGER.debug('Sending query')
-        with self.session.get(url, **kwargs) as r:
-
-            if r.status_code == codes.bad:
-                LOGGER.error('Bad http response code')
-                raise ProviderConnectionError('Bad http response code')
-            try:
-                return r.json()
-            except json.decoder.JSONDecodeError as err:
-                LOGGER.error(f'Bad response at {self.url}')
-                raise ProviderQueryError(err)
+        return self.http.get_json(url, params=params, headers=self.headers)
 
     @staticmethod
     def _make_orderby(sortby):
@@ -316,37 +313,39 @@ class ESRIServiceProvider(BaseProvider):
         response = self.get_response(self.url, params=params)
         return response.get('count', 0)
 
-    def _get_all(self, params, hits_):
+    def _get_all(self, params, features, hits_):
         """
-        Get all features from query args
+        Get all features from query args, fetching the pages following
+        the first one concurrently
 
-        :param properties: `dict` of query params
+        :param params: `dict` of query params
+        :param features: `list` of features of the first page
         :param hits_: `int` of number of features to expect
 
         :returns: `list` of features
         """
-        params = deepcopy(params)
 
-        # Return feature collection
-        features = self.get_response(self.url, params=params).get('features')
+        # the service may return less features than requested per page
         step = len(features)
-
-        # Query if values are less than expected
-        while len(features) < hits_:
-            LOGGER.debug('Fetching next set of values')
-            params['resultOffset'] += step
-            params['resultRecordCount'] += step
-
-            fs = self.get_response(self.url, params=params).get('features')
-            if len(fs) != 0:
-                features.extend(fs)
-            else:
+        if step == 0 or step >= hits_:
+            return features
+
+        def get_page(offset):
+            page_params = deepcopy(params)
+            page_params['resultOffset'] = offset
+            page_params['resultRecordCount'] = step
+            return self.get_response(
+                self.url, params=page_params).get('features')
+
+        offsets = range(params['resultOffset'] + step,
+                        params['resultOffset'] + hits_, step)
+        LOGGER.debug(f'Fetching {len(offsets)} next sets of values')
+        for fs in self.http.map(get_page, offsets):
+            if not fs:
                 break
+            features.extend(fs)
 
-        return features
-
-    def __exit__(self, **kwargs):
-        self.session.close()
+        return features[:hits_]
 
     def __repr__(self):
         return f'<ESRIServiceProvider> {self.data}'
@@ -26,16 +26,27 @@
 # FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
 # OTHER DEALINGS IN THE SOFTWARE.
 #
-# =================================================================
 
+from copy import deepcopy
+from datetime import timezone
 import json
 import logging
 import os
+import tempfile
+import threading
 import uuid
 
-from pygeoapi.provider.base import BaseProvider, ProviderItemNotFoundError
+import dateutil.parser
+from shapely.geometry import box, shape
+from shapely.geometry.base import BaseGeometry
+from shapely.strtree import STRtree
+
+from pygeoapi.provider.base import (BaseProvider, ProviderInvalidQueryError,
+                                    ProviderItemNotFoundError)
 from pygeoapi.util import crs_transform
 
+_INDEX_STORE = {}
+_INDEX_STORE_LOCK = threading.Lock()
 LOGGER = logging.getLogger(__name__)
 
 
@@ -43,19 +54,21 @@ class GeoJSONProvider(BaseProvider):
     """Provider class backed by local GeoJSON files
 
     This is meant to be simple
-    (no external services, no dependencies, no schema)
+    (no external services, no schema)
 
-    at the expense of performance
-    (no indexing, full serialization roundtrip on each request)
-
-    Not thread safe, a single server process is assumed
+    The FeatureCollection is parsed once and kept in memory together with
+    an id index, a spatial index (for bbox) and sort orders (for sortby),
+    shared by all provider instances pointing at the same file.  The
+    in-memory copy is reloaded whenever the file's mtime or size changes.
+    Transactions update the in-memory index and write the collection back
+    to disk atomically, serialized by a lock (single server process is
+    assumed for transactions).
 
     This implementation uses the feature 'id' heavily
     and will override any 'id' provided in the original data.
     The feature 'properties' will be preserved.
 
     TODO:
-    * query method should take bbox
     * instead of methods returning FeatureCollections,
     we should be yielding Features and aggregating in the view
     * there are strict id semantics; all features in the input GeoJSON file
@@ -64,12 +77,30 @@ class GeoJSONProvider(BaseProvider):
     * appropriate HTTP responses will be raised
     """
 
+    thread_safe = True
+
     def __init__(self, provider_def):
         """initializer"""
 
         super().__init__(provider_def)
         self.fields = self.get_fields()
 
+    @property
+    def index(self):
+        """
+        In-memory index of the GeoJSON file at self.data
+
+        :returns: `GeoJSONIndex` shared by all providers of the same file
+        """
+
+        key = (os.path.abspath(self.data), self.id_field)
+        with _INDEX_STORE_LOCK:
+            try:
+                return _INDEX_STORE[key]
+            except KeyError:
+                index = _INDEX_STORE[key] = GeoJSONIndex(*key)
+                return index
+
     def get_fields(self):
         """
          Get provider field information (names, types)
@@ -80,9 +111,11 @@ class GeoJSONProvider(BaseProvider):
         fields = {}
         LOGGER.debug('Treating all columns as string types')
         if os.path.exists(self.data):
-            with open(self.data) as src:
-                data = json.loads(src.read())
-            for key, value in data['features'][0]['properties'].items():
+            index = self.index
+            with index.lock:
+                index.refresh()
+                first_feature = index.features[0]
+            for key, value in first_feature['properties'].items():
                 if isinstance(value, float):
                     type_ = 'number'
                 elif isinstance(value, int):
@@ -95,46 +128,65 @@ class GeoJSONProvider(BaseProvider):
             LOGGER.warning(f'File {self.data} does not exist.')
         return fields
 
-    def _load(self, skip_geometry=None, properties=[], select_properties=[]):
-        """Load and validate the source GeoJSON file
-        at self.data
+    def _format_feature(self, feature, skip_geometry=False,
+                        select_properties=[]):
+        """
+        Prepare a copy of an indexed feature for output
+
+        :param feature: `dict` of indexed GeoJSON feature
+        :param skip_geometry: bool of whether to skip geometry
+        :param select_properties: list of property names
 
-        Yes loading from disk, deserializing and validation
-        happens on every request. This is not efficient.
+        :returns: `dict` of GeoJSON feature
         """
 
-        if os.path.exists(self.data):
-            with open(self.data) as src:
-                data = json.loads(src.read())
+        feature = feature.copy()
+
+        # downstream code may modify the output (e.g. transform its
+        # coordinates or add links): indexed values are not shared
+        if skip_geometry:
+            feature['geometry'] = None
         else:
-            LOGGER.warning(f'File {self.data} does not exist.')
-            data = {
-                'type': 'FeatureCollection',
-                'features': []}
+            feature['geometry'] = deepcopy(feature.get('geometry'))
+        if self.properties or select_properties:
+            keep = set(self.properties) | set(select_properties)
+            feature['properties'] = {
+                k: deepcopy(v) for k, v in feature['properties'].items()
+                if k in keep}
+        else:
+            feature['properties'] = deepcopy(feature.get('properties'))
+        if 'links' in feature:
+            feature['links'] = deepcopy(feature['links'])
 
-        # Must be a FeatureCollection
-        assert data['type'] == 'FeatureCollection'
+        return feature
 
-        # filter by properties if set
-        if properties:
-            data['features'] = [f for f in data['features'] if \
-                all([str(f['properties'][p[0]]) == str(p[1]) for p in properties])]  # noqa
+    def _load(self, skip_geometry=None, properties=[], select_properties=[]):
+        """Return the source GeoJSON file at self.data
+        as a FeatureCollection, from the in-memory index
+
+        :param skip_geometry: bool of whether to skip geometry
+        :param properties: list of tuples (name, value)
+        :param select_properties: list of property names
+
+        :returns: `dict` of GeoJSON FeatureCollection
+        """
+
+        index = self.index
+        with index.lock:
+            index.refresh()
+            data = index.collection.copy()
+            data['features'] = [
+                self._format_feature(index.features[i], skip_geometry,
+                                     select_properties)
+                for i in index.select(properties=properties)]
 
-        # All features must have ids, TODO must be unique strings
-        for i in data['features']:
-            if 'id' not in i and self.id_field in i['properties']:
-                i['id'] = i['properties'][self.id_field]
-            if skip_geometry:
-                i['geometry'] = None
-            if self.properties or select_properties:
-                i['properties'] = {k: v for k, v in i['properties'].items()
-                                   if k in set(self.properties) | set(select_properties)}  # noqa
         return data
 
     @crs_transform
     def query(self, offset=0, limit=10, resulttype='results',
               bbox=[], datetime_=None, properties=[], sortby=[],
-              select_properties=[], skip_geometry=False, q=None, **kwargs):
+              select_properties=[], skip_geometry=False, q=None,
+              stream=False, **kwargs):
         """
         query the provider
 
@@ -148,21 +200,44 @@ class GeoJSONProvider(BaseProvider):
         :param select_properties: list of property names
         :param skip_geometry: bool of whether to skip geometry (default False)
         :param q: full-text search term(s)
+        :param stream: bool of whether to return features as a generator
+                       (default False)
 
         :returns: FeatureCollection dict of 0..n GeoJSON features
         """
 
-        # TODO filter by bbox without resorting to third-party libs
-        data = self._load(skip_geometry=skip_geometry, properties=properties,
-                          select_properties=select_properties)
+        index = self.index
+        with index.lock:
+            index.refresh()
+            data = index.collection.copy()
 
-        data['numberMatched'] = len(data['features'])
+            positions = index.select(bbox=bbox, datetime_=datetime_,
+                                     properties=properties,
+                                     time_field=self.time_field)
+            data['numberMatched'] = len(positions)
 
-        if resulttype == 'hits':
-            data['features'] = []
-        else:
-            data['features'] = data['features'][offset:offset+limit]
-            data['numberReturned'] = len(data['features'])
+            if resulttype == 'hits':
+                data['features'] = []
+                return data
+
+            if sortby:
+                positions = index.sort(positions, sortby)
+
+            features = [index.features[i]
+                        for i in positions[offset:offset+limit]]
+
+        if stream:
+            # features are copied and formatted as they are consumed
+            data['features'] = (
+                self._format_feature(feature, skip_geometry,
+                                     select_properties)
+                for feature in features)
+            return data
+
+        data['features'] = [
+            self._format_feature(feature, skip_geometry, select_properties)
+            for feature in features]
+        data['numberReturned'] = len(data['features'])
 
         return data
 
@@ -175,11 +250,13 @@ class GeoJSONProvider(BaseProvider):
         :returns: dict of single GeoJSON feature
         """
 
-        all_data = self._load()
-        # if matches
-        for feature in all_data['features']:
-            if str(feature.get('id')) == identifier:
-                return feature
+        index = self.index
+        with index.lock:
+            index.refresh()
+            position = index.ids.get(str(identifier))
+            if position is not None:
+                return self._format_feature(index.features[position])
+
         # default, no match
         err = f'item {identifier} not found'
         LOGGER.error(err)
@@ -191,16 +268,15 @@ class GeoJSONProvider(BaseProvider):
         :param new_feature: new GeoJSON feature dictionary
         """
 
-        all_data = self._load()
-
         if self.id_field not in new_feature and\
            self.id_field not in new_feature['properties']:
             new_feature['properties'][self.id_field] = str(uuid.uuid4())
 
-        all_data['features'].append(new_feature)
-
-        with open(self.data, 'w') as dst:
-            dst.write(json.dumps(all_data))
+        index = self.index
+        with index.lock:
+            index.refresh()
+            index.append(new_feature)
+            index.flush()
 
     def update(self, identifier, new_feature):
         """Updates an existing feature id with new_feature
@@ -209,18 +285,15 @@ class GeoJSONProvider(BaseProvider):
         :param new_feature: new GeoJSON feature dictionary
         """
 
-        all_data = self._load()
-        for i, feature in enumerate(all_data['features']):
-            if self.id_field in feature:
-                if feature[self.id_field] == identifier:
-                    new_feature['properties'][self.id_field] = identifier
-                    all_data['features'][i] = new_feature
-            elif self.id_field in feature['properties']:
-                if feature['properties'][self.id_field] == identifier:
-                    new_feature['properties'][self.id_field] = identifier
-                    all_data['features'][i] = new_feature
-        with open(self.data, 'w') as dst:
-            dst.write(json.dumps(all_data))
+        index = self.index
+        with index.lock:
+            index.refresh()
+            position = index.ids.get(str(identifier))
+            if position is None:
+                return
+            new_feature['properties'][self.id_field] = identifier
+            index.replace(position, new_feature)
+            index.flush()
 
     def delete(self, identifier):
         """Deletes an existing feature
@@ -228,16 +301,345 @@ class GeoJSONProvider(BaseProvider):
         :param identifier: feature id
         """
 
-        all_data = self._load()
-        for i, feature in enumerate(all_data['features']):
-            if self.id_field in feature:
-                if feature[self.id_field] == identifier:
-                    all_data['features'].pop(i)
-            elif self.id_field in feature['properties']:
-                if feature['properties'][self.id_field] == identifier:
-                    all_data['features'].pop(i)
-        with open(self.data, 'w') as dst:
-            dst.write(json.dumps(all_data))
+        index = self.index
+        with index.lock:
+            index.refresh()
+            position = index.ids.get(str(identifier))
+            if position is None:
+                return
+            index.remove(position)
+            index.flush()
 
     def __repr__(self):
         return f'<GeoJSONProvider> {self.data}'
+
+
+class GeoJSONIndex:
+    """In-memory, indexed copy of a GeoJSON FeatureCollection file
+
+    The id index is maintained eagerly; the spatial index, sort orders
+    and parsed timestamps are built on first use and discarded whenever
+    the features change.  Callers are expected to hold `lock` around
+    any access.
+    """
+
+    def __init__(self, filename, id_field=None):
+        """
+        Initialize object
+
+        :param filename: path to the GeoJSON file
+        :param id_field: name of the property holding feature ids
+
+        :returns: pygeoapi.provider.geojson.GeoJSONIndex
+        """
+
+        self.filename = filename
+        self.id_field = id_field
+        self.lock = threading.RLock()
+
+        self.loaded = False
+        self.signature = None
+        self.collection = {'type': 'FeatureCollection'}
+        self.features = []
+        self.ids = {}
+        self._reset_derived()
+
+    def _reset_derived(self):
+        """Discard lazily built indexes"""
+
+        self._tree = None
+        self._tree_geoms = []
+        self._tree_positions = []
+        self._tree_slots = {}
+        self._sort_orders = {}
+        self._times = {}
+
+    def _stat(self):
+        try:
+            stat = os.stat(self.filename)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self):
+        """
+        (Re)load the file if it changed since it was last read
+
+        :returns: `bool` of whether the file was (re)loaded
+        """
+
+        signature = self._stat()
+        if self.loaded and signature == self.signature:
+            return False
+
+        if signature is None:
+            LOGGER.warning(f'File {self.filename} does not exist.')
+            data = {
+                'type': 'FeatureCollection',
+                'features': []}
+        else:
+            LOGGER.debug(f'Loading {self.filename}')
+            with open(self.filename) as src:
+                data = json.load(src)
+
+        # Must be a FeatureCollection
+        assert data['type'] == 'FeatureCollection'
+
+        self.features = data.pop('features')
+        self.collection = data
+        self.signature = signature
+        self.loaded = True
+
+        # All features must have ids, TODO must be unique strings
+        for feature in self.features:
+            self._set_id(feature)
+        self._reindex()
+        return True
+
+    def _set_id(self, feature):
+        if 'id' not in feature and \
+           self.id_field in (feature.get('properties') or {}):
+            feature['id'] = feature['properties'][self.id_field]
+
+    def _reindex(self, start=0):
+        if start == 0:
+            self.ids = {}
+        for i in range(start, len(self.features)):
+            self.ids[str(self.features[i].get('id'))] = i
+        self._reset_derived()
+
+    def append(self, feature):
+        """
+        Add a feature to the index
+
+        :param feature: `dict` of GeoJSON feature
+        """
+
+        self._set_id(feature)
+        self.features.append(feature)
+        self._reindex(len(self.features) - 1)
+
+    def replace(self, position, feature):
+        """
+        Replace the feature at a given position
+
+        :param position: `int` of feature position
+        :param feature: `dict` of GeoJSON feature
+        """
+
+        self.ids.pop(str(self.features[position].get('id')), None)
+        self._set_id(feature)
+        self.features[position] = feature
+        self.ids[str(feature.get('id'))] = position
+        self._reset_derived()
+
+    def remove(self, position):
+        """
+        Remove the feature at a given position
+
+        :param position: `int` of feature position
+        """
+
+        feature = self.features.pop(position)
+        self.ids.pop(str(feature.get('id')), None)
+        self._reindex(position)
+
+    def flush(self):
+        """
+        Write the in-memory collection back to the file, atomically
+
+        :returns: `None`
+        """
+
+        data = self.collection.copy()
+        data['features'] = self.features
+
+        dirname = os.path.dirname(self.filename) or '.'
+        fd, tmp_filename = tempfile.mkstemp(dir=dirname, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w') as dst:
+                json.dump(data, dst)
+            os.replace(tmp_filename, self.filename)
+        except Exception:
+            os.remove(tmp_filename)
+            raise
+
+        self.signature = self._stat()
+
+    def select(self, bbox=[], datetime_=None, properties=[],
+               time_field=None):
+        """
+        Find the positions of the features matching the given filters
+
+        :param bbox: bounding box [minx,miny,maxx,maxy]
+        :param datetime_: temporal (datestamp or extent)
+        :param properties: list of tuples (name, value)
+        :param time_field: name of the property holding feature timestamps
+
+        :returns: sequence of matching positions, in file order
+        """
+
+        if bbox:
+            positions = self._select_bbox(bbox)
+        else:
+            positions = range(len(self.features))
+
+        if datetime_ is not None:
+            positions = self._select_datetime(positions, datetime_,
+                                              time_field)
+
+        if properties:
+            positions = [
+                i for i in positions if all(
+                    str(self.features[i]['properties'].get(p[0])) == str(p[1])
+                    for p in properties)]
+
+        return positions
+
+    def _select_bbox(self, bbox):
+        if self._tree is None:
+            for i, feature in enumerate(self.features):
+                if feature.get('geometry'):
+                    geom = shape(feature['geometry'])
+                    self._tree_slots[id(geom)] = len(self._tree_geoms)
+                    self._tree_geoms.append(geom)
+                    self._tree_positions.append(i)
+            self._tree = STRtree(self._tree_geoms)
+
+        if len(bbox) == 6:
+            bbox = [bbox[0], bbox[1], bbox[3], bbox[4]]
+        bbox_geom = box(*bbox)
+
+        slots = []
+        for hit in self._tree.query(bbox_geom):
+            # shapely < 2 returns geometries, shapely >= 2 returns indices
+            if isinstance(hit, BaseGeometry):
+                slots.append(self._tree_slots[id(hit)])
+            else:
+                slots.append(int(hit))
+
+        return sorted(self._tree_positions[slot] for slot in slots
+                      if self._tree_geoms[slot].intersects(bbox_geom))
+
+    def _get_time(self, position, time_field):
+        try:
+            return self._times[(position, time_field)]
+        except KeyError:
+            pass
+
+        value = self.features[position]['properties'].get(time_field)
+        try:
+            value = _parse_datetime(value)
+        except (TypeError, ValueError, OverflowError):
+            value = None
+
+        self._times[(position, time_field)] = value
+        return value
+
+    def _select_datetime(self, positions, datetime_, time_field):
+        if time_field is None:
+            LOGGER.warning('time_field not enabled for collection')
+            return positions
+
+        try:
+            if '/' in datetime_:
+                begin, end = [None if value in ['..', ''] else
+                              _parse_datetime(value)
+                              for value in datetime_.split('/')]
+            else:
+                begin = end = _parse_datetime(datetime_)
+        except ValueError as err:
+            LOGGER.error(err)
+            raise ProviderInvalidQueryError(f'invalid datetime: {datetime_}')
+
+        selected = []
+        for i in positions:
+            value = self._get_time(i, time_field)
+            if value is None:
+                continue
+            if begin is not None and value < begin:
+                continue
+            if end is not None and value > end:
+                continue
+            selected.append(i)
+
+        return selected
+
+    def _sort_order(self, property_):
+        """
+        Positions of all features sorted by a property, with rank of each
+        position (features with equal values share a rank)
+        """
+
+        try:
+            return self._sort_orders[property_]
+        except KeyError:
+            pass
+
+        keys = [_sort_key(feature['properties'].get(property_))
+                for feature in self.features]
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+
+        ranks = [0] * len(keys)
+        rank = 0
+        for n, i in enumerate(order):
+            if n and keys[i] != keys[order[n - 1]]:
+                rank += 1
+            ranks[i] = rank
+
+        self._sort_orders[property_] = order, ranks
+        return order, ranks
+
+    def sort(self, positions, sortby):
+        """
+        Sort feature positions
+
+        :param positions: sequence of feature positions
+        :param sortby: list of dicts (property, order)
+
+        :returns: `list` of sorted positions
+        """
+
+        orders = [(self._sort_order(s['property']), s['order'] == '-')
+                  for s in sortby]
+
+        if len(orders) == 1 and len(positions) == len(self.features):
+            (order, _), descending = orders[0]
+            return order[::-1] if descending else order
+
+        def key(i):
+            return tuple(-ranks[i] if descending else ranks[i]
+                         for (_, ranks), descending in orders)
+
+        return sorted(positions, key=key)
+
+
+def _parse_datetime(value):
+    """
+    Parse an ISO 8601 value, assuming UTC when no timezone is given
+
+    :param value: `str` of datetime
+
+    :returns: `datetime.datetime`
+    """
+
+    value = dateutil.parser.isoparse(value)
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def _sort_key(value):
+    """
+    Sort key ordering numbers before strings, and missing values last
+
+    :param value: property value
+
+    :returns: `tuple` of sort key
+    """
+
+    if value is None:
+        return (2, '')
+    if isinstance(value, (int, float)):
+        return (0, value)
+    return (1, str(value))
@@ -0,0 +1,244 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+"""Shared HTTP client of remote providers"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+import json
+import logging
+import threading
+from typing import Any, Callable, Iterable, Optional
+
+from requests import Response, Session
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
+
+from pygeoapi.cache.memory import MemoryCache
+from pygeoapi.provider.base import ProviderConnectionError, ProviderQueryError
+
+LOGGER = logging.getLogger(__name__)
+
+#: HTTP status codes of responses which are retried
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+#: default options of clients (`http` in provider definitions)
+DEFAULTS = {
+    'pool_size': 10,
+    'retries': 3,
+    'backoff_factor': 0.5,
+    'timeout': 30,
+    'max_workers': 4,
+    'cache_ttl': 0,
+    'cache_size': 256
+}
+
+# clients, per options
+_CLIENTS = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def get_http_client(provider_def: dict) -> 'HTTPClient':
+    """
+    Get the HTTP client of a provider, shared by all providers with the
+    same `http` options
+
+    :param provider_def: provider definition
+
+    :returns: `pygeoapi.provider.http_.HTTPClient`
+    """
+
+    options = {**DEFAULTS, **(provider_def.get('http') or {})}
+    key = json.dumps(options, sort_keys=True)
+
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(key)
+        if client is None:
+            LOGGER.debug(f'Creating HTTP client with options {options}')
+            client = _CLIENTS[key] = HTTPClient(**options)
+
+    return client
+
+
+class HTTPClient:
+    """HTTP client keeping connections alive in pools per host, retrying
+    failed requests with backoff, fetching independent requests
+    concurrently and caching JSON responses"""
+
+    def __init__(self, pool_size: int = 10, retries: int = 3,
+                 backoff_factor: float = 0.5, timeout: float = 30,
+                 max_workers: int = 4, cache_ttl: int = 0,
+                 cache_size: int = 256):
+        """
+        Initialize object
+
+        :param pool_size: `int` of maximum number of connections kept
+                          alive per host
+        :param retries: `int` of number of retries of failed requests
+        :param backoff_factor: `float` of factor of the exponential
+                               backoff between retries, in seconds
+        :param timeout: `float` of connect and read timeout, in seconds
+        :param max_workers: `int` of maximum number of concurrent requests
+                            of `map` and `submit`
+        :param cache_ttl: `int` of time to live of cached JSON responses,
+                          in seconds (0 disables caching)
+        :param cache_size: `int` of maximum number of cached responses
+
+        :returns: `pygeoapi.provider.http_.HTTPClient`
+        """
+
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cache_ttl = cache_ttl
+
+        # idempotent requests only are retried
+        retry = Retry(total=retries, backoff_factor=backoff_factor,
+                      status_forcelist=RETRY_STATUSES,
+                      allowed_methods=['GET', 'HEAD'],
+                      raise_on_status=False)
+        self.adapter = HTTPAdapter(pool_connections=pool_size,
+                                   pool_maxsize=pool_size,
+                                   max_retries=retry)
+
+        self.session = Session()
+        self.session.mount('http://', self.adapter)
+        self.session.mount('https://', self.adapter)
+
+        self.executor = ThreadPoolExecutor(
+            max_workers, thread_name_prefix='pygeoapi-http')
+
+        self.cache = None
+        if cache_ttl:
+            self.cache = MemoryCache({'name': 'Memory', 'ttl': cache_ttl,
+                                      'max_entries': cache_size})
+
+    def request(self, method: str, url: str, **kwargs) -> Response:
+        """
+        Send a request
+
+        :param method: HTTP method
+        :param url: URL
+        :param kwargs: keyword arguments of `requests.Session.request`
+
+        :returns: `requests.Response`
+        """
+
+        kwargs.setdefault('timeout', self.timeout)
+        try:
+            return self.session.request(method, url, **kwargs)
+        except RequestException as err:
+            msg = f'Cannot reach {url}: {err}'
+            LOGGER.error(msg)
+            raise ProviderConnectionError(msg)
+
+    def get(self, url: str, params: Optional[dict] = None,
+            **kwargs) -> Response:
+        """
+        Send a GET request
+
+        :param url: URL
+        :param params: `dict` of query parameters
+        :param kwargs: keyword arguments of `requests.Session.request`
+
+        :returns: `requests.Response`
+        """
+
+        return self.request('GET', url, params=params, **kwargs)
+
+    def get_json(self, url: str, params: Optional[dict] = None,
+                 headers: Optional[dict] = None,
+                 ttl: Optional[int] = None) -> Any:
+        """
+        Get a JSON document, from the response cache if enabled
+
+        :param url: URL
+        :param params: `dict` of query parameters
+        :param headers: `dict` of request headers
+        :param ttl: `int` of time to live of the cached response, in
+                    seconds (default is the `cache_ttl` of the client)
+
+        :returns: decoded JSON document
+        """
+
+        ttl = self.cache_ttl if ttl is None else ttl
+
+        key = None
+        if self.cache is not None and ttl:
+            key = json.dumps([url, params, headers], sort_keys=True,
+                             default=str)
+            entry = self.cache.get(key)
+            if entry is not None:
+                LOGGER.debug(f'Using cached response of {url}')
+                return entry['content']
+
+        response = self.get(url, params=params, headers=headers)
+        if not response.ok:
+            msg = f'Bad http response code {response.status_code} from {url}'
+            LOGGER.error(msg)
+            raise ProviderConnectionError(msg)
+
+        try:
+            content = response.json()
+        except ValueError as err:
+            LOGGER.error(f'Bad response at {url}')
+            raise ProviderQueryError(err)
+
+        if key is not None:
+            self.cache.set(key, {'content': content}, ttl)
+
+        return content
+
+    def submit(self, func: Callable, *args, **kwargs) -> Future:
+        """
+        Call a function (i.e. sending requests) in the thread pool
+
+        :param func: function to call
+        :param args: positional arguments of function
+        :param kwargs: keyword arguments of function
+
+        :returns: `concurrent.futures.Future` of result
+        """
+
+        return self.executor.submit(func, *args, **kwargs)
+
+    def map(self, func: Callable, iterable: Iterable) -> list:
+        """
+        Call a function on items concurrently (i.e. fetching independent
+        pages), at most `max_workers` at a time
+
+        :param func: function to call
+        :param iterable: items to call function on
+
+        :returns: `list` of results, in the order of items
+        """
+
+        return list(self.executor.map(func, iterable))
+
+    def __repr__(self):
+        return f'<HTTPClient> {self.pool_size}'
@@ -36,6 +36,7 @@ from pymongo import MongoClient
 from pymongo import GEOSPHERE
 from pymongo import ASCENDING, DESCENDING
 from pymongo.collection import ObjectId
+from pymongo.errors import PyMongoError
 from pygeoapi.provider.base import BaseProvider, ProviderItemNotFoundError
 from pygeoapi.util import crs_transform
 
@@ -46,6 +47,8 @@ class MongoProvider(BaseProvider):
     """Generic provider for Mongodb.
     """
 
+    thread_safe = True
+
     def __init__(self, provider_def):
         """
         MongoProvider Class constructor
@@ -69,6 +72,21 @@ class MongoProvider(BaseProvider):
         self.featuredb[self.collection].create_index([("geometry", GEOSPHERE)])
         self.fields = self.get_fields()
 
+    def health_check(self):
+        """
+        Check that the MongoDB server is reachable
+
+        :returns: `bool` of provider health
+        """
+
+        try:
+            self.featuredb.command('ping')
+        except PyMongoError as err:
+            LOGGER.warning(f'MongoDB not reachable: {err}')
+            return False
+
+        return True
+
     def get_fields(self):
         """
         Get provider field information (names, types)
@@ -93,13 +111,18 @@ class MongoProvider(BaseProvider):
         return (fields)
 
     def _get_feature_list(self, filterObj, sortList=[], skip=0, maxitems=1,
-                          skip_geometry=False):
-        featurecursor = self.featuredb[self.collection].find(filterObj)
+                          skip_geometry=False, hits=False):
+        collection = self.featuredb[self.collection]
+        featurecursor = collection.find(filterObj)
 
         if sortList:
             featurecursor = featurecursor.sort(sortList)
 
-        matchCount = self.featuredb[self.collection].count_documents(filterObj)
+        # collection metadata count only applies to unfiltered queries
+        estimate = None if filterObj else collection.estimated_document_count
+        matchCount = self._get_count(
+            filterObj, lambda: collection.count_documents(filterObj),
+            estimate, hits)
         featurecursor.skip(skip)
         featurecursor.limit(maxitems)
         featurelist = list(featurecursor)
@@ -143,7 +166,7 @@ class MongoProvider(BaseProvider):
 
         featurelist, matchcount = self._get_feature_list(
             filterobj, sortList=sort_list, skip=offset, maxitems=limit,
-            skip_geometry=skip_geometry)
+            skip_geometry=skip_geometry, hits=resulttype == 'hits')
 
         if resulttype == 'hits':
             featurelist = []
@@ -151,9 +174,10 @@ class MongoProvider(BaseProvider):
         feature_collection = {
             'type': 'FeatureCollection',
             'features': featurelist,
-            'numberMatched': matchcount,
             'numberReturned': len(featurelist)
         }
+        if matchcount is not None:
+            feature_collection['numberMatched'] = matchcount
 
         return feature_collection
 
@@ -178,6 +202,7 @@ class MongoProvider(BaseProvider):
         """Create a new feature
         """
         self.featuredb[self.collection].insert_one(new_feature)
+        self._clear_count_cache()
 
     def update(self, identifier, updated_feature):
         """Updates an existing feature id with new_feature
@@ -188,6 +213,7 @@ class MongoProvider(BaseProvider):
         data = {k: v for k, v in updated_feature.items() if k != 'id'}
         self.featuredb[self.collection].update_one(
             {'_id': ObjectId(identifier)}, {"$set": data})
+        self._clear_count_cache()
 
     def delete(self, identifier):
         """Deletes an existing feature
@@ -196,3 +222,4 @@ class MongoProvider(BaseProvider):
         """
         self.featuredb[self.collection].delete_one(
             {'_id': ObjectId(identifier)})
+        self._clear_count_cache()
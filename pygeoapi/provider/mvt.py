@@ -60,6 +60,8 @@ class MVTProvider(BaseTileProvider):
         """
 
         super().__init__(provider_def)
+        # reuse connections to the tile server across tile requests
+        self._session = requests.Session()
         if is_url(self.data):
             url = urlparse(self.data)
             baseurl = f'{url.scheme}://{url.netloc}'
@@ -212,16 +214,14 @@ class MVTProvider(BaseTileProvider):
             else:
                 url_query = ''
 
-            with requests.Session() as session:
-                session.get(base_url)
-                # There is a "." in the url path
-                if '.' in url.path:
-                    resp = session.get(f'{base_url}/{layer}/{z}/{y}/{x}.{f}{url_query}')  # noqa
-                # There is no "." in the url )e.g. elasticsearch)
-                else:
-                    resp = session.get(f'{base_url}/{layer}/{z}/{y}/{x}{url_query}')  # noqa
-                resp.raise_for_status()
-                return resp.content
+            # There is a "." in the url path
+            if '.' in url.path:
+                resp = self._session.get(f'{base_url}/{layer}/{z}/{y}/{x}.{format_}{url_query}')  # noqa
+            # There is no "." in the url )e.g. elasticsearch)
+            else:
+                resp = self._session.get(f'{base_url}/{layer}/{z}/{y}/{x}{url_query}')  # noqa
+            resp.raise_for_status()
+            return resp.content
         else:
             if not isinstance(self.service_url, Path):
                 msg = f'Wrong data path configuration: {self.service_url}'
@@ -254,10 +254,8 @@ class MVTProvider(BaseTileProvider):
         if is_url(self.data):
             url = urlparse(self.data)
             base_url = f'{url.scheme}://{url.netloc}'
-            with requests.Session() as session:
-                session.get(base_url)
-                resp = session.get(f'{base_url}/{layer}/metadata.json')
-                resp.raise_for_status()
+            resp = self._session.get(f'{base_url}/{layer}/metadata.json')
+            resp.raise_for_status()
             metadata_json_content = resp.json()
         else:
             if not isinstance(self.service_metadata_url, Path):
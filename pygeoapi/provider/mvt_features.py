@@ -0,0 +1,565 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from copy import deepcopy
+import json
+import logging
+from pathlib import Path
+
+from shapely.geometry import box, shape
+from sqlalchemy import func, select, text
+
+from pygeoapi.models.provider.base import (
+    TileMatrixSetEnum, TilesMetadataFormat, TileSetMetadata, LinkType,
+    GeospatialDataType)
+from pygeoapi.models.provider.mvt import MVTTilesJson, VectorLayers
+from pygeoapi.plugin import load_plugin
+from pygeoapi.provider.base import ProviderConnectionError
+from pygeoapi.provider.tile import (
+    BaseTileProvider, ProviderTileNotFoundError, ProviderTileQueryError,
+    ProviderTilesetIdNotFoundError, TILE_MATRIX_SETS, get_tile_bounds,
+    get_tile_crs_uri)
+from pygeoapi.util import (crs_transform_features, get_crs_from_uri,
+                           get_transformer, url_join)
+
+LOGGER = logging.getLogger(__name__)
+
+
+class MVTFeaturesProvider(BaseTileProvider):
+    """
+    Dynamic MVT Provider, building Mapbox Vector Tiles on the fly from
+    the features of a feature provider.
+
+    Tiles of PostgreSQL tables are built by PostGIS (ST_AsMVT); features
+    of other providers are clipped, simplified and encoded in Python.
+    """
+
+    def __init__(self, provider_def):
+        """
+        Initialize object
+
+        # Typical MVT-features YAML config:
+
+        provider:
+            type: tile
+            name: MVT-features
+            feature_provider: GeoJSON
+            data: tests/data/ne_110m_lakes.geojson
+            id_field: id
+            options:
+                zoom:
+                    min: 0
+                    max: 15
+                schemes:
+                    - WebMercatorQuad
+                cache:
+                    name: Memory
+                cache_ttl:
+                    0: 86400
+                    10: 600
+            format:
+                name: pbf
+                mimetype: application/vnd.mapbox-vector-tile
+
+        :param provider_def: provider definition
+
+        :returns: pygeoapi.provider.mvt_features.MVTFeaturesProvider
+        """
+
+        super().__init__(provider_def)
+
+        self.options = self.options or {}
+        self.options.setdefault('metadata_format', 'default')
+        self.options.setdefault('zoom', {'min': 0, 'max': 15})
+        self.options.setdefault('schemes', list(TILE_MATRIX_SETS.keys()))
+
+        self.extent = self.options.get('extent', 4096)
+        self.buffer = self.options.get('buffer', 64)
+        self.simplify = self.options.get('simplify', 1)
+        self.max_features = self.options.get('max_features', 10000)
+
+        try:
+            feature_provider_name = provider_def['feature_provider']
+        except KeyError:
+            msg = 'Need explicit \'feature_provider\' attr in provider config'
+            LOGGER.error(msg)
+            raise ProviderConnectionError(msg)
+
+        feature_provider_def = provider_def.copy()
+        feature_provider_def.update(type='feature',
+                                    name=feature_provider_name)
+        feature_provider_def.pop('format', None)
+        feature_provider_def.pop('options', None)
+        self.feature_provider = load_plugin('provider', feature_provider_def)
+        self.storage_crs = provider_def.get(
+            'storage_crs', TileMatrixSetEnum.WORLDCRS84QUAD.value.crs)
+        self.layer = provider_def.get('layer') or provider_def.get('table') \
+            or Path(str(self.data)).stem
+
+        # tile cache, with time to live per zoom level
+        self.cache = None
+        if self.options.get('cache'):
+            self.cache = load_plugin('cache', self.options['cache'])
+        self.cache_ttl = self.options.get('cache_ttl')
+        # SRID of the PostgreSQL geometry column (looked up once)
+        self._storage_srid = None
+
+    def __repr__(self):
+        return f'<MVTFeaturesProvider> {self.feature_provider}'
+
+    def get_layer(self):
+        """
+        Get provider layer name
+
+        :returns: `string` of layer name
+        """
+
+        return self.layer
+
+    def get_fields(self):
+        """
+        Get provider field information (names, types)
+
+        :returns: `dict` of fields
+        """
+
+        return self.feature_provider.get_fields()
+
+    def get_tiling_schemes(self):
+        """
+        Get the supported tile matrix sets
+
+        :returns: `list` of tile matrix set definitions
+        """
+
+        tile_matrix_sets = [
+            TileMatrixSetEnum.WORLDCRS84QUAD.value,
+            TileMatrixSetEnum.WEBMERCATORQUAD.value
+        ]
+
+        return [tile_matrix_set for tile_matrix_set in tile_matrix_sets
+                if tile_matrix_set.tileMatrixSet in self.options['schemes']]
+
+    def get_tiles_service(self, baseurl=None, servicepath=None,
+                          dirpath=None, tile_type=None):
+        """
+        Gets mvt service description
+
+        :param baseurl: base URL of endpoint
+        :param servicepath: base path of URL
+        :param dirpath: directory basepath (equivalent of URL)
+        :param tile_type: tile format type
+
+        :returns: `dict` of item tile service
+        """
+
+        if servicepath.startswith(baseurl):
+            service_url = servicepath
+        else:
+            service_url = url_join(baseurl, servicepath)
+        tile_matrix_set = service_url.split(
+            '/{tileMatrix}/{tileRow}/{tileCol}')[0]
+
+        return {
+            'links': [
+                {
+                    'type': 'application/json',
+                    'rel': 'self',
+                    'title': 'This collection as multi vector tilesets',
+                    'href': f'{tile_matrix_set}?f=json'
+                },
+                {
+                    'type': self.mimetype,
+                    'rel': 'item',
+                    'title': 'This collection as multi vector tiles',
+                    'href': service_url
+                }, {
+                    'type': 'application/json',
+                    'rel': 'describedby',
+                    'title': 'Collection metadata in TileJSON format',
+                    'href': f'{url_join(tile_matrix_set, "metadata")}?f=json'
+                }
+            ]
+        }
+
+    def get_tiles(self, layer=None, tileset=None,
+                  z=None, y=None, x=None, format_=None):
+        """
+        Gets tile, from the tile cache or built from the features
+
+        :param layer: mvt tile layer
+        :param tileset: mvt tileset
+        :param z: z index
+        :param y: y index
+        :param x: x index
+        :param format_: tile format
+
+        :returns: an encoded mvt tile
+        """
+
+        z, y, x = int(z), int(y), int(x)
+        if tileset not in self.options['schemes']:
+            msg = f'Tileset not supported: {tileset}'
+            LOGGER.error(msg)
+            raise ProviderTilesetIdNotFoundError(msg)
+
+        zoom = self.options['zoom']
+        if not zoom['min'] <= z <= zoom['max']:
+            msg = f'Tile matrix {z} out of zoom levels'
+            LOGGER.error(msg)
+            raise ProviderTileNotFoundError(msg)
+
+        ttl = self._get_cache_ttl(z)
+        if ttl:
+            # tiles built before the data changed are left to expire
+            generation = self.cache.get_generation(f'tiles:{self.layer}')
+            key = f'tile:{self.layer}/{generation}/{tileset}/{z}/{y}/{x}'
+            entry = self.cache.get(key)
+            if entry is not None:
+                LOGGER.debug(f'Serving tile {key} from cache')
+                return entry['content']
+
+        tile = self._build_tile(tileset, z, y, x)
+
+        if ttl:
+            self.cache.set(key, {'content': tile}, ttl)
+
+        return tile
+
+    def invalidate(self):
+        """
+        Discard the tiles in the tile cache (e.g. when data has changed)
+
+        :returns: `None`
+        """
+
+        if self.cache is not None:
+            self.cache.invalidate(f'tiles:{self.layer}')
+
+    def _get_cache_ttl(self, z):
+        """
+        Get the time to live of the cached tiles of a zoom level
+
+        :param z: tile matrix (zoom level)
+
+        :returns: `int` of seconds, or `0` if tiles are not cached
+        """
+
+        if self.cache is None:
+            return 0
+
+        if self.cache_ttl is None:
+            return self.cache.ttl
+        elif isinstance(self.cache_ttl, dict):
+            # time to live of the closest configured zoom level below
+            zoom_levels = [int(zoom) for zoom in self.cache_ttl if
+                           int(zoom) <= z]
+            if not zoom_levels:
+                return 0
+            zoom_ttls = {int(k): v for k, v in self.cache_ttl.items()}
+            return zoom_ttls[max(zoom_levels)]
+
+        return self.cache_ttl
+
+    def _build_tile(self, tileset, z, y, x):
+        """
+        Build a tile from the features intersecting it
+
+        :param tileset: tile matrix set identifier
+        :param z: tile matrix (zoom level)
+        :param y: tile row
+        :param x: tile column
+
+        :returns: `bytes` of encoded mvt tile
+        """
+
+        bounds = get_tile_bounds(tileset, z, y, x)
+
+        if self.feature_provider.name == 'PostgreSQL':
+            return self._build_postgresql_tile(tileset, bounds)
+
+        return self._build_python_tile(tileset, bounds)
+
+    def _build_postgresql_tile(self, tileset, bounds):
+        """
+        Build a tile in PostGIS (ST_AsMVTGeom/ST_AsMVT)
+
+        :param tileset: tile matrix set identifier
+        :param bounds: tuple of tile bounds, in tile matrix set CRS
+
+        :returns: `bytes` of encoded mvt tile
+        """
+
+        provider = self.feature_provider
+        engine = provider._engine
+        table = provider.table_model.__table__
+        quote = engine.dialect.identifier_preparer.quote
+        geom = quote(provider.geom)
+
+        columns = [column for column in table.columns.keys()
+                   if column != provider.geom]
+        if provider.properties:
+            columns = [column for column in columns if column in
+                       provider.properties or column == provider.id_field]
+        properties = ''.join(f', t.{quote(column)}' for column in columns)
+        from_ = engine.dialect.identifier_preparer.format_table(table)
+
+        try:
+            id_type = table.columns[provider.id_field].type.python_type
+        except (KeyError, NotImplementedError):
+            id_type = None
+        feature_id = ', :id_field' if id_type is int else ''
+
+        # features within the tile buffer are clipped into the tile
+        # (the buffer must not cross the antimeridian)
+        minx, miny, maxx, maxy = bounds
+        buffer = (maxx - minx) * self.buffer / self.extent
+        tms_bounds = TILE_MATRIX_SETS[tileset]['bounds']
+
+        sql = f'''
+            WITH bounds AS (
+                SELECT ST_MakeEnvelope(:minx, :miny, :maxx, :maxy,
+                                       :srid) AS geom,
+                       ST_MakeEnvelope(:bminx, :bminy, :bmaxx, :bmaxy,
+                                       :srid) AS buffer_geom
+            ),
+            mvtgeom AS (
+                SELECT ST_AsMVTGeom(ST_Transform(t.{geom}, :srid),
+                                    bounds.geom, :extent, :buffer,
+                                    true) AS mvt_geom{properties}
+                FROM {from_} t, bounds
+                WHERE t.{geom} && ST_Transform(bounds.buffer_geom,
+                                               :storage_srid)
+                LIMIT :max_features
+            )
+            SELECT ST_AsMVT(mvtgeom.*, :layer, :extent,
+                            'mvt_geom'{feature_id})
+            FROM mvtgeom
+        '''
+
+        params = {
+            'minx': minx, 'miny': miny, 'maxx': maxx, 'maxy': maxy,
+            'bminx': max(minx - buffer, tms_bounds[0]),
+            'bminy': max(miny - buffer, tms_bounds[1]),
+            'bmaxx': min(maxx + buffer, tms_bounds[2]),
+            'bmaxy': min(maxy + buffer, tms_bounds[3]),
+            'srid': TILE_MATRIX_SETS[tileset]['srid'],
+            'extent': self.extent, 'buffer': self.buffer,
+            'max_features': self.max_features, 'layer': self.layer,
+            'id_field': provider.id_field
+        }
+
+        try:
+            params['storage_srid'] = self._get_storage_srid()
+            with engine.connect() as conn:
+                tile = conn.execute(text(sql), params).scalar()
+        except Exception as err:
+            LOGGER.error(err)
+            raise ProviderTileQueryError(err)
+
+        return bytes(tile or b'')
+
+    def _get_storage_srid(self):
+        """
+        Get the SRID of the geometries of the PostgreSQL table, from the
+        `storage_crs` of the provider definition or else from the table
+
+        :returns: `int` of SRID
+        """
+
+        from pygeoapi.provider.postgresql import _get_srid
+
+        if self._storage_srid is not None:
+            return self._storage_srid
+
+        provider = self.feature_provider
+        geom_column = provider.table_model.__table__.columns[provider.geom]
+
+        srid = None
+        if self.storage_crs != TileMatrixSetEnum.WORLDCRS84QUAD.value.crs:
+            crs = get_crs_from_uri(self.storage_crs)
+            srid = (_get_srid(crs.to_wkt()) or (None,))[0]
+        if srid is None:
+            srid = getattr(geom_column.type, 'srid', -1)
+        if srid is None or srid <= 0:
+            # geometry column without a type modifier
+            with provider._engine.connect() as conn:
+                srid = conn.execute(
+                    select(func.ST_SRID(geom_column))
+                    .where(geom_column.is_not(None)).limit(1)).scalar()
+
+        self._storage_srid = srid or 4326
+        return self._storage_srid
+
+    def _build_python_tile(self, tileset, bounds):
+        """
+        Build a tile by clipping, simplifying and encoding the features
+        of the feature provider
+
+        :param tileset: tile matrix set identifier
+        :param bounds: tuple of tile bounds, in tile matrix set CRS
+
+        :returns: `bytes` of encoded mvt tile
+        """
+
+        import mapbox_vector_tile
+
+        minx, miny, maxx, maxy = bounds
+        buffer = (maxx - minx) * self.buffer / self.extent
+        clip_box = box(minx - buffer, miny - buffer,
+                       maxx + buffer, maxy + buffer)
+        # tolerance of `simplify` pixels
+        tolerance = (maxx - minx) * self.simplify / self.extent
+
+        storage_crs = get_crs_from_uri(self.storage_crs)
+        tile_crs = get_crs_from_uri(get_tile_crs_uri(tileset))
+        to_tile_crs = None
+        # the buffer must not cross the antimeridian
+        tms_bounds = TILE_MATRIX_SETS[tileset]['bounds']
+        bbox = [max(clip_box.bounds[0], tms_bounds[0]),
+                max(clip_box.bounds[1], tms_bounds[1]),
+                min(clip_box.bounds[2], tms_bounds[2]),
+                min(clip_box.bounds[3], tms_bounds[3])]
+        if not storage_crs.equals(tile_crs):
+            to_tile_crs = get_transformer(storage_crs, tile_crs,
+                                          always_xy=True)
+            to_storage_crs = get_transformer(tile_crs, storage_crs,
+                                             always_xy=True)
+            bbox = list(to_storage_crs.transform_bounds(*bbox))
+
+        try:
+            features = self.feature_provider.query(
+                offset=0, limit=self.max_features, bbox=bbox)['features']
+        except Exception as err:
+            LOGGER.error(err)
+            raise ProviderTileQueryError(err)
+
+        features = [feature for feature in features
+                    if feature.get('geometry')]
+        if to_tile_crs is not None:
+            # providers may return the features they hold in memory
+            features = [dict(feature, geometry=deepcopy(feature['geometry']))
+                        for feature in features]
+            crs_transform_features(features, to_tile_crs)
+
+        mvt_features = []
+        for feature in features:
+            geometry = shape(feature['geometry'])
+            if not geometry.intersects(clip_box):
+                continue
+            geometry = geometry.intersection(clip_box)
+            if geometry.geom_type not in ['Point', 'MultiPoint']:
+                geometry = geometry.simplify(tolerance)
+            if geometry.is_empty:
+                continue
+
+            mvt_feature = {
+                'geometry': geometry,
+                'properties': {
+                    key: _mvt_value(value) for key, value in
+                    feature.get('properties', {}).items() if value is not None
+                }
+            }
+            if isinstance(feature.get('id'), int) and feature['id'] >= 0:
+                mvt_feature['id'] = feature['id']
+            mvt_features.append(mvt_feature)
+
+        layers = [{'name': self.layer, 'features': mvt_features}]
+
+        return mapbox_vector_tile.encode(layers, default_options={
+            'quantize_bounds': bounds,
+            'extents': self.extent
+        })
+
+    def get_metadata(self, dataset, server_url, layer=None,
+                     tileset=None, metadata_format=None, title=None,
+                     description=None, keywords=None, **kwargs):
+        """
+        Gets tile metadata
+
+        :param dataset: dataset name
+        :param server_url: server base url
+        :param layer: mvt tile layer name
+        :param tileset: mvt tileset name
+        :param metadata_format: format for metadata,
+                            enum TilesMetadataFormat
+
+        :returns: `dict` of JSON metadata
+        """
+
+        service_url = url_join(
+            server_url,
+            f'collections/{dataset}/tiles/{tileset}/{{tileMatrix}}/{{tileRow}}/{{tileCol}}?f=mvt')  # noqa
+
+        fields = {name: field.get('type') for name, field in
+                  self.get_fields().items()}
+        zoom = self.options['zoom']
+
+        if metadata_format in [TilesMetadataFormat.TILEJSON,
+                               TilesMetadataFormat.CUSTOMJSON]:
+            content = MVTTilesJson(
+                name=layer, tiles=service_url, description=description,
+                minzoom=zoom['min'], maxzoom=zoom['max'],
+                vector_layers=[VectorLayers(
+                    id=layer, fields=fields,
+                    minzoom=zoom['min'], maxzoom=zoom['max'])])
+            return content.dict(exclude_none=True)
+
+        tile_matrix_set = TileMatrixSetEnum.WEBMERCATORQUAD.value
+        for scheme in self.get_tiling_schemes():
+            if scheme.tileMatrixSet == tileset:
+                tile_matrix_set = scheme
+
+        content = TileSetMetadata(
+            title=title, description=description, keywords=keywords,
+            crs=tile_matrix_set.crs,
+            tileMatrixSetURI=tile_matrix_set.tileMatrixSetURI)
+        content.links = [LinkType(
+            href=service_url, rel='item', type=self.mimetype,
+            title=f'{tileset} vector tiles for {layer}')]
+        content.layers = [GeospatialDataType(id=layer)]
+
+        return content.dict(exclude_none=True)
+
+
+def _mvt_value(value):
+    """
+    Convert a property value to a type supported by MVT
+
+    :param value: property value
+
+    :returns: `str`, `int`, `float` or `bool` of value
+    """
+
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    elif isinstance(value, (dict, list)):
+        return json.dumps(value, default=str)
+
+    return str(value)
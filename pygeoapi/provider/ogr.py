@@ -30,25 +30,43 @@
 #
 # =================================================================
 
+from collections import OrderedDict
+from datetime import date, datetime
 import functools
 import importlib
+import json
 import logging
 import os
+import threading
+import time
 from typing import Any
 
 from osgeo import gdal as osgeo_gdal
 from osgeo import ogr as osgeo_ogr
 from osgeo import osr as osgeo_osr
+from shapely import wkb
+from shapely.geometry import mapping as geom_to_geojson
 
 from pygeoapi.provider.base import (
     BaseProvider, ProviderGenericError,
     ProviderQueryError, ProviderConnectionError,
     ProviderItemNotFoundError)
 
-from pygeoapi.util import get_crs_from_uri
+from pygeoapi.util import (crs_transform_features, get_crs_from_uri,
+                           get_transformer)
 
 LOGGER = logging.getLogger(__name__)
 
+#: maximum number of opened datasets kept per thread
+DATASET_POOL_SIZE = 16
+
+#: default seconds after which unused opened datasets are closed
+DATASET_IDLE_TIMEOUT = 300
+
+#: parts of the names of GDAL options holding credentials, which tell
+#: opened datasets of a same source apart
+AUTH_OPTIONS = ('AUTH', 'USERPWD', 'HEADER', 'BEARER', 'COOKIE', 'TOKEN')
+
 
 class OGRProvider(BaseProvider):
     """
@@ -142,6 +160,12 @@ class OGRProvider(BaseProvider):
         self.source_capabilities = self.data_def.get('source_capabilities',
                                                      {'paging': False})
 
+        # Read pages in batches through the columnar (Arrow) API of
+        # GDAL >= 3.6, rather than one feature at a time
+        self.arrow_stream = (
+            self.source_capabilities.get('arrow_stream', True) and
+            int(osgeo_gdal.VersionInfo('VERSION_NUM')) >= 3060000)
+
         # self.source_srs = int(self.data_def.get('source_srs',
         #                                         'EPSG:4326').split(':')[1])
         # self.target_srs = int(self.data_def.get('target_srs',
@@ -183,6 +207,11 @@ class OGRProvider(BaseProvider):
             LOGGER.error(msg)
             raise Exception(msg)
 
+        # Keep opened datasets across requests (one handle per thread)
+        self.keep_open = self.data_def.get('keep_open', True)
+        self.idle_timeout = self.data_def.get('idle_timeout',
+                                              DATASET_IDLE_TIMEOUT)
+
         # Init driver and Source connection
         self.driver = None
         self.conn = None
@@ -194,6 +223,28 @@ class OGRProvider(BaseProvider):
         return [
             f"{key}={str(value)}" for key, value in self.open_options.items()]
 
+    def _get_dataset_key(self):
+        """
+        Get the key of the opened dataset in the dataset pool: its source
+        (e.g. service URL), open options and credentials
+
+        :returns: `str` of dataset key, or `None` if the dataset is not
+                  kept open
+        """
+
+        if not self.keep_open or not self.source_helper.can_keep_open():
+            return None
+
+        options = {**self.data_def.get('gdal_ogr_options', {}),
+                   **self.data_def.get('source_options', {})}
+        auth = sorted((key, str(value)) for key, value in options.items()
+                      if any(name in key.upper() for name in AUTH_OPTIONS))
+
+        return json.dumps([
+            self.data_def['source_type'], self.data_def['source'],
+            self._list_open_options(), auth
+        ], default=str)
+
     def _open(self):
         source_type = self.data_def['source_type']
         self.driver = self.ogr.GetDriverByName(source_type)
@@ -201,6 +252,24 @@ class OGRProvider(BaseProvider):
             msg = f'No Driver for Source: {source_type}'
             LOGGER.error(msg)
             raise Exception(msg)
+
+        dataset_key = self._get_dataset_key()
+        if dataset_key is not None:
+            self.conn = _DATASET_POOL.get(dataset_key)
+
+        if self.conn is not None:
+            LOGGER.debug('Reusing opened OGR Source')
+        else:
+            self._open_dataset()
+            if dataset_key is not None:
+                _DATASET_POOL.put(dataset_key, self.conn, self.idle_timeout)
+
+        # Always need to disable paging immediately after Open!
+        if self.source_capabilities['paging']:
+            self.source_helper.disable_paging()
+
+    def _open_dataset(self):
+        source_type = self.data_def['source_type']
         if self.open_options:
             try:
                 self.conn = self.gdal.OpenEx(
@@ -235,10 +304,6 @@ class OGRProvider(BaseProvider):
             LOGGER.error(msg)
             raise Exception(msg)
 
-        # Always need to disable paging immediately after Open!
-        if self.source_capabilities['paging']:
-            self.source_helper.disable_paging()
-
     def _close(self):
         self.source_helper.close()
         self.conn = None
@@ -246,12 +311,29 @@ class OGRProvider(BaseProvider):
 
         self.driver = None
 
+    def _discard(self):
+        """
+        Discard the opened dataset from the dataset pool (e.g. after a
+        connection error), so that it is opened again on next use
+        """
+
+        dataset_key = self._get_dataset_key()
+        if dataset_key is not None:
+            _DATASET_POOL.discard(dataset_key)
+
     def _get_layer(self):
         if not self.conn:
             self._open()
 
         # Delegate getting Layer to SourceHelper
-        return self.source_helper.get_layer()
+        layer = self.source_helper.get_layer()
+
+        # Layers of kept open datasets retain filters from previous use
+        layer.SetSpatialFilter(None)
+        layer.SetAttributeFilter(None)
+        layer.ResetReading()
+
+        return layer
 
     def get_fields(self):
         """
@@ -356,7 +438,8 @@ class OGRProvider(BaseProvider):
             # Make response based on resulttype specified
             if resulttype == 'hits':
                 LOGGER.debug('hits only specified')
-                result = self._response_feature_hits(layer)
+                result = self._response_feature_hits(
+                    layer, {'bbox': bbox, 'properties': properties})
             elif resulttype == 'results':
                 LOGGER.debug('results specified')
                 result = self._response_feature_collection(
@@ -373,6 +456,7 @@ class OGRProvider(BaseProvider):
             raise ProviderQueryError(err)
         except ProviderConnectionError as err:
             LOGGER.error(err)
+            self._discard()
             raise ProviderConnectionError(err)
         except Exception as err:
             LOGGER.error(err)
@@ -449,6 +533,7 @@ class OGRProvider(BaseProvider):
             raise ProviderQueryError(err)
         except ProviderConnectionError as err:
             LOGGER.error(err)
+            self._discard()
             raise ProviderConnectionError(err)
         except ProviderItemNotFoundError as err:
             LOGGER.error(err)
@@ -555,6 +640,18 @@ class OGRProvider(BaseProvider):
         # See https://github.com/OSGeo/gdal/blob/master/autotest/
         #     ogr/ogr_wfs.py#L313
         layer.ResetReading()
+
+        if self.arrow_stream and hasattr(layer, 'GetArrowStreamAsNumPy'):
+            try:
+                feature_collection['features'] = self._read_arrow_features(
+                    layer, limit, skip_geometry=skip_geometry,
+                    crs_transform_spec=crs_transform_spec)
+                return feature_collection
+            except (RuntimeError, KeyError, ProviderGenericError) as err:
+                LOGGER.warning(f'Cannot read Arrow stream ({err}), '
+                               'reading features one by one')
+                layer.ResetReading()
+
         crs_transform_out = self._get_crs_transform(crs_transform_spec)
 
         # Keep support for source_srs/target_srs
@@ -585,22 +682,220 @@ class OGRProvider(BaseProvider):
             LOGGER.error(self.gdal.GetLastErrorMsg())
             raise gdalerr
 
-    def _response_feature_hits(self, layer):
+    def _read_arrow_features(self, layer, limit, skip_geometry=False,
+                             crs_transform_spec=None):
+        """
+        Reads features from a Layer in record batches, through the
+        GDAL columnar (Arrow) API, decoding whole attribute columns and
+        geometries at once.
+
+        :param layer: OGR layer, with filters set
+        :param limit: number of features to return
+        :param skip_geometry: bool of whether to skip geometry (default False)
+        :param crs_transform_spec: `CrsTransformSpec` instance, optional
+
+        :returns: list of GeoJSON features
+        """
+
+        layer_defn = layer.GetLayerDefn()
+        fid_column = layer.GetFIDColumn() or 'OGC_FID'
+
+        # Arrow geometry columns are named after the geometry fields
+        geom_columns = []
+        for i in range(layer_defn.GetGeomFieldCount()):
+            geom_columns.append(
+                layer_defn.GetGeomFieldDefn(i).GetName() or 'wkb_geometry')
+
+        geom_column = None
+        if geom_columns:
+            if isinstance(self.geom_field, int):
+                geom_column = geom_columns[self.geom_field]
+            else:
+                geom_column = self.geom_field or geom_columns[0]
+
+        options = [
+            'INCLUDE_FID=YES',
+            'GEOMETRY_ENCODING=WKB',
+            f'MAX_FEATURES_IN_BATCH={max(1, min(limit, 65536))}'
+        ]
+        stream = layer.GetArrowStreamAsNumPy(options=options)
+
+        features = []
+        while len(features) < limit:
+            batch = stream.GetNextRecordBatch()
+            if batch is None:
+                break
+
+            columns = {
+                name: values[:limit - len(features)].tolist()
+                for name, values in batch.items()
+            }
+            fids = columns.pop(fid_column)
+            wkbs = None if geom_column is None else columns[geom_column]
+            for name in geom_columns:
+                columns.pop(name, None)
+
+            for name, values in columns.items():
+                columns[name] = [_arrow_value(value) for value in values]
+
+            if skip_geometry or wkbs is None:
+                geometries = [None] * len(fids)
+            else:
+                geometries = [
+                    None if value is None
+                    else geom_to_geojson(wkb.loads(bytes(value)))
+                    for value in wkbs
+                ]
+
+            names = list(columns.keys())
+            for i, (fid, geometry) in enumerate(zip(fids, geometries)):
+                properties = {name: columns[name][i] for name in names}
+                features.append({
+                    'type': 'Feature',
+                    'properties': properties,
+                    'geometry': geometry,
+                    'id': properties.pop(self.id_field, fid)
+                })
+
+        if crs_transform_spec is not None and not skip_geometry:
+            # transform all coordinates of the page at once
+            transformer = get_transformer(crs_transform_spec.source_crs_wkt,
+                                          crs_transform_spec.target_crs_wkt)
+            crs_transform_features(features, transformer)
+
+        return features
+
+    def _response_feature_hits(self, layer, filters={}):
         """
         Assembles GeoJSON hits from OGR Feature count
         e.g: http://localhost:5000/collections/
         hotosm_bdi_waterways/items?resulttype=hits
 
+        :param layer: OGR layer, with filters set
+        :param filters: `dict` of query filters, as count cache key
+
         :returns: GeoJSON FeaturesCollection
         """
 
+        def estimate():
+            # only succeeds if the driver can count without a full scan
+            count = layer.GetFeatureCount(force=0)
+            return count if count >= 0 else None
+
         return {
             'type': 'FeatureCollection',
-            'numberMatched': layer.GetFeatureCount(),
+            'numberMatched': self._get_count(
+                filters, layer.GetFeatureCount, estimate, hits=True),
             'features': []
         }
 
 
+class DatasetPool:
+    """
+    Pool of opened GDAL/OGR datasets, kept per thread as GDAL dataset
+    handles must not be used from multiple threads at once.
+    Datasets unused for longer than their idle timeout are closed.
+    """
+
+    def __init__(self, size=DATASET_POOL_SIZE):
+        """
+        Initialize object
+
+        :param size: maximum number of opened datasets per thread
+
+        :returns: pygeoapi.provider.ogr.DatasetPool
+        """
+
+        self.size = size
+        self._local = threading.local()
+
+    def _get_datasets(self):
+        """
+        Get the opened datasets of the current thread
+
+        :returns: `OrderedDict` of dataset entries, least recently used first
+        """
+
+        try:
+            return self._local.datasets
+        except AttributeError:
+            self._local.datasets = OrderedDict()
+            return self._local.datasets
+
+    def get(self, key):
+        """
+        Get an opened dataset of the current thread
+
+        :param key: `str` of dataset key
+
+        :returns: GDAL dataset, or `None` if not opened
+        """
+
+        datasets = self._get_datasets()
+        self._expire(datasets)
+
+        entry = datasets.get(key)
+        if entry is None:
+            return None
+
+        datasets.move_to_end(key)
+        entry['used'] = time.monotonic()
+        return entry['dataset']
+
+    def put(self, key, dataset, idle_timeout=DATASET_IDLE_TIMEOUT):
+        """
+        Keep an opened dataset for the current thread
+
+        :param key: `str` of dataset key
+        :param dataset: GDAL dataset
+        :param idle_timeout: seconds after which the unused dataset is closed
+
+        :returns: `None`
+        """
+
+        datasets = self._get_datasets()
+        datasets[key] = {
+            'dataset': dataset,
+            'used': time.monotonic(),
+            'idle_timeout': idle_timeout
+        }
+        datasets.move_to_end(key)
+
+        while len(datasets) > self.size:
+            datasets.popitem(last=False)
+
+    def discard(self, key):
+        """
+        Close an opened dataset of the current thread
+
+        :param key: `str` of dataset key
+
+        :returns: `None`
+        """
+
+        self._get_datasets().pop(key, None)
+
+    def _expire(self, datasets):
+        """
+        Close the datasets which have been unused for too long
+
+        :param datasets: `OrderedDict` of dataset entries
+
+        :returns: `None`
+        """
+
+        now = time.monotonic()
+        expired = [key for key, entry in datasets.items()
+                   if now - entry['used'] > entry['idle_timeout']]
+
+        for key in expired:
+            LOGGER.debug(f'Closing idle OGR Source {key}')
+            del datasets[key]
+
+
+_DATASET_POOL = DatasetPool()
+
+
 class InvalidHelperError(Exception):
     """Invalid helper"""
     pass
@@ -661,6 +956,17 @@ class SourceHelper:
 
         pass
 
+    def can_keep_open(self):
+        """
+        Whether the dataset opened for the current query can be kept
+        open and shared with later queries (OGR Driver-specific).
+        Default is yes.
+
+        :returns: `bool`
+        """
+
+        return True
+
 
 class CommonSourceHelper(SourceHelper):
     """
@@ -819,6 +1125,15 @@ class WFSHelper(SourceHelper):
 
         super().__init__(provider)
 
+        self.offset = -1
+
+    def close(self):
+        """
+        Forget the paging of the last query
+        """
+
+        self.offset = -1
+
     def enable_paging(self, offset=-1, limit=-1):
         """
         Enable paged access to dataset (OGR Driver-specific)
@@ -834,6 +1149,7 @@ class WFSHelper(SourceHelper):
             'OGR_WFS_BASE_START_INDEX', str(offset))
         self.provider.gdal.SetConfigOption(
             'OGR_WFS_PAGE_SIZE', str(limit))
+        self.offset = offset
 
     def disable_paging(self):
         """
@@ -845,6 +1161,17 @@ class WFSHelper(SourceHelper):
         self.provider.gdal.SetConfigOption(
             'OGR_WFS_PAGE_SIZE', None)
 
+    def can_keep_open(self):
+        """
+        GDAL requests the start index of a page from the service when
+        opening the dataset: pages after the first one are read from a
+        dataset of their own, so that the service does the paging
+
+        :returns: `bool`
+        """
+
+        return self.offset <= 0
+
 
 class GdalErrorHandler:
 
@@ -910,6 +1237,23 @@ def _silent_gdal_error(f):
     return wrapper
 
 
+def _arrow_value(value):
+    """
+    Convert a value decoded from an Arrow record batch to a JSON
+    serializable value
+
+    :param value: Python value of Arrow column
+
+    :returns: JSON serializable value
+    """
+
+    if isinstance(value, bytes):
+        return value.decode('utf-8', errors='replace')
+    elif isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
 @_silent_gdal_error
 def _ignore_gdal_error(inst, fn, *args, **kwargs) -> Any:
     """
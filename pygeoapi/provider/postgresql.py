@@ -48,6 +48,10 @@
 # gunzip < tests/data/hotosm_bdi_waterways.sql.gz |
 #  psql -U postgres -h 127.0.0.1 -p 5432 test
 
+import base64
+import binascii
+import functools
+import json
 import logging
 
 from copy import deepcopy
@@ -57,16 +61,21 @@ from geoalchemy2.shape import to_shape
 from pygeofilter.backends.sqlalchemy.evaluate import to_filter
 import pyproj
 import shapely
-from sqlalchemy import create_engine, MetaData, PrimaryKeyConstraint, asc, desc
+from sqlalchemy import (create_engine, MetaData, PrimaryKeyConstraint, asc,
+                        cast, desc, false, func, literal, null, or_, select,
+                        JSON, Text)
 from sqlalchemy.engine import URL
-from sqlalchemy.exc import InvalidRequestError, OperationalError
+from sqlalchemy.exc import (InvalidRequestError, OperationalError,
+                            ProgrammingError)
 from sqlalchemy.ext.automap import automap_base
 from sqlalchemy.orm import Session, load_only
 from sqlalchemy.sql.expression import and_
 
 from pygeoapi.provider.base import BaseProvider, \
-    ProviderConnectionError, ProviderQueryError, ProviderItemNotFoundError
-from pygeoapi.util import get_transform_from_crs
+    ProviderConnectionError, ProviderInvalidQueryError, ProviderQueryError, \
+    ProviderItemNotFoundError
+from pygeoapi.util import (CRS_CACHE_SIZE, get_crs_from_wkt,
+                           get_transform_from_crs, RawJSON)
 
 
 _ENGINE_STORE = {}
@@ -79,6 +88,9 @@ class PostgreSQLProvider(BaseProvider):
     using sync approach and server side
     cursor (using support class DatabaseCursor)
     """
+
+    thread_safe = True
+
     def __init__(self, provider_def):
         """
         PostgreSQLProvider Class constructor
@@ -111,7 +123,8 @@ class PostgreSQLProvider(BaseProvider):
     def query(self, offset=0, limit=10, resulttype='results',
               bbox=[], datetime_=None, properties=[], sortby=[],
               select_properties=[], skip_geometry=False, q=None,
-              filterq=None, crs_transform_spec=None, **kwargs):
+              filterq=None, crs_transform_spec=None, cursor=None,
+              stream=False, **kwargs):
         """
         Query Postgis for all the content.
         e,g: http://localhost:5000/collections/hotosm_bdi_waterways/items?
@@ -129,6 +142,10 @@ class PostgreSQLProvider(BaseProvider):
         :param q: full-text search term(s)
         :param filterq: CQL query as text string
         :param crs_transform_spec: `CrsTransformSpec` instance, optional
+        :param cursor: opaque keyset pagination token (from `next_cursor`
+                       of a previous page), used instead of offset
+        :param stream: bool of whether to return features as raw JSON
+                       fragments (default False)
 
         :returns: GeoJSON FeatureCollection
         """
@@ -137,7 +154,25 @@ class PostgreSQLProvider(BaseProvider):
         property_filters = self._get_property_filters(properties)
         cql_filters = self._get_cql_filters(filterq)
         bbox_filter = self._get_bbox_filter(bbox)
+        keyset = self._get_keyset(sortby)
+        keyset_filter = self._get_keyset_filter(keyset, cursor)
         order_by_clauses = self._get_order_by_clauses(sortby, self.table_model)
+
+        matched = self._get_matched(
+            [property_filters, cql_filters, bbox_filter],
+            {'properties': properties, 'bbox': bbox, 'filterq': filterq},
+            hits=resulttype == 'hits')
+        LOGGER.debug(f'Found {matched} result(s)')
+
+        target_srid = self._get_target_srid(crs_transform_spec)
+        if crs_transform_spec is None or target_srid is not None:
+            # PostGIS builds the GeoJSON features
+            return self._query_geojson(
+                matched, offset, limit, resulttype, property_filters,
+                cql_filters, bbox_filter, keyset, keyset_filter,
+                order_by_clauses, select_properties, skip_geometry,
+                target_srid, stream)
+
         selected_properties = self._select_properties_clause(select_properties,
                                                              skip_geometry)
 
@@ -148,37 +183,199 @@ class PostgreSQLProvider(BaseProvider):
                        .filter(property_filters)
                        .filter(cql_filters)
                        .filter(bbox_filter)
+                       .filter(keyset_filter)
                        .order_by(*order_by_clauses)
                        .options(selected_properties)
                        .offset(offset))
 
-            matched = results.count()
-            if limit < matched:
-                returned = limit
-            else:
-                returned = matched
-
-            LOGGER.debug(f'Found {matched} result(s)')
-
             LOGGER.debug('Preparing response')
             response = {
                 'type': 'FeatureCollection',
                 'features': [],
-                'numberMatched': matched,
-                'numberReturned': returned
+                'numberReturned': 0
             }
+            if matched is not None:
+                response['numberMatched'] = matched
 
             if resulttype == "hits" or not results:
-                response['numberReturned'] = 0
                 return response
             crs_transform_out = self._get_crs_transform(crs_transform_spec)
             for item in results.limit(limit):
                 response['features'].append(
                     self._sqlalchemy_to_feature(item, crs_transform_out)
                 )
+            response['numberReturned'] = len(response['features'])
+
+        return response
+
+    def _query_geojson(self, matched, offset, limit, resulttype,
+                       property_filters, cql_filters, bbox_filter, keyset,
+                       keyset_filter, order_by_clauses, select_properties,
+                       skip_geometry, target_srid, stream):
+        """
+        Query features serialized as GeoJSON by PostGIS
+        (`ST_AsGeoJSON`/`json_build_object`), skipping ORM hydration
+
+        :returns: GeoJSON FeatureCollection
+        """
+
+        filters = [property_filters, cql_filters, bbox_filter]
+
+        response = {
+            'type': 'FeatureCollection',
+            'features': [],
+            'numberReturned': 0
+        }
+        if matched is not None:
+            response['numberMatched'] = matched
+        if resulttype == 'hits':
+            return response
+
+        # sort key values (as text) of each row, for the next cursor
+        key_columns = [cast(getattr(self.table_model, name), Text)
+                       for name, _ in keyset]
+        feature = self._geojson_feature_clause(
+            select_properties, skip_geometry, target_srid)
+
+        query = select(cast(feature, Text), *key_columns)
+        for filter_ in filters + [keyset_filter]:
+            query = query.where(filter_)
+        query = query.order_by(*order_by_clauses).offset(offset).limit(limit)
+
+        LOGGER.debug('Querying PostGIS')
+        with self._engine.connect() as connection:
+            rows = connection.execute(query).fetchall()
+
+        if stream:
+            response['features'] = [RawJSON(row[0]) for row in rows]
+        else:
+            response['features'] = [json.loads(row[0]) for row in rows]
+        response['numberReturned'] = len(rows)
+
+        if len(rows) == limit:
+            # NULL sort keys are kept (as null) in the cursor
+            response['next_cursor'] = self._encode_cursor(
+                keyset, list(rows[-1][1:]))
 
         return response
 
+    def _get_matched(self, filters, count_filters, hits=False):
+        """
+        Get numberMatched according to the count policy: an exact
+        `count(*)` (optionally cached), the planner estimate, or none
+
+        :param filters: list of SQLAlchemy filter clauses
+        :param count_filters: `dict` of query parameters, as cache key
+        :param hits: `bool` of whether only hits were requested
+
+        :returns: `int` of count, or `None` if omitted
+        """
+
+        table = self.table_model.__table__
+
+        def exact():
+            query = select(func.count()).select_from(table)
+            for filter_ in filters:
+                query = query.where(filter_)
+            with self._engine.connect() as connection:
+                return connection.execute(query).scalar()
+
+        def estimate():
+            query = select(getattr(self.table_model, self.id_field))
+            for filter_ in filters:
+                query = query.where(filter_)
+            return self._get_estimated_count(query)
+
+        return self._get_count(count_filters, exact, estimate, hits)
+
+    def _get_estimated_count(self, query):
+        """
+        Estimate the number of rows of a query from the query planner
+        statistics (`EXPLAIN`), without executing it
+
+        :param query: SQLAlchemy select
+
+        :returns: `int` of estimated count, or `None` if unavailable
+        """
+
+        try:
+            with self._engine.connect() as connection:
+                compiled = query.compile(dialect=connection.dialect)
+                plan = connection.exec_driver_sql(
+                    f'EXPLAIN (FORMAT JSON) {compiled}',
+                    compiled.params).scalar()
+        except (OperationalError, ProgrammingError) as err:
+            LOGGER.warning(f'Cannot estimate count: {err}')
+            return None
+
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    def _geojson_feature_clause(self, select_properties, skip_geometry,
+                                target_srid=None):
+        """
+        Build a `json_build_object` clause serializing a row as a
+        GeoJSON feature
+
+        :param select_properties: list of property names
+        :param skip_geometry: bool of whether to skip geometry
+        :param target_srid: tuple of SRID to transform geometries to and
+                            `bool` of whether to swap axes, optional
+
+        :returns: SQLAlchemy clause
+        """
+
+        if skip_geometry:
+            geometry = null()
+        else:
+            geometry = getattr(self.table_model, self.geom)
+            if target_srid is not None:
+                srid, swap_axes = target_srid
+                geometry = func.ST_Transform(geometry, srid)
+                if swap_axes:
+                    geometry = func.ST_FlipCoordinates(geometry)
+            geometry = cast(func.ST_AsGeoJSON(geometry, 15), JSON)
+
+        properties = []
+        for column_name in self._get_property_names(select_properties):
+            properties.extend([column_name,
+                               getattr(self.table_model, column_name)])
+
+        # json_build_object() takes at most 100 arguments
+        if len(properties) <= 100:
+            properties = func.json_build_object(*properties)
+        else:
+            chunks = [func.jsonb_build_object(*properties[i:i+100])
+                      for i in range(0, len(properties), 100)]
+            properties = chunks[0]
+            for chunk in chunks[1:]:
+                properties = properties.op('||')(chunk)
+            properties = cast(properties, JSON)
+
+        return func.json_build_object(
+            'type', 'Feature',
+            'id', getattr(self.table_model, self.id_field),
+            'geometry', geometry,
+            'properties', properties)
+
+    def health_check(self):
+        """
+        Check that the database is reachable
+
+        :returns: `bool` of provider health
+        """
+
+        try:
+            with self._engine.connect() as connection:
+                connection.execute(select(1))
+        except OperationalError as err:
+            LOGGER.warning(f'Database not reachable: {err}')
+            return False
+
+        return True
+
     def get_fields(self):
         """
         Return fields (columns) from PostgreSQL table
@@ -381,14 +578,94 @@ class PostgreSQLProvider(BaseProvider):
         for sort_by_dict in sort_by:
             model_column = getattr(table_model, sort_by_dict['property'])
             order_function = asc if sort_by_dict['order'] == '+' else desc
-            clauses.append(order_function(model_column))
+            # NULLs sort last in both directions, as assumed by the
+            # keyset filter of cursor pagination
+            clauses.append(order_function(model_column).nulls_last())
 
-        # Otherwise sort by primary key (to ensure reproducible output)
-        if not clauses:
+        # Always end with the primary key (to ensure reproducible output
+        # and a unique keyset for cursor pagination)
+        if self.id_field not in [s['property'] for s in sort_by]:
             clauses.append(asc(getattr(table_model, self.id_field)))
 
         return clauses
 
+    def _get_keyset(self, sort_by):
+        """
+        Get the sort keys identifying a row's position in the result set
+
+        :param sort_by: list of dicts (property, order)
+
+        :returns: list of tuples (property, order)
+        """
+
+        keyset = [(s['property'], s['order']) for s in sort_by]
+        if self.id_field not in [name for name, _ in keyset]:
+            keyset.append((self.id_field, '+'))
+
+        return keyset
+
+    def _encode_cursor(self, keyset, values):
+        """
+        Encode the sort key values of the last row of a page as an
+        opaque cursor token
+
+        :param keyset: list of tuples (property, order)
+        :param values: list of `str` of sort key values (`None` for NULL)
+
+        :returns: `str` of cursor token
+        """
+
+        token = json.dumps({'k': keyset, 'v': values},
+                           separators=(',', ':'))
+        return base64.urlsafe_b64encode(token.encode()).decode().rstrip('=')
+
+    def _get_keyset_filter(self, keyset, cursor):
+        """
+        Build a filter selecting the rows after a cursor token
+        (keyset pagination)
+
+        :param keyset: list of tuples (property, order)
+        :param cursor: `str` of cursor token, optional
+
+        :returns: SQLAlchemy clause
+        """
+
+        if not cursor:
+            return True
+
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            token = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            token_keyset = [tuple(key) for key in token['k']]
+            values = token['v']
+        except (binascii.Error, ValueError, KeyError, TypeError) as err:
+            LOGGER.error(err)
+            raise ProviderInvalidQueryError('Invalid cursor')
+
+        if token_keyset != keyset or len(values) != len(keyset):
+            msg = 'Cursor does not match the requested sortby'
+            LOGGER.error(msg)
+            raise ProviderInvalidQueryError(msg)
+
+        # (a > x) OR (a = x AND b > y) OR ..., with NULLs sorted last
+        # in both directions: nothing sorts after a NULL key but other
+        # NULLs, and NULLs sort after any non-NULL key
+        clauses = []
+        equals = []
+        for (name, order), value in zip(keyset, values):
+            column = getattr(self.table_model, name)
+            if value is None:
+                equals.append(column.is_(None))
+                continue
+
+            # cursor values are stored as text and cast back server-side
+            value = cast(literal(value, Text), column.type)
+            after = column > value if order == '+' else column < value
+            clauses.append(and_(*equals, or_(after, column.is_(None))))
+            equals.append(column == value)
+
+        return or_(false(), *clauses)
+
     def _get_cql_filters(self, filterq):
         if not filterq:
             return True  # Let everything through
@@ -426,6 +703,44 @@ class PostgreSQLProvider(BaseProvider):
 
         return bbox_filter
 
+    def _get_property_names(self, select_properties):
+        """
+        Get the names of the columns to return as feature properties
+
+        :param select_properties: list of property names
+
+        :returns: list of column names
+        """
+
+        # get_fields() doesn't include geometry column
+        column_names = [name for name in self.fields.keys()
+                        if name != self.id_field]
+        if select_properties:
+            column_names = [name for name in column_names
+                            if name in select_properties]
+
+        if self.properties:  # optional subset of properties defined in config
+            column_names = [name for name in column_names
+                            if name in self.properties]
+
+        return column_names
+
+    def _get_target_srid(self, crs_transform_spec=None):
+        """
+        Get the EPSG code PostGIS should transform geometries to
+
+        :param crs_transform_spec: `CrsTransformSpec` instance, optional
+
+        :returns: tuple of `int` SRID and `bool` of whether the target CRS
+                  has northing/easting axis order, or `None` when the
+                  target CRS has no EPSG code
+        """
+
+        if crs_transform_spec is None:
+            return None
+
+        return _get_srid(crs_transform_spec.target_crs_wkt)
+
     def _select_properties_clause(self, select_properties, skip_geometry):
         # List the column names that we want
         if select_properties:
@@ -456,9 +771,34 @@ class PostgreSQLProvider(BaseProvider):
     def _get_crs_transform(self, crs_transform_spec=None):
         if crs_transform_spec is not None:
             crs_transform = get_transform_from_crs(
-                pyproj.CRS.from_wkt(crs_transform_spec.source_crs_wkt),
-                pyproj.CRS.from_wkt(crs_transform_spec.target_crs_wkt),
+                get_crs_from_wkt(crs_transform_spec.source_crs_wkt),
+                get_crs_from_wkt(crs_transform_spec.target_crs_wkt),
             )
         else:
             crs_transform = None
         return crs_transform
+
+
+@functools.lru_cache(maxsize=CRS_CACHE_SIZE)
+def _get_srid(crs_wkt):
+    """
+    Get the PostGIS SRID of a CRS
+
+    :param crs_wkt: WKT of the CRS
+
+    :returns: tuple of `int` SRID and `bool` of whether the CRS has
+              northing/easting axis order, or `None` if the CRS has no
+              EPSG code
+    """
+
+    crs = get_crs_from_wkt(crs_wkt)
+    if crs.equals(pyproj.CRS.from_string('OGC:CRS84')):
+        return 4326, False
+
+    srid = crs.to_epsg()
+    if srid is None:
+        return None
+
+    swap_axes = crs.axis_info[0].direction in ['north', 'south']
+
+    return srid, swap_axes
@@ -28,18 +28,34 @@
 # =================================================================
 
 import logging
+from math import ceil
+import os
+import tempfile
 
+from affine import Affine
 from pyproj import CRS, Transformer
 import rasterio
-from rasterio.io import MemoryFile
-import rasterio.mask
+from rasterio.enums import Resampling
+from rasterio.errors import WindowError
+from rasterio.features import geometry_mask, geometry_window
+from rasterio.windows import Window
+from shapely.geometry import box
 
 from pygeoapi.provider.base import (BaseProvider, ProviderConnectionError,
                                     ProviderQueryError)
-from pygeoapi.util import read_data
+from pygeoapi.util import iter_file, read_data
 
 LOGGER = logging.getLogger(__name__)
 
+#: size (in bytes) of native outputs from which they are streamed
+STREAM_SIZE = 16777216
+
+#: size (in bytes) of the chunks of streamed outputs
+CHUNK_SIZE = 1048576
+
+#: minimum number of rows read at once when encoding native outputs
+CHUNK_ROWS = 256
+
 
 class RasterioProvider(BaseProvider):
     """Rasterio Provider"""
@@ -162,7 +178,8 @@ class RasterioProvider(BaseProvider):
         return rangetype
 
     def query(self, properties=[], subsets={}, bbox=None, bbox_crs=4326,
-              datetime_=None, format_='json', **kwargs):
+              datetime_=None, format_='json', scale_factor=None,
+              scale_size=None, **kwargs):
         """
         Extract data from collection collection
         :param properties: list of bands
@@ -170,35 +187,38 @@ class RasterioProvider(BaseProvider):
         :param bbox: bounding box [minx,miny,maxx,maxy]
         :param datetime_: temporal (datestamp or extent)
         :param format_: data format of output
+        :param scale_factor: `float` of factor to divide the resolution of
+                             the output by
+        :param scale_size: `dict` of axis names with number of cells of
+                           the output
 
         :returns: coverage data as dict of CoverageJSON or native format
+                  (generator of chunks for large outputs)
         """
 
         bands = properties
         LOGGER.debug(f'Bands: {bands}, subsets: {subsets}')
 
-        args = {
-            'indexes': None
-        }
-        shapes = []
+        indexes = None
+        bounds = None
 
         if not bbox:
             bbox = []
 
-        if all([not bands, not subsets, not bbox, format_ != 'json']):
+        if all([not bands, not subsets, not bbox, not scale_factor,
+                not scale_size, format_ != 'json']):
             LOGGER.debug('No parameters specified, returning native data')
-            return read_data(self.data)
+            return self._read_native_data()
+
+        x = self._coverage_properties['x_axis_label']
+        y = self._coverage_properties['y_axis_label']
 
-        if all([self._coverage_properties['x_axis_label'] in subsets,
-                self._coverage_properties['y_axis_label'] in subsets,
-                len(bbox) > 0]):
+        if all([x in subsets, y in subsets, len(bbox) > 0]):
             msg = 'bbox and subsetting by coordinates are exclusive'
             LOGGER.warning(msg)
             raise ProviderQueryError(msg)
 
         if len(bbox) > 0:
-            minx, miny, maxx, maxy = bbox
-
             crs_src = CRS.from_epsg(bbox_crs)
 
             if self.options and 'crs' in self.options:
@@ -208,120 +228,230 @@ class RasterioProvider(BaseProvider):
 
             if crs_src == crs_dest:
                 LOGGER.debug('source bbox CRS and data CRS are the same')
-                shapes = [{
-                   'type': 'Polygon',
-                   'coordinates': [[
-                       [minx, miny],
-                       [minx, maxy],
-                       [maxx, maxy],
-                       [maxx, miny],
-                       [minx, miny],
-                   ]]
-                }]
+                bounds = bbox
             else:
                 LOGGER.debug('source bbox CRS and data CRS are different')
                 LOGGER.debug('reprojecting bbox into native coordinates')
 
                 t = Transformer.from_crs(crs_src, crs_dest, always_xy=True)
-                minx2, miny2 = t.transform(minx, miny)
-                maxx2, maxy2 = t.transform(maxx, maxy)
-
-                LOGGER.debug(f'Source coordinates: {minx}, {miny}, {maxx}, {maxy}')  # noqa
-                LOGGER.debug(f'Destination: {minx2}, {miny2}, {maxx2}, {maxy2}')  # noqa
-
-                shapes = [{
-                   'type': 'Polygon',
-                   'coordinates': [[
-                       [minx2, miny2],
-                       [minx2, maxy2],
-                       [maxx2, maxy2],
-                       [maxx2, miny2],
-                       [minx2, miny2],
-                   ]]
-                }]
-
-        elif (self._coverage_properties['x_axis_label'] in subsets and
-                self._coverage_properties['y_axis_label'] in subsets):
-            LOGGER.debug('Creating spatial subset')
+                bounds = t.transform_bounds(*bbox)
 
-            x = self._coverage_properties['x_axis_label']
-            y = self._coverage_properties['y_axis_label']
+                LOGGER.debug(f'Source coordinates: {bbox}')
+                LOGGER.debug(f'Destination: {bounds}')
 
-            shapes = [{
-               'type': 'Polygon',
-               'coordinates': [[
-                   [subsets[x][0], subsets[y][0]],
-                   [subsets[x][0], subsets[y][1]],
-                   [subsets[x][1], subsets[y][1]],
-                   [subsets[x][1], subsets[y][0]],
-                   [subsets[x][0], subsets[y][0]]
-               ]]
-            }]
+        elif x in subsets and y in subsets:
+            LOGGER.debug('Creating spatial subset')
+            bounds = [subsets[x][0], subsets[y][0],
+                      subsets[x][1], subsets[y][1]]
 
         if bands:
             LOGGER.debug('Selecting bands')
-            args['indexes'] = list(map(int, bands))
-
-        with rasterio.open(self.data) as _data:
-            LOGGER.debug('Creating output coverage metadata')
-            out_meta = _data.meta
-
-            if self.options is not None:
-                LOGGER.debug('Adding dataset options')
-                for key, value in self.options.items():
-                    out_meta[key] = value
-
-            if shapes:  # spatial subset
-                try:
-                    LOGGER.debug('Clipping data with bbox')
-                    out_image, out_transform = rasterio.mask.mask(
-                        _data,
-                        filled=False,
-                        shapes=shapes,
-                        crop=True,
-                        indexes=args['indexes'])
-                except ValueError as err:
-                    LOGGER.error(err)
-                    raise ProviderQueryError(err)
-
-                out_meta.update({'driver': self.native_format,
-                                 'height': out_image.shape[1],
-                                 'width': out_image.shape[2],
-                                 'transform': out_transform})
-            else:  # no spatial subset
-                LOGGER.debug('Creating data in memory with band selection')
-                out_image = _data.read(indexes=args['indexes'])
-
-            if bbox:
-                out_meta['bbox'] = [bbox[0], bbox[1], bbox[2], bbox[3]]
-            elif shapes:
-                out_meta['bbox'] = [
-                    subsets[x][0], subsets[y][0],
-                    subsets[x][1], subsets[y][1]
-                ]
-            else:
-                out_meta['bbox'] = [
-                    _data.bounds.left,
-                    _data.bounds.bottom,
-                    _data.bounds.right,
-                    _data.bounds.top
-                ]
-
-            out_meta['units'] = _data.units
-
-            LOGGER.debug('Serializing data in memory')
-            with MemoryFile() as memfile:
-                with memfile.open(**out_meta) as dest:
-                    dest.write(out_image)
-
-                if format_ == 'json':
-                    LOGGER.debug('Creating output in CoverageJSON')
-                    out_meta['bands'] = args['indexes']
-                    return self.gen_covjson(out_meta, out_image)
-
-                else:  # return data in native format
-                    LOGGER.debug('Returning data in native format')
-                    return memfile.read()
+            indexes = list(map(int, bands))
+
+        shapes = []
+        if bounds is not None:
+            shapes = [box(*bounds)]
+            try:
+                LOGGER.debug('Computing window of bbox')
+                window = geometry_window(self._data, shapes)
+            except WindowError as err:
+                LOGGER.error(err)
+                raise ProviderQueryError(err)
+        else:
+            window = Window(0, 0, self._data.width, self._data.height)
+
+        width, height = self._get_output_size(window, scale_factor,
+                                              scale_size)
+        LOGGER.debug(f'Window: {window}, output size: {width}x{height}')
+
+        LOGGER.debug('Creating output coverage metadata')
+        out_meta = self._data.meta.copy()
+
+        if self.options is not None:
+            LOGGER.debug('Adding dataset options')
+            for key, value in self.options.items():
+                out_meta[key] = value
+
+        out_meta.update({
+            'driver': self.native_format,
+            'count': len(indexes) if indexes else self._data.count,
+            'height': height,
+            'width': width,
+            'transform': self._data.window_transform(window) * Affine.scale(
+                window.width / width, window.height / height)
+        })
+
+        if bbox:
+            out_meta['bbox'] = [bbox[0], bbox[1], bbox[2], bbox[3]]
+        elif shapes:
+            out_meta['bbox'] = [
+                subsets[x][0], subsets[y][0],
+                subsets[x][1], subsets[y][1]
+            ]
+        else:
+            out_meta['bbox'] = [
+                self._data.bounds.left,
+                self._data.bounds.bottom,
+                self._data.bounds.right,
+                self._data.bounds.top
+            ]
+
+        out_meta['units'] = self._data.units
+
+        if format_ == 'json':
+            LOGGER.debug('Creating output in CoverageJSON')
+            out_image = self._read_window(window, indexes, shapes,
+                                          out_meta['transform'], 0, height,
+                                          width, height)
+            out_meta['bands'] = indexes
+            return self.gen_covjson(out_meta, out_image)
+
+        LOGGER.debug('Returning data in native format')
+        return self._write_native_data(out_meta, window, indexes, shapes)
+
+    def _get_output_size(self, window, scale_factor=None, scale_size=None):
+        """
+        Helper function to compute the size of an output grid
+
+        :param window: `rasterio.windows.Window` of data to read
+        :param scale_factor: `float` of factor to divide the resolution of
+                             the output by
+        :param scale_size: `dict` of axis names with number of cells of
+                           the output
+
+        :returns: tuple of width and height of output
+        """
+
+        width, height = ceil(window.width), ceil(window.height)
+
+        if scale_factor:
+            width = max(1, round(window.width / scale_factor))
+            height = max(1, round(window.height / scale_factor))
+
+        if scale_size:
+            width = scale_size.get(
+                self._coverage_properties['x_axis_label'], width)
+            height = scale_size.get(
+                self._coverage_properties['y_axis_label'], height)
+
+        return width, height
+
+    def _get_chunks(self, window, height):
+        """
+        Helper function to split the rows of an output grid in chunks
+        aligned on the blocks of the data, so that each block is read once
+
+        :param window: `rasterio.windows.Window` of data to read
+        :param height: height of output
+
+        :returns: generator of tuples of first and last (excluded) rows
+        """
+
+        block_height = self._data.block_shapes[0][0]
+        chunk_height = block_height * max(1, CHUNK_ROWS // block_height)
+        scale = window.height / height
+
+        row = 0
+        boundary = (window.row_off // chunk_height + 1) * chunk_height
+        while row < height:
+            next_row = min(height, max(
+                row + 1, round((boundary - window.row_off) / scale)))
+            yield row, next_row
+            row = next_row
+            boundary += chunk_height
+
+    def _read_window(self, window, indexes, shapes, transform, row,
+                     next_row, width, height):
+        """
+        Helper function to read rows of an output grid, from the overview
+        of the data closest to the output resolution
+
+        :param window: `rasterio.windows.Window` of data to read
+        :param indexes: list of bands (or `None` for all bands)
+        :param shapes: list of geometries outside of which cells are masked
+        :param transform: `affine.Affine` transform of output
+        :param row: first row to read
+        :param next_row: last row (excluded) to read
+        :param width: width of output
+        :param height: height of output
+
+        :returns: `numpy.ndarray` (masked if `shapes`) of bands, rows
+                  and columns
+        """
+
+        scale = window.height / height
+        count = len(indexes) if indexes else self._data.count
+        rows = Window(window.col_off, window.row_off + row * scale,
+                      window.width, (next_row - row) * scale)
+
+        data = self._data.read(
+            indexes=indexes, window=rows, masked=bool(shapes),
+            out_shape=(count, next_row - row, width),
+            resampling=Resampling.nearest)
+
+        if shapes:
+            data.mask |= geometry_mask(
+                shapes, out_shape=(next_row - row, width),
+                transform=transform * Affine.translation(0, row))
+
+        return data
+
+    def _write_native_data(self, out_meta, window, indexes, shapes):
+        """
+        Helper function to encode an output grid in the native format,
+        chunk by chunk
+
+        :param out_meta: `dict` of output metadata
+        :param window: `rasterio.windows.Window` of data to read
+        :param indexes: list of bands (or `None` for all bands)
+        :param shapes: list of geometries outside of which cells are masked
+
+        :returns: `bytes` of output, or generator of `bytes` chunks for
+                  large outputs
+        """
+
+        width, height = out_meta['width'], out_meta['height']
+
+        fd, filename = tempfile.mkstemp(prefix='pygeoapi-rasterio-')
+        os.close(fd)
+        try:
+            LOGGER.debug('Serializing data')
+            with rasterio.open(filename, 'w', **out_meta) as dest:
+                for row, next_row in self._get_chunks(window, height):
+                    data = self._read_window(
+                        window, indexes, shapes, out_meta['transform'],
+                        row, next_row, width, height)
+                    dest.write(data, window=Window(
+                        0, row, width, next_row - row))
+
+            if os.path.getsize(filename) > STREAM_SIZE:
+                LOGGER.debug('Streaming large output')
+                return iter_file(filename, CHUNK_SIZE, delete=True)
+
+            with open(filename, 'rb') as fh:
+                content = fh.read()
+        except Exception:
+            os.remove(filename)
+            raise
+
+        os.remove(filename)
+        return content
+
+    def _read_native_data(self):
+        """
+        Helper function to read the data in its native format
+
+        :returns: `bytes` of data, or generator of `bytes` chunks for
+                  large local files
+        """
+
+        if (isinstance(self.data, str) and
+                not self.data.startswith(('http', 's3')) and
+                os.path.getsize(self.data) > STREAM_SIZE):
+            LOGGER.debug('Streaming large file')
+            return iter_file(self.data, CHUNK_SIZE)
+
+        return read_data(self.data)
 
     def gen_covjson(self, metadata, data):
         """
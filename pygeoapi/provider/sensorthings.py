@@ -29,13 +29,12 @@
 #
 # =================================================================
 
-from json.decoder import JSONDecodeError
 import os
 import logging
-from requests import Session
 
 from pygeoapi.provider.base import (
     BaseProvider, ProviderQueryError, ProviderConnectionError)
+from pygeoapi.provider.http_ import get_http_client
 from pygeoapi.util import (
     yaml_load, url_join, get_provider_default, crs_transform, get_base_url)
 
@@ -141,7 +140,7 @@ class SensorThingsProvider(BaseProvider):
                 }
 
         # Start session
-        self.http = Session()
+        self.http = get_http_client(provider_def)
         self.get_fields()
 
     def get_fields(self):
@@ -251,15 +250,24 @@ class SensorThingsProvider(BaseProvider):
         response = self._get_response(url=self._url, params=params)
         v = response.get('value')
 
-        # Query if values are less than expected
-        while len(v) < limit:
-            try:
-                LOGGER.debug('Fetching next set of values')
-                next_ = response['@iot.nextLink']
-                response = self._get_response(next_)
-                v.extend(response['value'])
-            except (ProviderConnectionError, KeyError):
-                break
+        # Query if values are less than expected, the pages following
+        # the first one (as per @iot.nextLink) being fetched concurrently
+        if v and len(v) < limit and '@iot.nextLink' in response:
+            step = len(v)
+
+            def get_page(skip):
+                page_params = {**params, '$skip': str(skip), '$top': str(step)}
+                try:
+                    return self._get_response(self._url, page_params)['value']
+                except (ProviderConnectionError, KeyError):
+                    return []
+
+            skips = range(offset + step, offset + limit, step)
+            LOGGER.debug(f'Fetching {len(skips)} next sets of values')
+            for values in self.http.map(get_page, skips):
+                if not values:
+                    break
+                v.extend(values)
 
         hits_ = min(limit, len(v))
         props = (select_properties, skip_geometry)
@@ -307,21 +315,9 @@ class SensorThingsProvider(BaseProvider):
 
         :returns: STA response
         """
-        params.update({'$expand': EXPAND[self.entity]})
-
-        r = self.http.get(url, params=params)
-
-        if not r.ok:
-            LOGGER.error('Bad http response code')
-            raise ProviderConnectionError('Bad http response code')
-
-        try:
-            response = r.json()
-        except JSONDecodeError as err:
-            LOGGER.error('JSON decode error')
-            raise ProviderQueryError(err)
+        params = {**params, '$expand': EXPAND[self.entity]}
 
-        return response
+        return self.http.get_json(url, params)
 
     def _make_filter(self, properties, bbox=[], datetime_=None):
         """
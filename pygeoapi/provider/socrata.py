@@ -37,6 +37,7 @@ import logging
 
 from pygeoapi.provider.base import (BaseProvider, ProviderQueryError,
                                     ProviderConnectionError)
+from pygeoapi.provider.http_ import get_http_client
 from pygeoapi.util import format_datetime, crs_transform
 
 LOGGER = logging.getLogger(__name__)
@@ -65,7 +66,11 @@ class SODAServiceProvider(BaseProvider):
         self.token = provider_def.get('token')
         self.geom_field = provider_def.get('geom_field')
         self.url = urlparse(self.data).netloc
-        self.client = Socrata(self.url, self.token)
+        self.http = get_http_client(provider_def)
+        self.client = Socrata(self.url, self.token, timeout=self.http.timeout)
+        # share the connection pools and retries of remote providers
+        for prefix in ['http://', 'https://']:
+            self.client.session.mount(prefix, self.http.adapter)
         self.get_fields()
 
     def get_fields(self):
@@ -122,15 +127,18 @@ class SODAServiceProvider(BaseProvider):
 
         fc = {
             'type': 'FeatureCollection',
-            'features': [],
-            'numberMatched': self._get_count(params)
+            'features': []
         }
 
         if resulttype == 'hits':
             # Return hits
             LOGGER.debug('Returning hits')
+            fc['numberMatched'] = self._get_count(params)
             return fc
 
+        # count while fetching the features
+        count = self.http.submit(self._get_count, deepcopy(params))
+
         if sortby != []:
             params['order'] = self._make_orderby(sortby)
 
@@ -154,6 +162,7 @@ class SODAServiceProvider(BaseProvider):
             LOGGER.error(msg)
             raise ProviderQueryError(msg)
 
+        fc['numberMatched'] = count.result()
         fc['numberReturned'] = len(resp['features'])
 
         return fc
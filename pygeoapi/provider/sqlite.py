@@ -31,12 +31,25 @@
 #
 # =================================================================
 
-import sqlite3
+from contextlib import contextmanager
+from datetime import date, datetime, time, timedelta
+import json
 import logging
 import os
-import json
+from pathlib import Path
+import queue
+import sqlite3
+import threading
+
+from pygeofilter import ast, values
+from pygeofilter.backends.evaluator import handle
+from pygeofilter.backends.sql.evaluate import (SPATIAL_COMPARISON_OP_MAP,
+                                               SQLEvaluator)
+import shapely.geometry
+
 from pygeoapi.plugin import InvalidPluginError
 from pygeoapi.provider.base import (BaseProvider, ProviderConnectionError,
+                                    ProviderInvalidQueryError,
                                     ProviderItemNotFoundError)
 from pygeoapi.util import crs_transform
 
@@ -46,6 +59,206 @@ LOGGER = logging.getLogger(__name__)
 SPATIALITE_EXTENSION = os.getenv('SPATIALITE_LIBRARY_PATH',
                                  'mod_spatialite.so')
 
+#: default number of pooled connections per database file
+POOL_SIZE = 4
+
+#: default size of the memory map of pooled connections (bytes)
+MMAP_SIZE = 268435456
+
+# connection pools, per database file and pool settings
+_POOLS = {}
+_POOLS_LOCK = threading.Lock()
+
+
+class SQLiteConnectionPool:
+    """Pool of shared, read-only SpatiaLite connections to a database file"""
+
+    def __init__(self, path, size=POOL_SIZE, mmap_size=MMAP_SIZE):
+        """
+        Initialize object
+
+        :param path: path to SQLite/GPKG database file
+        :param size: maximum number of open connections
+        :param mmap_size: size of the memory map of each connection (bytes)
+
+        :returns: pygeoapi.provider.sqlite.SQLiteConnectionPool
+        """
+
+        self.path = path
+        self.size = size
+        self.mmap_size = mmap_size
+
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    def _connect(self):
+        """
+        Open a read-only connection and load SpatiaLite
+
+        :returns: sqlite3.Connection
+        """
+
+        uri = f'{Path(self.path).resolve().as_uri()}?mode=ro'
+        LOGGER.debug(f'Opening connection to {uri}')
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+
+        try:
+            conn.enable_load_extension(True)
+        except AttributeError as err:
+            conn.close()
+            LOGGER.error(f'Extension loading not enabled: {err}')
+            raise ProviderConnectionError()
+
+        conn.row_factory = sqlite3.Row
+        # conn.set_trace_callback(LOGGER.debug)
+        try:
+            conn.execute(f"SELECT load_extension('{SPATIALITE_EXTENSION}')")
+        except sqlite3.OperationalError as err:
+            conn.close()
+            LOGGER.error(f'Extension loading error: {err}')
+            raise ProviderConnectionError()
+        conn.enable_load_extension(False)
+
+        # SpatiaLite functions accept GeoPackage geometry blobs as is,
+        # which does not require writing to the database (AutoGPKGStart)
+        conn.execute('SELECT EnableGpkgAmphibiousMode()')
+        conn.execute(f'PRAGMA mmap_size={int(self.mmap_size)}')
+        conn.execute('PRAGMA query_only=1')
+
+        return conn
+
+    @contextmanager
+    def connection(self):
+        """
+        Check out a connection, blocking while all connections are in use
+
+        :returns: context manager of sqlite3.Connection
+        """
+
+        with self._slots:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            try:
+                yield conn
+            finally:
+                self._idle.put(conn)
+
+    def __repr__(self):
+        return f'<SQLiteConnectionPool> {self.path}'
+
+
+def get_connection_pool(path, size=POOL_SIZE, mmap_size=MMAP_SIZE):
+    """
+    Get the connection pool shared by the providers of a database file
+
+    :param path: path to SQLite/GPKG database file
+    :param size: maximum number of open connections
+    :param mmap_size: size of the memory map of each connection (bytes)
+
+    :returns: pygeoapi.provider.sqlite.SQLiteConnectionPool
+    """
+
+    key = (os.path.realpath(path), size, mmap_size)
+    with _POOLS_LOCK:
+        if key not in _POOLS:
+            _POOLS[key] = SQLiteConnectionPool(path, size, mmap_size)
+        return _POOLS[key]
+
+
+def _quote(identifier):
+    """
+    Quote an SQL identifier (table or column name)
+
+    :param identifier: `str` of identifier
+
+    :returns: `str` of quoted identifier
+    """
+
+    return '"{}"'.format(identifier.replace('"', '""'))
+
+
+class SQLiteEvaluator(SQLEvaluator):
+    """
+    CQL to SQL evaluator binding literals as `?` parameters, so that
+    filter values never reach the SQL text
+    """
+
+    def __init__(self, attribute_map):
+        super().__init__(attribute_map, {})
+        self.values = []
+
+    def bind(self, value):
+        """
+        Bind a value
+
+        :param value: literal value
+
+        :returns: `str` of parameter placeholder
+        """
+
+        if isinstance(value, (date, datetime, time)):
+            value = value.isoformat()
+        elif isinstance(value, timedelta):
+            value = value.total_seconds()
+        elif isinstance(value, list):
+            raise ValueError('list literals are not supported')
+
+        self.values.append(value)
+        return '?'
+
+    @handle(ast.Like)
+    def like(self, node, lhs):
+        pattern = node.pattern
+        if node.wildcard != '%':
+            pattern = pattern.replace(node.wildcard, '%')
+        if node.singlechar != '_':
+            pattern = pattern.replace(node.singlechar, '_')
+
+        not_ = 'NOT ' if node.not_ else ''
+        return (f'{lhs} {not_}LIKE {self.bind(pattern)} '
+                f'ESCAPE {self.bind(node.escapechar)}')
+
+    @handle(ast.BBox)
+    def bbox(self, node, lhs):
+        func = SPATIAL_COMPARISON_OP_MAP[ast.SpatialComparisonOp.INTERSECTS]
+        bounds = ','.join(self.bind(value) for value in (
+            node.minx, node.miny, node.maxx, node.maxy))
+        return f'{func}({lhs},BuildMbr({bounds}))'
+
+    @handle(ast.Attribute)
+    def attribute(self, node):
+        return _quote(self.attribute_map[node.name])
+
+    @handle(*values.LITERALS)
+    def literal(self, node):
+        return self.bind(node)
+
+    @handle(values.Geometry)
+    def geometry(self, node):
+        wkb = shapely.geometry.shape(node).wkb
+        return f'ST_GeomFromWKB({self.bind(wkb)})'
+
+    @handle(values.Envelope)
+    def envelope(self, node):
+        wkb = shapely.geometry.box(node.x1, node.y1, node.x2, node.y2).wkb
+        return f'ST_GeomFromWKB({self.bind(wkb)})'
+
+
+def to_sql_where(filterq, field_mapping):
+    """
+    Translate a CQL filter to an SQL condition with bound parameters
+
+    :param filterq: CQL filter (pygeofilter AST)
+    :param field_mapping: `dict` of CQL attribute names to column names
+
+    :returns: `str` of SQL condition, `tuple` of parameter values
+    """
+
+    evaluator = SQLiteEvaluator(field_mapping)
+    return evaluator.evaluate(filterq), tuple(evaluator.values)
+
 
 class SQLiteGPKGProvider(BaseProvider):
     """Generic provider for SQLITE and GPKG using sqlite3 module.
@@ -53,6 +266,8 @@ class SQLiteGPKGProvider(BaseProvider):
     TODO: DELETE, UPDATE, CREATE
     """
 
+    thread_safe = True
+
     def __init__(self, provider_def):
         """
         SQLiteGPKGProvider Class constructor
@@ -67,6 +282,7 @@ class SQLiteGPKGProvider(BaseProvider):
         self.table = provider_def['table']
         self.application_id = None
         self.geom_col = None
+        self.spatial_index = None
 
         LOGGER.debug('Setting SQLite properties:')
         LOGGER.debug(f'Data source: {self.data}')
@@ -74,23 +290,37 @@ class SQLiteGPKGProvider(BaseProvider):
         LOGGER.debug(f'ID_field: {self.id_field}')
         LOGGER.debug(f'Table: {self.table}')
 
-        self.cursor = self.__load()
+        if not os.path.exists(self.data):
+            LOGGER.error('Path to sqlite does not exist')
+            raise InvalidPluginError()
+
+        self.pool = get_connection_pool(
+            self.data, provider_def.get('pool_size', POOL_SIZE),
+            provider_def.get('mmap_size', MMAP_SIZE))
 
-        LOGGER.debug('Got cursor from DB')
-        LOGGER.debug('Get available fields/properties')
+        with self.pool.connection() as conn:
+            self.__load(conn)
 
-        self.get_fields()
+            LOGGER.debug('Get available fields/properties')
+            self.get_fields(conn)
 
-    def get_fields(self):
+    def get_fields(self, conn=None):
         """
          Get fields from sqlite table (columns are field)
 
+        :param conn: sqlite3.Connection (default checks out a connection
+                     from the pool)
+
         :returns: dict of fields
         """
 
         if not self.fields:
-            results = self.cursor.execute(
-                f'PRAGMA table_info({self.table})').fetchall()
+            if conn is None:
+                with self.pool.connection() as conn:
+                    return self.get_fields(conn)
+
+            results = conn.execute(
+                f'PRAGMA table_info({_quote(self.table)})').fetchall()
             for item in results:
                 json_type = None
 
@@ -104,7 +334,8 @@ class SQLiteGPKGProvider(BaseProvider):
 
         return self.fields
 
-    def __get_where_clauses(self, properties=[], bbox=[]):
+    def __get_where_clauses(self, properties=[], bbox=[], datetime_=None,
+                            filterq=None):
         """
         Generarates WHERE conditions to be implemented in query.
         Private method mainly associated with query method.
@@ -114,27 +345,122 @@ class SQLiteGPKGProvider(BaseProvider):
 
         :param properties: list of tuples (name, value)
         :param bbox: bounding box [minx,miny,maxx,maxy]
+        :param datetime_: temporal (datestamp or extent)
+        :param filterq: CQL filter (pygeofilter AST)
 
         :returns: str, tuple
         """
 
+        clauses = []
         where_values = tuple()
-        where_clause = " WHERE " if (properties or bbox) else ""
-        if not where_clause:
-            return where_clause, where_values
 
-        if properties:
-            where_clause += " AND ".join(
-                [f"{k}=?" for k, v in properties])
-            where_values += where_values + tuple((v for k, v in properties))
+        for k, v in properties:
+            clauses.append(f'{_quote(k)} = ?')
+            where_values += (v, )
 
         if bbox:
-            if properties:
-                where_clause += " AND "
-            where_clause += f" Intersects({self.geom_col}, BuildMbr(?,?,?,?)) "
-            where_values += tuple(bbox)
-        # WHERE continent=? <class 'tuple'>: ('Europe',)
-        return where_clause, where_values
+            minx, miny, maxx, maxy = bbox
+            if self.spatial_index is not None:
+                # pre-filter candidates through the R-tree, so that the
+                # exact test is only evaluated for intersecting envelopes
+                index_table, index_id, index_bounds = self.spatial_index
+                index_minx, index_maxx, index_miny, index_maxy = index_bounds
+                clauses.append(
+                    f'rowid IN (SELECT {index_id} FROM {_quote(index_table)} '
+                    f'WHERE {index_minx} <= ? AND {index_maxx} >= ? '
+                    f'AND {index_miny} <= ? AND {index_maxy} >= ?)')
+                where_values += (maxx, minx, maxy, miny)
+            clauses.append(
+                f'Intersects({_quote(self.geom_col)}, BuildMbr(?,?,?,?))')
+            where_values += (minx, miny, maxx, maxy)
+
+        if datetime_ is not None:
+            if self.time_field is None:
+                msg = 'time_field not enabled for collection'
+                LOGGER.error(msg)
+                raise ProviderInvalidQueryError(msg)
+
+            time_field = _quote(self.time_field)
+            if '/' in datetime_:
+                begin, end = datetime_.split('/')
+                if begin != '..':
+                    clauses.append(f'{time_field} >= ?')
+                    where_values += (begin, )
+                if end != '..':
+                    clauses.append(f'{time_field} <= ?')
+                    where_values += (end, )
+            else:
+                clauses.append(f'{time_field} = ?')
+                where_values += (datetime_, )
+
+        if filterq:
+            field_mapping = {column: column for column in self.columns}
+            field_mapping[self.geom_col] = self.geom_col
+            try:
+                filter_clause, filter_values = to_sql_where(
+                    filterq, field_mapping)
+            except Exception as err:
+                msg = f'Unsupported CQL filter: {err}'
+                LOGGER.error(msg)
+                raise ProviderInvalidQueryError(msg)
+            clauses.append(filter_clause)
+            where_values += filter_values
+
+        if not clauses:
+            return '', where_values
+
+        # WHERE "continent" = ? <class 'tuple'>: ('Europe',)
+        return f" WHERE {' AND '.join(clauses)}", where_values
+
+    def __get_order_by_clause(self, sortby=[]):
+        """
+        Generates the ORDER BY clause of a query
+
+        :param sortby: list of dicts (property, order)
+
+        :returns: str
+        """
+
+        if not sortby:
+            return ''
+
+        orders = []
+        for sort in sortby:
+            if sort['property'] not in self.columns:
+                msg = f"Invalid sortby property: {sort['property']}"
+                LOGGER.error(msg)
+                raise ProviderInvalidQueryError(msg)
+            direction = 'DESC' if sort['order'] == '-' else 'ASC'
+            orders.append(f"{_quote(sort['property'])} {direction}")
+
+        # stable ordering for pagination
+        if self.id_field not in [sort['property'] for sort in sortby]:
+            orders.append(f'{_quote(self.id_field)} ASC')
+
+        return f" ORDER BY {', '.join(orders)}"
+
+    def __get_select_clause(self, select_properties=[], skip_geometry=False):
+        """
+        Generates the column list of a query
+
+        :param select_properties: list of property names
+        :param skip_geometry: bool of whether to skip geometry (default False)
+
+        :returns: str
+        """
+
+        columns = self.columns
+        if self.properties or select_properties:
+            selected = set(self.properties) | set(select_properties)
+            columns = [column for column in self.columns
+                       if column in selected or column == self.id_field]
+
+        columns = [_quote(column) for column in columns]
+        if not skip_geometry:
+            geom_col = _quote(self.geom_col)
+            columns.append(f'AsGeoJSON({geom_col}) AS {geom_col}')
+
+        return ', '.join(columns)
 
     def __response_feature(self, row_data, skip_geometry=False):
         """
@@ -155,9 +481,7 @@ class SQLiteGPKGProvider(BaseProvider):
 
             try:
                 if not skip_geometry:
-                    feature['geometry'] = json.loads(
-                        rd.pop(f'AsGeoJSON({self.geom_col})')
-                    )
+                    feature['geometry'] = json.loads(rd.pop(self.geom_col))
             except TypeError:
                 LOGGER.warning('Missing geometry')
 
@@ -180,40 +504,49 @@ class SQLiteGPKGProvider(BaseProvider):
 
         return feature_collection
 
-    def __load(self):
+    def __get_spatial_index(self, conn):
         """
-        Private method for loading spatiallite,
-        get the table structure and dump geometry
+        Detect the R-tree spatial index of the geometry column, either
+        a GeoPackage `rtree_<table>_<column>` or a SpatiaLite
+        `idx_<table>_<column>` table
+
+        :param conn: sqlite3.Connection
 
-        :returns: sqlite3.Cursor
+        :returns: tuple of index table name, id column and bounds columns
+                  (minx, maxx, miny, maxy), or `None`
         """
 
-        if (os.path.exists(self.data)):
-            conn = sqlite3.connect(self.data)
+        if self.application_id:
+            index_table = f'rtree_{self.table}_{self.geom_col}'
+            index_columns = ('id', ('minx', 'maxx', 'miny', 'maxy'))
         else:
-            LOGGER.error('Path to sqlite does not exist')
-            raise InvalidPluginError()
+            index_table = f'idx_{self.table}_{self.geom_col}'
+            index_columns = ('pkid', ('xmin', 'xmax', 'ymin', 'ymax'))
 
-        try:
-            conn.enable_load_extension(True)
-        except AttributeError as err:
-            LOGGER.error(f'Extension loading not enabled: {err}')
-            raise ProviderConnectionError()
+        result = conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' "
+            "AND lower(name) = lower(?)", (index_table, )).fetchone()
 
-        conn.row_factory = sqlite3.Row
-        conn.enable_load_extension(True)
-        # conn.set_trace_callback(LOGGER.debug)
-        cursor = conn.cursor()
-        try:
-            cursor.execute(f"SELECT load_extension('{SPATIALITE_EXTENSION}')")
-        except sqlite3.OperationalError as err:
-            LOGGER.error(f'Extension loading error: {err}')
-            raise ProviderConnectionError()
-        result = cursor.fetchall()
+        if result is None:
+            LOGGER.warning(f'No spatial index found for {self.table}; '
+                           'bbox queries will scan the whole table')
+            return None
+
+        LOGGER.debug(f"Found spatial index {result['name']}")
+        return (result['name'], ) + index_columns
+
+    def __load(self, conn):
+        """
+        Private method for detecting the table structure, geometry
+        column and spatial index
+
+        :param conn: sqlite3.Connection
+
+        :returns: `None`
+        """
 
         # Checking for geopackage
-        cursor.execute("PRAGMA application_id")
-        result = cursor.fetchone()
+        result = conn.execute("PRAGMA application_id").fetchone()
 
         self.application_id = result["application_id"]
         if self.application_id == 1196444487:
@@ -228,29 +561,24 @@ class SQLiteGPKGProvider(BaseProvider):
             geometry_columns_table = 'gpkg_geometry_columns'
             geometry_columns_table_name = 'table_name'
             geometry_columns_column_name = 'column_name'
-            cursor.execute("SELECT AutoGPKGStart()")
-            result = cursor.fetchall()
-            if result[0][0] >= 1:
-                LOGGER.info("Loaded Geopackage support")
-            else:
-                LOGGER.info("SELECT AutoGPKGStart() returned 0." +
-                            "Detected GPKG but couldn't load support")
-                raise InvalidPluginError()
         else:
             geometry_columns_table = 'geometry_columns'
             geometry_columns_column_name = 'f_geometry_column'
             geometry_columns_table_name = 'f_table_name'
 
         try:
-            cursor.execute(f'PRAGMA table_info({self.table})')
-            result = cursor.fetchall()
+            result = conn.execute(
+                f'PRAGMA table_info({_quote(self.table)})').fetchall()
         except sqlite3.OperationalError:
             LOGGER.error(f'Could not find table: {self.table}')
             raise ProviderConnectionError()
 
         LOGGER.debug('Determining name of geometry column')
-        cursor.execute(f"SELECT {geometry_columns_column_name} FROM {geometry_columns_table} WHERE {geometry_columns_table_name} = '{self.table}'")  # noqa
-        geometry_column = cursor.fetchall()
+        geometry_column = conn.execute(
+            f'SELECT {geometry_columns_column_name} '
+            f'FROM {geometry_columns_table} '
+            f'WHERE lower({geometry_columns_table_name}) = lower(?)',
+            (self.table, )).fetchall()
 
         if geometry_column:
             LOGGER.debug("Found geometry column")
@@ -267,19 +595,16 @@ class SQLiteGPKGProvider(BaseProvider):
         except AssertionError:
             raise InvalidPluginError()
 
-        self.columns = [item[1] for item in result if item[1]
-                        not in [self.geom_col, self.geom_col.upper()]]
-        self.columns = ','.join(self.columns)+f',AsGeoJSON({self.geom_col})'
-
-        if self.application_id:
-            self.table = f"vgpkg_{self.table}"
+        self.columns = [item[1] for item in result if item[1].lower()
+                        != self.geom_col.lower()]
 
-        return cursor
+        self.spatial_index = self.__get_spatial_index(conn)
 
     @crs_transform
     def query(self, offset=0, limit=10, resulttype='results',
               bbox=[], datetime_=None, properties=[], sortby=[],
-              select_properties=[], skip_geometry=False, q=None, **kwargs):
+              select_properties=[], skip_geometry=False, q=None,
+              filterq=None, **kwargs):
         """
         Query SQLite/GPKG for all the content.
         e,g: http://localhost:5000/collections/countries/items?
@@ -296,25 +621,38 @@ class SQLiteGPKGProvider(BaseProvider):
         :param select_properties: list of property names
         :param skip_geometry: bool of whether to skip geometry (default False)
         :param q: full-text search term(s)
+        :param filterq: CQL filter (pygeofilter AST)
 
         :returns: GeoJSON FeaturesCollection
         """
         LOGGER.debug('Querying SQLite/GPKG')
 
         where_clause, where_values = self.__get_where_clauses(
-            properties=properties, bbox=bbox)
+            properties=properties, bbox=bbox, datetime_=datetime_,
+            filterq=filterq)
+
+        table = _quote(self.table)
 
         if resulttype == 'hits':
 
-            sql_query = f"SELECT COUNT(*) as hits FROM {self.table} {where_clause} "  # noqa
+            sql_query = f'SELECT COUNT(*) as hits FROM {table}{where_clause}'
 
-            res = self.cursor.execute(sql_query, where_values)
+            def count():
+                with self.pool.connection() as conn:
+                    res = conn.execute(sql_query, where_values)
+                    return res.fetchone()['hits']
 
-            hits = res.fetchone()["hits"]
+            hits = self._get_count(
+                {'properties': properties, 'bbox': bbox,
+                 'datetime': datetime_, 'filterq': filterq},
+                count, hits=True)
             return self.__response_feature_hits(hits)
 
-        sql_query = f"SELECT DISTINCT {self.columns} from \
-            {self.table} {where_clause} limit ? offset ?"
+        columns = self.__get_select_clause(select_properties, skip_geometry)
+        order_by_clause = self.__get_order_by_clause(sortby)
+
+        sql_query = (f'SELECT {columns} FROM {table}{where_clause}'
+                     f'{order_by_clause} LIMIT ? OFFSET ?')
 
         end_index = offset + limit
 
@@ -322,17 +660,23 @@ class SQLiteGPKGProvider(BaseProvider):
         LOGGER.debug(f'Start Index: {offset}')
         LOGGER.debug(f'End Index: {end_index}')
 
-        row_data = self.cursor.execute(
-            sql_query, where_values + (limit, offset))
-
         feature_collection = {
             'type': 'FeatureCollection',
             'features': []
         }
 
-        for rd in row_data:
-            feature_collection['features'].append(
-                self.__response_feature(rd, skip_geometry=skip_geometry))
+        with self.pool.connection() as conn:
+            try:
+                row_data = conn.execute(
+                    sql_query, where_values + (limit, offset))
+            except sqlite3.OperationalError as err:
+                msg = f'Query error: {err}'
+                LOGGER.error(msg)
+                raise ProviderInvalidQueryError(msg)
+
+            for rd in row_data:
+                feature_collection['features'].append(
+                    self.__response_feature(rd, skip_geometry=skip_geometry))
 
         return feature_collection
 
@@ -349,13 +693,15 @@ class SQLiteGPKGProvider(BaseProvider):
 
         LOGGER.debug('Get item from SQLite/GPKG')
 
-        sql_query = f'SELECT {self.columns} FROM \
-            {self.table} WHERE {self.id_field}==?;'
+        columns = self.__get_select_clause()
+        sql_query = (f'SELECT {columns} FROM {_quote(self.table)} '
+                     f'WHERE {_quote(self.id_field)} = ?')
 
         LOGGER.debug(f'SQL Query: {sql_query}')
         LOGGER.debug(f'Identifier: {identifier}')
 
-        row_data = self.cursor.execute(sql_query, (identifier, )).fetchone()
+        with self.pool.connection() as conn:
+            row_data = conn.execute(sql_query, (identifier, )).fetchone()
 
         feature = self.__response_feature(row_data)
         if feature:
@@ -31,10 +31,122 @@
 
 import logging
 
+from pygeoapi.models.provider.base import TileMatrixSetEnum
 from pygeoapi.provider.base import ProviderGenericError
+from pygeoapi.util import get_crs_from_uri, get_transformer
 
 LOGGER = logging.getLogger(__name__)
 
+#: tile matrix sets of dynamic and cached tiles: PostGIS SRID, bounds and
+#: number of tile columns of the (single row) first tile matrix
+TILE_MATRIX_SETS = {
+    'WebMercatorQuad': {
+        'srid': 3857,
+        'bounds': (-20037508.3427892, -20037508.3427892,
+                   20037508.3427892, 20037508.3427892),
+        'columns': 1
+    },
+    'WorldCRS84Quad': {
+        'srid': 4326,
+        'bounds': (-180, -90, 180, 90),
+        'columns': 2
+    }
+}
+
+
+def get_tile_bounds(tileset, z, y, x):
+    """
+    Get the bounds of a tile, in the CRS of its tile matrix set
+
+    :param tileset: tile matrix set identifier
+    :param z: tile matrix (zoom level)
+    :param y: tile row
+    :param x: tile column
+
+    :returns: tuple of tile bounds (minx, miny, maxx, maxy)
+    """
+
+    try:
+        tile_matrix_set = TILE_MATRIX_SETS[tileset]
+    except KeyError:
+        msg = f'Unsupported tile matrix set: {tileset}'
+        LOGGER.error(msg)
+        raise ProviderTilesetIdNotFoundError(msg)
+
+    minx, miny, maxx, maxy = tile_matrix_set['bounds']
+    columns = tile_matrix_set['columns'] * 2 ** z
+    rows = 2 ** z
+
+    if not (0 <= x < columns and 0 <= y < rows):
+        msg = f'Tile {z}/{y}/{x} out of {tileset} bounds'
+        LOGGER.error(msg)
+        raise ProviderTileNotFoundError(msg)
+
+    width = (maxx - minx) / columns
+    height = (maxy - miny) / rows
+
+    return (minx + x * width, maxy - (y + 1) * height,
+            minx + (x + 1) * width, maxy - y * height)
+
+
+def get_tile_range(tileset, z, bbox=None):
+    """
+    Get the rows and columns of the tiles of a zoom level intersecting
+    a bounding box
+
+    :param tileset: tile matrix set identifier
+    :param z: tile matrix (zoom level)
+    :param bbox: bounding box [minx,miny,maxx,maxy] (in CRS84)
+
+    :returns: tuple of `range` of rows and `range` of columns
+    """
+
+    try:
+        tile_matrix_set = TILE_MATRIX_SETS[tileset]
+    except KeyError:
+        msg = f'Unsupported tile matrix set: {tileset}'
+        LOGGER.error(msg)
+        raise ProviderTilesetIdNotFoundError(msg)
+
+    columns = tile_matrix_set['columns'] * 2 ** z
+    rows = 2 ** z
+    if bbox is None:
+        return range(rows), range(columns)
+
+    tms_crs = get_crs_from_uri(get_tile_crs_uri(tileset))
+    transformer = get_transformer(
+        get_crs_from_uri(TileMatrixSetEnum.WORLDCRS84QUAD.value.crs),
+        tms_crs, always_xy=True)
+    minx, miny, maxx, maxy = transformer.transform_bounds(*bbox)
+
+    tms_minx, tms_miny, tms_maxx, tms_maxy = tile_matrix_set['bounds']
+    width = (tms_maxx - tms_minx) / columns
+    height = (tms_maxy - tms_miny) / rows
+
+    def clamp(value, count):
+        return min(max(int(value), 0), count - 1)
+
+    return (
+        range(clamp((tms_maxy - maxy) / height, rows),
+              clamp((tms_maxy - miny) / height, rows) + 1),
+        range(clamp((minx - tms_minx) / width, columns),
+              clamp((maxx - tms_minx) / width, columns) + 1)
+    )
+
+
+def get_tile_crs_uri(tileset):
+    """
+    Get the CRS of a tile matrix set
+
+    :param tileset: tile matrix set identifier
+
+    :returns: `str` of CRS URI
+    """
+
+    for tile_matrix_set in TileMatrixSetEnum:
+        if tile_matrix_set.value.tileMatrixSet == tileset:
+            return tile_matrix_set.value.crs
+
 
 class BaseTileProvider:
     """generic Tile Provider ABC"""
@@ -111,6 +223,15 @@ class BaseTileProvider:
 
         raise NotImplementedError()
 
+    def invalidate(self):
+        """
+        Discard tiles cached by the provider (e.g. when data has changed)
+
+        :returns: `None`
+        """
+
+        pass
+
     def get_metadata(self):
         """
         Provide data/file metadata
@@ -82,8 +82,6 @@ class WMSFacadeProvider(BaseProvider):
         :returns: `bytes` of map image
         """
 
-        self._transparent = 'TRUE'
-
         if crs in [4326, 'CRS;84']:
             LOGGER.debug('Swapping 4326 axis order to WMS 1.3 mode (yx)')
             bbox2 = ','.join(str(c) for c in
@@ -103,8 +101,7 @@ class WMSFacadeProvider(BaseProvider):
 
             bbox2 = ','.join(str(c) for c in [minx, miny, maxx, maxy])
 
-        if not transparent:
-            self._transparent = 'FALSE'
+        transparent = 'TRUE' if transparent else 'FALSE'
 
         params = {
             'version': '1.3.0',
@@ -117,7 +114,7 @@ class WMSFacadeProvider(BaseProvider):
             'width': width,
             'height': height,
             'format': OUTPUT_FORMATS[format_],
-            'transparent': self._transparent
+            'transparent': transparent
         }
 
         if datetime_ is not None:
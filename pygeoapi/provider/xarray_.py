@@ -29,8 +29,11 @@
 #
 # =================================================================
 
+from functools import partial
+import io
 import os
 import logging
+import shutil
 import tempfile
 import zipfile
 
@@ -40,11 +43,19 @@ import numpy as np
 from pygeoapi.provider.base import (BaseProvider,
                                     ProviderConnectionError,
                                     ProviderNoDataError,
-                                    ProviderQueryError)
-from pygeoapi.util import read_data
+                                    ProviderQueryError,
+                                    ProviderRequestEntityTooLargeError)
+from pygeoapi.util import (ClosingIterator, human_size, iter_file,
+                           read_data)
 
 LOGGER = logging.getLogger(__name__)
 
+#: size (in bytes) of outputs from which they are streamed
+STREAM_SIZE = 16777216
+
+#: size (in bytes) of the chunks of streamed outputs
+CHUNK_SIZE = 1048576
+
 
 class XarrayProvider(BaseProvider):
     """Xarray Provider"""
@@ -58,6 +69,10 @@ class XarrayProvider(BaseProvider):
 
         super().__init__(provider_def)
 
+        self.chunks = provider_def.get('chunks')
+        self.max_size = provider_def.get('max_size')
+        self.num_workers = provider_def.get('num_workers')
+
         try:
             if provider_def['data'].endswith('.zarr'):
                 open_func = xarray.open_zarr
@@ -68,7 +83,12 @@ class XarrayProvider(BaseProvider):
                 else:
                     open_func = xarray.open_dataset
 
-            self._data = open_func(self.data)
+            open_args = {}
+            if self.chunks is not None:
+                LOGGER.debug(f'Opening data with chunks {self.chunks}')
+                open_args['chunks'] = self.chunks
+
+            self._data = open_func(self.data, **open_args)
             self._coverage_properties = self._get_coverage_properties()
 
             self.axes = [self._coverage_properties['x_axis_label'],
@@ -205,10 +225,7 @@ class XarrayProvider(BaseProvider):
 
         if not properties and not subsets and format_ != 'json':
             LOGGER.debug('No parameters specified, returning native data')
-            if format_ == 'zarr':
-                return _get_zarr_data(self._data)
-            else:
-                return read_data(self.data)
+            return self._read_native_data(format_)
 
         if len(properties) < 1:
             properties = self.fields
@@ -276,6 +293,13 @@ class XarrayProvider(BaseProvider):
             LOGGER.warning(msg)
             raise ProviderNoDataError(msg)
 
+        size = sum(data[name].nbytes for name in data.data_vars)
+        if self.max_size is not None and size > self.max_size:
+            msg = (f'Request size ({human_size(size)}) exceeds the maximum '
+                   f'of {human_size(self.max_size)}')
+            LOGGER.warning(msg)
+            raise ProviderRequestEntityTooLargeError(msg)
+
         out_meta = {
             'bbox': [
                 data.coords[self.x_field].values[0],
@@ -295,27 +319,26 @@ class XarrayProvider(BaseProvider):
                           for var_name, var in data.variables.items()}
         }
 
-        LOGGER.debug('Serializing data in memory')
         if format_ == 'json':
             LOGGER.debug('Creating output in CoverageJSON')
-            return self.gen_covjson(out_meta, data, properties)
+            return self.gen_covjson(out_meta, data, properties,
+                                    stream=size > STREAM_SIZE)
         elif format_ == 'zarr':
             LOGGER.debug('Returning data in native zarr format')
-            return _get_zarr_data(data)
+            return self._get_zarr_data(data)
         else:  # return data in native format
-            with tempfile.TemporaryFile() as fp:
-                LOGGER.debug('Returning data in native NetCDF format')
-                fp.write(data.to_netcdf())
-                fp.seek(0)
-                return fp.read()
+            LOGGER.debug('Returning data in native NetCDF format')
+            return self._get_netcdf_data(data)
 
-    def gen_covjson(self, metadata, data, range_type):
+    def gen_covjson(self, metadata, data, range_type, stream=False):
         """
         Generate coverage as CoverageJSON representation
 
         :param metadata: coverage metadata
         :param data: rasterio DatasetReader object
         :param range_type: range type list
+        :param stream: `bool` of whether to evaluate the values of the
+                       ranges lazily, as generators of blocks of values
 
         :returns: dict of CoverageJSON representation
         """
@@ -392,9 +415,6 @@ class XarrayProvider(BaseProvider):
 
             cj['parameters'][pm['id']] = parameter
 
-        data = data.fillna(None)
-        data = _convert_float32_to_float64(data)
-
         try:
             for key in cj['parameters'].keys():
                 cj['ranges'][key] = {
@@ -407,13 +427,134 @@ class XarrayProvider(BaseProvider):
                               metadata['width'],
                               metadata['time_steps']]
                 }
-                cj['ranges'][key]['values'] = data[key].values.flatten().tolist()  # noqa
+                if stream:
+                    cj['ranges'][key]['values'] = self._iter_values(data[key])
+                else:
+                    values = self._compute(data[key]).values
+                    cj['ranges'][key]['values'] = _to_list(values.flatten())
         except IndexError as err:
             LOGGER.warning(err)
             raise ProviderQueryError('Invalid query parameter')
 
         return cj
 
+    def _compute(self, data):
+        """
+        Helper function to evaluate lazy data, or delayed writes, with Dask
+        chunks evaluated in parallel on a local threaded scheduler
+
+        :param data: xarray object or `dask.delayed.Delayed`
+
+        :returns: evaluated data
+        """
+
+        return data.compute(scheduler='threads',
+                            num_workers=self.num_workers)
+
+    def _iter_values(self, data):
+        """
+        Helper function to evaluate the values of a variable in blocks
+        along its first dimension (aligned on its Dask chunks if any)
+
+        :param data: `xarray.DataArray` of variable
+
+        :returns: generator of `list` of values of successive blocks
+        """
+
+        dim = data.dims[0]
+        length = data.sizes[dim]
+        rows = max(1, CHUNK_SIZE // max(1, data.nbytes // max(1, length)))
+
+        bounds = None
+        if data.chunks is not None:
+            bounds = np.cumsum(data.chunks[0])
+
+        start = 0
+        while start < length:
+            stop = min(start + rows, length)
+            if bounds is not None:
+                stop = int(bounds[bounds >= stop][0])
+
+            block = self._compute(data.isel({dim: slice(start, stop)}))
+            yield _to_list(block.values.flatten())
+            start = stop
+
+    def _read_native_data(self, format_):
+        """
+        Helper function to read the data in its native format
+
+        :param format_: data format of output
+
+        :returns: `bytes` of data, or generator of `bytes` chunks for
+                  large outputs
+        """
+
+        if format_ == 'zarr':
+            if os.path.isdir(self.data):
+                return _get_zip_data(self.data)
+            return self._get_zarr_data(self._data)
+
+        if (not self.data.startswith(('http', 's3')) and
+                os.path.getsize(self.data) > STREAM_SIZE):
+            LOGGER.debug('Streaming large file')
+            return iter_file(self.data, CHUNK_SIZE)
+
+        return read_data(self.data)
+
+    def _get_netcdf_data(self, data):
+        """
+        Helper function to encode data as NetCDF
+
+        :param data: Xarray dataset of coverage data
+
+        :returns: `bytes` of NetCDF data, or iterator of `bytes` chunks
+                  for large outputs
+        """
+
+        fd, filename = tempfile.mkstemp(prefix='pygeoapi-xarray-',
+                                        suffix='.nc')
+        os.close(fd)
+        try:
+            if _is_chunked(data):
+                self._compute(data.to_netcdf(filename, compute=False))
+            else:
+                data.to_netcdf(filename)
+
+            if os.path.getsize(filename) > STREAM_SIZE:
+                LOGGER.debug('Streaming large output')
+                return iter_file(filename, CHUNK_SIZE, delete=True)
+
+            with open(filename, 'rb') as fh:
+                content = fh.read()
+        except Exception:
+            os.remove(filename)
+            raise
+
+        os.remove(filename)
+        return content
+
+    def _get_zarr_data(self, data):
+        """
+        Helper function to encode data as a Zarr directory zip
+
+        :param data: Xarray dataset of coverage data
+
+        :returns: `bytes` of zip data, or iterator of `bytes` chunks
+                  for large outputs
+        """
+
+        tmp_dir = tempfile.mkdtemp(prefix='pygeoapi-xarray-')
+        try:
+            if _is_chunked(data):
+                self._compute(data.to_zarr(tmp_dir, mode='w', compute=False))
+            else:
+                data.to_zarr(tmp_dir, mode='w')
+        except Exception:
+            shutil.rmtree(tmp_dir)
+            raise
+
+        return _get_zip_data(tmp_dir, delete=True)
+
     def _get_coverage_properties(self):
         """
         Helper function to normalize coverage properties
@@ -552,6 +693,25 @@ class XarrayProvider(BaseProvider):
         return ', '.join(times)
 
 
+def _to_list(values):
+    """
+    Convenience function to convert an array of values to a list, with
+    missing (NaN) values as `None` (null in JSON, which has no NaN)
+
+    :param values: `numpy.ndarray` of values
+
+    :returns: `list` of values
+    """
+
+    if values.dtype.kind in 'fc':
+        missing = np.isnan(values)
+        if missing.any():
+            values = values.astype(object)
+            values[missing] = None
+
+    return values.tolist()
+
+
 def _to_datetime_string(datetime_obj):
     """
     Convenience function to formulate string from various datetime objects
@@ -576,64 +736,101 @@ def _to_datetime_string(datetime_obj):
     return value
 
 
-def _zip_dir(path, ziph, cwd):
+def _is_chunked(data):
     """
-        Convenience function to zip directory with sub directories
-        (based on source: https://stackoverflow.com/questions/1855095/)
-        :param path: str directory to zip
-        :param ziph: zipfile file
-        :param cwd: current working directory
+    Convenience function to detect Dask backed data
 
-        """
-    for root, dirs, files in os.walk(path):
-        for file in files:
+    :param data: Xarray dataset of coverage data
 
-            if len(dirs) < 1:
-                new_root = '/'.join(root.split('/')[:-1])
-                new_path = os.path.join(root.split('/')[-1], file)
-            else:
-                new_root = root
-                new_path = file
+    :returns: `bool` of whether any variable is a Dask array
+    """
 
-            os.chdir(new_root)
-            ziph.write(new_path)
-            os.chdir(cwd)
+    return any(var.chunks is not None for var in data.data_vars.values())
 
 
-def _get_zarr_data(data):
-    """
-       Returns bytes to read from Zarr directory zip
-       :param data: Xarray dataset of coverage data
+class _ZipStream(io.RawIOBase):
+    """unseekable file object buffering the output of a zip file"""
 
-       :returns: byte array of zip data
-       """
+    def __init__(self):
+        self._buffer = bytearray()
 
-    tmp_dir = tempfile.TemporaryDirectory().name
+    def writable(self):
+        return True
 
-    zarr_data_filename = f'{tmp_dir}zarr.zarr'
-    zarr_zip_filename = f'{tmp_dir}zarr.zarr.zip'
+    def write(self, b):
+        self._buffer += b
+        return len(b)
 
-    data.to_zarr(zarr_data_filename, mode='w')
+    def pop(self):
+        """
+        Get and clear the buffered output
 
-    with zipfile.ZipFile(zarr_zip_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:  # noqa
-        _zip_dir(zarr_data_filename, zipf, os.getcwd())
+        :returns: `bytes` of output
+        """
 
-    with open(zarr_zip_filename, 'rb') as fh:
-        return fh.read()
+        content = bytes(self._buffer)
+        self._buffer.clear()
+        return content
 
 
-def _convert_float32_to_float64(data):
+def _iter_zip(path, delete=False):
     """
-        Converts DataArray values of float32 to float64
-        :param data: Xarray dataset of coverage data
+    Convenience function to zip a directory with sub directories as
+    a stream
 
-        :returns: Xarray dataset of coverage data
-        """
+    :param path: `str` of directory to zip
+    :param delete: `bool` of whether to delete the directory once zipped
+                   (or once the stream is closed, even if never started)
+
+    :returns: iterator of `bytes` chunks of zip data
+    """
+
+    def zip_chunks():
+        stream = _ZipStream()
+        with zipfile.ZipFile(stream, 'w', zipfile.ZIP_DEFLATED) as zipf:
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for file in sorted(files):
+                    filename = os.path.join(root, file)
+                    zinfo = zipfile.ZipInfo.from_file(
+                        filename, os.path.relpath(filename, path))
+                    zinfo.compress_type = zipfile.ZIP_DEFLATED
+                    force_zip64 = zinfo.file_size > zipfile.ZIP64_LIMIT
+
+                    with open(filename, 'rb') as src, \
+                            zipf.open(zinfo, 'w', force_zip64) as dest:
+                        while True:
+                            chunk = src.read(CHUNK_SIZE)
+                            if not chunk:
+                                break
+                            dest.write(chunk)
+                            content = stream.pop()
+                            if content:
+                                yield content
+
+        yield stream.pop()
+
+    cleanup = partial(shutil.rmtree, path, ignore_errors=True) \
+        if delete else None
+
+    return ClosingIterator(zip_chunks(), cleanup)
+
+
+def _get_zip_data(path, delete=False):
+    """
+    Returns zip data of a directory, streamed for large directories
+
+    :param path: `str` of directory to zip
+    :param delete: `bool` of whether to delete the directory once zipped
+
+    :returns: `bytes` of zip data, or iterator of `bytes` chunks
+    """
+
+    size = sum(os.path.getsize(os.path.join(root, file))
+               for root, _, files in os.walk(path) for file in files)
 
-    for var_name in data.variables:
-        if data[var_name].dtype == 'float32':
-            og_attrs = data[var_name].attrs
-            data[var_name] = data[var_name].astype('float64')
-            data[var_name].attrs = og_attrs
+    if size > STREAM_SIZE:
+        LOGGER.debug('Streaming large output')
+        return _iter_zip(path, delete)
 
-    return data
+    return b''.join(_iter_zip(path, delete))
@@ -30,13 +30,19 @@
 import logging
 
 import numpy as np
+import xarray
 
-from pygeoapi.provider.base import ProviderNoDataError, ProviderQueryError
+from pygeoapi.provider.base import (ProviderInvalidQueryError,
+                                    ProviderNoDataError, ProviderQueryError)
 from pygeoapi.provider.base_edr import BaseEDRProvider
-from pygeoapi.provider.xarray_ import _to_datetime_string, XarrayProvider
+from pygeoapi.provider.xarray_ import (_to_datetime_string, _to_list,
+                                       XarrayProvider)
 
 LOGGER = logging.getLogger(__name__)
 
+#: dimension of data indexed pointwise (MultiPoint/LineString queries)
+POINTS_DIM = 'points'
+
 
 class XarrayEDRProvider(BaseEDRProvider, XarrayProvider):
     """EDR Provider"""
@@ -90,9 +96,13 @@ class XarrayEDRProvider(BaseEDRProvider, XarrayProvider):
             if wkt.type == 'Point':
                 query_params[self._coverage_properties['x_axis_label']] = wkt.x
                 query_params[self._coverage_properties['y_axis_label']] = wkt.y
-            elif wkt.type == 'LineString':
-                query_params[self._coverage_properties['x_axis_label']] = wkt.xy[0]  # noqa
-                query_params[self._coverage_properties['y_axis_label']] = wkt.xy[1]  # noqa
+            elif wkt.type in ['MultiPoint', 'LineString']:
+                LOGGER.debug('Indexing points pointwise')
+                xs, ys = _get_points(wkt)
+                query_params[self._coverage_properties['x_axis_label']] = \
+                    xarray.DataArray(xs, dims=POINTS_DIM)
+                query_params[self._coverage_properties['y_axis_label']] = \
+                    xarray.DataArray(ys, dims=POINTS_DIM)
             elif wkt.type == 'Polygon':
                 query_params[self._coverage_properties['x_axis_label']] = slice(wkt.bounds[0], wkt.bounds[2])  # noqa
                 query_params[self._coverage_properties['y_axis_label']] = slice(wkt.bounds[1], wkt.bounds[3])  # noqa
@@ -112,9 +122,10 @@ class XarrayEDRProvider(BaseEDRProvider, XarrayProvider):
 
         LOGGER.debug(f'query parameters: {query_params}')
 
+        fields = self.fields
         try:
             if select_properties:
-                self.fields = select_properties
+                fields = select_properties
                 data = self._data[[*select_properties]]
             else:
                 data = self._data
@@ -134,6 +145,9 @@ class XarrayEDRProvider(BaseEDRProvider, XarrayProvider):
         except KeyError:
             raise ProviderNoDataError()
 
+        if POINTS_DIM in data.dims:
+            return self.gen_covjson_collection(data, fields)
+
         try:
             height = data.dims[self.y_field]
         except KeyError:
@@ -156,7 +170,7 @@ class XarrayEDRProvider(BaseEDRProvider, XarrayProvider):
                           for var_name, var in data.variables.items()}
         }
 
-        return self.gen_covjson(out_meta, data, self.fields)
+        return self.gen_covjson(out_meta, data, fields)
 
     @BaseEDRProvider.register()
     def cube(self, **kwargs):
@@ -199,9 +213,82 @@ class XarrayEDRProvider(BaseEDRProvider, XarrayProvider):
             query_params[self.time_field] = self._make_datetime(datetime_)
 
         LOGGER.debug(f'query parameters: {query_params}')
+        fields = self.fields
+        try:
+            if select_properties:
+                fields = select_properties
+                data = self._data[[*select_properties]]
+            else:
+                data = self._data
+            data = data.sel(query_params)
+        except KeyError:
+            raise ProviderNoDataError()
+
+        height = data.dims[self.y_field]
+        width = data.dims[self.x_field]
+        time, time_steps = self._parse_time_metadata(data, kwargs)
+
+        out_meta = {
+            'bbox': [
+                data.coords[self.x_field].values[0],
+                data.coords[self.y_field].values[0],
+                data.coords[self.x_field].values[-1],
+                data.coords[self.y_field].values[-1]
+            ],
+            "time": time,
+            "driver": "xarray",
+            "height": height,
+            "width": width,
+            "time_steps": time_steps,
+            "variables": {var_name: var.attrs
+                          for var_name, var in data.variables.items()}
+        }
+
+        return self.gen_covjson(out_meta, data, fields)
+
+    @BaseEDRProvider.register()
+    def area(self, **kwargs):
+        """
+        Extract data from collection
+
+        :param query_type: query type
+        :param wkt: `shapely.geometry` WKT geometry
+        :param datetime_: temporal (datestamp or extent)
+        :param select_properties: list of parameters
+        :param z: vertical level(s)
+        :param format_: data format of output
+
+        :returns: coverage data as dict of CoverageJSON or native format
+        """
+
+        query_params = {}
+
+        LOGGER.debug(f'Query parameters: {kwargs}')
+
+        LOGGER.debug(f"Query type: {kwargs.get('query_type')}")
+
+        wkt = kwargs.get('wkt')
+        if wkt is None or wkt.type not in ['Polygon', 'MultiPolygon']:
+            msg = 'area queries require a Polygon or MultiPolygon'
+            LOGGER.error(msg)
+            raise ProviderInvalidQueryError(msg)
+
+        minx, miny, maxx, maxy = wkt.bounds
+        query_params[self.x_field] = self._get_slice(self.x_field, minx, maxx)
+        query_params[self.y_field] = self._get_slice(self.y_field, miny, maxy)
+
+        LOGGER.debug('Processing parameter-name')
+        select_properties = kwargs.get('select_properties')
+
+        datetime_ = kwargs.get('datetime_')
+        if datetime_ is not None:
+            query_params[self.time_field] = self._make_datetime(datetime_)
+
+        LOGGER.debug(f'query parameters: {query_params}')
+        fields = self.fields
         try:
             if select_properties:
-                self.fields = select_properties
+                fields = select_properties
                 data = self._data[[*select_properties]]
             else:
                 data = self._data
@@ -209,6 +296,14 @@ class XarrayEDRProvider(BaseEDRProvider, XarrayProvider):
         except KeyError:
             raise ProviderNoDataError()
 
+        LOGGER.debug('Masking cells outside of the area')
+        mask = _get_polygon_mask(wkt, data.coords[self.x_field].values,
+                                 data.coords[self.y_field].values)
+        if not mask.any():
+            raise ProviderNoDataError()
+        data = data.where(xarray.DataArray(
+            mask, dims=(self.y_field, self.x_field)))
+
         height = data.dims[self.y_field]
         width = data.dims[self.x_field]
         time, time_steps = self._parse_time_metadata(data, kwargs)
@@ -229,7 +324,125 @@ class XarrayEDRProvider(BaseEDRProvider, XarrayProvider):
                           for var_name, var in data.variables.items()}
         }
 
-        return self.gen_covjson(out_meta, data, self.fields)
+        return self.gen_covjson(out_meta, data, fields)
+
+    def gen_covjson_collection(self, data, range_type):
+        """
+        Generate point series as CoverageJSON CoverageCollection
+        representation
+
+        :param data: xarray dataset indexed pointwise along `POINTS_DIM`
+        :param range_type: range type list
+
+        :returns: dict of CoverageJSON representation
+        """
+
+        LOGGER.debug('Creating CoverageJSON coverage collection')
+        xs = data.coords[self.x_field].values.tolist()
+        ys = data.coords[self.y_field].values.tolist()
+
+        axes = {}
+        if self.time_field in data.coords:
+            times = np.atleast_1d(data.coords[self.time_field].values)
+            try:
+                axes['t'] = {'values': np.datetime_as_string(times).tolist()}
+            except TypeError:
+                axes['t'] = {'values': [_to_datetime_string(t)
+                                        for t in times]}
+
+        cj = {
+            'type': 'CoverageCollection',
+            'domainType': 'PointSeries' if axes else 'Point',
+            'parameters': {},
+            'referencing': [{
+                'coordinates': ['x', 'y'],
+                'system': {
+                    'type': self._coverage_properties['crs_type'],
+                    'id': self._coverage_properties['bbox_crs']
+                }
+            }],
+            'coverages': []
+        }
+
+        ranges = {}
+        for variable in range_type:
+            pm = self._get_parameter_metadata(
+                variable, self._data[variable].attrs)
+
+            cj['parameters'][pm['id']] = {
+                'type': 'Parameter',
+                'description': pm['description'],
+                'unit': {
+                    'symbol': pm['unit_label']
+                },
+                'observedProperty': {
+                    'id': pm['observed_property_id'],
+                    'label': {
+                        'en': pm['observed_property_name']
+                    }
+                }
+            }
+
+            # one row of values per point, converted at once
+            values = self._compute(data[variable]).transpose(POINTS_DIM, ...)
+            dims = values.dims[1:]
+            for dim in dims:
+                if dim != self.time_field and dim in data.coords:
+                    axes[dim] = {
+                        'values': np.atleast_1d(data.coords[dim].values)
+                        .tolist()
+                    }
+            ranges[pm['id']] = (
+                str(self._data[variable].dtype),
+                ['t' if dim == self.time_field else dim for dim in dims],
+                list(values.shape[1:]),
+                _to_list(values.values.reshape(len(xs), -1))
+            )
+
+        for i, (x, y) in enumerate(zip(xs, ys)):
+            coverage = {
+                'type': 'Coverage',
+                'domain': {
+                    'type': 'Domain',
+                    'axes': {
+                        'x': {'values': [x]},
+                        'y': {'values': [y]},
+                        **axes
+                    }
+                },
+                'ranges': {}
+            }
+
+            for key, (data_type, axis_names, shape, values) in \
+                    ranges.items():
+                coverage['ranges'][key] = {
+                    'type': 'NdArray',
+                    'dataType': data_type,
+                    'axisNames': axis_names,
+                    'shape': shape,
+                    'values': values[i]
+                }
+
+            cj['coverages'].append(coverage)
+
+        return cj
+
+    def _get_slice(self, field, lower, upper):
+        """
+        Make xarray slice of coordinate values, in the order of the
+        coordinate
+
+        :param field: coordinate name
+        :param lower: lower coordinate value
+        :param upper: upper coordinate value
+
+        :returns: `slice` of coordinate values
+        """
+
+        values = self._data.coords[field].values
+        if values.size > 1 and values[0] > values[-1]:
+            return slice(upper, lower)
+        return slice(lower, upper)
 
     def _make_datetime(self, datetime_):
         """
@@ -288,3 +501,54 @@ class XarrayEDRProvider(BaseEDRProvider, XarrayProvider):
         except KeyError:
             time_steps = kwargs.get('limit')
         return time, time_steps
+
+
+def _get_points(geom):
+    """
+    Get the coordinates of the points or vertices of a geometry
+
+    :param geom: `shapely.geometry` MultiPoint or LineString
+
+    :returns: tuple of `numpy.ndarray` of x and y coordinates
+    """
+
+    if geom.type == 'MultiPoint':
+        coords = np.array([point.coords[0][:2] for point in geom.geoms])
+    else:
+        coords = np.asarray(geom.coords)[:, :2]
+
+    return coords[:, 0], coords[:, 1]
+
+
+def _get_polygon_mask(geom, xs, ys):
+    """
+    Rasterize a (multi)polygon over the cell centres of a grid, with the
+    even-odd rule applied row by row
+
+    :param geom: `shapely.geometry` Polygon or MultiPolygon
+    :param xs: `numpy.ndarray` of x coordinates of the grid
+    :param ys: `numpy.ndarray` of y coordinates of the grid
+
+    :returns: `numpy.ndarray` of `bool` of shape (y, x), `True` inside
+    """
+
+    polygons = getattr(geom, 'geoms', [geom])
+    rings = [ring for polygon in polygons
+             for ring in [polygon.exterior, *polygon.interiors]]
+    edges = np.concatenate([
+        np.column_stack([coords[:-1], coords[1:]]) for coords in
+        (np.asarray(ring.coords)[:, :2] for ring in rings)])
+    x0, y0, x1, y1 = edges.T
+
+    # x of the crossings of the edges with the line of each row
+    rows = np.asarray(ys, dtype=float)[:, np.newaxis]
+    crosses = (y0 <= rows) != (y1 <= rows)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        crossings = x0 + (rows - y0) * (x1 - x0) / (y1 - y0)
+    crossings = np.sort(np.where(crosses, crossings, np.inf), axis=1)
+
+    mask = np.empty((len(ys), len(xs)), dtype=bool)
+    for i, row in enumerate(crossings):
+        mask[i] = np.searchsorted(row, xs) % 2 == 1
+
+    return mask
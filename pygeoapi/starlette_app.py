@@ -33,7 +33,7 @@
 """ Starlette module providing the route paths to the api"""
 
 import os
-from typing import Union
+from typing import AsyncIterator, Iterator, Union
 from pathlib import Path
 
 import click
@@ -45,11 +45,13 @@ from starlette.requests import Request
 from starlette.datastructures import URL
 from starlette.types import ASGIApp, Scope, Send, Receive
 from starlette.responses import (
-    Response, JSONResponse, HTMLResponse, RedirectResponse
+    Response, JSONResponse, HTMLResponse, RedirectResponse, StreamingResponse
 )
 import uvicorn
 
 from pygeoapi.api import API
+from pygeoapi.concurrency import RequestDispatcher
+from pygeoapi.openapi import OpenAPIDocument
 from pygeoapi.util import yaml_load, get_api_rules
 
 if 'PYGEOAPI_CONFIG' not in os.environ:
@@ -72,8 +74,16 @@ API_RULES = get_api_rules(CONFIG)
 
 api_ = API(CONFIG)
 
+# Blocking API calls are run in a thread pool, off the event loop
+DISPATCHER = RequestDispatcher.from_config(CONFIG)
 
-def get_response(result: tuple) -> Union[Response, JSONResponse, HTMLResponse]:
+OPENAPI = OpenAPIDocument(os.environ.get('PYGEOAPI_OPENAPI'),
+                          os.environ.get('PYGEOAPI_CONFIG'),
+                          CONFIG['server'].get('pretty_print', False))
+
+
+def get_response(result: tuple) -> Union[Response, JSONResponse, HTMLResponse,
+                                         StreamingResponse]:
     """
     Creates a Starlette Response object and updates matching headers.
 
@@ -84,7 +94,10 @@ def get_response(result: tuple) -> Union[Response, JSONResponse, HTMLResponse]:
     """
 
     headers, status, content = result
-    if headers['Content-Type'] == 'text/html':
+    if isinstance(content, (Iterator, AsyncIterator)):
+        # streamed content is sent chunked (unless its length is known)
+        response = StreamingResponse(content, status_code=status)
+    elif headers['Content-Type'] == 'text/html':
         response = HTMLResponse(content=content, status_code=status)
     else:
         if isinstance(content, dict):
@@ -97,6 +110,26 @@ def get_response(result: tuple) -> Union[Response, JSONResponse, HTMLResponse]:
     return response
 
 
+async def call_api(request: Request, api_function, *args):
+    """
+    Calls an API function in the dispatcher thread pool
+
+    :param request: Starlette Request instance
+    :param api_function: API function to call with request and args
+    :param args: additional positional arguments of API function
+
+    :returns: Starlette HTTP Response
+    """
+
+    if request.method in ['POST', 'PUT', 'PATCH']:
+        # read the body on the event loop; APIRequest picks it up
+        await request.body()
+
+    return get_response(await DISPATCHER.run(
+        api_function, request, *args,
+        collection=request.path_params.get('collection_id')))
+
+
 async def landing_page(request: Request):
     """
     OGC API landing page endpoint
@@ -105,7 +138,7 @@ async def landing_page(request: Request):
 
     :returns: Starlette HTTP Response
     """
-    return get_response(api_.landing_page(request))
+    return await call_api(request, api_.landing_page)
 
 
 async def openapi(request: Request):
@@ -116,13 +149,7 @@ async def openapi(request: Request):
 
     :returns: Starlette HTTP Response
     """
-    with open(os.environ.get('PYGEOAPI_OPENAPI'), encoding='utf8') as ff:
-        if os.environ.get('PYGEOAPI_OPENAPI').endswith(('.yaml', '.yml')):
-            openapi_ = yaml_load(ff)
-        else:  # JSON file, do not transform
-            openapi_ = ff
-
-    return get_response(api_.openapi(request, openapi_))
+    return await call_api(request, api_.openapi, OPENAPI)
 
 
 async def conformance(request: Request):
@@ -133,7 +160,7 @@ async def conformance(request: Request):
 
     :returns: Starlette HTTP Response
     """
-    return get_response(api_.conformance(request))
+    return await call_api(request, api_.conformance)
 
 
 async def collection_queryables(request: Request, collection_id=None):
@@ -147,7 +174,8 @@ async def collection_queryables(request: Request, collection_id=None):
     """
     if 'collection_id' in request.path_params:
         collection_id = request.path_params['collection_id']
-    return get_response(api_.get_collection_queryables(request, collection_id))
+    return await call_api(request, api_.get_collection_queryables,
+                          collection_id)
 
 
 async def get_collection_tiles(request: Request, collection_id=None):
@@ -161,8 +189,7 @@ async def get_collection_tiles(request: Request, collection_id=None):
     """
     if 'collection_id' in request.path_params:
         collection_id = request.path_params['collection_id']
-    return get_response(api_.get_collection_tiles(
-        request, collection_id))
+    return await call_api(request, api_.get_collection_tiles, collection_id)
 
 
 async def get_collection_tiles_metadata(request: Request, collection_id=None,
@@ -179,8 +206,8 @@ async def get_collection_tiles_metadata(request: Request, collection_id=None,
         collection_id = request.path_params['collection_id']
     if 'tileMatrixSetId' in request.path_params:
         tileMatrixSetId = request.path_params['tileMatrixSetId']
-    return get_response(api_.get_collection_tiles_metadata(
-        request, collection_id, tileMatrixSetId))
+    return await call_api(request, api_.get_collection_tiles_metadata,
+                          collection_id, tileMatrixSetId)
 
 
 async def get_collection_items_tiles(request: Request, collection_id=None,
@@ -208,9 +235,9 @@ async def get_collection_items_tiles(request: Request, collection_id=None,
         tileRow = request.path_params['tileRow']
     if 'tileCol' in request.path_params:
         tileCol = request.path_params['tileCol']
-    return get_response(api_.get_collection_tiles_data(
-        request, collection_id, tileMatrixSetId,
-        tile_matrix, tileRow, tileCol))
+    return await call_api(request, api_.get_collection_tiles_data,
+                          collection_id, tileMatrixSetId, tile_matrix, tileRow,
+                          tileCol)
 
 
 async def collection_items(request: Request, collection_id=None, item_id=None):
@@ -230,38 +257,33 @@ async def collection_items(request: Request, collection_id=None, item_id=None):
         item_id = request.path_params['item_id']
     if item_id is None:
         if request.method == 'GET':  # list items
-            return get_response(
-                api_.get_collection_items(
-                    request, collection_id))
+            return await call_api(request, api_.get_collection_items,
+                                  collection_id)
         elif request.method == 'POST':  # filter or manage items
             content_type = request.headers.get('content-type')
             if content_type is not None:
                 if content_type == 'application/geo+json':
-                    return get_response(
-                        api_.manage_collection_item(request, 'create',
-                                                    collection_id))
+                    return await call_api(request, api_.manage_collection_item,
+                                          'create', collection_id)
                 else:
-                    return get_response(
-                        api_.post_collection_items(request, collection_id))
+                    return await call_api(request, api_.post_collection_items,
+                                          collection_id)
         elif request.method == 'OPTIONS':
-            return get_response(
-                api_.manage_collection_item(request, 'options', collection_id))
+            return await call_api(request, api_.manage_collection_item,
+                                  'options', collection_id)
 
     elif request.method == 'DELETE':
-        return get_response(
-            api_.manage_collection_item(request, 'delete',
-                                        collection_id, item_id))
+        return await call_api(request, api_.manage_collection_item, 'delete',
+                              collection_id, item_id)
     elif request.method == 'PUT':
-        return get_response(
-            api_.manage_collection_item(request, 'update',
-                                        collection_id, item_id))
+        return await call_api(request, api_.manage_collection_item, 'update',
+                              collection_id, item_id)
     elif request.method == 'OPTIONS':
-        return get_response(
-            api_.manage_collection_item(request, 'options',
-                                        collection_id, item_id))
+        return await call_api(request, api_.manage_collection_item, 'options',
+                              collection_id, item_id)
     else:
-        return get_response(api_.get_collection_item(
-            request, collection_id, item_id))
+        return await call_api(request, api_.get_collection_item, collection_id,
+                              item_id)
 
 
 async def collection_coverage(request: Request, collection_id=None):
@@ -276,7 +298,7 @@ async def collection_coverage(request: Request, collection_id=None):
     if 'collection_id' in request.path_params:
         collection_id = request.path_params['collection_id']
 
-    return get_response(api_.get_collection_coverage(request, collection_id))
+    return await call_api(request, api_.get_collection_coverage, collection_id)
 
 
 async def collection_coverage_domainset(request: Request, collection_id=None):
@@ -291,8 +313,8 @@ async def collection_coverage_domainset(request: Request, collection_id=None):
     if 'collection_id' in request.path_params:
         collection_id = request.path_params['collection_id']
 
-    return get_response(api_.get_collection_coverage_domainset(
-        request, collection_id))
+    return await call_api(request, api_.get_collection_coverage_domainset,
+                          collection_id)
 
 
 async def collection_coverage_rangetype(request: Request, collection_id=None):
@@ -308,8 +330,8 @@ async def collection_coverage_rangetype(request: Request, collection_id=None):
     if 'collection_id' in request.path_params:
         collection_id = request.path_params['collection_id']
 
-    return get_response(api_.get_collection_coverage_rangetype(
-        request, collection_id))
+    return await call_api(request, api_.get_collection_coverage_rangetype,
+                          collection_id)
 
 
 async def collection_map(request: Request, collection_id, style_id=None):
@@ -327,8 +349,8 @@ async def collection_map(request: Request, collection_id, style_id=None):
     if 'style_id' in request.path_params:
         style_id = request.path_params['style_id']
 
-    return get_response(api_.get_collection_map(
-        request, collection_id, style_id))
+    return await call_api(request, api_.get_collection_map, collection_id,
+                          style_id)
 
 
 async def get_processes(request: Request, process_id=None):
@@ -343,7 +365,7 @@ async def get_processes(request: Request, process_id=None):
     if 'process_id' in request.path_params:
         process_id = request.path_params['process_id']
 
-    return get_response(api_.describe_processes(request, process_id))
+    return await call_api(request, api_.describe_processes, process_id)
 
 
 async def get_jobs(request: Request, job_id=None):
@@ -360,12 +382,12 @@ async def get_jobs(request: Request, job_id=None):
         job_id = request.path_params['job_id']
 
     if job_id is None:  # list of submit job
-        return get_response(api_.get_jobs(request))
+        return await call_api(request, api_.get_jobs)
     else:  # get or delete job
         if request.method == 'DELETE':
-            return get_response(api_.delete_job(job_id))
+            return get_response(await DISPATCHER.run(api_.delete_job, job_id))
         else:  # Return status of a specific job
-            return get_response(api_.get_jobs(request, job_id))
+            return await call_api(request, api_.get_jobs, job_id)
 
 
 async def execute_process_jobs(request: Request, process_id=None):
@@ -381,7 +403,7 @@ async def execute_process_jobs(request: Request, process_id=None):
     if 'process_id' in request.path_params:
         process_id = request.path_params['process_id']
 
-    return get_response(api_.execute_process(request, process_id))
+    return await call_api(request, api_.execute_process, process_id)
 
 
 async def get_job_result(request: Request, job_id=None):
@@ -397,7 +419,7 @@ async def get_job_result(request: Request, job_id=None):
     if 'job_id' in request.path_params:
         job_id = request.path_params['job_id']
 
-    return get_response(api_.get_job_result(request, job_id))
+    return await call_api(request, api_.get_job_result, job_id)
 
 
 async def get_job_result_resource(request: Request,
@@ -417,8 +439,8 @@ async def get_job_result_resource(request: Request,
     if 'resource' in request.path_params:
         resource = request.path_params['resource']
 
-    return get_response(api_.get_job_result_resource(
-        request, job_id, resource))
+    return await call_api(request, api_.get_job_result_resource, job_id,
+                          resource)
 
 
 async def get_collection_edr_query(request: Request, collection_id=None, instance_id=None):  # noqa
@@ -438,8 +460,8 @@ async def get_collection_edr_query(request: Request, collection_id=None, instanc
         instance_id = request.path_params['instance_id']
 
     query_type = request["path"].split('/')[-1]  # noqa
-    return get_response(api_.get_collection_edr_query(request, collection_id,
-                                                      instance_id, query_type))
+    return await call_api(request, api_.get_collection_edr_query,
+                          collection_id, instance_id, query_type)
 
 
 async def collections(request: Request, collection_id=None):
@@ -453,7 +475,7 @@ async def collections(request: Request, collection_id=None):
     """
     if 'collection_id' in request.path_params:
         collection_id = request.path_params['collection_id']
-    return get_response(api_.describe_collections(request, collection_id))
+    return await call_api(request, api_.describe_collections, collection_id)
 
 
 async def stac_catalog_root(request: Request):
@@ -464,7 +486,7 @@ async def stac_catalog_root(request: Request):
 
     :returns: Starlette HTTP response
     """
-    return get_response(api_.get_stac_root(request))
+    return await call_api(request, api_.get_stac_root)
 
 
 async def stac_catalog_path(request: Request):
@@ -476,7 +498,7 @@ async def stac_catalog_path(request: Request):
     :returns: Starlette HTTP response
     """
     path = request.path_params["path"]
-    return get_response(api_.get_stac_path(request, path))
+    return await call_api(request, api_.get_stac_path, path)
 
 
 class ApiRulesMiddleware:
@@ -558,8 +580,10 @@ APP = Starlette(
     routes=[
         Mount(f'{url_prefix}/static', StaticFiles(directory=STATIC_DIR)),
         Mount(url_prefix or '/', routes=api_routes)
-    ]
+    ],
+    on_shutdown=[DISPATCHER.shutdown]
 )
+APP.state.dispatcher = DISPATCHER
 
 if url_prefix:
     # If a URL prefix is in effect, Flask allows the static resource URLs
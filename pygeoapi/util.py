@@ -30,19 +30,22 @@
 """Generic util functions used in the code"""
 
 import base64
+from collections import OrderedDict
 import json
 import logging
 import mimetypes
 import os
 import re
 import functools
+import threading
 from functools import partial
+from itertools import islice
 from dataclasses import dataclass
 from datetime import date, datetime, time
 from decimal import Decimal
 from enum import Enum
 from pathlib import Path
-from typing import Any, IO, Union, List, Callable
+from typing import Any, IO, Iterator, Optional, Union, List, Callable
 from urllib.parse import urlparse
 from urllib.request import urlopen
 
@@ -62,7 +65,8 @@ from shapely.geometry import (
 )
 import yaml
 from babel.support import Translations
-from jinja2 import Environment, FileSystemLoader, select_autoescape
+from jinja2 import (Environment, FileSystemBytecodeCache, FileSystemLoader,
+                    select_autoescape)
 import pyproj
 from pyproj.exceptions import CRSError
 from requests import Session
@@ -95,6 +99,12 @@ CRS_URI_PATTERN = re.compile(
     )
 )
 
+# Maximum number of cached CRS instances and transformers (per thread)
+CRS_CACHE_SIZE = 128
+
+# pyproj Transformers, cached per thread
+_TRANSFORMERS = threading.local()
+
 
 # Type for Shapely geometrical objects.
 GeomObject = Union[
@@ -247,6 +257,126 @@ def to_json(dict_: dict, pretty: bool = False) -> str:
                       separators=(',', ':'))
 
 
+class RawJSON(str):
+    """JSON text (e.g. a feature serialized by a database) which
+    :func:`to_json_stream` writes verbatim"""
+    pass
+
+
+def to_json_stream(dict_: dict, pretty: bool = False,
+                   batch_size: int = 100) -> Iterator[str]:
+    """
+    Serialize a FeatureCollection dict to JSON chunks, lazily
+
+    The `features` of the collection may be any iterable (e.g. a generator
+    yielding features from a provider); they are serialized in batches
+    of `batch_size` features as they are consumed.  Members preceding
+    `features` form the header segment.  Members whose value is a
+    callable are deferred to the trailer segment and called with the
+    number of features written, once all features have been consumed
+    (e.g. `links` depending on whether a next page exists).
+    `numberReturned` is always written in the trailer.  Features
+    already serialized as :class:`RawJSON` are passed through as is.
+
+    :param dict_: `dict` of FeatureCollection
+    :param pretty: `bool` of whether to prettify JSON (default is `False`)
+    :param batch_size: `int` of number of features per chunk
+
+    :returns: generator of JSON string chunks
+    """
+
+    def dumps(value):
+        return json.dumps(value, default=json_serial, indent=indent,
+                          separators=(',', ':'))
+
+    if pretty:
+        indent = 4
+        sep = ',\n'
+    else:
+        indent = None
+        sep = ','
+
+    header = []
+    trailer = {}
+    for key, value in dict_.items():
+        if key in ['features', 'numberReturned']:
+            continue
+        if callable(value):
+            trailer[key] = value
+        else:
+            header.append(f'{dumps(key)}:{dumps(value)}')
+
+    yield '{' + ''.join(f'{member},' for member in header) + '"features":['
+
+    count = 0
+    batch = []
+    for feature in dict_.get('features', []):
+        if isinstance(feature, RawJSON):
+            batch.append(feature)
+        else:
+            batch.append(dumps(feature))
+        count += 1
+        if len(batch) == batch_size:
+            yield ('' if count == len(batch) else sep) + sep.join(batch)
+            batch = []
+    if batch:
+        yield ('' if count == len(batch) else sep) + sep.join(batch)
+
+    members = [f'"numberReturned":{count}']
+    for key, value in trailer.items():
+        members.append(f'{dumps(key)}:{dumps(value(count))}')
+
+    yield '],' + ','.join(members) + '}'
+
+
+def to_coverage_json_stream(dict_: dict,
+                            pretty: bool = False) -> Iterator[str]:
+    """
+    Serialize a CoverageJSON dict to JSON chunks, lazily
+
+    The `values` of the `ranges` of the coverage may be any iterable of
+    lists of values (e.g. a generator yielding the values of successive
+    blocks of an array), which are serialized as they are consumed.
+
+    :param dict_: `dict` of CoverageJSON
+    :param pretty: `bool` of whether to prettify JSON (default is `False`)
+
+    :returns: generator of JSON string chunks
+    """
+
+    def dumps(value):
+        return json.dumps(value, default=json_serial, indent=indent,
+                          separators=(',', ':'))
+
+    def members(dict2):
+        return ''.join(f'{dumps(key)}:{dumps(value)},'
+                       for key, value in dict2.items()
+                       if key not in ['ranges', 'values'])
+
+    indent = 4 if pretty else None
+
+    yield '{' + members(dict_) + '"ranges":{'
+
+    for i, (key, range_) in enumerate(dict_.get('ranges', {}).items()):
+        yield ('' if i == 0 else ',') + f'{dumps(key)}:{{' + \
+            members(range_) + '"values":['
+
+        values = range_.get('values', [])
+        if isinstance(values, list):
+            values = [values]
+
+        first = True
+        for chunk in values:
+            if len(chunk) == 0:
+                continue
+            yield ('' if first else ',') + dumps(list(chunk))[1:-1]
+            first = False
+
+        yield ']}'
+
+    yield '}}'
+
+
 def format_datetime(value: str, format_: str = DATETIME_FORMAT) -> str:
     """
     Parse datetime as ISO 8601 string; re-present it in particular format
@@ -387,24 +517,17 @@ def is_url(urlstring: str) -> bool:
         return False
 
 
-def render_j2_template(config: dict, template: Path,
-                       data: dict, locale_: str = None) -> str:
+def get_j2_template_paths(config: dict) -> tuple:
     """
-    render Jinja2 template
+    Get Jinja2 template search paths (custom templates first)
 
     :param config: dict of configuration
-    :param template: template (relative path)
-    :param data: dict of data
-    :param locale_: the requested output Locale
 
-    :returns: string of rendered template
+    :returns: `tuple` of template paths
     """
 
     template_paths = [TEMPLATES, '.']
 
-    locale_dir = config['server'].get('locale_dir', 'locale')
-    LOGGER.debug(f'Locale directory: {locale_dir}')
-
     try:
         templates = config['server']['templates']['path']
         template_paths.insert(0, templates)
@@ -412,9 +535,39 @@ def render_j2_template(config: dict, template: Path,
     except (KeyError, TypeError):
         LOGGER.debug(f'using default templates: {TEMPLATES}')
 
+    return tuple(str(path) for path in template_paths)
+
+
+@functools.lru_cache(maxsize=None)
+def get_j2_environment(template_paths: tuple, locale_dir: str,
+                       locale_: str = None,
+                       bytecode_cache_dir: str = None) -> Environment:
+    """
+    Get Jinja2 environment, built once per template paths and locale
+
+    Templates are compiled on first use and kept by the environment, so
+    that subsequent renders skip loading translations and recompiling.
+
+    :param template_paths: `tuple` of template search paths
+    :param locale_dir: directory of translations
+    :param locale_: the requested output Locale
+    :param bytecode_cache_dir: optional directory to persist compiled
+                               templates across processes
+
+    :returns: `jinja2.Environment`
+    """
+
+    LOGGER.debug(f'Creating Jinja2 environment for locale {locale_}')
+
+    bytecode_cache = None
+    if bytecode_cache_dir is not None:
+        os.makedirs(bytecode_cache_dir, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+
     env = Environment(loader=FileSystemLoader(template_paths),
                       extensions=['jinja2.ext.i18n'],
-                      autoescape=select_autoescape())
+                      autoescape=select_autoescape(),
+                      bytecode_cache=bytecode_cache)
 
     env.filters['to_json'] = to_json
     env.filters['format_datetime'] = format_datetime
@@ -434,12 +587,80 @@ def render_j2_template(config: dict, template: Path,
     translations = Translations.load(locale_dir, [locale_])
     env.install_gettext_translations(translations)
 
+    return env
+
+
+def _get_j2_environment_from_config(config: dict,
+                                    locale_: str = None) -> Environment:
+    """
+    Get Jinja2 environment for a given configuration and locale
+
+    :param config: dict of configuration
+    :param locale_: the requested output Locale
+
+    :returns: `jinja2.Environment`
+    """
+
+    locale_dir = config['server'].get('locale_dir', 'locale')
+    LOGGER.debug(f'Locale directory: {locale_dir}')
+
+    try:
+        bytecode_cache_dir = config['server']['templates']['bytecode_cache']
+    except (KeyError, TypeError):
+        bytecode_cache_dir = None
+
+    return get_j2_environment(get_j2_template_paths(config), locale_dir,
+                              locale_, bytecode_cache_dir)
+
+
+def render_j2_template(config: dict, template: Path,
+                       data: dict, locale_: str = None) -> str:
+    """
+    render Jinja2 template
+
+    :param config: dict of configuration
+    :param template: template (relative path)
+    :param data: dict of data
+    :param locale_: the requested output Locale
+
+    :returns: string of rendered template
+    """
+
+    env = _get_j2_environment_from_config(config, locale_)
+
     template = env.get_template(template)
 
     return template.render(config=l10n.translate_struct(config, locale_, True),
                            data=data, locale=locale_, version=__version__)
 
 
+def precompile_j2_templates(config: dict, locales: list) -> int:
+    """
+    Compile all HTML and JSON-LD templates ahead of the first request
+
+    :param config: dict of configuration
+    :param locales: list of Locales to compile templates for
+
+    :returns: `int` of number of templates compiled
+    """
+
+    # skip the working directory, which is only a fallback search path
+    template_paths = [path for path in get_j2_template_paths(config)
+                      if path != '.']
+    templates = FileSystemLoader(template_paths).list_templates()
+    templates = [t for t in templates if t.endswith(('.html', '.jsonld'))]
+
+    count = 0
+    for locale_ in locales:
+        env = _get_j2_environment_from_config(config, locale_)
+        for template in templates:
+            env.get_template(template)
+            count += 1
+
+    LOGGER.debug(f'Precompiled {count} templates')
+    return count
+
+
 def get_mimetype(filename: str) -> str:
     """
     helper function to return MIME type of a given file
@@ -588,6 +809,85 @@ def read_data(path: Union[Path, str]) -> Union[bytes, str]:
             return r.read()
 
 
+def iter_file(path: Union[Path, str], chunk_size: int = 1048576,
+              delete: bool = False) -> Iterator[bytes]:
+    """
+    helper function to read a local file in chunks
+
+    :param path: path of file
+    :param chunk_size: `int` of size (in bytes) of chunks
+    :param delete: `bool` of whether to delete the file once read (or
+                   once the iterator is closed, even if never started)
+
+    :returns: iterator of `bytes` chunks
+    """
+
+    def read_chunks():
+        with Path(path).open('rb') as fh:
+            while True:
+                chunk = fh.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+    def remove():
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    return ClosingIterator(read_chunks(), remove if delete else None)
+
+
+class ClosingIterator:
+    """
+    Iterator running a cleanup function (e.g. removing temporary files)
+    once its iteration is over: when exhausted, failed or closed, or when
+    garbage collected (e.g. a response which is never sent)
+    """
+
+    def __init__(self, iterable: Any, cleanup: Optional[Callable] = None):
+        """
+        Initialize object
+
+        :param iterable: iterable to iterate over
+        :param cleanup: function to run once the iteration is over
+
+        :returns: `pygeoapi.util.ClosingIterator`
+        """
+
+        self._iterator = iter(iterable)
+        self._cleanup = cleanup
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._iterator)
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self) -> None:
+        """
+        Close the iterator and run its cleanup function (once)
+
+        :returns: `None`
+        """
+
+        cleanup, self._cleanup = self._cleanup, None
+        try:
+            if hasattr(self._iterator, 'close'):
+                self._iterator.close()
+        finally:
+            if cleanup is not None:
+                cleanup()
+
+    def __del__(self):
+        self.close()
+
+
 def url_join(*parts: str) -> str:
     """
     helper function to join a URL from a number of parts/fragments.
@@ -648,9 +948,11 @@ def get_supported_crs_list(config: dict, default_crs_list: list) -> list:
     return supported_crs_list
 
 
+@functools.lru_cache(maxsize=CRS_CACHE_SIZE)
 def get_crs_from_uri(uri: str) -> pyproj.CRS:
     """
     Get a `pyproj.CRS` instance from a CRS URI.
+    Instances are cached, so that PROJ database lookups happen once per URI.
     Author: @MTachon
 
     :param uri: Uniform resource identifier of the coordinate
@@ -687,6 +989,90 @@ def get_crs_from_uri(uri: str) -> pyproj.CRS:
         return crs
 
 
+@functools.lru_cache(maxsize=CRS_CACHE_SIZE)
+def get_crs_from_wkt(wkt: str) -> pyproj.CRS:
+    """
+    Get a (cached) `pyproj.CRS` instance from a WKT string
+
+    :param wkt: WKT representation of the coordinate reference system
+
+    :returns: `pyproj.CRS` instance
+    """
+
+    return pyproj.CRS.from_wkt(wkt)
+
+
+@functools.lru_cache(maxsize=CRS_CACHE_SIZE)
+def get_crs_transform_spec(source_crs_uri: str,
+                           target_crs_uri: str) -> Optional[CrsTransformSpec]:
+    """
+    Get the (cached) coordinates transformation between two CRS URIs
+
+    :param source_crs_uri: URI of the source (storage) CRS
+    :param target_crs_uri: URI of the target CRS
+    :raises `CRSError`: Error raised if no CRS could be identified from an
+        URI.
+
+    :returns: `CrsTransformSpec` instance if the CRSs differ, else `None`
+    """
+
+    crs_in = get_crs_from_uri(source_crs_uri)
+    crs_out = get_crs_from_uri(target_crs_uri)
+    if str(crs_in) == str(crs_out):
+        return None
+
+    return CrsTransformSpec(
+        source_crs_uri=source_crs_uri,
+        source_crs_wkt=crs_in.to_wkt(),
+        target_crs_uri=target_crs_uri,
+        target_crs_wkt=crs_out.to_wkt(),
+    )
+
+
+def get_transformer(crs_in: Union[str, pyproj.CRS],
+                    crs_out: Union[str, pyproj.CRS],
+                    always_xy: bool = False) -> pyproj.Transformer:
+    """
+    Get a `pyproj.Transformer` between two CRSs.
+
+    Transformers are cached per thread (least recently used first out),
+    keyed by source, target and axis order, so that PROJ operations are
+    only set up once per thread.
+
+    :param crs_in: source CRS, as `pyproj.CRS` instance or WKT
+    :param crs_out: target CRS, as `pyproj.CRS` instance or WKT
+    :param always_xy: should axis order be forced to x,y (lon, lat) even if
+                      CRS declares y,x (lat,lon)
+
+    :returns: `pyproj.Transformer` instance
+    """
+
+    try:
+        transformers = _TRANSFORMERS.cache
+    except AttributeError:
+        transformers = _TRANSFORMERS.cache = OrderedDict()
+
+    key = (crs_in, crs_out, always_xy)
+    try:
+        transformers.move_to_end(key)
+        return transformers[key]
+    except KeyError:
+        pass
+
+    if isinstance(crs_in, str):
+        crs_in = get_crs_from_wkt(crs_in)
+    if isinstance(crs_out, str):
+        crs_out = get_crs_from_wkt(crs_out)
+
+    transformer = pyproj.Transformer.from_crs(crs_in, crs_out,
+                                              always_xy=always_xy)
+    transformers[key] = transformer
+    while len(transformers) > CRS_CACHE_SIZE:
+        transformers.popitem(last=False)
+
+    return transformer
+
+
 def get_transform_from_crs(
     crs_in: pyproj.CRS, crs_out: pyproj.CRS, always_xy: bool = False
 ) -> Callable[[GeomObject], GeomObject]:
@@ -707,9 +1093,7 @@ def get_transform_from_crs(
     :returns: Function to transform the coordinates of a `GeomObject`.
     :rtype: `callable`
     """
-    crs_transform = pyproj.Transformer.from_crs(
-        crs_in, crs_out, always_xy=always_xy,
-    ).transform
+    crs_transform = get_transformer(crs_in, crs_out, always_xy).transform
     return partial(shapely.ops.transform, crs_transform)
 
 
@@ -750,12 +1134,10 @@ def crs_transform(func):
             # decorated function.
             LOGGER.debug('crs_transform: NOT applying coordinate transforms')
             return result
-        # Create transformation function and transform the output feature(s)'
+        # Get the (cached) transformer and transform the output feature(s)'
         # coordinates before returning them.
-        transform_func = get_transform_from_crs(
-            pyproj.CRS.from_wkt(crs_transform_spec.source_crs_wkt),
-            pyproj.CRS.from_wkt(crs_transform_spec.target_crs_wkt),
-        )
+        transformer = get_transformer(crs_transform_spec.source_crs_wkt,
+                                      crs_transform_spec.target_crs_wkt)
 
         LOGGER.debug(f'crs_transform: transforming features CRS '
                      f'from {crs_transform_spec.source_crs_uri} '
@@ -765,16 +1147,147 @@ def crs_transform(func):
         # Decorated function returns a single Feature
         if features is None:
             # Transform the feature's coordinates
-            crs_transform_feature(result, transform_func)
+            crs_transform_features([result], transformer)
         # Decorated function returns a FeatureCollection
+        elif isinstance(features, list):
+            # Transform all features' coordinates at once
+            crs_transform_features(features, transformer)
+        # Decorated function streams the features of a FeatureCollection
         else:
-            # Transform all features' coordinates
-            for feature in features:
-                crs_transform_feature(feature, transform_func)
+            result['features'] = _crs_transform_features(features,
+                                                         transformer)
         return result
     return get_geojsonf
 
 
+def _crs_transform_features(features, transformer, batch_size=100):
+    """
+    Lazily transform the coordinates of streamed Features, in batches
+
+    :param features: iterable of Features (GeoJSON-like `dict`)
+    :param transformer: `pyproj.Transformer` instance
+    :param batch_size: number of Features to transform at once
+
+    :returns: generator of transformed Features
+    """
+
+    batch = []
+    for feature in features:
+        batch.append(feature)
+        if len(batch) == batch_size:
+            crs_transform_features(batch, transformer)
+            yield from batch
+            batch = []
+
+    crs_transform_features(batch, transformer)
+    yield from batch
+
+
+def crs_transform_features(features: list,
+                           transformer: pyproj.Transformer) -> None:
+    """
+    Transform the coordinates of Features.
+
+    The coordinates of all geometries are transformed with a single
+    (vectorized) call to the transformer, rather than geometry by geometry.
+    The `geometry` of each Feature is replaced with a new geometry: the
+    input geometries (e.g. shared with a provider cache) are left as is.
+
+    :param features: list of Features (GeoJSON-like `dict`) to transform
+    :param transformer: `pyproj.Transformer` instance
+
+    :returns: None
+    """
+
+    features = [feature for feature in features
+                if feature.get('geometry') is not None]
+
+    positions = []
+    for feature in features:
+        _get_positions(feature['geometry'], positions)
+
+    if not positions:
+        return
+
+    xx = [position[0] for position in positions]
+    yy = [position[1] for position in positions]
+    dimensions = set(map(len, positions))
+    if dimensions == {2}:
+        transformed = map(list, zip(*transformer.transform(xx, yy)))
+    elif min(dimensions) > 2:
+        zz = [position[2] for position in positions]
+        transformed = (
+            [x, y, z, *position[3:]] for x, y, z, position in
+            zip(*transformer.transform(xx, yy, zz), positions)
+        )
+    else:
+        transformed = (
+            [x, y, *position[2:]] for x, y, position in
+            zip(*transformer.transform(xx, yy), positions)
+        )
+
+    for feature in features:
+        feature['geometry'] = _replace_positions(feature['geometry'],
+                                                 transformed)
+
+
+def _get_positions(geometry: dict, positions: list) -> None:
+    """
+    Collect the positions of a GeoJSON geometry, in document order
+
+    :param geometry: GeoJSON geometry `dict`
+    :param positions: `list` to append the positions to
+
+    :returns: None
+    """
+
+    if geometry['type'] == 'GeometryCollection':
+        for geometry_ in geometry['geometries']:
+            _get_positions(geometry_, positions)
+        return
+
+    def walk(coordinates):
+        if not coordinates:
+            return
+        if isinstance(coordinates[0], (int, float)):  # position
+            positions.append(coordinates)
+        elif coordinates[0] and isinstance(coordinates[0][0], (int, float)):
+            positions.extend(coordinates)  # line or ring
+        else:
+            for coordinates_ in coordinates:
+                walk(coordinates_)
+
+    walk(geometry['coordinates'])
+
+
+def _replace_positions(geometry: dict, positions: Iterator) -> dict:
+    """
+    Copy a GeoJSON geometry with new positions, in document order
+
+    :param geometry: GeoJSON geometry `dict` (left unchanged)
+    :param positions: iterator of new positions
+
+    :returns: new GeoJSON geometry `dict`
+    """
+
+    if geometry['type'] == 'GeometryCollection':
+        return dict(geometry, geometries=[
+            _replace_positions(geometry_, positions)
+            for geometry_ in geometry['geometries']
+        ])
+
+    def walk(coordinates):
+        if not coordinates:
+            return []
+        if isinstance(coordinates[0], (int, float)):  # position
+            return next(positions)
+        elif coordinates[0] and isinstance(coordinates[0][0], (int, float)):
+            return list(islice(positions, len(coordinates)))  # line or ring
+        return [walk(coordinates_) for coordinates_ in coordinates]
+
+    return dict(geometry, coordinates=walk(geometry['coordinates']))
+
+
 def crs_transform_feature(feature, transform_func):
     """Transform the coordinates of a Feature.
 
@@ -810,8 +1323,7 @@ def transform_bbox(bbox: list, from_crs: str, to_crs: str) -> list:
 
     from_crs_obj = get_crs_from_uri(from_crs)
     to_crs_obj = get_crs_from_uri(to_crs)
-    transform_func = pyproj.Transformer.from_crs(
-        from_crs_obj, to_crs_obj).transform
+    transform_func = get_transformer(from_crs_obj, to_crs_obj).transform
     n_dims = len(bbox) // 2
     return list(transform_func(*bbox[:n_dims]) + transform_func(
         *bbox[n_dims:]))
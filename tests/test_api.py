@@ -31,10 +31,13 @@
 # =================================================================
 
 import copy
+import gc
 import json
 import logging
+import threading
 import time
 import gzip
+import weakref
 from http import HTTPStatus
 
 from pyld import jsonld
@@ -43,9 +46,12 @@ import pyproj
 from shapely.geometry import Point
 
 from pygeoapi.api import (
-    API, APIRequest, FORMAT_TYPES, validate_bbox, validate_datetime,
-    validate_subset, F_HTML, F_JSON, F_JSONLD, F_GZIP, __version__
+    API, APIRequest, CHARSET, FORMAT_TYPES, gzip_content, parse_byte_range,
+    validate_bbox, validate_datetime, validate_subset, F_HTML, F_JSON,
+    F_JSONLD, F_GZIP,
+    __version__
 )
+from pygeoapi.openapi import OpenAPIDocument
 from pygeoapi.util import (yaml_load, get_crs_from_uri,
                            get_api_rules, get_base_url)
 
@@ -515,6 +521,22 @@ def test_gzip(config, api_):
         gzip.decompress(rsp_gzip_html).decode(enc_16)
 
 
+def test_gzip_stream():
+    # charset of the server encoding
+    charset = f'charset={CHARSET[0]}'
+    for content_type, expected in [
+        ('application/geo+json', f'application/geo+json; {charset}'),
+        ('text/html', f'text/html; {charset}'),
+        ('text/csv; charset=utf-8', 'text/csv; charset=utf-8'),
+        ('image/tiff', 'image/tiff'),
+        ('application/x-netcdf', 'application/x-netcdf')
+    ]:
+        headers = {'Content-Type': content_type, 'Content-Encoding': F_GZIP}
+        content = gzip_content(headers, iter([b'abc', b'def']))
+        assert headers['Content-Type'] == expected
+        assert gzip.decompress(b''.join(content)) == b'abcdef'
+
+
 def test_gzip_csv(config, api_):
     req_csv = mock_request({'f': 'csv'})
     rsp_csv_headers, _, rsp_csv = api_.get_collection_items(req_csv, 'obs')
@@ -538,6 +560,41 @@ def test_gzip_csv(config, api_):
     assert rsp_csv == rsp_csv_
 
 
+def test_api_openapi_document(config, api_, tmp_path):
+    openapi_file = tmp_path / 'openapi.yml'
+    openapi_file.write_text('openapi: 3.0.2')
+    document = OpenAPIDocument(openapi_file)
+
+    req = mock_request(HTTP_ACCEPT='application/json')
+    rsp_headers, code, response = api_.openapi(req, document)
+    assert code == HTTPStatus.OK
+    assert json.loads(response) == {'openapi': '3.0.2'}
+    assert rsp_headers['ETag'] == document.etag
+
+    req = mock_request(HTTP_ACCEPT='application/json',
+                       HTTP_IF_NONE_MATCH=f'"foo", {document.etag}')
+    rsp_headers, code, response = api_.openapi(req, document)
+    assert code == HTTPStatus.NOT_MODIFIED
+    assert rsp_headers['ETag'] == document.etag
+    assert response == ''
+
+    config['server']['gzip'] = True
+    api_ = API(config)
+    req = mock_request(HTTP_ACCEPT='application/json',
+                       HTTP_ACCEPT_ENCODING=F_GZIP)
+    rsp_headers, code, response = api_.openapi(req, document)
+    assert code == HTTPStatus.OK
+    assert rsp_headers['Content-Encoding'] == F_GZIP
+    assert rsp_headers['ETag'] != document.etag
+    assert json.loads(gzip.decompress(response)) == {'openapi': '3.0.2'}
+
+    req = mock_request(HTTP_ACCEPT='application/json',
+                       HTTP_ACCEPT_ENCODING=F_GZIP,
+                       HTTP_IF_NONE_MATCH=rsp_headers['ETag'])
+    _, code, _ = api_.openapi(req, document)
+    assert code == HTTPStatus.NOT_MODIFIED
+
+
 def test_root(config, api_):
     req = mock_request()
     rsp_headers, code, response = api_.landing_page(req)
@@ -1077,6 +1134,97 @@ def test_get_collection_items(config, api_):
     assert code == HTTPStatus.BAD_REQUEST
 
 
+def test_get_collection_items_streaming(config, api_):
+    config['server']['streaming'] = True
+    streaming_api = API(config)
+
+    for params in [{}, {'limit': 2}, {'offset': 4, 'skipGeometry': 'true'}]:
+        req = mock_request(params)
+        expected_headers, _, response = api_.get_collection_items(req, 'obs')
+        expected = json.loads(response)
+
+        req = mock_request(params)
+        rsp_headers, code, response = streaming_api.get_collection_items(
+            req, 'obs')
+        assert code == HTTPStatus.OK
+        assert rsp_headers == expected_headers
+        assert not isinstance(response, str)
+
+        features = json.loads(''.join(response))
+        assert features['features'] == expected['features']
+        assert features['numberReturned'] == expected['numberReturned']
+        assert features['links'] == expected['links']
+
+    # HTML is rendered from a fully materialized collection
+    req = mock_request({'f': 'html'})
+    _, _, response = streaming_api.get_collection_items(req, 'obs')
+    assert isinstance(response, str)
+
+    config['server']['gzip'] = True
+    streaming_api = API(config)
+    req = mock_request({'limit': 2}, HTTP_ACCEPT_ENCODING=F_GZIP)
+    rsp_headers, _, response = streaming_api.get_collection_items(req, 'obs')
+    assert rsp_headers['Content-Encoding'] == F_GZIP
+
+    features = json.loads(gzip.decompress(b''.join(response)))
+    assert len(features['features']) == 2
+
+
+def test_cached_responses(config):
+    config['server']['cache'] = {'name': 'Memory', 'ttl': 60}
+    config['resources']['norway_pop']['cache_ttl'] = 0
+    cached_api = API(config)
+
+    req = mock_request({'limit': 2})
+    rsp_headers, code, response = cached_api.get_collection_items(req, 'obs')
+    assert code == HTTPStatus.OK
+    etag = rsp_headers['ETag']
+    last_modified = rsp_headers['Last-Modified']
+
+    # served from the cache (same timeStamp)
+    req = mock_request({'limit': 2})
+    rsp_headers, code, response2 = cached_api.get_collection_items(req, 'obs')
+    assert rsp_headers['ETag'] == etag
+    assert response2 == response
+
+    # parameters are part of the key
+    req = mock_request({'limit': 3})
+    rsp_headers, code, _ = cached_api.get_collection_items(req, 'obs')
+    assert rsp_headers['ETag'] != etag
+
+    req = mock_request({'limit': 2}, HTTP_IF_NONE_MATCH=etag)
+    rsp_headers, code, response = cached_api.get_collection_items(req, 'obs')
+    assert code == HTTPStatus.NOT_MODIFIED
+    assert response == ''
+
+    req = mock_request({'limit': 2}, HTTP_IF_NONE_MATCH='"other"',
+                       HTTP_IF_MODIFIED_SINCE=last_modified)
+    _, code, _ = cached_api.get_collection_items(req, 'obs')
+    assert code == HTTPStatus.OK
+
+    req = mock_request({'limit': 2}, HTTP_IF_MODIFIED_SINCE=last_modified)
+    _, code, _ = cached_api.get_collection_items(req, 'obs')
+    assert code == HTTPStatus.NOT_MODIFIED
+
+    # transactions start a new generation of the collection
+    cached_api.cache.invalidate('obs')
+    req = mock_request({'limit': 2}, HTTP_IF_NONE_MATCH=etag)
+    _, code, response = cached_api.get_collection_items(req, 'obs')
+    assert code == HTTPStatus.OK
+    assert json.loads(response)['timeStamp'] != \
+        json.loads(response2)['timeStamp']
+
+    # errors are not cached
+    req = mock_request()
+    _, code, _ = cached_api.get_collection_item(req, 'obs', 'notfound')
+    assert code == HTTPStatus.NOT_FOUND
+
+    # caching disabled for the collection
+    req = mock_request()
+    rsp_headers, _, _ = cached_api.get_collection_items(req, 'norway_pop')
+    assert 'ETag' not in rsp_headers
+
+
 def test_get_collection_items_crs(config, api_):
 
     # Invalid CRS query parameter
@@ -1202,6 +1350,47 @@ def test_manage_collection_item_editable_options_req(config):
     assert rsp_headers['Allow'] == 'HEAD, GET, PUT, DELETE'
 
 
+def test_provider_registry(config, api_):
+    provider_def = config['resources']['obs']['providers'][0]
+
+    p = api_.providers.get('obs', provider_def)
+    assert p.thread_safe
+    assert api_.providers.get('obs', provider_def) is p
+    assert api_.providers.check_health() == {('obs', 'feature'): True}
+
+    # changed provider definitions are rebuilt
+    provider_def = copy.deepcopy(provider_def)
+    provider_def['title_field'] = 'stn_id'
+    p2 = api_.providers.get('obs', provider_def)
+    assert p2 is not p
+    assert p2.title_field == 'stn_id'
+
+    api_.providers.invalidate('obs')
+    assert api_.providers.get('obs', provider_def) is not p2
+
+    # non thread-safe providers are kept per thread
+    provider_def['thread_safe'] = False
+    p3 = api_.providers.get('obs', provider_def)
+    assert api_.providers.get('obs', provider_def) is p3
+    result = []
+    thread = threading.Thread(
+        target=lambda: result.append(api_.providers.get('obs', provider_def)))
+    thread.start()
+    thread.join()
+    assert result[0] is not p3
+
+    # per-thread instances are released with their thread
+    released = weakref.ref(result.pop())
+    gc.collect()
+    assert released() is None
+
+    # and invalidated from any thread
+    thread = threading.Thread(target=api_.providers.invalidate, args=('obs',))
+    thread.start()
+    thread.join()
+    assert api_.providers.get('obs', provider_def) is not p3
+
+
 def test_describe_collections_enclosures(config_enclosure, enclosure_api):
     original_enclosures = {
         lnk['title']: lnk
@@ -1256,6 +1445,15 @@ def test_get_collection_items_json_ld(config, api_):
 
 
 def test_get_collection_item(config, api_):
+    # links are not added to the features of the provider
+    req = mock_request()
+    links = []
+    for _ in range(2):
+        rsp_headers, code, response = api_.get_collection_item(
+            req, 'naturalearth/lakes', '0')
+        links.append(len(json.loads(response)['links']))
+    assert links[0] == links[1]
+
     req = mock_request({'f': 'foo'})
     rsp_headers, code, response = api_.get_collection_item(req, 'obs', '371')
 
@@ -1524,6 +1722,34 @@ def test_get_collection_map(config, api_):
     assert response[1:4] == b'PNG'
 
 
+def test_get_collection_coverage_scale(config, api_):
+    req = mock_request({'scale-size': 'Lat(100),Long(200)'})
+    rsp_headers, code, response = api_.get_collection_coverage(
+        req, 'gdps-temperature')
+
+    assert code == HTTPStatus.OK
+    content = json.loads(response)
+    assert content['domain']['axes']['x']['num'] == 200
+    assert content['domain']['axes']['y']['num'] == 100
+    assert len(content['ranges']['TMP']['values']) == 20000
+
+    req = mock_request({'scale-factor': '4', 'subset': 'Lat(5:10),Long(5:10)'})
+    rsp_headers, code, response = api_.get_collection_coverage(
+        req, 'gdps-temperature')
+
+    assert code == HTTPStatus.OK
+    content = json.loads(response)
+    assert content['domain']['axes']['x']['num'] == 9
+
+    for params in [{'scale-factor': '0'}, {'scale-factor': 'foo'},
+                   {'scale-size': 'Lat(foo)'}, {'scale-size': 'foo(10)'}]:
+        req = mock_request(params)
+        rsp_headers, code, response = api_.get_collection_coverage(
+            req, 'gdps-temperature')
+
+        assert code == HTTPStatus.BAD_REQUEST
+
+
 def test_get_collection_tiles(config, api_):
     req = mock_request()
     rsp_headers, code, response = api_.get_collection_tiles(req, 'obs')
@@ -1543,6 +1769,49 @@ def test_get_collection_tiles(config, api_):
     assert len(content['tilesets']) > 0
 
 
+def test_get_collection_tiles_data_tile_cache(config, tmp_path):
+    config['server']['tile_cache'] = {
+        'name': 'MBTiles',
+        'path': str(tmp_path),
+        'gzip': True,
+        'max_age': 600
+    }
+    tile_cache_api = API(config)
+    tile = ('naturalearth/lakes', 'WorldCRS84Quad', '3', '1', '1')
+
+    req = mock_request({'f': 'mvt'})
+    rsp_headers, code, response = \
+        tile_cache_api.get_collection_tiles_data(req, *tile)
+    assert code == HTTPStatus.OK
+    assert rsp_headers['Cache-Control'] == 'public, max-age=600'
+    assert 'Content-Encoding' not in rsp_headers
+    with open(get_test_file_path('data/tiles/ne_110m_lakes/3/1/1.pbf'),
+              'rb') as fh:
+        assert response == fh.read()
+
+    cached = tile_cache_api.tile_cache.get(
+        'naturalearth/lakes', 'WorldCRS84Quad', 3, 1, 1, 'pbf')
+    assert gzip.decompress(cached) == response
+
+    req = mock_request({'f': 'mvt'}, HTTP_ACCEPT_ENCODING=F_GZIP)
+    rsp_headers, code, response = \
+        tile_cache_api.get_collection_tiles_data(req, *tile)
+    assert code == HTTPStatus.OK
+    assert rsp_headers['Content-Encoding'] == F_GZIP
+    assert response == cached
+
+    req = mock_request({'f': 'mvt'}, HTTP_ACCEPT_ENCODING=F_GZIP,
+                       HTTP_IF_NONE_MATCH=rsp_headers['ETag'])
+    _, code, response = tile_cache_api.get_collection_tiles_data(req, *tile)
+    assert code == HTTPStatus.NOT_MODIFIED
+    assert response == ''
+
+    # transactions remove the cached tiles of the collection
+    tile_cache_api.tile_cache.invalidate('naturalearth/lakes')
+    assert tile_cache_api.tile_cache.get(
+        'naturalearth/lakes', 'WorldCRS84Quad', 3, 1, 1, 'pbf') is None
+
+
 def test_describe_processes(config, api_):
     req = mock_request({'limit': 1})
     # Test for description of single processes
@@ -1862,6 +2131,172 @@ def test_delete_job(api_):
     assert code == HTTPStatus.NOT_FOUND
 
 
+def test_get_jobs(api_):
+    for i in range(3):
+        req = mock_request(data={'inputs': {'name': f'Jobs {i}'}})
+        rsp_headers, code, response = api_.execute_process(
+            req, 'hello-world')
+        assert code == HTTPStatus.OK
+
+    req = mock_request({'limit': 2, 'processID': 'hello-world'})
+    rsp_headers, code, response = api_.get_jobs(req)
+    assert code == HTTPStatus.OK
+    data = json.loads(response)
+    assert data['numberReturned'] == 2
+    assert data['numberMatched'] >= 3
+    assert all(job['processID'] == 'hello-world' for job in data['jobs'])
+    next_link = next(link for link in data['links'] if link['rel'] == 'next')
+    assert 'offset=2' in next_link['href']
+    assert 'limit=2' in next_link['href']
+    assert not any(link['rel'] == 'prev' for link in data['links'])
+
+    req = mock_request({'limit': 2, 'offset': 2, 'status': 'successful'})
+    rsp_headers, code, response = api_.get_jobs(req)
+    assert code == HTTPStatus.OK
+    data = json.loads(response)
+    assert data['numberReturned'] >= 1
+    assert all(job['status'] == 'successful' for job in data['jobs'])
+    prev_link = next(link for link in data['links'] if link['rel'] == 'prev')
+    assert 'offset=0' in prev_link['href']
+
+    req = mock_request({'processID': 'does-not-exist'})
+    rsp_headers, code, response = api_.get_jobs(req)
+    data = json.loads(response)
+    assert data['jobs'] == []
+    assert data['numberMatched'] == 0
+
+    req = mock_request({'datetime': '2000-01-01T00:00:00Z/..'})
+    rsp_headers, code, response = api_.get_jobs(req)
+    assert code == HTTPStatus.OK
+
+    for params in ({'limit': 0}, {'offset': -1}, {'status': 'unknown'},
+                   {'datetime': 'yesterday'}):
+        rsp_headers, code, response = api_.get_jobs(mock_request(params))
+        assert code == HTTPStatus.BAD_REQUEST
+
+
+def test_get_jobs_legacy_manager(api_, monkeypatch):
+    jobs = [{
+        'identifier': str(i),
+        'process_id': 'hello-world' if i % 2 else 'echo',
+        'status': 'successful',
+        'message': 'Job complete',
+        'progress': 100,
+        'mimetype': 'application/json',
+        'job_start_datetime': f'2024-01-0{i}T00:00:00.000000Z',
+        'job_end_datetime': f'2024-01-0{i}T00:00:01.000000Z'
+    } for i in range(1, 8)]
+
+    def get_jobs(status=None):
+        return jobs
+
+    # managers returning all jobs as a list are filtered by the API
+    monkeypatch.setattr(api_.manager, 'get_jobs', get_jobs)
+    req = mock_request({'limit': 2, 'offset': 1, 'processID': 'hello-world',
+                        'datetime': '2024-01-01/2024-01-06'})
+    rsp_headers, code, response = api_.get_jobs(req)
+    assert code == HTTPStatus.OK
+    data = json.loads(response)
+    assert data['numberMatched'] == 3
+    assert [job['jobID'] for job in data['jobs']] == ['3', '1']
+
+
+def test_get_job_result(api_):
+    req = mock_request(data={'inputs': {'name': 'Result'}})
+    rsp_headers, code, response = api_.execute_process(req, 'hello-world')
+    job_id = rsp_headers['Location'].split('/')[-1]
+
+    # the result file is streamed
+    req = mock_request({'f': 'json'})
+    rsp_headers, code, response = api_.get_job_result(req, job_id)
+    assert code == HTTPStatus.OK
+    data = b''.join(response)
+    assert json.loads(data)['value'] == 'Hello Result!'
+    assert rsp_headers['Content-Type'] == FORMAT_TYPES[F_JSON]
+    assert rsp_headers['Content-Length'] == str(len(data))
+    assert rsp_headers['Accept-Ranges'] == 'bytes'
+    etag = rsp_headers['ETag']
+
+    req = mock_request({'f': 'json'}, HTTP_IF_NONE_MATCH=etag)
+    rsp_headers, code, response = api_.get_job_result(req, job_id)
+    assert code == HTTPStatus.NOT_MODIFIED
+
+    req = mock_request({'f': 'json'}, HTTP_RANGE='bytes=2-9')
+    rsp_headers, code, response = api_.get_job_result(req, job_id)
+    assert code == HTTPStatus.PARTIAL_CONTENT
+    assert b''.join(response) == data[2:10]
+    assert rsp_headers['Content-Range'] == f'bytes 2-9/{len(data)}'
+    assert rsp_headers['Content-Length'] == '8'
+
+    req = mock_request({'f': 'json'}, HTTP_RANGE='bytes=-5',
+                       HTTP_IF_RANGE=etag)
+    rsp_headers, code, response = api_.get_job_result(req, job_id)
+    assert code == HTTPStatus.PARTIAL_CONTENT
+    assert b''.join(response) == data[-5:]
+
+    req = mock_request({'f': 'json'}, HTTP_RANGE='bytes=0-9',
+                       HTTP_IF_RANGE='"outdated"')
+    rsp_headers, code, response = api_.get_job_result(req, job_id)
+    assert code == HTTPStatus.OK
+    assert b''.join(response) == data
+
+    req = mock_request({'f': 'json'}, HTTP_RANGE=f'bytes={len(data)}-')
+    rsp_headers, code, response = api_.get_job_result(req, job_id)
+    assert code == HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE
+    assert rsp_headers['Content-Range'] == f'bytes */{len(data)}'
+
+    # HTML is rendered from the result
+    req = mock_request({'f': 'html'})
+    rsp_headers, code, response = api_.get_job_result(req, job_id)
+    assert code == HTTPStatus.OK
+    assert 'Hello Result!' in response
+
+    # result files are left to the front web server
+    api_.manager.offload = {'header': 'X-Accel-Redirect',
+                            'prefix': '/results/'}
+    req = mock_request({'f': 'json'})
+    rsp_headers, code, response = api_.get_job_result(req, job_id)
+    assert code == HTTPStatus.OK
+    assert rsp_headers['X-Accel-Redirect'] == \
+        f'/results/hello-world-{job_id}'
+    assert response == ''
+    api_.manager.offload = None
+
+    # compressed results
+    api_.manager.compress_outputs = True
+    req = mock_request(data={'inputs': {'name': 'Gzip'}})
+    rsp_headers, code, response = api_.execute_process(req, 'hello-world')
+    job_id = rsp_headers['Location'].split('/')[-1]
+    assert api_.manager.get_job_result(job_id)[1]['value'] == 'Hello Gzip!'
+
+    req = mock_request({'f': 'json'}, HTTP_ACCEPT_ENCODING=F_GZIP)
+    rsp_headers, code, response = api_.get_job_result(req, job_id)
+    assert rsp_headers['Content-Encoding'] == F_GZIP
+    data = gzip.decompress(b''.join(response))
+    assert json.loads(data)['value'] == 'Hello Gzip!'
+
+    req = mock_request({'f': 'json'})
+    rsp_headers, code, response = api_.get_job_result(req, job_id)
+    assert 'Content-Encoding' not in rsp_headers
+    assert 'Content-Length' not in rsp_headers
+    assert b''.join(response) == data
+
+
+def test_parse_byte_range():
+    assert parse_byte_range('bytes=0-99', 1000) == (0, 99)
+    assert parse_byte_range('bytes=900-', 1000) == (900, 999)
+    assert parse_byte_range('bytes=900-2000', 1000) == (900, 999)
+    assert parse_byte_range('bytes=-100', 1000) == (900, 999)
+    assert parse_byte_range('bytes=-2000', 1000) == (0, 999)
+    assert parse_byte_range('bytes=0-9,20-29', 1000) is None
+    assert parse_byte_range('bytes=9-0', 1000) is None
+    assert parse_byte_range('items=0-9', 1000) is None
+    with pytest.raises(ValueError):
+        parse_byte_range('bytes=1000-', 1000)
+    with pytest.raises(ValueError):
+        parse_byte_range('bytes=-0', 1000)
+
+
 def test_get_collection_edr_query(config, api_):
     # edr resource
     req = mock_request()
@@ -2037,6 +2472,82 @@ def test_get_collection_edr_query(config, api_):
     assert code == HTTPStatus.BAD_REQUEST
 
 
+def test_get_collection_edr_query_points_area(config, api_):
+    # multiple points
+    req = mock_request({
+        'coords': 'MULTIPOINT((11 11),(-40 20),(100 -30))',
+        'parameter-name': 'SST',
+        'datetime': '2000-01-16/2000-04-16'
+    })
+    rsp_headers, code, response = api_.get_collection_edr_query(
+        req, 'icoads-sst', None, 'position')
+    assert code == HTTPStatus.OK
+
+    data = json.loads(response)
+    assert data['type'] == 'CoverageCollection'
+    assert data['domainType'] == 'PointSeries'
+    assert list(data['parameters'].keys()) == ['SST']
+    assert len(data['coverages']) == 3
+
+    coverage = data['coverages'][1]
+    assert coverage['domain']['axes']['x']['values'] == [-39.0]
+    assert coverage['domain']['axes']['y']['values'] == [21.0]
+    assert len(coverage['domain']['axes']['t']['values']) == 4
+    assert coverage['ranges']['SST']['axisNames'] == ['t']
+    assert coverage['ranges']['SST']['shape'] == [4]
+
+    # same values as single point queries
+    req = mock_request({
+        'coords': 'POINT(-40 20)', 'parameter-name': 'SST',
+        'datetime': '2000-01-16/2000-04-16'
+    })
+    rsp_headers, code, response = api_.get_collection_edr_query(
+        req, 'icoads-sst', None, 'position')
+    values = json.loads(response)['ranges']['SST']['values']
+    assert coverage['ranges']['SST']['values'] == values
+
+    # vertices of a linestring
+    req = mock_request({'coords': 'LINESTRING(0 0, 10 10, 20 5)'})
+    rsp_headers, code, response = api_.get_collection_edr_query(
+        req, 'icoads-sst', None, 'position')
+    assert code == HTTPStatus.OK
+
+    data = json.loads(response)
+    assert len(data['coverages']) == 3
+    assert len(data['parameters'].keys()) == 4
+
+    # area
+    req = mock_request({
+        'coords': 'POLYGON((0 0, 20 0, 10 20, 0 0))',
+        'parameter-name': 'SST',
+        'datetime': '2000-01-16'
+    })
+    rsp_headers, code, response = api_.get_collection_edr_query(
+        req, 'icoads-sst', None, 'area')
+    assert code == HTTPStatus.OK
+
+    data = json.loads(response)
+    assert data['domain']['axes']['x']['num'] == 10
+    assert data['domain']['axes']['y']['num'] == 10
+    values = data['ranges']['SST']['values']
+    assert len(values) == 100
+    # cells of the upper row are outside of the triangle (null)
+    assert not any(value is None for value in values[:10])
+    assert all(value is None for value in values[90:])
+
+    # area outside of the grid
+    req = mock_request({'coords': 'POLYGON((0 0, 0.5 0, 0.5 0.5, 0 0))'})
+    rsp_headers, code, response = api_.get_collection_edr_query(
+        req, 'icoads-sst', None, 'area')
+    assert code == HTTPStatus.NO_CONTENT
+
+    # area of a point
+    req = mock_request({'coords': 'POINT(11 11)'})
+    rsp_headers, code, response = api_.get_collection_edr_query(
+        req, 'icoads-sst', None, 'area')
+    assert code == HTTPStatus.BAD_REQUEST
+
+
 def test_validate_bbox():
     assert validate_bbox('1,2,3,4') == [1, 2, 3, 4]
     assert validate_bbox('1,2,3,4,5,6') == [1, 2, 3, 4, 5, 6]
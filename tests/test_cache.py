@@ -0,0 +1,136 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import time
+
+import pytest
+
+from pygeoapi.plugin import load_plugin
+from pygeoapi.cache.redis_ import RedisCache
+
+
+class FakeRedis:
+    """Minimal in-memory stand-in for a Redis client"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        value, expires = self.data.get(key, (None, 0))
+        if expires < time.time():
+            return None
+        return value
+
+    def set(self, key, value, px=None):
+        self.data[key] = (value, time.time() + px / 1000)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+@pytest.fixture(params=['Memory', 'Filesystem', 'Redis'])
+def cache(request, tmp_path):
+    cache_def = {'name': request.param, 'ttl': 60, 'path': str(tmp_path)}
+    if request.param == 'Redis':
+        return RedisCache(cache_def, client=FakeRedis())
+    return load_plugin('cache', cache_def)
+
+
+def test_get_set(cache):
+    entry = {'headers': {'ETag': '"1"'}, 'content': '{"a": 1}'}
+    assert cache.get('key') is None
+
+    cache.set('key', entry, 60)
+    assert cache.get('key') == entry
+
+    binary = {'headers': {}, 'content': b'\x00\x01'}
+    cache.set('binary', binary, 60)
+    assert cache.get('binary') == binary
+
+    cache.delete('key')
+    assert cache.get('key') is None
+
+    cache.set('expired', entry, -1)
+    assert cache.get('expired') is None
+
+
+def test_generations(cache):
+    generation = cache.get_generation('obs')
+    assert cache.get_generation('obs') == generation
+    assert cache.get_generation('lakes') != generation
+
+    cache.invalidate('obs')
+    assert cache.get_generation('obs') != generation
+
+
+def test_memory_cache_lru():
+    cache = load_plugin('cache', {'name': 'Memory', 'max_entries': 2})
+    for key in ['a', 'b']:
+        cache.set(key, {'content': key}, 60)
+    cache.get('a')
+    cache.set('c', {'content': 'c'}, 60)
+
+    assert cache.get('a') is not None
+    assert cache.get('b') is None
+
+
+def test_sub_second_ttl(cache):
+    cache.set('key', {'content': 'a'}, 0.5)
+    assert cache.get('key') == {'content': 'a'}
+
+    time.sleep(0.6)
+    assert cache.get('key') is None
+
+
+def test_filesystem_cache_sweep(tmp_path):
+    cache = load_plugin('cache', {
+        'name': 'Filesystem',
+        'path': str(tmp_path),
+        'max_size': 1000,
+        'sweep_interval': 0
+    })
+
+    def count():
+        return len(list(tmp_path.glob('*/*')))
+
+    # expired entries are swept, even if never read again
+    cache.set('expired', {'content': 'a'}, 0.1)
+    time.sleep(0.2)
+    cache.set('key', {'content': 'a'}, 60)
+    assert count() == 1
+
+    # least recently used entries go beyond the maximum size
+    for i in range(10):
+        time.sleep(0.01)
+        cache.set(f'key{i}', {'content': 'a' * 100}, 60)
+        cache.get('key')
+    assert count() < 10
+    assert cache.get('key') is not None
+    assert cache.get('key9') is not None
+    assert cache.get('key0') is None
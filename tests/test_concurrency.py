@@ -0,0 +1,144 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import asyncio
+import threading
+import time
+
+from pygeoapi.concurrency import await_result, RequestDispatcher
+from pygeoapi.util import ClosingIterator
+
+
+def test_await_result():
+    async def query():
+        await asyncio.sleep(0)
+        return 'async'
+
+    assert await_result('sync') == 'sync'
+    assert await_result(query()) == 'async'
+
+    async def on_loop():
+        return await_result(query())
+
+    assert asyncio.run(on_loop()) == 'async'
+
+
+def test_request_dispatcher():
+    config = {
+        'server': {'concurrency': {'max_workers': 4}},
+        'resources': {'slow': {'concurrency_limit': 1}}
+    }
+    dispatcher = RequestDispatcher.from_config(config)
+    assert dispatcher.max_workers == 4
+    assert dispatcher.collection_limits == {'slow': 1}
+
+    loop_thread = []
+    running = {'slow': 0, 'other': 0}
+    peak = {'slow': 0, 'other': 0}
+    lock = threading.Lock()
+
+    async def provider_query():
+        loop_thread.append(threading.get_ident())
+        return 'result'
+
+    def api_call(collection):
+        with lock:
+            running[collection] += 1
+            peak[collection] = max(peak[collection], running[collection])
+        time.sleep(0.05)
+        result = await_result(provider_query())
+        with lock:
+            running[collection] -= 1
+        return threading.get_ident(), result
+
+    async def main():
+        calls = [dispatcher.run(api_call, name, collection=name)
+                 for name in ['slow', 'other'] * 3]
+        results = await asyncio.gather(*calls)
+
+        stats = dispatcher.stats()
+        return threading.get_ident(), results, stats
+
+    main_thread, results, stats = asyncio.run(main())
+    dispatcher.shutdown()
+
+    assert all(result == 'result' for _, result in results)
+    # blocking calls run off the event loop, async provider calls on it
+    assert all(thread != main_thread for thread, _ in results)
+    assert set(loop_thread) == {main_thread}
+
+    assert peak['slow'] == 1
+    assert peak['other'] > 1
+
+    assert stats['max_workers'] == 4
+    assert stats['queued'] == 0
+    assert stats['active'] == 0
+    assert stats['collections']['slow'] == {
+        'waiting': 0, 'queued': 0, 'active': 0}
+
+
+def test_request_dispatcher_stream():
+    dispatcher = RequestDispatcher(2, collection_limits={'slow': 1})
+    threads = []
+    closed = []
+
+    def chunks():
+        for i in range(3):
+            threads.append(threading.get_ident())
+            yield f'{i}'
+
+    def api_call():
+        return {}, 200, ClosingIterator(
+            chunks(), lambda: closed.append(threading.get_ident()))
+
+    async def main():
+        _, _, stream = await dispatcher.run(api_call, collection='slow')
+        # the stream holds the collection slot until it is consumed
+        semaphore = dispatcher._get_semaphore('slow')
+        assert semaphore.locked()
+        chunks_ = [chunk async for chunk in stream]
+        await asyncio.sleep(0.01)
+        assert not semaphore.locked()
+
+        # or closed, even if never started
+        _, _, stream = await dispatcher.run(api_call, collection='slow')
+        assert semaphore.locked()
+        await stream.aclose()
+        await asyncio.sleep(0.01)
+        assert not semaphore.locked()
+
+        return threading.get_ident(), chunks_
+
+    main_thread, chunks_ = asyncio.run(main())
+    dispatcher.shutdown()
+
+    assert chunks_ == ['0', '1', '2']
+    # the stream is consumed in the thread pool, off the event loop
+    assert threads and main_thread not in threads
+    assert len(closed) == 2 and main_thread not in closed
@@ -28,9 +28,15 @@
 #
 # =================================================================
 
+import copy
+
+from elasticsearch import exceptions
 import pytest
 
-from pygeoapi.provider.base import ProviderItemNotFoundError
+from pygeoapi.plugin import ProviderRegistry
+from pygeoapi.provider.base import (ProviderInvalidQueryError,
+                                    ProviderItemNotFoundError)
+from pygeoapi.provider import elasticsearch_
 from pygeoapi.provider.elasticsearch_ import ElasticsearchProvider
 from pygeoapi.models.cql import CQLModel
 
@@ -211,6 +217,134 @@ def test_query(config):
     assert len(results['features'][0]['properties']) == 1
 
 
+def test_query_cursor(config):
+    config['max_result_window'] = 100
+    p = ElasticsearchProvider(config)
+
+    sortby = [{'property': 'nameascii', 'order': '+'}]
+
+    results = p.query(sortby=sortby, offset=90, limit=10)
+    assert results['numberMatched'] == 242
+    assert results['numberReturned'] == 10
+    assert 'next_cursor' in results
+
+    expected = p.query(sortby=sortby, offset=100, limit=150)
+    assert len(expected['features']) == 142
+    assert 'next_cursor' not in expected
+
+    names = []
+    cursor = results['next_cursor']
+    while cursor is not None:
+        results = p.query(sortby=sortby, limit=50, cursor=cursor)
+        assert results['numberMatched'] == 242
+        names.extend(f['properties']['nameascii']
+                     for f in results['features'])
+        cursor = results.get('next_cursor')
+
+    assert names == [f['properties']['nameascii']
+                     for f in expected['features']]
+
+    results = p.query(sortby=sortby, offset=90, limit=10)
+    with pytest.raises(ProviderInvalidQueryError):
+        p.query(limit=50, cursor=results['next_cursor'])
+
+    with pytest.raises(ProviderInvalidQueryError):
+        p.query(sortby=sortby, limit=50, cursor='invalid')
+
+
+class PitElasticsearch:
+    """Elasticsearch client paging 25 hits over points in time"""
+
+    def __init__(self):
+        self.opened = []
+        self.closed = []
+
+    def open_point_in_time(self, index, keep_alive):
+        self.opened.append(f'pit-{len(self.opened)}')
+        return {'id': self.opened[-1]}
+
+    def close_point_in_time(self, body=None, params=None, headers=None):
+        self.closed.append(body['id'])
+        raise exceptions.TransportError('N/A', 'already closed')
+
+    def search(self, pit, size, search_after=None, **kwargs):
+        start = 0 if search_after is None else search_after[0] + 1
+        hits = [{'_id': str(i), 'sort': [i]}
+                for i in range(start, min(start + size, 25))]
+        return {'pit_id': pit['id'], 'hits': {'hits': hits}}
+
+
+def test_search_after_cursor_pit():
+    p = ElasticsearchProvider.__new__(ElasticsearchProvider)
+    p.es = PitElasticsearch()
+    p.index_name = 'index'
+    p.max_result_window = 5
+    p.pit_keep_alive = '1m'
+
+    query = {'query': {'match_all': {}}}
+    results, cursor = p._search_after(query, 8, 4)
+    ids = [hit['_id'] for hit in results['hits']['hits']]
+    assert ids == ['8', '9', '10', '11']
+
+    while cursor is not None:
+        results, cursor = p._search_after(query, 0, 4, cursor)
+        ids.extend(hit['_id'] for hit in results['hits']['hits'])
+
+    assert ids == [str(i) for i in range(8, 25)]
+    # the pages of the cursor share one point in time, closed at the end
+    assert p.es.opened == ['pit-0']
+    assert p.es.closed == ['pit-0']
+
+
+class FeatureElasticsearch:
+    """Elasticsearch client of an index of one feature"""
+
+    def __init__(self, host):
+        self.indices = self
+        self.doc = {
+            '_id': '1',
+            '_source': {
+                'type': 'Feature',
+                'geometry': None,
+                'properties': {'geonameid': 1, 'name': 'Lisbon', 'pop': 5}
+            }
+        }
+
+    def ping(self):
+        return True
+
+    def info(self):
+        return {'version': {'number': '8.11.0'}}
+
+    def get(self, index, id=None):
+        if id is None:  # indices.get
+            properties = {'name': {'type': 'text'}, 'pop': {'type': 'long'}}
+            return {index: {'mappings': {'properties': {'properties': {
+                'properties': properties}}}}}
+        return copy.deepcopy(self.doc)
+
+    def search(self, index, from_, size, **kwargs):
+        return {'hits': {'total': {'value': 1},
+                         'hits': [copy.deepcopy(self.doc)]}}
+
+
+def test_registry_select_properties(config, monkeypatch):
+    monkeypatch.setattr(elasticsearch_, 'Elasticsearch', FeatureElasticsearch)
+    providers = ProviderRegistry()
+    p = providers.get('es', config)
+
+    results = p.query(select_properties=['name'])
+    assert results['features'][0]['properties'] == {'name': 'Lisbon'}
+
+    # the instance reused by the next requests keeps no selection
+    assert providers.get('es', config) is p
+    feature = p.get('1')
+    assert feature['properties'] == {
+        'geonameid': 1, 'name': 'Lisbon', 'pop': 5}
+    results = p.query()
+    assert results['features'][0]['properties']['pop'] == 5
+
+
 def test_get(config):
     p = ElasticsearchProvider(config)
 
@@ -33,6 +33,7 @@ import pytest
 
 from pygeoapi.provider.base import ProviderItemNotFoundError
 from pygeoapi.provider.geojson import GeoJSONProvider
+from pygeoapi.util import get_crs_transform_spec
 
 
 path = '/tmp/test.geojson'
@@ -154,3 +155,100 @@ def test_update(fixture, config):
     # Should be changed
     results = p.get('123-456')
     assert 'Null' in results['properties']['name']
+
+
+@pytest.fixture()
+def fixture_many():
+    data = {
+        'type': 'FeatureCollection',
+        'features': [{
+            'type': 'Feature',
+            'id': str(i),
+            'geometry': {
+                'type': 'Point',
+                'coordinates': [float(i), float(i)]},
+            'properties': {
+                'name': name,
+                'value': i % 2,
+                'datetime': f'2020-01-0{i + 1}T00:00:00Z'
+            }} for i, name in enumerate(['c', 'a', 'd', 'b'])
+        ]
+    }
+
+    with open(path, 'w') as fh:
+        fh.write(json.dumps(data))
+    return path
+
+
+def test_query_indexed(fixture_many, config):
+    p = GeoJSONProvider(dict(config, time_field='datetime'))
+
+    results = p.query(bbox=[0.5, 0.5, 2.5, 2.5])
+    assert results['numberMatched'] == 2
+    assert [f['id'] for f in results['features']] == ['1', '2']
+
+    results = p.query(datetime_='2020-01-02/..')
+    assert [f['id'] for f in results['features']] == ['1', '2', '3']
+
+    results = p.query(datetime_='../2020-01-02T00:00:00Z',
+                      bbox=[-1, -1, 10, 10])
+    assert [f['id'] for f in results['features']] == ['0', '1']
+
+    results = p.query(sortby=[{'property': 'name', 'order': '+'}])
+    assert [f['id'] for f in results['features']] == ['1', '3', '0', '2']
+
+    results = p.query(sortby=[{'property': 'value', 'order': '-'},
+                              {'property': 'name', 'order': '+'}],
+                      limit=3)
+    assert [f['id'] for f in results['features']] == ['1', '3', '0']
+
+    results = p.query(sortby=[{'property': 'name', 'order': '-'}],
+                      properties=[('value', 0)])
+    assert [f['id'] for f in results['features']] == ['2', '0']
+
+
+def test_reload_on_change(fixture_many, config):
+    p = GeoJSONProvider(config)
+    assert p.query()['numberMatched'] == 4
+
+    # results are copies of the in-memory index
+    p.query(skip_geometry=True)
+    assert p.get('0')['geometry'] is not None
+    feature = p.get('0')
+    feature['geometry']['coordinates'].append(0)
+    feature['properties']['name'] = 'changed'
+    feature.setdefault('links', []).append({'rel': 'self'})
+    assert p.get('0') != feature
+    p.query()['features'][0]['properties'].clear()
+    assert p.query()['features'][0]['properties']
+
+    with open(path) as fh:
+        data = json.load(fh)
+    data['features'] = data['features'][:1]
+    with open(path, 'w') as fh:
+        fh.write(json.dumps(data))
+
+    assert p.query()['numberMatched'] == 1
+    with pytest.raises(ProviderItemNotFoundError):
+        p.get('3')
+
+
+def test_get_crs_transform(fixture, config):
+    p = GeoJSONProvider(config)
+    spec = get_crs_transform_spec(
+        'http://www.opengis.net/def/crs/OGC/1.3/CRS84',
+        'http://www.opengis.net/def/crs/EPSG/0/3857')
+
+    # transformed features do not alter the in-memory index
+    for _ in range(2):
+        feature = p.get('123-456', crs_transform_spec=spec)
+        assert feature['geometry']['coordinates'][0] == \
+            pytest.approx(13981728.0, abs=1)
+        feature = p.get('123-456')
+        assert feature['geometry']['coordinates'] == [125.6, 10.1]
+
+    results = p.query(crs_transform_spec=spec)
+    assert results['features'][0]['geometry']['coordinates'][0] == \
+        pytest.approx(13981728.0, abs=1)
+    assert p.query()['features'][0]['geometry']['coordinates'] == \
+        [125.6, 10.1]
@@ -0,0 +1,247 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+from pygeoapi.provider.base import ProviderConnectionError, ProviderQueryError
+from pygeoapi.provider.esri import ESRIServiceProvider
+from pygeoapi.provider.http_ import HTTPClient, get_http_client
+
+FEATURES = [{'type': 'Feature', 'id': i, 'geometry': None,
+             'properties': {'objectid': i}} for i in range(25)]
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """stub upstream service"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def send_json(self, content, status=200):
+        body = json.dumps(content).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        stats = self.server.stats
+        with stats['lock']:
+            stats['requests'].append(url.path)
+            stats['ports'].add(self.client_address[1])
+            stats['active'] += 1
+            stats['max_active'] = max(stats['max_active'], stats['active'])
+
+        try:
+            self.handle_path(url.path, params)
+        finally:
+            with stats['lock']:
+                stats['active'] -= 1
+
+    def handle_path(self, path, params):
+        if path == '/json':
+            self.send_json({'value': params.get('value')})
+        elif path == '/flaky':
+            # first two requests of a key fail
+            flaky = self.server.stats['flaky']
+            with self.server.stats['lock']:
+                flaky[params['key']] = flaky.get(params['key'], 0) + 1
+            if flaky[params['key']] <= 2:
+                self.send_json({}, 503)
+            else:
+                self.send_json({'value': 'ok'})
+        elif path == '/slow':
+            time.sleep(0.2)
+            self.send_json({'value': params.get('value')})
+        elif path == '/invalid':
+            body = b'not json'
+            self.send_response(200)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        elif path == '/FeatureServer/0':
+            self.send_json({
+                'advancedQueryCapabilities': {
+                    'supportsPagination': True,
+                    'supportsOrderBy': True
+                },
+                'supportedQueryFormats': 'JSON, geoJSON',
+                'fields': [{'name': 'objectid', 'type': 'esriFieldTypeOID'}]
+            })
+        elif path == '/FeatureServer/0/query':
+            if params.get('returnCountOnly') == 'true':
+                self.send_json({'count': len(FEATURES)})
+                return
+            # pages of at most 10 features
+            offset = int(params['resultOffset'])
+            count = min(int(params['resultRecordCount']), 10)
+            self.send_json({
+                'type': 'FeatureCollection',
+                'features': FEATURES[offset:offset + count]
+            })
+        else:
+            self.send_json({}, 404)
+
+
+@pytest.fixture()
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.daemon_threads = True
+    server.stats = {'lock': threading.Lock(), 'requests': [],
+                    'ports': set(), 'active': 0, 'max_active': 0,
+                    'flaky': {}}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def get_url(server, path):
+    return f'http://127.0.0.1:{server.server_address[1]}{path}'
+
+
+def test_get_json(server):
+    client = HTTPClient()
+
+    for value in ['a', 'b', 'c']:
+        content = client.get_json(get_url(server, '/json'), {'value': value})
+        assert content == {'value': value}
+
+    # connections are kept alive
+    assert len(server.stats['ports']) == 1
+
+    with pytest.raises(ProviderConnectionError):
+        client.get_json(get_url(server, '/missing'))
+
+    with pytest.raises(ProviderQueryError):
+        client.get_json(get_url(server, '/invalid'))
+
+    client = HTTPClient(retries=0)
+    with pytest.raises(ProviderConnectionError):
+        client.get_json('http://127.0.0.1:1/json')
+
+
+def test_retries(server):
+    client = HTTPClient(retries=3, backoff_factor=0)
+    url = get_url(server, '/flaky')
+
+    assert client.get_json(url, {'key': 'a'}) == {'value': 'ok'}
+    assert server.stats['flaky']['a'] == 3
+
+    client = HTTPClient(retries=0)
+    with pytest.raises(ProviderConnectionError):
+        client.get_json(url, {'key': 'b'})
+
+
+def test_cache(server):
+    client = HTTPClient(cache_ttl=60)
+    url = get_url(server, '/json')
+
+    content = client.get_json(url, {'value': 'a'})
+    content['value'] = 'changed'
+    assert client.get_json(url, {'value': 'a'}) == {'value': 'a'}
+    assert server.stats['requests'].count('/json') == 1
+
+    # keyed by params and headers
+    client.get_json(url, {'value': 'b'})
+    client.get_json(url, {'value': 'b'}, headers={'Authorization': 'x'})
+    assert server.stats['requests'].count('/json') == 3
+
+    client.get_json(url, {'value': 'a'}, ttl=0)
+    assert server.stats['requests'].count('/json') == 4
+
+    client = HTTPClient()
+    client.get_json(url, {'value': 'a'})
+    client.get_json(url, {'value': 'a'})
+    assert server.stats['requests'].count('/json') == 6
+
+
+def test_map(server):
+    client = HTTPClient(max_workers=3)
+    url = get_url(server, '/slow')
+    values = ['a', 'b', 'c', 'd', 'e', 'f']
+
+    start = time.monotonic()
+    results = client.map(lambda value: client.get_json(url, {'value': value}),
+                         values)
+    elapsed = time.monotonic() - start
+
+    assert [result['value'] for result in results] == values
+    # 3 requests at a time, instead of 6 in sequence (1.2s)
+    assert server.stats['max_active'] == 3
+    assert elapsed < 1
+
+    future = client.submit(client.get_json, url, {'value': 'e'})
+    assert future.result() == {'value': 'e'}
+
+
+def test_get_http_client():
+    client = get_http_client({'name': 'ESRI'})
+    assert get_http_client({'name': 'Socrata', 'http': {}}) is client
+    assert get_http_client({'http': {'timeout': 30}}) is client
+
+    client2 = get_http_client({'http': {'cache_ttl': 60}})
+    assert client2 is not client
+    assert client2.cache is not None
+
+
+def test_esri_pages(server):
+    p = ESRIServiceProvider({
+        'name': 'ESRI',
+        'type': 'feature',
+        'data': get_url(server, '/FeatureServer/0'),
+        'id_field': 'objectid'
+    })
+
+    results = p.query(limit=25)
+    assert results['numberMatched'] == 25
+    assert results['numberReturned'] == 25
+    assert [f['id'] for f in results['features']] == list(range(25))
+
+    results = p.query(offset=5, limit=12)
+    assert results['numberReturned'] == 12
+    assert [f['id'] for f in results['features']] == list(range(5, 17))
+
+    results = p.query(offset=20, limit=10)
+    assert [f['id'] for f in results['features']] == list(range(20, 25))
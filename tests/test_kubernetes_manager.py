@@ -0,0 +1,231 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+pytest.importorskip('kubernetes')
+
+from pygeoapi.process.hello_world import HelloWorldProcessor  # noqa
+from pygeoapi.process.manager.kubernetes import KubernetesManager  # noqa
+from pygeoapi.process.manager.kubernetes_utils import get_api, k8s_execute  # noqa
+from pygeoapi.util import JobStatus  # noqa
+
+LOG = [b'Starting\n'] + [f'{i}% done\n'.encode() for i in range(0, 101)]
+
+
+class FakeAPIHandler(BaseHTTPRequestHandler):
+    """fake Kubernetes API server, running pods through given phases"""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def send_body(self, body, content_type='application/json'):
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def get_pod(self, name, version):
+        phase, statuses = self.server.phases[version - 1]
+        return {
+            'apiVersion': 'v1',
+            'kind': 'Pod',
+            'metadata': {
+                'name': name,
+                'namespace': 'default',
+                'resourceVersion': str(version),
+                'labels': self.server.pods[name]
+            },
+            'status': {
+                'phase': phase,
+                'containerStatuses': statuses
+            }
+        }
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(
+            int(self.headers['Content-Length'])))
+        name = body['metadata']['name']
+        with self.server.lock:
+            self.server.pods[name] = body['metadata']['labels']
+            self.server.requests.append(('create', name))
+        self.send_body(json.dumps(self.get_pod(name, 1)).encode())
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        path = url.path.split('/')
+
+        if path[-1] == 'log':
+            with self.server.lock:
+                self.server.requests.append(('log', path[-2]))
+            self.send_body(b''.join(LOG), 'text/plain')
+        elif params.get('watch') in (['true'], ['True']):
+            name = params['fieldSelector'][0].split('=')[1]
+            version = int(params['resourceVersion'][0])
+            with self.server.lock:
+                self.server.requests.append(('watch', name))
+            # the events of the pod since version
+            events = [{
+                'type': 'MODIFIED',
+                'object': self.get_pod(name, i)
+            } for i in range(version + 1, len(self.server.phases) + 1)]
+            self.send_body(b''.join(
+                json.dumps(event).encode() + b'\n' for event in events))
+        else:
+            selector = params['labelSelector'][0].split('=')
+            items = [self.get_pod(name, 2)
+                     for name, labels in self.server.pods.items()
+                     if labels.get(selector[0]) == selector[1]]
+            self.send_body(json.dumps({
+                'apiVersion': 'v1', 'kind': 'PodList', 'metadata': {},
+                'items': items}).encode())
+
+    def do_DELETE(self):
+        self.rfile.read(int(self.headers.get('Content-Length', 0)))
+        name = urlparse(self.path).path.split('/')[-1]
+        with self.server.lock:
+            pod = self.get_pod(name, 1)
+            self.server.pods.pop(name)
+            self.server.requests.append(('delete', name))
+        self.send_body(json.dumps(pod).encode())
+
+
+@pytest.fixture()
+def server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeAPIHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.pods = {}
+    server.requests = []
+    server.phases = [('Pending', None), ('Pending', None),
+                     ('Running', None), ('Succeeded', None)]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture()
+def manager(server, tmp_path):
+    return KubernetesManager({
+        'name': 'Kubernetes',
+        'connection': str(tmp_path / 'jobs.db'),
+        'output_dir': str(tmp_path),
+        'host': f'http://127.0.0.1:{server.server_address[1]}',
+        'progress_interval': 3600
+    })
+
+
+def test_execute(server, manager):
+    p = HelloWorldProcessor({'name': 'HelloWorld'})
+    updates = []
+    update_job = manager.update_job
+
+    def log_update_job(job_id, update_dict):
+        updates.append(update_dict)
+        return update_job(job_id, update_dict)
+
+    manager.update_job = log_update_job
+
+    job_id, mimetype, outputs, status, _ = manager.execute_process(
+        p, {'command': 'gdalinfo --version'})
+
+    assert status == JobStatus.successful
+    assert mimetype == 'text/plain'
+    assert outputs == b''.join(LOG)
+
+    # the pod is followed through one watch per wait, then deleted
+    actions = [action for action, _ in server.requests]
+    assert actions == ['create', 'watch', 'log', 'watch', 'delete']
+    assert server.pods == {}
+
+    # progress lines are coalesced into a single update
+    progress = [u['progress'] for u in updates if list(u) == ['progress']]
+    assert progress == [100]
+
+    job = manager.get_job(job_id)
+    assert job['status'] == JobStatus.successful.value
+    assert manager.get_job_result(job_id) == ('text/plain', outputs)
+
+
+def test_execute_failed(server, manager):
+    server.phases[-1] = ('Failed', [{
+        'name': 'gdal',
+        'image': 'gdal',
+        'imageID': '',
+        'ready': False,
+        'restartCount': 0,
+        'state': {'terminated': {'exitCode': 2, 'reason': 'Error'}}
+    }])
+    p = HelloWorldProcessor({'name': 'HelloWorld'})
+
+    job_id, mimetype, outputs, status, _ = manager.execute_process(
+        p, {'command': 'gdalinfo --version'})
+
+    assert status == JobStatus.failed
+    assert 'exited with code 2' in outputs['description']
+    assert server.pods == {}
+
+    _, _, _, status, _ = manager.execute_process(
+        p, {'command': 'unknown'})
+    assert status == JobStatus.failed
+    assert [action for action, _ in server.requests].count('create') == 1
+
+
+def test_cancel_job(server, manager):
+    server.pods['gdal-1'] = {'pygeoapi-job': 'job-1'}
+    server.pods['gdal-2'] = {'pygeoapi-job': 'job-2'}
+
+    assert manager.cancel_job('job-1')
+    assert list(server.pods) == ['gdal-2']
+    assert not manager.cancel_job('job-3')
+
+
+def test_k8s_execute(server):
+    api = get_api(f'http://127.0.0.1:{server.server_address[1]}')
+
+    outputs = k8s_execute('gdalinfo --version', api)
+    assert outputs['status'] == 'Completed'
+    assert outputs['message'] == b''.join(LOG).decode()
+    assert server.pods == {}
+
+    outputs = k8s_execute('unknown', api)
+    assert outputs['status'] == 'Failed'
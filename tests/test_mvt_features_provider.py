@@ -0,0 +1,136 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import mapbox_vector_tile
+import pytest
+
+from pygeoapi.provider.mvt_features import (MVTFeaturesProvider,
+                                            get_tile_bounds)
+from pygeoapi.provider.tile import (ProviderTileNotFoundError,
+                                    ProviderTilesetIdNotFoundError)
+
+from .util import get_test_file_path
+
+
+@pytest.fixture()
+def config():
+    return {
+        'type': 'tile',
+        'name': 'MVT-features',
+        'feature_provider': 'GeoJSON',
+        'data': get_test_file_path('data/ne_110m_lakes.geojson'),
+        'id_field': 'id',
+        'options': {
+            'zoom': {
+                'min': 0,
+                'max': 10
+            },
+            'schemes': ['WebMercatorQuad', 'WorldCRS84Quad'],
+            'cache': {
+                'name': 'Memory'
+            },
+            'cache_ttl': {
+                0: 3600,
+                5: 0
+            }
+        },
+        'format': {
+            'name': 'pbf',
+            'mimetype': 'application/vnd.mapbox-vector-tile'
+        }
+    }
+
+
+def test_get_tile_bounds():
+    assert get_tile_bounds('WorldCRS84Quad', 0, 0, 1) == (0, -90, 180, 90)
+    assert get_tile_bounds('WebMercatorQuad', 1, 1, 0) == \
+        (-20037508.3427892, -20037508.3427892, 0, 0)
+
+    with pytest.raises(ProviderTileNotFoundError):
+        get_tile_bounds('WebMercatorQuad', 1, 2, 0)
+
+    with pytest.raises(ProviderTilesetIdNotFoundError):
+        get_tile_bounds('foo', 0, 0, 0)
+
+
+@pytest.mark.parametrize('tileset', ['WebMercatorQuad', 'WorldCRS84Quad'])
+def test_get_tiles(config, tileset):
+    p = MVTFeaturesProvider(config)
+    assert p.get_layer() == 'ne_110m_lakes'
+
+    tile = p.get_tiles(p.get_layer(), tileset, 1, 0, 0, 'mvt')
+    layer = mapbox_vector_tile.decode(tile)['ne_110m_lakes']
+    assert layer['extent'] == 4096
+
+    names = [f['properties']['name'] for f in layer['features']]
+    assert 'Lake Winnipeg' in names
+    assert 'Lake Baikal' not in names
+
+
+def test_get_tiles_out_of_range(config):
+    p = MVTFeaturesProvider(config)
+
+    with pytest.raises(ProviderTileNotFoundError):
+        p.get_tiles(p.get_layer(), 'WebMercatorQuad', 11, 0, 0, 'mvt')
+
+    with pytest.raises(ProviderTilesetIdNotFoundError):
+        p.get_tiles(p.get_layer(), 'foo', 0, 0, 0, 'mvt')
+
+
+def test_tile_cache(config):
+    p = MVTFeaturesProvider(config)
+    assert p._get_cache_ttl(4) == 3600
+    assert p._get_cache_ttl(5) == 0
+
+    generation = p.cache.get_generation('tiles:ne_110m_lakes')
+    tile = p.get_tiles(p.get_layer(), 'WebMercatorQuad', 0, 0, 0, 'mvt')
+    key = f'tile:ne_110m_lakes/{generation}/WebMercatorQuad/0/0/0'
+    assert p.cache.get(key)['content'] == tile
+
+    p.get_tiles(p.get_layer(), 'WebMercatorQuad', 5, 0, 0, 'mvt')
+    assert p.cache.get(
+        f'tile:ne_110m_lakes/{generation}/WebMercatorQuad/5/0/0') is None
+
+
+def test_tile_cache_invalidate(config):
+    p = MVTFeaturesProvider(config)
+    tile = p.get_tiles(p.get_layer(), 'WebMercatorQuad', 0, 0, 0, 'mvt')
+
+    p.feature_provider.data = get_test_file_path(
+        'data/ne_110m_populated_places_simple.geojson')
+    assert p.get_tiles(
+        p.get_layer(), 'WebMercatorQuad', 0, 0, 0, 'mvt') == tile
+
+    # tiles are rebuilt from the current data once invalidated
+    p.invalidate()
+    tile = p.get_tiles(p.get_layer(), 'WebMercatorQuad', 0, 0, 0, 'mvt')
+    layer = mapbox_vector_tile.decode(tile)['ne_110m_lakes']
+    names = [f['properties']['name'] for f in layer['features']]
+    assert 'Lake Winnipeg' not in names
+    assert 'Ottawa' in names
@@ -36,7 +36,7 @@ import logging
 import pytest
 
 from pygeoapi.provider.base import ProviderItemNotFoundError
-from pygeoapi.provider.ogr import OGRProvider
+from pygeoapi.provider.ogr import _DATASET_POOL, DatasetPool, OGRProvider
 
 
 LOGGER = logging.getLogger(__name__)
@@ -403,3 +403,60 @@ def test_query_with_property_filtering(config_gpkg_4326):
         assert 'straatnaam' in feature['properties']
 
         assert feature['properties']['straatnaam'] == 'Arnhemseweg'
+
+
+def test_query_arrow_stream(config_gpkg_4326):
+    """Testing that batched (Arrow) and per-feature reads are identical"""
+
+    p = OGRProvider(config_gpkg_4326)
+    features = p.query(offset=10, limit=50)['features']
+
+    config_gpkg_4326['data']['source_capabilities']['arrow_stream'] = False
+    p2 = OGRProvider(config_gpkg_4326)
+    assert not p2.arrow_stream
+    features2 = p2.query(offset=10, limit=50)['features']
+
+    assert len(features) == len(features2) == 50
+    for feature, feature2 in zip(features, features2):
+        assert feature['id'] == feature2['id']
+        assert feature['properties'] == feature2['properties']
+        assert feature['geometry']['type'] == feature2['geometry']['type']
+        assert list(feature['geometry']['coordinates']) == \
+            pytest.approx(list(feature2['geometry']['coordinates']))
+
+
+def test_query_dataset_pool(config_gpkg_4326):
+    """Testing that opened datasets are reused and filters reset"""
+
+    p = OGRProvider(config_gpkg_4326)
+    dataset_key = p._get_dataset_key()
+    dataset = _DATASET_POOL.get(dataset_key)
+    assert dataset is not None
+
+    fc = p.query(properties=[('straatnaam', 'Arnhemseweg')], limit=10000)
+    assert _DATASET_POOL.get(dataset_key) is dataset
+
+    fc2 = p.query(resulttype='hits')
+    assert fc2['numberMatched'] > len(fc['features'])
+
+    config_gpkg_4326['data']['keep_open'] = False
+    p2 = OGRProvider(config_gpkg_4326)
+    assert p2._get_dataset_key() is None
+
+
+def test_dataset_pool_expiry():
+    """Testing that idle datasets are closed"""
+
+    pool = DatasetPool(size=2)
+    pool.put('a', 'dataset-a', idle_timeout=-1)
+    assert pool.get('a') is None
+
+    pool.put('b', 'dataset-b')
+    pool.put('c', 'dataset-c')
+    pool.put('d', 'dataset-d')
+    assert pool.get('b') is None
+    assert pool.get('c') == 'dataset-c'
+    assert pool.get('d') == 'dataset-d'
+
+    pool.discard('d')
+    assert pool.get('d') is None
@@ -38,7 +38,7 @@ import logging
 import pytest
 
 from pygeoapi.provider.base import (ProviderItemNotFoundError)
-from pygeoapi.provider.ogr import OGRProvider
+from pygeoapi.provider.ogr import OGRProvider, _DATASET_POOL
 
 
 LOGGER = logging.getLogger(__name__)
@@ -466,6 +466,43 @@ def test_query_with_offset(config_MapServer_WFS_cities):
     assert geometry is not None
 
 
+def test_query_pages_dataset_pool(config_MapServer_WFS_cities, monkeypatch):
+    """Testing that deep pages are requested from the service"""
+
+    p = OGRProvider(config_MapServer_WFS_cities)
+    dataset_key = p._get_dataset_key()
+
+    start_indexes = []
+    open_dataset = p._open_dataset
+
+    def _open_dataset():
+        start_indexes.append(
+            p.gdal.GetConfigOption('OGR_WFS_BASE_START_INDEX'))
+        open_dataset()
+
+    monkeypatch.setattr(p, '_open_dataset', _open_dataset)
+
+    first = p.query(offset=0, limit=25)
+    dataset = _DATASET_POOL.get(dataset_key)
+    assert dataset is not None
+    p.query(offset=0, limit=10)
+    assert start_indexes == ['0']
+
+    # the first feature of a deep page is the start index of the request
+    # to the service, on a dataset opened for the page only
+    page = p.query(offset=20, limit=5)
+    assert start_indexes == ['0', '20']
+    assert _DATASET_POOL.get(dataset_key) is dataset
+    assert [f['id'] for f in page['features']] == \
+        [f['id'] for f in first['features'][20:]]
+
+    # credentials tell datasets of a same service apart
+    config_MapServer_WFS_cities['data']['gdal_ogr_options'][
+        'GDAL_HTTP_USERPWD'] = 'user:password'
+    assert OGRProvider(
+        config_MapServer_WFS_cities)._get_dataset_key() != dataset_key
+
+
 def test_query_with_property_filtering_gs(config_MapServer_WFS_continents):
     """Testing query with property filtering on geoserver backend"""
 
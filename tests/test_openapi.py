@@ -27,12 +27,17 @@
 #
 # =================================================================
 
+import gzip
+import json
+import os
+
 import pytest
+import yaml
 
 from jsonschema.exceptions import ValidationError
 
 from pygeoapi.openapi import (get_oas, get_ogc_schemas_location,
-                              validate_openapi_document)
+                              validate_openapi_document, OpenAPIDocument)
 from pygeoapi.util import yaml_load
 
 from .util import get_test_file_path
@@ -97,3 +102,36 @@ def test_hidden_resources(config_hidden_resources):
 
     assert '/collections/obs' not in openapi_doc['paths']
     assert '/collections/obs/items' not in openapi_doc['paths']
+
+
+def test_openapi_document(config, tmp_path):
+    openapi_file = tmp_path / 'openapi.yml'
+    openapi_file.write_text(yaml.safe_dump({'openapi': '3.0.2'}))
+
+    config['resources'] = {}
+    config_file = tmp_path / 'config.yml'
+    config_file.write_text(yaml.safe_dump(config))
+
+    document = OpenAPIDocument(openapi_file, config_file)
+    assert json.loads(document.content) == {'openapi': '3.0.2'}
+    assert document.etag.startswith('"')
+    assert gzip.decompress(document.compressed()) == \
+        document.content.encode('utf-8')
+    assert not document.refresh()
+
+    # configuration changes regenerate the document in-process
+    etag = document.etag
+    config['metadata']['identification']['title'] = 'Changed title'
+    config_file.write_text(yaml.safe_dump(config))
+    os.utime(config_file, ns=(0, 0))
+
+    assert document.refresh()
+    assert document.etag != etag
+    content = json.loads(document.content)
+    assert content['info']['title'] == 'Changed title'
+    assert gzip.decompress(document.compressed()) == \
+        document.content.encode('utf-8')
+
+    # generated from configuration when no OpenAPI document is given
+    document = OpenAPIDocument(config_file=config_file)
+    assert json.loads(document.content)['info']['title'] == 'Changed title'
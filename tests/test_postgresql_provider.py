@@ -50,6 +50,7 @@ from pygeoapi.api import API
 
 from pygeoapi.provider.base import (
     ProviderConnectionError,
+    ProviderInvalidQueryError,
     ProviderItemNotFoundError,
     ProviderQueryError
 )
@@ -188,6 +189,81 @@ def test_query_sortby(config):
     assert name['features'][0]['properties']['name'] == 'Agasasa'
 
 
+def test_query_cursor(config):
+    """Test keyset pagination with cursor tokens"""
+    psp = PostgreSQLProvider(config)
+    sortby = [{'property': 'name', 'order': '+'}]
+    expected = psp.query(offset=0, limit=20, sortby=sortby)
+
+    first = psp.query(limit=10, sortby=sortby)
+    assert 'next_cursor' in first
+    second = psp.query(limit=10, sortby=sortby,
+                       cursor=first['next_cursor'])
+
+    ids = [f['id'] for f in first['features'] + second['features']]
+    assert ids == [f['id'] for f in expected['features']]
+    assert second['numberMatched'] == expected['numberMatched']
+
+    with pytest.raises(ProviderInvalidQueryError):
+        psp.query(cursor=first['next_cursor'])
+
+    with pytest.raises(ProviderInvalidQueryError):
+        psp.query(cursor='not-a-cursor')
+
+
+def test_query_cursor_null_keys(config):
+    """Test keyset pagination across NULL sort keys"""
+    psp = PostgreSQLProvider(config)
+    sortby = [{'property': 'name', 'order': '-'}]
+    matched = psp.query(resulttype='hits')['numberMatched']
+
+    # the last rows of the result set have no name
+    offset = matched - 25
+    expected = psp.query(offset=offset, limit=20, sortby=sortby)
+
+    first = psp.query(offset=offset, limit=10, sortby=sortby)
+    assert first['features'][-1]['properties']['name'] is None
+    assert 'next_cursor' in first
+    second = psp.query(limit=10, sortby=sortby,
+                       cursor=first['next_cursor'])
+
+    ids = [f['id'] for f in first['features'] + second['features']]
+    assert ids == [f['id'] for f in expected['features']]
+
+
+def test_query_count_policy(config):
+    """Test numberMatched with the count policies"""
+    exact = PostgreSQLProvider(config).query()
+    assert exact['numberMatched'] == 14776
+
+    config['count'] = 'estimated'
+    estimated = PostgreSQLProvider(config).query()
+    assert estimated['numberMatched'] > 0
+
+    config['count'] = 'omitted'
+    omitted = PostgreSQLProvider(config).query()
+    assert 'numberMatched' not in omitted
+    assert omitted['numberReturned'] == 10
+
+    hits = PostgreSQLProvider(config).query(resulttype='hits')
+    assert hits['numberMatched'] == 14776
+
+
+def test_query_count_cache(config):
+    """Test caching of exact counts"""
+    config['count_cache_ttl'] = 60
+    psp = PostgreSQLProvider(config)
+    properties = [('waterway', 'stream')]
+
+    count = psp.query(properties=properties)['numberMatched']
+    assert psp._get_cached_count(
+        {'properties': properties, 'bbox': [], 'filterq': None}) == count
+
+    psp._clear_count_cache()
+    assert psp._get_cached_count(
+        {'properties': properties, 'bbox': [], 'filterq': None}) is None
+
+
 def test_query_skip_geometry(config):
     """Test query without geometry"""
     provider = PostgreSQLProvider(config)
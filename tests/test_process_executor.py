@@ -0,0 +1,221 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import socket
+import threading
+import time
+
+import pytest
+
+from pygeoapi.process.base import BaseProcessor
+from pygeoapi.process.executor.base import ExecutorQueueFullError
+from pygeoapi.process.executor.pool import ProcessExecutor, ThreadExecutor
+from pygeoapi.process.executor.worker import WorkerExecutor, run_worker
+from pygeoapi.process.hello_world import HelloWorldProcessor
+from pygeoapi.process.manager.tinydb_ import TinyDBManager
+from pygeoapi.util import JobStatus
+
+
+class WaitProcessor(BaseProcessor):
+    """Processor waiting for an event (or a delay) before returning"""
+
+    events = {}
+
+    def __init__(self, process_id):
+        super().__init__({'name': 'Wait'}, {'id': process_id})
+
+    def execute(self, data):
+        event = self.events.get(data.get('event'))
+        if event is not None:
+            event.wait(10)
+        else:
+            time.sleep(data.get('delay', 0))
+
+        return 'application/json', {'id': data.get('event')}
+
+
+@pytest.fixture()
+def manager(tmp_path):
+    return TinyDBManager({
+        'name': 'TinyDB',
+        'connection': str(tmp_path / 'jobs.db'),
+        'output_dir': str(tmp_path)
+    })
+
+
+def _wait_for(manager, job_id, status, timeout=10):
+    end = time.monotonic() + timeout
+    while time.monotonic() < end:
+        job = manager.get_job(job_id)
+        if job is not None and job['status'] == status.value:
+            return job
+        time.sleep(0.05)
+
+    raise AssertionError(f'job {job_id} is not {status.value}')
+
+
+def _submit(manager, executor, p, job_id, data):
+    manager.add_job(manager._get_job_metadata(p, job_id))
+    executor.submit(manager, p, job_id, data)
+
+
+def test_thread_executor(manager):
+    executor = ThreadExecutor({
+        'name': 'Thread',
+        'max_workers': 2,
+        'queue_size': 2,
+        'processes': {
+            'slow': {'max_workers': 1},
+            'urgent': {'priority': 10}
+        }
+    })
+
+    events = WaitProcessor.events
+    for key in ['a', 'b', 'c', 'd']:
+        events[key] = threading.Event()
+
+    slow = WaitProcessor('slow')
+    _submit(manager, executor, slow, 'job-a', {'event': 'a'})
+    _wait_for(manager, 'job-a', JobStatus.running)
+
+    # slow is limited to one job: the second one waits
+    _submit(manager, executor, slow, 'job-b', {'event': 'b'})
+    _submit(manager, executor, WaitProcessor('other'), 'job-c',
+            {'event': 'c'})
+    _wait_for(manager, 'job-c', JobStatus.running)
+    assert manager.get_job('job-b')['status'] == JobStatus.accepted.value
+
+    # both workers are busy: queued jobs run by priority
+    _submit(manager, executor, WaitProcessor('urgent'), 'job-d',
+            {'event': 'd'})
+    with pytest.raises(ExecutorQueueFullError):
+        _submit(manager, executor, slow, 'job-e', {})
+
+    events['c'].set()
+    _wait_for(manager, 'job-d', JobStatus.running)
+    assert manager.get_job('job-b')['status'] == JobStatus.accepted.value
+
+    assert executor.cancel('job-b')
+    assert not executor.cancel('job-d')
+
+    events['a'].set()
+    events['d'].set()
+    _wait_for(manager, 'job-a', JobStatus.successful)
+    _wait_for(manager, 'job-d', JobStatus.successful)
+    time.sleep(0.2)
+    assert manager.get_job('job-b')['status'] == JobStatus.accepted.value
+
+    executor.shutdown()
+
+
+def test_process_executor(manager):
+    executor = ProcessExecutor({'name': 'Process', 'max_workers': 2})
+
+    hello = HelloWorldProcessor({'name': 'HelloWorld'})
+    _submit(manager, executor, hello, 'job-1', {'name': 'World'})
+    job = _wait_for(manager, 'job-1', JobStatus.successful)
+    assert manager.get_job_result('job-1')[1]['value'] == 'Hello World!'
+    assert job['mimetype'] == 'application/json'
+
+    slow = WaitProcessor('slow')
+    _submit(manager, executor, slow, 'job-2', {'delay': 30})
+    _wait_for(manager, 'job-2', JobStatus.running)
+    assert executor.cancel('job-2')
+    assert not executor.cancel('job-2')
+
+    executor.shutdown()
+
+
+def test_worker_executor(manager, tmp_path):
+    executor = WorkerExecutor({
+        'name': 'Worker',
+        'connection': str(tmp_path / 'queue.db'),
+        'queue_size': 3,
+        'processes': {'urgent': {'priority': 10}}
+    })
+
+    hello = HelloWorldProcessor({'name': 'HelloWorld'})
+    _submit(manager, executor, hello, 'job-1', {'name': 'World'})
+    _submit(manager, executor, WaitProcessor('urgent'), 'job-2', {})
+    _submit(manager, executor, hello, 'job-3', {'name': 'Moon'})
+    with pytest.raises(ExecutorQueueFullError):
+        _submit(manager, executor, hello, 'job-4', {'name': 'Mars'})
+
+    assert executor.cancel('job-3')
+    assert not executor.cancel('job-3')
+
+    # jobs claimed by a dead worker are queued again
+    assert executor.claim('localhost:0')[0] == 'job-2'
+    assert executor.claim('localhost:0')[0] == 'job-1'
+    assert executor.claim('localhost:0') is None
+    assert executor.recover() == 0
+
+    executor._connect().execute(
+        'UPDATE job_queue SET status = ?, worker = ?',
+        ('running', f'{socket.gethostname()}:999999999'))
+    executor._connect().commit()
+    assert executor.recover() == 2
+
+
+def test_run_worker(manager, tmp_path):
+    queue = str(tmp_path / 'queue.db')
+    manager_def = {
+        'name': 'TinyDB',
+        'connection': manager.connection,
+        'output_dir': str(tmp_path),
+        'executor': {'name': 'Worker', 'connection': queue,
+                     'poll_interval': 0.1}
+    }
+    config = {
+        'server': {'manager': manager_def},
+        'resources': {
+            'hello-world': {
+                'type': 'process',
+                'processor': {'name': 'HelloWorld'}
+            }
+        }
+    }
+
+    server_manager = TinyDBManager(manager_def)
+    hello = HelloWorldProcessor({'name': 'HelloWorld'})
+    _, _, status = server_manager._execute_handler_async(
+        hello, 'job-1', {'name': 'World'})
+    assert status == JobStatus.accepted
+    assert manager.get_job('job-1')['status'] == JobStatus.accepted.value
+
+    stop = threading.Event()
+    thread = threading.Thread(target=run_worker, args=(config, 2, stop))
+    thread.start()
+    try:
+        _wait_for(manager, 'job-1', JobStatus.successful)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert server_manager.executor.claim('localhost:0') is None
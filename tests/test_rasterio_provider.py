@@ -28,7 +28,9 @@
 # =================================================================
 
 import pytest
+from rasterio.io import MemoryFile
 
+from pygeoapi.provider import rasterio_
 from pygeoapi.provider.rasterio_ import RasterioProvider
 
 from .util import get_test_file_path
@@ -105,3 +107,44 @@ def test_query_bbox_reprojection(config):
     assert data['domain']['axes']['x']['stop'] == -75.0
     assert data['domain']['axes']['y']['start'] == 49.0
     assert data['domain']['axes']['y']['stop'] == 45.0
+
+
+def test_query_scale(config):
+    p = RasterioProvider(config)
+
+    data = p.query(scale_factor=4)
+    assert data['domain']['axes']['x']['num'] == 600
+    assert data['domain']['axes']['y']['num'] == 300
+
+    data = p.query(scale_size={'Long': 240}, subsets={
+        'Lat': [-45, 45],
+        'Long': [-90, 90]
+    })
+    assert data['domain']['axes']['x']['num'] == 240
+    assert data['domain']['axes']['y']['num'] == 601
+
+
+def test_query_stream(config, monkeypatch):
+    config['options'] = None
+    config['format'] = {
+        'name': 'GTiff',
+        'mimetype': 'image/tiff'
+    }
+    p = RasterioProvider(config)
+
+    data = p.query(format_='GTiff', scale_size={'Long': 600, 'Lat': 300})
+    assert isinstance(data, bytes)
+
+    # large outputs are streamed
+    monkeypatch.setattr(rasterio_, 'STREAM_SIZE', 1024)
+    data = p.query(format_='GTiff', subsets={
+        'Lat': [5, 60],
+        'Long': [5, 60]
+    })
+    assert not isinstance(data, bytes)
+
+    with MemoryFile(b''.join(data)) as memfile, memfile.open() as dataset:
+        assert dataset.width == 368
+        assert dataset.height == 368
+        assert dataset.bounds.left == pytest.approx(4.875)
+        assert dataset.bounds.top == pytest.approx(60.075)
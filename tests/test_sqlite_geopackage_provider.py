@@ -33,10 +33,13 @@
 # In eclipse we need to set PYGEOAPI_CONFIG, Run>Debug Configurations>
 # (Arguments as py.test and set external variables to the correct config path)
 
+from pygeofilter import ast
+from pygeofilter.parsers.ecql import parse
 import pytest
 
-from pygeoapi.provider.base import ProviderItemNotFoundError
-from pygeoapi.provider.sqlite import SQLiteGPKGProvider
+from pygeoapi.provider.base import (ProviderInvalidQueryError,
+                                    ProviderItemNotFoundError)
+from pygeoapi.provider.sqlite import SQLiteGPKGProvider, to_sql_where
 
 from .util import get_test_file_path
 
@@ -205,3 +208,76 @@ def test_get_geopackage_skip_geometry(config_geopackage):
     feature_collection = p.query(skip_geometry=True)
     for feature in feature_collection['features']:
         assert feature['geometry'] is None
+
+
+def test_query_bbox_geopackage(config_geopackage):
+    """Test query with a bounding box through the GeoPackage R-tree"""
+
+    p = SQLiteGPKGProvider(config_geopackage)
+    assert p.spatial_index[0] == 'rtree_poi_portugal_geom'
+
+    bbox = [-9.5, 38.6, -9.0, 38.9]
+    results = p.query(bbox=bbox, limit=1000)
+    assert len(results['features']) > 0
+    for feature in results['features']:
+        x, y = feature['geometry']['coordinates']
+        assert bbox[0] <= x <= bbox[2]
+        assert bbox[1] <= y <= bbox[3]
+
+    hits = p.query(bbox=bbox, resulttype='hits')
+    assert hits['numberMatched'] == len(results['features'])
+
+
+def test_query_sortby_select_properties_geopackage(config_geopackage):
+    """Test query with sortby, select_properties and skip_geometry"""
+
+    p = SQLiteGPKGProvider(config_geopackage)
+    results = p.query(sortby=[{'property': 'osm_id', 'order': '-'}],
+                      select_properties=['name'], skip_geometry=True)
+    features = results['features']
+    ids = [feature['id'] for feature in features]
+    assert ids == sorted(ids, reverse=True)
+    assert features[0]['geometry'] is None
+    assert list(features[0]['properties'].keys()) == ['name']
+
+    with pytest.raises(ProviderInvalidQueryError):
+        p.query(sortby=[{'property': 'foo', 'order': '+'}])
+
+
+def test_query_cql_geopackage(config_geopackage):
+    """Test query with a CQL filter"""
+
+    p = SQLiteGPKGProvider(config_geopackage)
+    results = p.query(filterq=parse("fclass = 'cafe'"), limit=1000)
+    assert len(results['features']) > 0
+    for feature in results['features']:
+        assert feature['properties']['fclass'] == 'cafe'
+
+
+def test_query_cql_quote_geopackage(config_geopackage):
+    """Test query with a CQL filter value containing a quote"""
+
+    p = SQLiteGPKGProvider(config_geopackage)
+    results = p.query(filterq=ast.Equal(ast.Attribute('name'),
+                                        "Brown's Bistro"))
+    assert len(results['features']) == 1
+    assert results['features'][0]['properties']['name'] == "Brown's Bistro"
+
+    results = p.query(filterq=ast.Equal(ast.Attribute('name'),
+                                        "x' OR 1=1 --"))
+    assert len(results['features']) == 0
+
+
+def test_to_sql_where():
+    """Test CQL filter values are bound as parameters"""
+
+    clause, values = to_sql_where(
+        parse("name = 'cafe' AND osm_id BETWEEN 1 AND 3"),
+        {'name': 'name', 'osm_id': 'osm_id'})
+    assert clause == '(("name" = ?) AND ("osm_id" BETWEEN ? AND ?))'
+    assert values == ('cafe', 1, 3)
+
+    clause, values = to_sql_where(
+        ast.Equal(ast.Attribute('name'), "x' OR 1=1 --"), {'name': 'name'})
+    assert clause == '("name" = ?)'
+    assert values == ("x' OR 1=1 --", )
@@ -0,0 +1,146 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+
+import pytest
+
+from pygeoapi.process.hello_world import HelloWorldProcessor
+from pygeoapi.process.manager.sqlite_ import SQLiteManager
+from pygeoapi.util import JobStatus
+
+
+@pytest.fixture()
+def manager(tmp_path):
+    return SQLiteManager({
+        'name': 'SQLite',
+        'connection': str(tmp_path / 'jobs.sqlite'),
+        'output_dir': str(tmp_path)
+    })
+
+
+def _job(identifier, process_id, status, start):
+    return {
+        'identifier': identifier,
+        'process_id': process_id,
+        'job_start_datetime': f'2023-01-{start:02}T00:00:00.000000Z',
+        'job_end_datetime': None,
+        'status': status.value,
+        'location': None,
+        'mimetype': None,
+        'message': 'Job accepted and ready for execution',
+        'progress': 5
+    }
+
+
+def test_jobs(manager):
+    for i in range(1, 11):
+        status = JobStatus.successful if i % 2 else JobStatus.failed
+        process_id = 'hello-world' if i <= 5 else 'other'
+        assert manager.add_job(_job(f'job-{i}', process_id, status, i)) \
+            == f'job-{i}'
+
+    result = manager.get_jobs()
+    assert len(result['jobs']) == 10
+    assert result['numberMatched'] == 10
+
+    jobs = manager.get_jobs(status=[JobStatus.failed])['jobs']
+    assert len(jobs) == 5
+    assert all(job['status'] == 'failed' for job in jobs)
+
+    jobs = manager.get_jobs(status=['successful'],
+                            process_id=['hello-world'])['jobs']
+    assert [job['identifier'] for job in jobs] == ['job-1', 'job-3', 'job-5']
+
+    jobs = manager.get_jobs(process_id=['hello-world', 'other'],
+                            datetime_='2023-01-03/2023-01-04')['jobs']
+    assert [job['identifier'] for job in jobs] == ['job-3', 'job-4']
+    assert len(manager.get_jobs(datetime_='../2023-01-02')['jobs']) == 2
+    assert len(manager.get_jobs(datetime_='2023-01-02')['jobs']) == 1
+    assert len(manager.get_jobs(datetime_='2023-01-09T00:00:00Z/..')['jobs']) == 2  # noqa
+
+    sortby = [{'property': 'job_start_datetime', 'order': '-'}]
+    result = manager.get_jobs(sortby=sortby, limit=3, offset=2)
+    assert [job['identifier'] for job in result['jobs']] == \
+        ['job-8', 'job-7', 'job-6']
+    assert result['numberMatched'] == 10
+    result = manager.get_jobs(sortby=sortby, limit=3, offset=9)
+    assert len(result['jobs']) == 1
+    assert result['numberMatched'] == 10
+    result = manager.get_jobs(sortby=sortby, limit=3, offset=20)
+    assert result['jobs'] == []
+    assert result['numberMatched'] == 10
+
+    sortby = [{'property': 'status', 'order': '+'},
+              {'property': 'job_start_datetime', 'order': '-'}]
+    jobs = manager.get_jobs(sortby=sortby, limit=2)['jobs']
+    assert [job['identifier'] for job in jobs] == ['job-10', 'job-8']
+
+    with pytest.raises(ValueError):
+        manager.get_jobs(datetime_='yesterday')
+
+    assert manager.update_job('job-1', {'progress': 50,
+                                        'parameters': {'name': 'World'}})
+    job = manager.get_job('job-1')
+    assert job['progress'] == 50
+    assert job['parameters'] == {'name': 'World'}
+    assert not manager.update_job('job-404', {'progress': 50})
+
+    assert manager.get_job('job-404') is None
+    assert manager.delete_job('job-1')
+    assert not manager.delete_job('job-1')
+    assert manager.get_jobs()['numberMatched'] == 9
+
+
+def test_execute(manager):
+    p = HelloWorldProcessor({'name': 'HelloWorld'})
+
+    job_id, mimetype, outputs, status, _ = manager.execute_process(
+        p, {'name': 'World'})
+    assert status == JobStatus.successful
+    assert outputs['value'] == 'Hello World!'
+
+    job = manager.get_job(job_id)
+    assert job['status'] == JobStatus.successful.value
+    assert job['progress'] == 100
+    assert manager.get_job_result(job_id) == (mimetype, outputs)
+
+    # progress updates of concurrent jobs
+    with ThreadPoolExecutor(4) as executor:
+        results = list(executor.map(
+            lambda i: manager.execute_process(p, {'name': str(i)}),
+            range(20)))
+    assert all(result[3] == JobStatus.successful for result in results)
+    assert manager.get_jobs(
+        status=[JobStatus.successful])['numberMatched'] == 21
+
+    # managers are sent to the child processes of jobs
+    manager2 = pickle.loads(pickle.dumps(manager))
+    assert manager2.get_job(job_id)['identifier'] == job_id
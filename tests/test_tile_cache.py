@@ -0,0 +1,225 @@
+# =================================================================
+#
+# Authors: Tom Kralidis <tomkralidis@gmail.com>
+#
+# Copyright (c) 2023 Tom Kralidis
+#
+# Permission is hereby granted, free of charge, to any person
+# obtaining a copy of this software and associated documentation
+# files (the "Software"), to deal in the Software without
+# restriction, including without limitation the rights to use,
+# copy, modify, merge, publish, distribute, sublicense, and/or sell
+# copies of the Software, and to permit persons to whom the
+# Software is furnished to do so, subject to the following
+# conditions:
+#
+# The above copyright notice and this permission notice shall be
+# included in all copies or substantial portions of the Software.
+#
+# THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND,
+# EXPRESS OR IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES
+# OF MERCHANTABILITY, FITNESS FOR A PARTICULAR PURPOSE AND
+# NONINFRINGEMENT. IN NO EVENT SHALL THE AUTHORS OR COPYRIGHT
+# HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER LIABILITY,
+# WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
+# FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR
+# OTHER DEALINGS IN THE SOFTWARE.
+#
+# =================================================================
+
+import gzip
+import sqlite3
+
+import pytest
+
+from pygeoapi.cache.tiles import pmtiles
+from pygeoapi.cache.tiles.pmtiles import (
+    Entry, deserialize_directory, find_entry, serialize_directory,
+    tile_id_to_z, zxy_to_tile_id)
+from pygeoapi.cache.tiles.seed import seed_tiles
+from pygeoapi.plugin import load_plugin
+from pygeoapi.util import yaml_load
+
+from .util import get_test_file_path
+
+TILES = [
+    (z, y, x, f'{z}/{y}/{x}'.encode() if x % 2 else b'same')
+    for z in range(6) for y in range(2 ** z) for x in range(2 ** z)
+]
+
+
+@pytest.fixture(params=['Directory', 'MBTiles', 'PMTiles'])
+def store(request, tmp_path):
+    return load_plugin('tile_cache', {
+        'name': request.param,
+        'path': str(tmp_path)
+    })
+
+
+@pytest.fixture()
+def config():
+    with open(get_test_file_path('pygeoapi-test-config.yml')) as fh:
+        return yaml_load(fh)
+
+
+def test_set_many(store):
+    assert store.get('lakes', 'WebMercatorQuad', 0, 0, 0, 'pbf') is None
+
+    assert store.set_many('lakes', 'WebMercatorQuad', 'pbf', TILES) == \
+        len(TILES)
+    for z, y, x, data in TILES:
+        assert store.get('lakes', 'WebMercatorQuad', z, y, x, 'pbf') == data
+
+    # keyed by tile matrix set and format
+    assert store.get('lakes', 'WorldCRS84Quad', 0, 0, 0, 'pbf') is None
+    assert store.get('lakes', 'WebMercatorQuad', 0, 0, 0, 'png') is None
+    assert store.get('lakes', 'WebMercatorQuad', 6, 0, 0, 'pbf') is None
+
+    # renewed tiles replace the cached ones, others are kept
+    store.set_many('lakes', 'WebMercatorQuad', 'pbf', [(5, 3, 2, b'new')])
+    assert store.get('lakes', 'WebMercatorQuad', 5, 3, 2, 'pbf') == b'new'
+    assert store.get('lakes', 'WebMercatorQuad', 5, 3, 3, 'pbf') == \
+        b'5/3/3'
+
+
+def test_set(store):
+    data = store.set('lakes', 'WebMercatorQuad', 1, 0, 1, 'pbf', b'tile')
+    assert data == b'tile'
+    assert store.get('lakes', 'WebMercatorQuad', 1, 0, 1, 'pbf') == b'tile'
+
+    headers = store.get_response_headers(data)
+    assert headers['Cache-Control'] == 'public, max-age=86400'
+    assert headers['ETag'].startswith('"')
+
+    store.invalidate('lakes')
+    assert store.get('lakes', 'WebMercatorQuad', 1, 0, 1, 'pbf') is None
+
+
+def test_gzip(tmp_path):
+    store = load_plugin('tile_cache', {
+        'name': 'Directory',
+        'path': str(tmp_path),
+        'gzip': True
+    })
+
+    data = store.set('lakes', 'WebMercatorQuad', 0, 0, 0, 'pbf', b'tile')
+    assert gzip.decompress(data) == b'tile'
+    assert store.get('lakes', 'WebMercatorQuad', 0, 0, 0, 'pbf') == data
+
+    # tiles compressed by the provider are not compressed twice
+    data = store.set('lakes', 'WebMercatorQuad', 1, 0, 0, 'pbf',
+                     gzip.compress(b'tile'))
+    assert gzip.decompress(data) == b'tile'
+
+
+def test_mbtiles_tms_rows(tmp_path):
+    store = load_plugin('tile_cache', {
+        'name': 'MBTiles',
+        'path': str(tmp_path)
+    })
+    store.set('lakes', 'WebMercatorQuad', 2, 0, 1, 'pbf', b'tile')
+
+    conn = sqlite3.connect(tmp_path / 'lakes' / 'WebMercatorQuad.pbf.mbtiles')
+    assert conn.execute(
+        'SELECT zoom_level, tile_column, tile_row FROM tiles').fetchall() == \
+        [(2, 1, 3)]
+    assert dict(conn.execute('SELECT * FROM metadata'))['format'] == 'pbf'
+
+
+def test_pmtiles_write_error(tmp_path, monkeypatch):
+    store = load_plugin('tile_cache', {
+        'name': 'PMTiles',
+        'path': str(tmp_path)
+    })
+    store.set_many('lakes', 'WebMercatorQuad', 'pbf', TILES[:5])
+
+    def replace(src, dst):
+        raise OSError('No space left on device')
+
+    monkeypatch.setattr(pmtiles.os, 'replace', replace)
+    with pytest.raises(OSError):
+        store.set_many('lakes', 'WebMercatorQuad', 'pbf', TILES[5:])
+
+    # the archive is left as it was, without temporary files
+    assert [path.name for path in (tmp_path / 'lakes').iterdir()] == \
+        ['WebMercatorQuad.pbf.pmtiles']
+    assert store.get('lakes', 'WebMercatorQuad', 0, 0, 0, 'pbf') == b'same'
+    assert store.get('lakes', 'WebMercatorQuad', 2, 0, 1, 'pbf') is None
+
+
+def test_pmtiles_tilesets(tmp_path):
+    store = load_plugin('tile_cache', {
+        'name': 'PMTiles',
+        'path': str(tmp_path)
+    })
+    assert store.supports('WebMercatorQuad')
+    assert not store.supports('WorldCRS84Quad')
+
+    # PMTiles tile ids do not cover the 2:1 matrices of WorldCRS84Quad
+    with pytest.raises(ValueError):
+        store.set_many('lakes', 'WorldCRS84Quad', 'pbf', [(0, 0, 1, b'b')])
+    assert store.get('lakes', 'WorldCRS84Quad', 0, 0, 1, 'pbf') is None
+
+
+def test_pmtiles_directories():
+    assert zxy_to_tile_id(0, 0, 0) == 0
+    assert [zxy_to_tile_id(1, x, y) for x, y in
+            [(0, 0), (0, 1), (1, 1), (1, 0)]] == [1, 2, 3, 4]
+    assert zxy_to_tile_id(2, 0, 0) == 5
+    assert tile_id_to_z(zxy_to_tile_id(12, 2048, 1024)) == 12
+
+    with pytest.raises(ValueError):
+        zxy_to_tile_id(1, 2, 0)
+
+    entries = [Entry(0, 0, 10, 1), Entry(1, 10, 5, 2), Entry(5, 0, 10, 1),
+               Entry(100, 15, 7, 0)]
+    assert deserialize_directory(serialize_directory(entries)) == entries
+
+    assert find_entry(entries, 2) == entries[1]
+    assert find_entry(entries, 3) is None
+    assert find_entry(entries, 1000) == entries[3]
+
+
+def test_pmtiles_leaf_directories(tmp_path, monkeypatch):
+    # entries do not fit in a smaller root directory
+    monkeypatch.setattr(pmtiles, 'ROOT_SIZE', 256)
+
+    store = load_plugin('tile_cache', {
+        'name': 'PMTiles',
+        'path': str(tmp_path),
+        'gzip': True
+    })
+    tiles = [(z, y, x, f'{z}/{y}/{x}'.encode()) for z in range(8)
+             for y in range(2 ** z) for x in range(2 ** z)]
+    store.set_many('lakes', 'WebMercatorQuad', 'pbf', tiles)
+
+    with (tmp_path / 'lakes' / 'WebMercatorQuad.pbf.pmtiles').open('rb') as fh:
+        header, root = store._read_header(fh)
+    assert header['leaf_length'] > 0
+    assert all(entry.run_length == 0 for entry in root)
+
+    for z, y, x, data in tiles[::97]:
+        tile = store.get('lakes', 'WebMercatorQuad', z, y, x, 'pbf')
+        assert gzip.decompress(tile) == data
+
+
+def test_seed_tiles(config, tmp_path):
+    config['server']['tile_cache'] = {
+        'name': 'MBTiles',
+        'path': str(tmp_path)
+    }
+
+    # missing tiles of the provider are skipped
+    count = seed_tiles(config, 'naturalearth/lakes', 'WorldCRS84Quad', [3],
+                       bbox=[-179, 1, -1, 89], workers=2)
+    assert count == 6
+
+    store = load_plugin('tile_cache', config['server']['tile_cache'])
+    with open(get_test_file_path('data/tiles/ne_110m_lakes/3/1/1.pbf'),
+              'rb') as fh:
+        assert store.get('naturalearth/lakes', 'WorldCRS84Quad', 3, 1, 1,
+                         'pbf') == fh.read()
+
+    config['server']['tile_cache']['name'] = 'PMTiles'
+    with pytest.raises(ValueError):
+        seed_tiles(config, 'naturalearth/lakes', 'WorldCRS84Quad', [0])
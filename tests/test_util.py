@@ -30,12 +30,13 @@
 from datetime import datetime, date, time
 from decimal import Decimal
 from copy import deepcopy
+import json
 
 import pytest
 from pyproj.exceptions import CRSError
 from shapely.geometry import Point
 
-from pygeoapi import util
+from pygeoapi import l10n, util
 from pygeoapi.api import __version__
 from pygeoapi.provider.base import ProviderTypeError
 
@@ -89,6 +90,87 @@ def test_str2bool():
     assert not util.str2bool('off')
 
 
+def test_iter_file(tmp_path):
+    path = tmp_path / 'data.bin'
+    path.write_bytes(b'0123456789')
+    assert list(util.iter_file(path, 4)) == [b'0123', b'4567', b'89']
+    assert path.exists()
+
+    # exhausted
+    assert b''.join(util.iter_file(path, 4, delete=True)) == b'0123456789'
+    assert not path.exists()
+
+    # closed while streamed
+    path.write_bytes(b'0123456789')
+    chunks = util.iter_file(path, 4, delete=True)
+    assert next(chunks) == b'0123'
+    chunks.close()
+    assert not path.exists()
+
+    # never started
+    path.write_bytes(b'0123456789')
+    chunks = util.iter_file(path, 4, delete=True)
+    del chunks
+    assert not path.exists()
+
+
+def test_to_json_stream():
+    features = ({'type': 'Feature', 'id': i, 'geometry': None,
+                 'properties': {}} for i in range(5))
+    collection = {
+        'type': 'FeatureCollection',
+        'numberMatched': 5,
+        'features': features,
+        'links': lambda number_returned: [{'rel': str(number_returned)}]
+    }
+
+    chunks = list(util.to_json_stream(collection, batch_size=2))
+    assert len(chunks) == 5
+
+    for pretty in [False, True]:
+        collection['features'] = [{'id': i} for i in range(3)]
+        result = json.loads(''.join(util.to_json_stream(collection, pretty)))
+        assert result['type'] == 'FeatureCollection'
+        assert result['numberMatched'] == 5
+        assert result['numberReturned'] == 3
+        assert [f['id'] for f in result['features']] == [0, 1, 2]
+        assert result['links'] == [{'rel': '3'}]
+
+    collection['features'] = [util.RawJSON('{"id": 0}'), {'id': 1}]
+    result = json.loads(''.join(util.to_json_stream(collection)))
+    assert [f['id'] for f in result['features']] == [0, 1]
+
+    collection['features'] = []
+    result = json.loads(''.join(util.to_json_stream(collection)))
+    assert result['features'] == []
+    assert result['numberReturned'] == 0
+
+
+def test_to_coverage_json_stream():
+    coverage = {
+        'type': 'Coverage',
+        'ranges': {
+            'a': {'type': 'NdArray', 'values': iter([[1, 2], [], [3]])},
+            'b': {'type': 'NdArray', 'values': [4, 5]}
+        }
+    }
+
+    chunks = list(util.to_coverage_json_stream(coverage))
+    assert len(chunks) == 9
+
+    result = json.loads(''.join(chunks))
+    assert result['type'] == 'Coverage'
+    assert result['ranges']['a'] == {'type': 'NdArray', 'values': [1, 2, 3]}
+    assert result['ranges']['b']['values'] == [4, 5]
+
+    coverage['ranges']['a']['values'] = iter([])
+    result = json.loads(''.join(util.to_coverage_json_stream(coverage, True)))
+    assert result['ranges']['a']['values'] == []
+
+    assert json.loads(''.join(util.to_coverage_json_stream({}))) == {
+        'ranges': {}}
+
+
 def test_json_serial():
     d = datetime(1972, 10, 30)
     assert util.json_serial(d) == '1972-10-30T00:00:00'
@@ -125,6 +207,27 @@ def test_path_basename():
     assert util.get_path_basename('/path/to/dir') == 'dir'
 
 
+def test_render_j2_template(config, tmp_path):
+    locale_ = l10n.str2locale('en')
+    data = {'foo': 'bar'}
+    content = util.render_j2_template(config, 'landing_page.html', data,
+                                      locale_)
+    assert '<html' in content
+
+    # environment is built once per template paths and locale
+    paths = util.get_j2_template_paths(config)
+    env = util.get_j2_environment(paths, 'locale', locale_, None)
+    assert util.get_j2_environment(paths, 'locale', locale_, None) is env
+    template = env.get_template('landing_page.html')
+    assert env.get_template('landing_page.html') is template
+
+    config['server']['templates'] = {
+        'bytecode_cache': str(tmp_path / 'templates')
+    }
+    assert util.precompile_j2_templates(config, [locale_]) > 0
+    assert any((tmp_path / 'templates').iterdir())
+
+
 def test_filter_dict_by_key_value(config):
     collections = util.filter_dict_by_key_value(config['resources'],
                                                 'type', 'collection')
@@ -233,6 +336,58 @@ def test_get_transform_from_crs():
     assert p_out.equals_exact(transform_func(p_in), 1e-3)
 
 
+def test_get_transformer():
+    crs_in = util.get_crs_from_uri(
+        'http://www.opengis.net/def/crs/EPSG/0/4258'
+    )
+    assert crs_in is util.get_crs_from_uri(
+        'http://www.opengis.net/def/crs/EPSG/0/4258'
+    )
+    crs_out = util.get_crs_from_uri(
+        'http://www.opengis.net/def/crs/EPSG/0/25833'
+    )
+    transformer = util.get_transformer(crs_in, crs_out)
+    assert transformer is util.get_transformer(crs_in, crs_out)
+    assert transformer is not util.get_transformer(crs_in, crs_out, True)
+
+    wkt = crs_out.to_wkt()
+    assert util.get_transformer(crs_in.to_wkt(), wkt).target_crs == crs_out
+
+
+def test_crs_transform_features():
+    crs_in = util.get_crs_from_uri(
+        'http://www.opengis.net/def/crs/EPSG/0/4258'
+    )
+    crs_out = util.get_crs_from_uri(
+        'http://www.opengis.net/def/crs/EPSG/0/25833'
+    )
+    transform_func = util.get_transform_from_crs(crs_in, crs_out)
+    features = [
+        {'geometry': {'type': 'Point', 'coordinates': [67.27, 14.39]}},
+        {'geometry': None},
+        {'geometry': {'type': 'Polygon', 'coordinates': [
+            [[67.2, 14.3], [67.3, 14.3], [67.3, 14.4], [67.2, 14.3]]]}},
+        {'geometry': {'type': 'GeometryCollection', 'geometries': [
+            {'type': 'LineString', 'coordinates': [[67.2, 14.3, 10],
+                                                   [67.3, 14.4, 20]]}]}}
+    ]
+    expected = deepcopy(features)
+    for feature in expected:
+        util.crs_transform_feature(feature, transform_func)
+
+    inputs = deepcopy(features)
+    geometries = [feature['geometry'] for feature in features]
+    util.crs_transform_features(features,
+                                util.get_transformer(crs_in, crs_out))
+    # input geometries are not modified
+    assert geometries == [feature['geometry'] for feature in inputs]
+    assert features[1]['geometry'] is None
+    for feature, expected_feature in zip(features, expected):
+        if feature['geometry'] is not None:
+            assert util.geojson_to_geom(feature['geometry']).equals_exact(
+                util.geojson_to_geom(expected_feature['geometry']), 1e-6)
+
+
 def test_get_supported_crs_list():
     DEFAULT_CRS_LIST = [
         'http://www.opengis.net/def/crs/OGC/1.3/CRS84',
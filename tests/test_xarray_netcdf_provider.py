@@ -27,10 +27,16 @@
 #
 # =================================================================
 
+import json
+import tempfile
+
 import pytest
 
-from pygeoapi.provider.base import ProviderQueryError
+from pygeoapi.provider import xarray_
+from pygeoapi.provider.base import (ProviderQueryError,
+                                    ProviderRequestEntityTooLargeError)
 from pygeoapi.provider.xarray_ import XarrayProvider
+from pygeoapi.util import to_coverage_json_stream, to_json
 
 from .util import get_test_file_path
 
@@ -95,3 +101,61 @@ def test_query(config):
 
     with pytest.raises(ProviderQueryError):
         data = p.query(datetime_='2010-01-16')
+
+
+def test_query_max_size(config):
+    config['max_size'] = 100000
+    p = XarrayProvider(config)
+
+    data = p.query(properties=['SST'], datetime_='2000-01-16')
+    assert isinstance(data, dict)
+
+    with pytest.raises(ProviderRequestEntityTooLargeError):
+        p.query(properties=['SST', 'AIRT'], datetime_='2000-01-16')
+
+
+def test_query_stream(config, monkeypatch):
+    p = XarrayProvider(config)
+    subsets = {'COADSX': [-10, 10]}
+
+    data = p.query(properties=['SST'], subsets=subsets)
+    assert isinstance(data['ranges']['SST']['values'], list)
+    content = to_json(data)
+
+    netcdf = p.query(properties=['SST'], subsets=subsets, format_='netcdf')
+    assert isinstance(netcdf, bytes)
+
+    monkeypatch.setattr(xarray_, 'STREAM_SIZE', 1000)
+    monkeypatch.setattr(xarray_, 'CHUNK_SIZE', 4096)
+
+    data = p.query(properties=['SST'], subsets=subsets)
+    assert not isinstance(data['ranges']['SST']['values'], list)
+    assert ''.join(to_coverage_json_stream(data)) == content
+
+    data = p.query(properties=['SST'], subsets=subsets)
+    data = json.loads(''.join(to_coverage_json_stream(data, True)))
+    assert len(data['ranges']['SST']['values']) == 12 * 90 * 10
+
+    data = p.query(properties=['SST'], subsets=subsets, format_='netcdf')
+    assert not isinstance(data, bytes)
+    assert b''.join(data) == netcdf
+
+
+def test_query_stream_cleanup(config, monkeypatch, tmp_path):
+    p = XarrayProvider(config)
+    subsets = {'COADSX': [-10, 10]}
+
+    monkeypatch.setattr(xarray_, 'STREAM_SIZE', 1000)
+    monkeypatch.setattr(tempfile, 'tempdir', str(tmp_path))
+
+    # temporary files are removed even if the stream is never started
+    for format_ in ['netcdf', 'zarr']:
+        data = p.query(properties=['SST'], subsets=subsets, format_=format_)
+        assert not isinstance(data, bytes)
+        assert list(tmp_path.iterdir())
+        data.close()
+        assert not list(tmp_path.iterdir())
+
+        data = p.query(properties=['SST'], subsets=subsets, format_=format_)
+        del data
+        assert not list(tmp_path.iterdir())